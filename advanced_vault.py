@@ -4,17 +4,18 @@ Advanced Vault Contract - Goal-based crowdfunding with deadline
 Inherits wallet system from existing branch
 """
 
-import json
 import os
-import base64
-from algosdk.v2client import algod
-from algosdk import transaction, logic
+from algosdk import encoding, transaction, logic
 from algosdk.transaction import ApplicationCreateTxn, OnComplete
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import record_deployment
+from teal_compiler import compile_teal
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
+# Recorded with each deployment. 2: the receiver is stored as its 32-byte
+# address and release keeps the inner payment's fee above min balance
+CONTRACT_VERSION = 2
 
 def get_advanced_vault_teal():
     """Generate advanced vault TEAL code"""
@@ -86,18 +87,28 @@ handle_noop:
     return
 
 contribute:
+    // The payment is the transaction just before this call, so a group
+    // can carry several [pay, contribute] pairs
+    txn GroupIndex
+    int 1
+    -
+    store 0
+    
     // Verify payment transaction in group
-    gtxn 0 TypeEnum
+    load 0
+    gtxns TypeEnum
     int pay
     ==
     assert
     
-    gtxn 0 Receiver
+    load 0
+    gtxns Receiver
     global CurrentApplicationAddress
     ==
     assert
     
-    gtxn 0 Amount
+    load 0
+    gtxns Amount
     int 0
     >
     assert
@@ -106,7 +117,8 @@ contribute:
     byte "total"
     byte "total"
     app_global_get
-    gtxn 0 Amount
+    load 0
+    gtxns Amount
     +
     app_global_put
     
@@ -137,7 +149,7 @@ release:
     itxn_field Receiver
     global CurrentApplicationAddress
     balance
-    int 100000  // Keep min balance
+    int 101000  // Keep min balance plus the inner transaction fee
     -
     itxn_field Amount
     itxn_submit
@@ -158,11 +170,6 @@ return
     
     return approval_teal, clear_teal
 
-def compile_teal(algod_client, teal_source):
-    """Compile TEAL source code"""
-    compile_response = algod_client.compile(teal_source)
-    return base64.b64decode(compile_response['result'])
-
 def deploy_advanced_vault():
     """Deploy advanced vault with parameters"""
     print("🏦 Deploy Advanced Vault Contract")
@@ -195,7 +202,7 @@ def deploy_advanced_vault():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get TEAL code
     approval_teal, clear_teal = get_advanced_vault_teal()
@@ -217,7 +224,7 @@ def deploy_advanced_vault():
     app_args = [
         goal_micro.to_bytes(8, 'big'),
         deadline_timestamp.to_bytes(8, 'big'),
-        receiver.encode()
+        encoding.decode_address(receiver)
     ]
     
     # Create application creation transaction
@@ -240,7 +247,7 @@ def deploy_advanced_vault():
     print(f"Sent app create tx: {tx_id}")
     
     # Wait for confirmation
-    confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
     app_id = confirmed_txn["application-index"]
     
     if not app_id:
@@ -259,18 +266,16 @@ def deploy_advanced_vault():
     deployment_info = {
         "appId": app_id,
         "appAddress": app_addr,
+        "createdRound": confirmed_txn["confirmed-round"],
         "goal": goal_micro,
         "deadline": deadline_timestamp,
         "receiver": receiver,
-        "network": "testnet",
         "deployedBy": creator['name'],
-        "type": "advanced_vault"
+        "contractVersion": CONTRACT_VERSION
     }
     
-    with open("advanced_vault_deployment.json", 'w') as f:
-        json.dump(deployment_info, f, indent=2)
-    
-    print(f"Wrote advanced_vault_deployment.json")
+    record = record_deployment("vault", deployment_info, approval_prog, clear_prog)
+    print("Recorded in deployments.json" + (f" (tag: {record['tag']})" if record['tag'] else ""))
     print(f"\n🎯 Next Steps:")
     print(f"1. Send ALGO to: {app_addr}")
     print(f"2. Use: python vault_interact.py")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Shared Algod client - one configured endpoint, keep-alive connections
+
+Every script gets its client from get_algod_client() instead of building a
+fresh algod.AlgodClient per call, so repeated requests reuse the same
+TCP/TLS connection rather than paying a new handshake each time.
+
+Endpoint and timeout come from the environment (see .env.example):
+  ALGOD_URL, ALGOD_TOKEN, ALGOD_TIMEOUT
+"""
+
+import http.client
+import json
+import os
+import threading
+from urllib import parse
+from algosdk import constants, error
+from algosdk.v2client import algod
+
+# Configuration
+ALGOD_URL = os.environ.get("ALGOD_URL", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.environ.get("ALGOD_TOKEN", "")  # not needed for Algonode
+ALGOD_TIMEOUT = float(os.environ.get("ALGOD_TIMEOUT", "30"))
+
+# Errors that mean a kept-alive socket went stale and the request can be retried
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class PooledAlgodClient(algod.AlgodClient):
+    """AlgodClient that keeps one persistent HTTP connection per thread"""
+
+    def __init__(self, algod_token, algod_address, headers=None, timeout=ALGOD_TIMEOUT):
+        super().__init__(algod_token, algod_address, headers)
+        url = parse.urlsplit(algod_address)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported algod URL scheme: {algod_address}")
+        self._scheme = url.scheme
+        self._host = url.hostname
+        self._port = url.port
+        self._base_path = url.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self, timeout):
+        """Return this thread's connection, opening it if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_class = (http.client.HTTPSConnection if self._scheme == "https"
+                          else http.client.HTTPConnection)
+            conn = conn_class(self._host, self._port, timeout=timeout)
+            self._local.conn = conn
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def close(self):
+        """Close the calling thread's connection"""
+        self._drop_connection()
+
+    def algod_request(self, method, requrl, params=None, data=None, headers=None,
+                      response_format="json", timeout=None):
+        """Execute a request over the pooled connection (same contract as AlgodClient)"""
+        header = {"User-Agent": "py-algorand-sdk"}
+
+        if self.headers:
+            header.update(self.headers)
+
+        if headers:
+            header.update(headers)
+
+        if requrl not in constants.no_auth:
+            header.update({constants.algod_auth_header: self.algod_token})
+
+        if requrl not in constants.unversioned_paths:
+            requrl = algod.api_version_path_prefix + requrl
+        if params:
+            requrl = requrl + "?" + parse.urlencode(params)
+
+        if timeout is None:
+            timeout = self.timeout
+
+        # One retry covers a keep-alive socket the server closed while idle
+        for attempt in range(2):
+            conn = self._connection(timeout)
+            try:
+                conn.request(method, self._base_path + requrl, body=data, headers=header)
+                resp = conn.getresponse()
+                body = resp.read()
+            except _STALE_CONNECTION_ERRORS:
+                self._drop_connection()
+                if attempt == 1:
+                    raise
+                continue
+            except Exception:
+                self._drop_connection()
+                raise
+            break
+
+        if resp.will_close:
+            self._drop_connection()
+
+        if resp.status >= 400:
+            message = body.decode("utf-8", errors="replace")
+            try:
+                message = json.loads(message)["message"]
+            except (ValueError, KeyError, TypeError):
+                pass
+            raise error.AlgodHTTPError(message, resp.status)
+
+        if response_format == "json":
+            if not body:
+                # Some algod responses return 200 OK with an empty body
+                return {}
+            try:
+                return json.loads(body)
+            except ValueError as e:
+                raise error.AlgodResponseError(
+                    "Failed to parse JSON response from algod"
+                ) from e
+        return body
+
+
+def get_algod_client():
+    """Return the process-wide Algod client for the configured endpoint"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PooledAlgodClient(ALGOD_TOKEN, ALGOD_URL, timeout=ALGOD_TIMEOUT)
+    return _client
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Decoded contract state with a per-round snapshot cache
+
+algod returns global and local state as base64 TEAL key-values. The reader
+decodes them by each contract's schema (uints to int, addresses to base32)
+and keeps one snapshot per app, member and roster per round. The round comes
+from the shared block follower (confirmations.py), so a status screen or bot
+polling every second makes no state requests until a new block lands.
+When a balance watcher (watcher.py) is running, balances and global state
+come from it instead, at no algod cost even on a fresh process.
+
+  reader = get_state_reader()
+  reader.global_state(app_id, "governance")   # {"owner": "ABC...", "total_contributors": 12, ...}
+  reader.member(app_id, "governance", address)
+  reader.members(app_id, "governance")        # {address: record} for the whole roster, fetched concurrently
+
+Usage:
+  python app_state.py <kind> [app_id]         # kind: governance, vault, sender, echo, simple
+"""
+
+import base64
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from algosdk import encoding, error
+from algod_client import get_algod_client
+from confirmations import get_confirmation_waiter
+from deployments import load_deployment
+from roster import member_box_name, read_roster
+from watcher_client import watched_account, watched_app
+
+# Configuration
+READ_WORKERS = int(os.environ.get("STATE_READ_WORKERS", "16"))  # concurrent member reads
+
+UINT = "uint"
+ADDRESS = "address"
+
+# Key -> type for every contract; keys missing on chain read as 0 / None
+SCHEMAS = {
+    "governance": {
+        "global": {"owner": ADDRESS, "total_contributors": UINT, "total_sent": UINT, "active_proposal": UINT,
+                   "proposal_votes": UINT, "proposal_amount": UINT, "proposal_recipient": ADDRESS,
+                   "payout_count": UINT, "payout_cursor": UINT, "proposal_id": UINT,
+                   "box_proposal_id": UINT},
+        "local": {"contributed": UINT, "voted": UINT, "slot": UINT},
+    },
+    "vault": {
+        "global": {"goal": UINT, "deadline": UINT, "receiver": ADDRESS, "total": UINT},
+        "local": {},
+    },
+    "sender": {
+        "global": {"owner": ADDRESS, "total_sent": UINT},
+        "local": {},
+    },
+    "echo": {
+        "global": {"total_echoed": UINT, "echo_count": UINT},
+        "local": {},
+    },
+    "simple": {
+        "global": {"n": UINT},  # depositors that joined through the box roster
+        "local": {"d": UINT},   # microAlgos deposited
+    },
+}
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+
+def decode_key_values(entries):
+    """algod TealKeyValue list -> {key: int or bytes}"""
+    state = {}
+    for entry in entries:
+        value = entry['value']
+        state[base64.b64decode(entry['key']).decode('utf-8', errors='replace')] = (
+            value['uint'] if value['type'] == 2 else base64.b64decode(value['bytes']))
+    return state
+
+
+def decode_state(entries, schema):
+    """TealKeyValue list -> {key: value} typed by schema; unknown keys are kept raw"""
+    raw = decode_key_values(entries)
+    state = {key: 0 if kind == UINT else None for key, kind in schema.items()}
+    for key, value in raw.items():
+        if schema.get(key) == ADDRESS and isinstance(value, bytes) and len(value) == 32:
+            value = encoding.encode_address(value)
+        state[key] = value
+    return state
+
+
+def decode_member_box(kind, record):
+    """Member box record -> the same fields local state has"""
+    if kind == "governance":
+        return {"contributed": int.from_bytes(record[0:8], 'big'), "voted": int.from_bytes(record[8:16], 'big'),
+                "slot": int.from_bytes(record[16:24], 'big')}
+    if kind == "simple":
+        return {"d": int.from_bytes(record[0:8], 'big'), "slot": int.from_bytes(record[8:16], 'big')}
+    raise ValueError(f"{kind} apps have no member boxes")
+
+
+def read_global_state(algod_client, app_id):
+    """Global state as {key: int or bytes}, straight from algod"""
+    return decode_key_values(algod_client.application_info(app_id)['params'].get('global-state', []))
+
+
+class StateReader:
+    """Typed state reads for one algod client, cached per round"""
+
+    def __init__(self, algod_client):
+        self.algod_client = algod_client
+        self._lock = threading.Lock()
+        self._snapshots = {}  # (what, app_id, ...) -> (round, value)
+
+    def round(self):
+        return get_confirmation_waiter(self.algod_client).last_round()
+
+    def _cached(self, key, load):
+        current = self.round()
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot[0] >= current:
+            return snapshot[1]
+        value = load(current)
+        with self._lock:
+            self._snapshots[key] = (current, value)
+        return value
+
+    def global_state(self, app_id, kind):
+        """Typed global state of a kind ("governance", "vault", ...) app"""
+        watched = watched_app(app_id, self.round())
+        if watched is not None and watched['kind'] == kind:
+            return decode_state(watched['global-state'], SCHEMAS[kind]["global"])
+        return self._cached(("global", app_id), lambda _: decode_state(
+            self.algod_client.application_info(app_id)['params'].get('global-state', []),
+            SCHEMAS[kind]["global"]))
+
+    def balance(self, address):
+        """microAlgos held by address"""
+        watched = watched_account(address, self.round())
+        if watched is not None:
+            return watched['amount']
+        return self._cached(("balance", address), lambda _: self.algod_client.account_info(
+            address, exclude="all")['amount'])
+
+    def _read_member(self, app_id, kind, address, box_member=None):
+        if box_member is not False and SCHEMAS[kind]["local"]:
+            try:
+                box = self.algod_client.application_box_by_name(app_id, member_box_name(address))
+                return dict(decode_member_box(kind, base64.b64decode(box['value'])), storage="box")
+            except error.AlgodHTTPError:
+                if box_member:
+                    raise
+        try:
+            info = self.algod_client.account_application_info(address, app_id)
+        except error.AlgodHTTPError:
+            return None
+        local_state = info.get('app-local-state')
+        if local_state is None:
+            return None
+        return dict(decode_state(local_state.get('key-value', []), SCHEMAS[kind]["local"]), storage="local")
+
+    def member(self, app_id, kind, address):
+        """A member's record from their member box or local state, or None"""
+        return self._cached(("member", app_id, address), lambda _: self._read_member(app_id, kind, address))
+
+    def members(self, app_id, kind, workers=READ_WORKERS):
+        """{address: record} for every member on the app's roster, in slot order. A simple
+        deposit app's roster only lists box depositors."""
+        def load(round_num):
+            count = self.global_state(app_id, kind)["total_contributors" if kind == "governance" else "n"]
+            addresses = read_roster(self.algod_client, app_id, count)
+            box_names = {base64.b64decode(box['name'])
+                         for box in self.algod_client.application_boxes(app_id).get('boxes', [])}
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                members = dict(zip(addresses, pool.map(lambda address: self._read_member(
+                    app_id, kind, address, member_box_name(address) in box_names), addresses)))
+            with self._lock:
+                for address, record in members.items():
+                    self._snapshots[("member", app_id, address)] = (round_num, record)
+            return members
+        return self._cached(("members", app_id), load)
+
+
+def get_state_reader(algod_client=None):
+    """Return the shared state reader for an algod client (default: the process-wide one)"""
+    if algod_client is None:
+        algod_client = get_algod_client()
+    key = id(algod_client)
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is None or reader.algod_client is not algod_client:
+            reader = StateReader(algod_client)
+            _readers[key] = reader
+        return reader
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in SCHEMAS:
+        print("💡 Usage:")
+        print(f"  python app_state.py <{'|'.join(SCHEMAS)}> [app_id]")
+        return
+    kind = args[0]
+    if len(args) > 1:
+        app_id = int(args[1])
+    else:
+        info = load_deployment(kind)
+        if not info:
+            return
+        app_id = info['appId']
+
+    reader = get_state_reader()
+    print(f"📊 {kind} app {app_id} at round {reader.round()}")
+    for key, value in reader.global_state(app_id, kind).items():
+        print(f"   {key}: {value}")
+    if kind in ("governance", "simple"):
+        members = reader.members(app_id, kind)
+        print(f"👥 Roster ({len(members)})")
+        for address, record in members.items():
+            fields = ", ".join(f"{k}={v}" for k, v in (record or {}).items())
+            print(f"   {address}: {fields or 'no member record'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1985 @@
+#!/usr/bin/env python3
+"""
+In-process AVM interpreter for the OGC contracts
+
+Executes atomic groups (algosdk transactions, signed or not) against an
+in-memory ledger and reports what algod would: approval/rejection, logs,
+inner transactions and the global/local/box/balance deltas. Lets us check
+whether a contribute, vote or execute_send group succeeds in microseconds
+instead of a ~4 s testnet round trip.
+
+Covers the opcodes our contracts use (txn/gtxn/global fields, app state,
+boxes, balance, inner transactions, log, assert, ...). Signatures and
+resource-reference limits are not checked.
+
+Usage:
+  python avm.py bench      # groups per second for a governance contribute
+"""
+
+import base64
+import hashlib
+import time
+from algosdk import encoding, logic, transaction
+from teal_assembler import (
+    OPCODES, OPCODES_BY_BYTE, TXN_FIELDS, TXN_ARRAY_FIELDS, FIELD_TABLES,
+    TealAssemblyError, decode_varuint,
+)
+
+MIN_TXN_FEE = 1000
+MIN_BALANCE = 100_000
+MAX_TXN_LIFE = 1000
+APP_BUDGET = 700
+MAX_INNER_TXNS = 256
+MAX_LOGS = 32
+MAX_LOG_BYTES = 1024
+MAX_STACK = 1000
+MAX_BYTES = 4096
+MAX_BOX_SIZE = 32768
+MAX_UINT = 2 ** 64 - 1
+ZERO_ADDRESS = bytes(32)
+
+TYPE_ENUMS = {b"pay": 1, b"keyreg": 2, b"acfg": 3, b"axfer": 4, b"afrz": 5, b"appl": 6}
+TYPE_NAMES = {v: k for k, v in TYPE_ENUMS.items()}
+
+ADDRESS_FIELDS = {
+    "Sender", "Receiver", "CloseRemainderTo", "AssetSender", "AssetReceiver",
+    "AssetCloseTo", "RekeyTo", "ConfigAssetManager", "ConfigAssetReserve",
+    "ConfigAssetFreeze", "ConfigAssetClawback", "FreezeAssetAccount",
+}
+BYTES_FIELDS = ADDRESS_FIELDS | {
+    "Note", "Lease", "Type", "TxID", "ApprovalProgram", "ClearStateProgram",
+    "ConfigAssetUnitName", "ConfigAssetName", "ConfigAssetURL",
+    "ConfigAssetMetadataHash", "VotePK", "SelectionPK", "StateProofPK", "LastLog",
+}
+
+# Opcode costs that differ from 1
+OPCODE_COSTS = {
+    "sha256": 35, "keccak256": 130, "sha512_256": 45, "sha3_256": 130,
+    "ed25519verify": 1900, "b+": 10, "b-": 10, "b/": 20, "b*": 20, "b%": 20,
+    "b|": 6, "b&": 6, "b^": 6, "b~": 4,
+}
+
+_MISSING = object()
+
+
+class AvmError(Exception):
+    """Raised when a program fails or a transaction is invalid"""
+
+
+def _addr(value):
+    """Accept a base32 address or raw 32 bytes, return raw bytes"""
+    if isinstance(value, str):
+        return encoding.decode_address(value)
+    return bytes(value)
+
+
+def _b32(raw):
+    return encoding.encode_address(raw)
+
+
+def app_address_bytes(app_id):
+    return encoding.checksum(b"appID" + app_id.to_bytes(8, "big"))
+
+
+def txn_fields(txn, group_index=0):
+    """Flatten an algosdk transaction into a dict keyed by TEAL field names"""
+    txn = getattr(txn, "transaction", txn)
+    fields = {
+        "Sender": _addr(txn.sender),
+        "Fee": txn.fee,
+        "FirstValid": txn.first_valid_round,
+        "LastValid": txn.last_valid_round,
+        "Note": txn.note or b"",
+        "Lease": txn.lease or bytes(32),
+        "RekeyTo": _addr(txn.rekey_to) if txn.rekey_to else ZERO_ADDRESS,
+        "Type": txn.type.encode(),
+        "TypeEnum": TYPE_ENUMS.get(txn.type.encode(), 0),
+        "GroupIndex": group_index,
+        "TxID": base64.b32decode(txn.get_txid() + "===="),
+        "GroupID": txn.group or bytes(32),
+    }
+    if txn.type == "pay":
+        fields["Receiver"] = _addr(txn.receiver)
+        fields["Amount"] = txn.amt
+        fields["CloseRemainderTo"] = _addr(txn.close_remainder_to) if txn.close_remainder_to else ZERO_ADDRESS
+    elif txn.type == "axfer":
+        fields["XferAsset"] = txn.index
+        fields["AssetAmount"] = txn.amount
+        fields["AssetReceiver"] = _addr(txn.receiver)
+        fields["AssetSender"] = _addr(txn.revocation_target) if txn.revocation_target else ZERO_ADDRESS
+        fields["AssetCloseTo"] = _addr(txn.close_assets_to) if txn.close_assets_to else ZERO_ADDRESS
+    elif txn.type == "acfg":
+        fields["ConfigAsset"] = txn.index or 0
+        fields["ConfigAssetTotal"] = txn.total or 0
+        fields["ConfigAssetDecimals"] = txn.decimals or 0
+        fields["ConfigAssetDefaultFrozen"] = int(bool(txn.default_frozen))
+        fields["ConfigAssetUnitName"] = (txn.unit_name or "").encode()
+        fields["ConfigAssetName"] = (txn.asset_name or "").encode()
+        fields["ConfigAssetURL"] = (txn.url or "").encode()
+        fields["ConfigAssetMetadataHash"] = txn.metadata_hash or b""
+        for field, attr in (("ConfigAssetManager", "manager"), ("ConfigAssetReserve", "reserve"),
+                            ("ConfigAssetFreeze", "freeze"), ("ConfigAssetClawback", "clawback")):
+            value = getattr(txn, attr)
+            fields[field] = _addr(value) if value else ZERO_ADDRESS
+    elif txn.type == "appl":
+        fields["ApplicationID"] = txn.index or 0
+        fields["OnCompletion"] = int(txn.on_complete)
+        fields["ApplicationArgs"] = list(txn.app_args or [])
+        fields["Accounts"] = [fields["Sender"]] + [_addr(a) for a in (txn.accounts or [])]
+        fields["Applications"] = [fields["ApplicationID"]] + list(txn.foreign_apps or [])
+        fields["Assets"] = list(txn.foreign_assets or [])
+        fields["ApprovalProgram"] = txn.approval_program or b""
+        fields["ClearStateProgram"] = txn.clear_program or b""
+        gs, ls = txn.global_schema, txn.local_schema
+        fields["GlobalNumUint"] = gs.num_uints if gs else 0
+        fields["GlobalNumByteSlice"] = gs.num_byte_slices if gs else 0
+        fields["LocalNumUint"] = ls.num_uints if ls else 0
+        fields["LocalNumByteSlice"] = ls.num_byte_slices if ls else 0
+        fields["ExtraProgramPages"] = txn.extra_pages or 0
+        fields["Boxes"] = [(b.app_index, b.name) for b in (txn.boxes or [])]
+    return fields
+
+
+def _field_default(name):
+    if name in ADDRESS_FIELDS:
+        return ZERO_ADDRESS
+    if name in BYTES_FIELDS:
+        return b""
+    if name in TXN_ARRAY_FIELDS:
+        return []
+    return 0
+
+
+def _get_field(fields, name, index=None):
+    """Read a txn field (index for array fields) the way the AVM sees it"""
+    if name in TXN_ARRAY_FIELDS:
+        array = fields.get(name, [])
+        if index is None:
+            raise AvmError(f"{name} needs an index")
+        if index >= len(array):
+            raise AvmError(f"{name} index {index} out of range")
+        return array[index]
+    if name == "NumAppArgs":
+        return len(fields.get("ApplicationArgs", []))
+    if name == "NumAccounts":
+        return max(len(fields.get("Accounts", [])) - 1, 0)
+    if name == "NumApplications":
+        return max(len(fields.get("Applications", [])) - 1, 0)
+    if name == "NumAssets":
+        return len(fields.get("Assets", []))
+    if name == "NumLogs":
+        return len(fields.get("Logs", []))
+    if name == "LastLog":
+        logs = fields.get("Logs", [])
+        return logs[-1] if logs else b""
+    if name == "FirstValidTime":
+        raise AvmError("FirstValidTime is not supported")
+    return fields.get(name, _field_default(name))
+
+
+class Ledger:
+    """In-memory ledger state: balances, assets, apps, local state, boxes"""
+
+    def __init__(self, round=1000, timestamp=None):
+        self.balances = {}   # addr -> microALGO
+        self.assets = {}     # asset id -> params dict
+        self.holdings = {}   # (addr, asset id) -> amount
+        self.apps = {}       # app id -> params dict
+        self.globals = {}    # app id -> {key: value}
+        self.locals = {}     # (addr, app id) -> {key: value}
+        self.boxes = {}      # (app id, name) -> bytes
+        self.next_id = 1001
+        self.round = round
+        self.timestamp = int(time.time()) if timestamp is None else timestamp
+        self._journal = None
+
+    # -- journaled mutation ---------------------------------------------
+
+    def _set(self, tag, container, key, value):
+        if self._journal is not None:
+            self._journal.append((tag, container, key, container.get(key, _MISSING)))
+        container[key] = value
+
+    def _del(self, tag, container, key):
+        if key not in container:
+            return
+        if self._journal is not None:
+            self._journal.append((tag, container, key, container[key]))
+        del container[key]
+
+    def begin(self):
+        self._journal = []
+
+    def savepoint(self):
+        return len(self._journal)
+
+    def rollback(self, savepoint=None):
+        """Undo the group (or everything after a savepoint)"""
+        while len(self._journal) > (savepoint or 0):
+            _, container, key, old = self._journal.pop()
+            if old is _MISSING:
+                container.pop(key, None)
+            else:
+                container[key] = old
+        if savepoint is None:
+            self._journal = None
+
+    def commit(self):
+        """Finish a group, returning its state deltas"""
+        originals = {}
+        for tag, container, key, old in self._journal:
+            ident = (id(container), key)
+            if ident not in originals:
+                originals[ident] = (tag, container, key, old)
+        self._journal = None
+
+        deltas = {"global_delta": {}, "local_delta": {}, "box_delta": {}, "balance_delta": {}}
+        for tag, container, key, old in originals.values():
+            new = container.get(key, _MISSING)
+            if new is old or new == old:
+                continue
+            kind, owner = tag
+            if kind == "global":
+                deltas["global_delta"].setdefault(owner, {})[key] = None if new is _MISSING else new
+            elif kind == "local":
+                addr, app_id = owner
+                deltas["local_delta"].setdefault((_b32(addr), app_id), {})[key] = (
+                    None if new is _MISSING else new)
+            elif kind == "box":
+                deltas["box_delta"][(key[0], key[1])] = None if new is _MISSING else new
+            elif kind == "balance":
+                before = 0 if old is _MISSING else old
+                after = 0 if new is _MISSING else new
+                deltas["balance_delta"][_b32(key)] = after - before
+        return deltas
+
+    # -- accounts -------------------------------------------------------
+
+    def fund(self, address, amount):
+        """Credit an account outside of any transaction (test setup)"""
+        addr = _addr(address)
+        self._set(("balance", None), self.balances, addr, self.balances.get(addr, 0) + amount)
+
+    def balance(self, address):
+        return self.balances.get(_addr(address), 0)
+
+    def _move(self, sender, receiver, amount):
+        if amount == 0:
+            return
+        have = self.balances.get(sender, 0)
+        if have < amount:
+            raise AvmError(f"overspend: {_b32(sender)} has {have}, needs {amount}")
+        self._set(("balance", None), self.balances, sender, have - amount)
+        self._set(("balance", None), self.balances, receiver, self.balances.get(receiver, 0) + amount)
+
+    def pay_fee(self, sender, fee):
+        """Debit a transaction fee (fees leave circulation, like the fee sink)"""
+        have = self.balances.get(sender, 0)
+        if have < fee:
+            raise AvmError(f"overspend: {_b32(sender)} has {have}, needs {fee} for the fee")
+        if fee:
+            self._set(("balance", None), self.balances, sender, have - fee)
+
+    def min_balance(self, address):
+        """Minimum balance requirement for an account"""
+        addr = _addr(address)
+        total = MIN_BALANCE
+        total += MIN_BALANCE * sum(1 for (a, _) in self.holdings if a == addr)
+        for (a, app_id) in self.locals:
+            if a == addr and app_id in self.apps:
+                ints, byts = self.apps[app_id]["local_schema"]
+                total += 100_000 + 28_500 * ints + 50_000 * byts
+        for app_id, params in self.apps.items():
+            if params["creator"] == addr:
+                ints, byts = params["global_schema"]
+                total += 100_000 * (1 + params["extra_pages"]) + 28_500 * ints + 50_000 * byts
+        for app_id, params in self.apps.items():
+            if params["address"] == addr:
+                for (box_app, name), value in self.boxes.items():
+                    if box_app == app_id:
+                        total += 2_500 + 400 * (len(name) + len(value))
+        return total
+
+    def _is_empty(self, addr):
+        if self.balances.get(addr, 0):
+            return False
+        return (not any(a == addr for (a, _) in self.holdings)
+                and not any(a == addr for (a, _) in self.locals)
+                and not any(p["creator"] == addr for p in self.apps.values()))
+
+    # -- apps -----------------------------------------------------------
+
+    def global_state(self, app_id):
+        return dict(self.globals.get(app_id, {}))
+
+    def local_state(self, address, app_id):
+        return dict(self.locals.get((_addr(address), app_id), {}))
+
+    def box(self, app_id, name):
+        return self.boxes.get((app_id, name))
+
+    def app_address(self, app_id):
+        return logic.get_application_address(app_id)
+
+
+class _Group:
+    """Per-group evaluation context"""
+
+    def __init__(self, ledger, fields):
+        self.ledger = ledger
+        self.txns = fields
+        self.scratch = [None] * len(fields)
+        self.budget = APP_BUDGET * sum(1 for f in fields if f["Type"] == b"appl")
+        self.budget_used = 0
+        self.fee_credit = sum(f["Fee"] for f in fields) - MIN_TXN_FEE * len(fields)
+
+
+class _Eval:
+    """One program execution"""
+
+    def __init__(self, group, fields, index, app_id, program, depth):
+        self.group = group
+        self.ledger = group.ledger
+        self.txn = fields
+        self.index = index
+        self.app_id = app_id
+        self.depth = depth
+        self.version, self.code = _decode(program)
+        self.stack = []
+        self.scratch = [0] * 256
+        self.callstack = []
+        self.intc = []
+        self.bytec = []
+        self.logs = []
+        self.inner_pending = None
+        self.inner_submitted = []
+        self.inner_count = 0
+        self.last_inner_group = []
+
+    # -- helpers ---------------------------------------------------------
+
+    def pop(self):
+        if not self.stack:
+            raise AvmError("stack underflow")
+        return self.stack.pop()
+
+    def pop_int(self):
+        value = self.pop()
+        if not isinstance(value, int):
+            raise AvmError("expected uint64, got bytes")
+        return value
+
+    def pop_bytes(self):
+        value = self.pop()
+        if not isinstance(value, bytes):
+            raise AvmError("expected bytes, got uint64")
+        return value
+
+    def push(self, value):
+        if isinstance(value, (bytes, bytearray)):
+            value = bytes(value)
+            if len(value) > MAX_BYTES:
+                raise AvmError("byte value exceeds 4096 bytes")
+        elif value < 0 or value > MAX_UINT:
+            raise AvmError("uint64 overflow")
+        self.stack.append(value)
+
+    def account(self, ref):
+        """Resolve an account reference (address bytes or Accounts index)"""
+        if isinstance(ref, int):
+            accounts = self.txn.get("Accounts", [])
+            if ref >= len(accounts):
+                raise AvmError(f"invalid Accounts index {ref}")
+            return accounts[ref]
+        if len(ref) != 32:
+            raise AvmError("invalid address length")
+        return ref
+
+    def app_ref(self, ref):
+        apps = self.txn.get("Applications", [])
+        if ref == 0:
+            return self.app_id
+        if ref in apps[1:] or ref == self.app_id:
+            return ref
+        if ref < len(apps):
+            return apps[ref]
+        return ref
+
+    def asset_ref(self, ref):
+        assets = self.txn.get("Assets", [])
+        if ref in assets:
+            return ref
+        if ref < len(assets):
+            return assets[ref]
+        return ref
+
+    def global_field(self, name):
+        ledger = self.ledger
+        if name == "MinTxnFee":
+            return MIN_TXN_FEE
+        if name == "MinBalance":
+            return MIN_BALANCE
+        if name == "MaxTxnLife":
+            return MAX_TXN_LIFE
+        if name == "ZeroAddress":
+            return ZERO_ADDRESS
+        if name == "GroupSize":
+            return len(self.group.txns)
+        if name == "LogicSigVersion":
+            return 10
+        if name == "Round":
+            return ledger.round
+        if name == "LatestTimestamp":
+            return ledger.timestamp
+        if name == "CurrentApplicationID":
+            return self.app_id
+        if name == "CreatorAddress":
+            return ledger.apps[self.app_id]["creator"]
+        if name == "CurrentApplicationAddress":
+            return app_address_bytes(self.app_id)
+        if name == "GroupID":
+            return self.txn.get("GroupID", bytes(32))
+        if name == "OpcodeBudget":
+            return self.group.budget - self.group.budget_used
+        if name == "CallerApplicationID":
+            return self.txn.get("_caller", 0)
+        if name == "CallerApplicationAddress":
+            caller = self.txn.get("_caller", 0)
+            return app_address_bytes(caller) if caller else ZERO_ADDRESS
+        if name in ("AssetCreateMinBalance", "AssetOptInMinBalance"):
+            return MIN_BALANCE
+        if name == "GenesisHash":
+            return bytes(32)
+        raise AvmError(f"unsupported global field {name}")
+
+    def local_map(self, addr, app_id):
+        key = (addr, app_id)
+        if key not in self.ledger.locals:
+            raise AvmError(f"{_b32(addr)} is not opted in to app {app_id}")
+        return self.ledger.locals[key]
+
+    def check_schema(self, app_id, state, local):
+        params = self.ledger.apps[app_id]
+        ints, byts = params["local_schema" if local else "global_schema"]
+        n_ints = sum(1 for v in state.values() if isinstance(v, int))
+        n_bytes = len(state) - n_ints
+        if n_ints > ints or n_bytes > byts:
+            kind = "local" if local else "global"
+            raise AvmError(f"store {kind} state: schema exceeded ({n_ints}/{ints} uints, {n_bytes}/{byts} bytes)")
+
+    # -- main loop -------------------------------------------------------
+
+    def run(self):
+        """Execute the program; True when it approves"""
+        code = self.code
+        pc = code["start"]
+        end = code["end"]
+        group = self.group
+        handlers = _HANDLERS
+        costs = OPCODE_COSTS
+        while pc < end:
+            instr = code.get(pc)
+            if instr is None:
+                raise AvmError(f"invalid branch target / pc {pc}")
+            name, imm, next_pc = instr
+            group.budget_used += costs.get(name, 1)
+            if group.budget_used > group.budget:
+                raise AvmError("dynamic cost budget exceeded")
+            if name == "callsub":
+                # retsub resumes at the instruction after callsub
+                if len(self.callstack) >= 1024:
+                    raise AvmError("callsub stack overflow")
+                self.callstack.append((next_pc, len(self.stack), None))
+                pc = imm
+                continue
+            handler = handlers.get(name)
+            if handler is None:
+                raise AvmError(f"opcode {name} is not supported by the local AVM")
+            jump = handler(self, imm)
+            if jump is None:
+                pc = next_pc
+            elif jump is _RETURN:
+                break
+            else:
+                pc = jump
+            if len(self.stack) > MAX_STACK:
+                raise AvmError("stack overflow")
+        if self.inner_pending is not None:
+            raise AvmError("program ended with an unsubmitted inner transaction")
+        if len(self.stack) != 1:
+            raise AvmError(f"stack has {len(self.stack)} values at end of program, expected 1")
+        result = self.stack[0]
+        if not isinstance(result, int):
+            raise AvmError("program ended with bytes on the stack")
+        return result != 0
+
+
+_RETURN = object()
+_PROGRAM_CACHE = {}
+
+
+def _decode(program):
+    """Decode bytecode into {pc: (name, immediates, next_pc)} (cached)"""
+    cached = _PROGRAM_CACHE.get(program)
+    if cached is not None:
+        return cached
+    if not program:
+        raise AvmError("empty program")
+    version, pos = decode_varuint(program, 0)
+    code = {"start": pos, "end": len(program)}
+    data = program
+    while pos < len(data):
+        start = pos
+        opcode = data[pos]
+        pos += 1
+        name = OPCODES_BY_BYTE.get(opcode)
+        if name is None:
+            raise AvmError(f"illegal opcode 0x{opcode:02x}")
+        layout = OPCODES[name][1]
+        try:
+            if layout == "":
+                imm = None
+            elif layout == "u8":
+                imm = data[pos]
+                pos += 1
+            elif layout == "u8u8":
+                imm = (data[pos], data[pos + 1])
+                pos += 2
+            elif layout == "i8":
+                imm = data[pos] - 256 if data[pos] > 127 else data[pos]
+                pos += 1
+            elif layout == "label":
+                delta = int.from_bytes(data[pos:pos + 2], "big", signed=True)
+                pos += 2
+                imm = pos + delta
+            elif layout == "labels":
+                count = data[pos]
+                pos += 1
+                offsets = [int.from_bytes(data[pos + 2 * i:pos + 2 * i + 2], "big", signed=True)
+                           for i in range(count)]
+                pos += 2 * count
+                imm = [pos + d for d in offsets]
+            elif layout == "txn":
+                imm = TXN_FIELDS[data[pos]]
+                pos += 1
+            elif layout == "txna":
+                imm = (TXN_FIELDS[data[pos]], data[pos + 1])
+                pos += 2
+            elif layout == "gtxn":
+                imm = (data[pos], TXN_FIELDS[data[pos + 1]])
+                pos += 2
+            elif layout == "gtxna":
+                imm = (data[pos], TXN_FIELDS[data[pos + 1]], data[pos + 2])
+                pos += 3
+            elif layout in FIELD_TABLES:
+                imm = FIELD_TABLES[layout][data[pos]]
+                pos += 1
+            elif layout == "varuint":
+                imm, pos = decode_varuint(data, pos)
+            elif layout == "bytes":
+                length, pos = decode_varuint(data, pos)
+                imm = bytes(data[pos:pos + length])
+                pos += length
+            elif layout in ("intcblock", "pushints"):
+                count, pos = decode_varuint(data, pos)
+                imm = []
+                for _ in range(count):
+                    value, pos = decode_varuint(data, pos)
+                    imm.append(value)
+            elif layout in ("bytecblock", "pushbytess"):
+                count, pos = decode_varuint(data, pos)
+                imm = []
+                for _ in range(count):
+                    length, pos = decode_varuint(data, pos)
+                    imm.append(bytes(data[pos:pos + length]))
+                    pos += length
+            else:
+                raise AvmError(f"unhandled layout {layout}")
+        except (IndexError, TealAssemblyError):
+            raise AvmError(f"truncated or invalid immediate at pc {start}")
+        if pos > len(data):
+            raise AvmError(f"truncated instruction at pc {start}")
+        code[start] = (name, imm, pos)
+    result = (version, code)
+    _PROGRAM_CACHE[program] = result
+    return result
+
+
+# -- opcode handlers ------------------------------------------------------
+
+_HANDLERS = {}
+
+
+def _op(*names):
+    def register(fn):
+        for name in names:
+            _HANDLERS[name] = fn
+        return fn
+    return register
+
+
+def _binary_int(fn):
+    def handler(ev, imm):
+        b = ev.pop_int()
+        a = ev.pop_int()
+        ev.push(fn(a, b))
+    return handler
+
+
+def _checked(fn, message):
+    def inner(a, b):
+        try:
+            result = fn(a, b)
+        except ZeroDivisionError:
+            raise AvmError(message)
+        if result < 0 or result > MAX_UINT:
+            raise AvmError(message)
+        return result
+    return inner
+
+
+_HANDLERS["+"] = _binary_int(_checked(lambda a, b: a + b, "+ overflowed"))
+_HANDLERS["-"] = _binary_int(_checked(lambda a, b: a - b, "- would result negative"))
+_HANDLERS["*"] = _binary_int(_checked(lambda a, b: a * b, "* overflowed"))
+_HANDLERS["/"] = _binary_int(_checked(lambda a, b: a // b, "/ 0"))
+_HANDLERS["%"] = _binary_int(_checked(lambda a, b: a % b, "% 0"))
+_HANDLERS["<"] = _binary_int(lambda a, b: int(a < b))
+_HANDLERS[">"] = _binary_int(lambda a, b: int(a > b))
+_HANDLERS["<="] = _binary_int(lambda a, b: int(a <= b))
+_HANDLERS[">="] = _binary_int(lambda a, b: int(a >= b))
+_HANDLERS["&&"] = _binary_int(lambda a, b: int(bool(a) and bool(b)))
+_HANDLERS["||"] = _binary_int(lambda a, b: int(bool(a) or bool(b)))
+_HANDLERS["|"] = _binary_int(lambda a, b: a | b)
+_HANDLERS["&"] = _binary_int(lambda a, b: a & b)
+_HANDLERS["^"] = _binary_int(lambda a, b: a ^ b)
+_HANDLERS["shl"] = _binary_int(lambda a, b: (a << b) & MAX_UINT if b < 64 else _fail("shl by >= 64"))
+_HANDLERS["shr"] = _binary_int(lambda a, b: a >> b if b < 64 else _fail("shr by >= 64"))
+_HANDLERS["exp"] = _binary_int(_checked(lambda a, b: a ** b if (a or b) else _fail("0^0"), "exp overflowed"))
+
+
+def _fail(message):
+    raise AvmError(message)
+
+
+@_op("==")
+def _op_eq(ev, imm):
+    b = ev.pop()
+    a = ev.pop()
+    if type(a) is not type(b):
+        raise AvmError("cannot compare uint64 to bytes")
+    ev.push(int(a == b))
+
+
+@_op("!=")
+def _op_ne(ev, imm):
+    b = ev.pop()
+    a = ev.pop()
+    if type(a) is not type(b):
+        raise AvmError("cannot compare uint64 to bytes")
+    ev.push(int(a != b))
+
+
+@_op("!")
+def _op_not(ev, imm):
+    ev.push(int(ev.pop_int() == 0))
+
+
+@_op("~")
+def _op_bitnot(ev, imm):
+    ev.push(ev.pop_int() ^ MAX_UINT)
+
+
+@_op("len")
+def _op_len(ev, imm):
+    ev.push(len(ev.pop_bytes()))
+
+
+@_op("itob")
+def _op_itob(ev, imm):
+    ev.push(ev.pop_int().to_bytes(8, "big"))
+
+
+@_op("btoi")
+def _op_btoi(ev, imm):
+    value = ev.pop_bytes()
+    if len(value) > 8:
+        raise AvmError("btoi arg too long")
+    ev.push(int.from_bytes(value, "big"))
+
+
+@_op("mulw")
+def _op_mulw(ev, imm):
+    b = ev.pop_int()
+    a = ev.pop_int()
+    product = a * b
+    ev.push(product >> 64)
+    ev.push(product & MAX_UINT)
+
+
+@_op("addw")
+def _op_addw(ev, imm):
+    b = ev.pop_int()
+    a = ev.pop_int()
+    total = a + b
+    ev.push(total >> 64)
+    ev.push(total & MAX_UINT)
+
+
+@_op("divw")
+def _op_divw(ev, imm):
+    c = ev.pop_int()
+    lo = ev.pop_int()
+    hi = ev.pop_int()
+    if c == 0:
+        raise AvmError("divw by 0")
+    ev.push(((hi << 64) | lo) // c)
+
+
+@_op("sqrt")
+def _op_sqrt(ev, imm):
+    import math
+    ev.push(math.isqrt(ev.pop_int()))
+
+
+@_op("bitlen")
+def _op_bitlen(ev, imm):
+    value = ev.pop()
+    if isinstance(value, bytes):
+        value = int.from_bytes(value, "big")
+    ev.push(value.bit_length())
+
+
+@_op("sha256")
+def _op_sha256(ev, imm):
+    ev.push(hashlib.sha256(ev.pop_bytes()).digest())
+
+
+@_op("sha512_256")
+def _op_sha512_256(ev, imm):
+    ev.push(encoding.checksum(ev.pop_bytes()))
+
+
+@_op("sha3_256")
+def _op_sha3_256(ev, imm):
+    ev.push(hashlib.sha3_256(ev.pop_bytes()).digest())
+
+
+@_op("keccak256")
+def _op_keccak256(ev, imm):
+    from Cryptodome.Hash import keccak
+    ev.push(keccak.new(digest_bits=256, data=ev.pop_bytes()).digest())
+
+
+# constants
+
+@_op("intcblock")
+def _op_intcblock(ev, imm):
+    ev.intc = imm
+
+
+@_op("bytecblock")
+def _op_bytecblock(ev, imm):
+    ev.bytec = imm
+
+
+@_op("intc")
+def _op_intc(ev, imm):
+    if imm >= len(ev.intc):
+        raise AvmError(f"intc {imm} beyond intcblock")
+    ev.push(ev.intc[imm])
+
+
+@_op("bytec")
+def _op_bytec(ev, imm):
+    if imm >= len(ev.bytec):
+        raise AvmError(f"bytec {imm} beyond bytecblock")
+    ev.push(ev.bytec[imm])
+
+
+def _intc_n(n):
+    def handler(ev, imm):
+        _op_intc(ev, n)
+    return handler
+
+
+def _bytec_n(n):
+    def handler(ev, imm):
+        _op_bytec(ev, n)
+    return handler
+
+
+for _n in range(4):
+    _HANDLERS[f"intc_{_n}"] = _intc_n(_n)
+    _HANDLERS[f"bytec_{_n}"] = _bytec_n(_n)
+
+
+@_op("pushint", "pushbytes")
+def _op_push(ev, imm):
+    ev.push(imm)
+
+
+@_op("pushints", "pushbytess")
+def _op_pushn(ev, imm):
+    for value in imm:
+        ev.push(value)
+
+
+# flow control
+
+@_op("err")
+def _op_err(ev, imm):
+    raise AvmError("err opcode executed")
+
+
+@_op("bnz")
+def _op_bnz(ev, imm):
+    return imm if ev.pop_int() != 0 else None
+
+
+@_op("bz")
+def _op_bz(ev, imm):
+    return imm if ev.pop_int() == 0 else None
+
+
+@_op("b")
+def _op_b(ev, imm):
+    return imm
+
+
+@_op("return")
+def _op_return(ev, imm):
+    value = ev.pop_int()
+    ev.stack = [value]
+    return _RETURN
+
+
+@_op("assert")
+def _op_assert(ev, imm):
+    if ev.pop_int() == 0:
+        raise AvmError("assert failed")
+
+
+@_op("retsub")
+def _op_retsub(ev, imm):
+    if not ev.callstack:
+        raise AvmError("retsub with empty callstack")
+    return_pc, height, frame = ev.callstack.pop()
+    if frame is not None:
+        args, rets = frame
+        if len(ev.stack) < height + rets:
+            raise AvmError("retsub: not enough return values")
+        returns = ev.stack[len(ev.stack) - rets:] if rets else []
+        ev.stack = ev.stack[:height - args] + returns
+    return return_pc
+
+
+@_op("proto")
+def _op_proto(ev, imm):
+    if not ev.callstack:
+        raise AvmError("proto outside of a subroutine")
+    return_pc, _, _ = ev.callstack[-1]
+    args, rets = imm
+    height = len(ev.stack)
+    if height < args:
+        raise AvmError("proto: not enough arguments")
+    ev.callstack[-1] = (return_pc, height, (args, rets))
+
+
+@_op("frame_dig")
+def _op_frame_dig(ev, imm):
+    _, height, _ = ev.callstack[-1]
+    index = height + imm
+    if not 0 <= index < len(ev.stack):
+        raise AvmError("frame_dig out of range")
+    ev.push(ev.stack[index])
+
+
+@_op("frame_bury")
+def _op_frame_bury(ev, imm):
+    _, height, _ = ev.callstack[-1]
+    value = ev.pop()
+    index = height + imm
+    if not 0 <= index < len(ev.stack):
+        raise AvmError("frame_bury out of range")
+    ev.stack[index] = value
+
+
+@_op("switch")
+def _op_switch(ev, imm):
+    index = ev.pop_int()
+    return imm[index] if index < len(imm) else None
+
+
+@_op("match")
+def _op_match(ev, imm):
+    count = len(imm)
+    target = ev.pop()
+    candidates = ev.stack[len(ev.stack) - count:]
+    del ev.stack[len(ev.stack) - count:]
+    for i, value in enumerate(candidates):
+        if type(value) is type(target) and value == target:
+            return imm[i]
+    return None
+
+
+# stack manipulation
+
+@_op("pop")
+def _op_pop(ev, imm):
+    ev.pop()
+
+
+@_op("popn")
+def _op_popn(ev, imm):
+    for _ in range(imm):
+        ev.pop()
+
+
+@_op("dup")
+def _op_dup(ev, imm):
+    value = ev.pop()
+    ev.push(value)
+    ev.push(value)
+
+
+@_op("dupn")
+def _op_dupn(ev, imm):
+    value = ev.pop()
+    for _ in range(imm + 1):
+        ev.push(value)
+
+
+@_op("dup2")
+def _op_dup2(ev, imm):
+    b = ev.pop()
+    a = ev.pop()
+    for value in (a, b, a, b):
+        ev.push(value)
+
+
+@_op("dig")
+def _op_dig(ev, imm):
+    if imm >= len(ev.stack):
+        raise AvmError("dig beyond stack")
+    ev.push(ev.stack[-1 - imm])
+
+
+@_op("bury")
+def _op_bury(ev, imm):
+    value = ev.pop()
+    if imm == 0 or imm > len(ev.stack):
+        raise AvmError("bury beyond stack")
+    ev.stack[-imm] = value
+
+
+@_op("swap")
+def _op_swap(ev, imm):
+    b = ev.pop()
+    a = ev.pop()
+    ev.push(b)
+    ev.push(a)
+
+
+@_op("select")
+def _op_select(ev, imm):
+    c = ev.pop_int()
+    b = ev.pop()
+    a = ev.pop()
+    ev.push(b if c != 0 else a)
+
+
+@_op("cover")
+def _op_cover(ev, imm):
+    if imm >= len(ev.stack):
+        raise AvmError("cover beyond stack")
+    value = ev.stack.pop()
+    ev.stack.insert(len(ev.stack) - imm, value)
+
+
+@_op("uncover")
+def _op_uncover(ev, imm):
+    if imm >= len(ev.stack):
+        raise AvmError("uncover beyond stack")
+    value = ev.stack.pop(len(ev.stack) - 1 - imm)
+    ev.stack.append(value)
+
+
+# scratch
+
+@_op("load")
+def _op_load(ev, imm):
+    ev.push(ev.scratch[imm])
+
+
+@_op("store")
+def _op_store(ev, imm):
+    ev.scratch[imm] = ev.pop()
+
+
+@_op("loads")
+def _op_loads(ev, imm):
+    index = ev.pop_int()
+    if index > 255:
+        raise AvmError("loads index out of range")
+    ev.push(ev.scratch[index])
+
+
+@_op("stores")
+def _op_stores(ev, imm):
+    value = ev.pop()
+    index = ev.pop_int()
+    if index > 255:
+        raise AvmError("stores index out of range")
+    ev.scratch[index] = value
+
+
+def _gload(ev, group_index, slot):
+    if group_index >= ev.index:
+        raise AvmError("gload can only read earlier transactions")
+    scratch = ev.group.scratch[group_index]
+    if scratch is None:
+        raise AvmError(f"transaction {group_index} is not an app call")
+    ev.push(scratch[slot])
+
+
+@_op("gload")
+def _op_gload(ev, imm):
+    _gload(ev, imm[0], imm[1])
+
+
+@_op("gloads")
+def _op_gloads(ev, imm):
+    _gload(ev, ev.pop_int(), imm)
+
+
+@_op("gloadss")
+def _op_gloadss(ev, imm):
+    slot = ev.pop_int()
+    _gload(ev, ev.pop_int(), slot)
+
+
+@_op("gaid", "gaids")
+def _op_gaid(ev, imm):
+    index = imm if imm is not None else ev.pop_int()
+    fields = ev.group.txns[index]
+    created = fields.get("CreatedApplicationID") or fields.get("CreatedAssetID")
+    if not created:
+        raise AvmError(f"transaction {index} did not create an app or asset")
+    ev.push(created)
+
+
+# transaction fields
+
+def _group_txn(ev, index):
+    if index >= len(ev.group.txns):
+        raise AvmError(f"gtxn {index} beyond group size")
+    return ev.group.txns[index]
+
+
+@_op("txn")
+def _op_txn(ev, imm):
+    ev.push(_get_field(ev.txn, imm))
+
+
+@_op("txna")
+def _op_txna(ev, imm):
+    ev.push(_get_field(ev.txn, imm[0], imm[1]))
+
+
+@_op("txnas")
+def _op_txnas(ev, imm):
+    ev.push(_get_field(ev.txn, imm, ev.pop_int()))
+
+
+@_op("gtxn")
+def _op_gtxn(ev, imm):
+    ev.push(_get_field(_group_txn(ev, imm[0]), imm[1]))
+
+
+@_op("gtxna")
+def _op_gtxna(ev, imm):
+    ev.push(_get_field(_group_txn(ev, imm[0]), imm[1], imm[2]))
+
+
+@_op("gtxnas")
+def _op_gtxnas(ev, imm):
+    ev.push(_get_field(_group_txn(ev, imm[0]), imm[1], ev.pop_int()))
+
+
+@_op("gtxns")
+def _op_gtxns(ev, imm):
+    ev.push(_get_field(_group_txn(ev, ev.pop_int()), imm))
+
+
+@_op("gtxnsa")
+def _op_gtxnsa(ev, imm):
+    ev.push(_get_field(_group_txn(ev, ev.pop_int()), imm[0], imm[1]))
+
+
+@_op("gtxnsas")
+def _op_gtxnsas(ev, imm):
+    index = ev.pop_int()
+    ev.push(_get_field(_group_txn(ev, ev.pop_int()), imm, index))
+
+
+@_op("global")
+def _op_global(ev, imm):
+    ev.push(ev.global_field(imm))
+
+
+@_op("args", "arg", "arg_0", "arg_1", "arg_2", "arg_3")
+def _op_arg(ev, imm):
+    raise AvmError("arg is only available to logic signatures")
+
+
+# byte manipulation
+
+@_op("concat")
+def _op_concat(ev, imm):
+    b = ev.pop_bytes()
+    a = ev.pop_bytes()
+    ev.push(a + b)
+
+
+def _substring(ev, value, start, end):
+    if start > end or end > len(value):
+        raise AvmError("substring range beyond value")
+    ev.push(value[start:end])
+
+
+@_op("substring")
+def _op_substring(ev, imm):
+    _substring(ev, ev.pop_bytes(), imm[0], imm[1])
+
+
+@_op("substring3")
+def _op_substring3(ev, imm):
+    end = ev.pop_int()
+    start = ev.pop_int()
+    _substring(ev, ev.pop_bytes(), start, end)
+
+
+@_op("extract")
+def _op_extract(ev, imm):
+    value = ev.pop_bytes()
+    start, length = imm
+    if length == 0:
+        length = len(value) - start
+    _substring(ev, value, start, start + length)
+
+
+@_op("extract3")
+def _op_extract3(ev, imm):
+    length = ev.pop_int()
+    start = ev.pop_int()
+    _substring(ev, ev.pop_bytes(), start, start + length)
+
+
+def _extract_uint(size):
+    def handler(ev, imm):
+        start = ev.pop_int()
+        value = ev.pop_bytes()
+        if start + size > len(value):
+            raise AvmError("extract_uint range beyond value")
+        ev.push(int.from_bytes(value[start:start + size], "big"))
+    return handler
+
+
+_HANDLERS["extract_uint16"] = _extract_uint(2)
+_HANDLERS["extract_uint32"] = _extract_uint(4)
+_HANDLERS["extract_uint64"] = _extract_uint(8)
+
+
+def _replace(ev, value, start, replacement):
+    if start + len(replacement) > len(value):
+        raise AvmError("replace range beyond value")
+    ev.push(value[:start] + replacement + value[start + len(replacement):])
+
+
+@_op("replace2")
+def _op_replace2(ev, imm):
+    replacement = ev.pop_bytes()
+    _replace(ev, ev.pop_bytes(), imm, replacement)
+
+
+@_op("replace3")
+def _op_replace3(ev, imm):
+    replacement = ev.pop_bytes()
+    start = ev.pop_int()
+    _replace(ev, ev.pop_bytes(), start, replacement)
+
+
+@_op("getbit")
+def _op_getbit(ev, imm):
+    index = ev.pop_int()
+    target = ev.pop()
+    if isinstance(target, int):
+        if index > 63:
+            raise AvmError("getbit index beyond uint64")
+        ev.push((target >> index) & 1)
+    else:
+        if index >= len(target) * 8:
+            raise AvmError("getbit index beyond byte array")
+        ev.push((target[index // 8] >> (7 - index % 8)) & 1)
+
+
+@_op("setbit")
+def _op_setbit(ev, imm):
+    bit = ev.pop_int()
+    index = ev.pop_int()
+    target = ev.pop()
+    if bit > 1:
+        raise AvmError("setbit value must be 0 or 1")
+    if isinstance(target, int):
+        if index > 63:
+            raise AvmError("setbit index beyond uint64")
+        ev.push(target | (1 << index) if bit else target & ~(1 << index))
+    else:
+        if index >= len(target) * 8:
+            raise AvmError("setbit index beyond byte array")
+        data = bytearray(target)
+        mask = 1 << (7 - index % 8)
+        if bit:
+            data[index // 8] |= mask
+        else:
+            data[index // 8] &= ~mask & 0xff
+        ev.push(bytes(data))
+
+
+@_op("getbyte")
+def _op_getbyte(ev, imm):
+    index = ev.pop_int()
+    value = ev.pop_bytes()
+    if index >= len(value):
+        raise AvmError("getbyte index beyond array")
+    ev.push(value[index])
+
+
+@_op("setbyte")
+def _op_setbyte(ev, imm):
+    byte = ev.pop_int()
+    index = ev.pop_int()
+    value = ev.pop_bytes()
+    if index >= len(value) or byte > 255:
+        raise AvmError("setbyte out of range")
+    data = bytearray(value)
+    data[index] = byte
+    ev.push(bytes(data))
+
+
+@_op("bzero")
+def _op_bzero(ev, imm):
+    size = ev.pop_int()
+    if size > MAX_BYTES:
+        raise AvmError("bzero size too large")
+    ev.push(bytes(size))
+
+
+def _byte_math(fn, compare=False):
+    def handler(ev, imm):
+        b = ev.pop_bytes()
+        a = ev.pop_bytes()
+        if len(a) > 64 or len(b) > 64:
+            raise AvmError("byte math input exceeds 64 bytes")
+        x, y = int.from_bytes(a, "big"), int.from_bytes(b, "big")
+        result = fn(x, y)
+        if compare:
+            ev.push(int(result))
+        else:
+            if result < 0:
+                raise AvmError("byte math result negative")
+            ev.push(result.to_bytes(max(1, (result.bit_length() + 7) // 8), "big") if result else b"")
+    return handler
+
+
+_HANDLERS["b+"] = _byte_math(lambda a, b: a + b)
+_HANDLERS["b-"] = _byte_math(lambda a, b: a - b)
+_HANDLERS["b*"] = _byte_math(lambda a, b: a * b)
+_HANDLERS["b/"] = _byte_math(lambda a, b: a // b if b else _fail("b/ 0"))
+_HANDLERS["b%"] = _byte_math(lambda a, b: a % b if b else _fail("b% 0"))
+_HANDLERS["b<"] = _byte_math(lambda a, b: a < b, compare=True)
+_HANDLERS["b>"] = _byte_math(lambda a, b: a > b, compare=True)
+_HANDLERS["b<="] = _byte_math(lambda a, b: a <= b, compare=True)
+_HANDLERS["b>="] = _byte_math(lambda a, b: a >= b, compare=True)
+_HANDLERS["b=="] = _byte_math(lambda a, b: a == b, compare=True)
+_HANDLERS["b!="] = _byte_math(lambda a, b: a != b, compare=True)
+
+
+def _byte_bitwise(fn):
+    def handler(ev, imm):
+        b = ev.pop_bytes()
+        a = ev.pop_bytes()
+        size = max(len(a), len(b))
+        a, b = a.rjust(size, b"\x00"), b.rjust(size, b"\x00")
+        ev.push(bytes(fn(x, y) for x, y in zip(a, b)))
+    return handler
+
+
+_HANDLERS["b|"] = _byte_bitwise(lambda x, y: x | y)
+_HANDLERS["b&"] = _byte_bitwise(lambda x, y: x & y)
+_HANDLERS["b^"] = _byte_bitwise(lambda x, y: x ^ y)
+
+
+@_op("b~")
+def _op_bnot(ev, imm):
+    ev.push(bytes(x ^ 0xff for x in ev.pop_bytes()))
+
+
+@_op("log")
+def _op_log(ev, imm):
+    value = ev.pop_bytes()
+    if len(ev.logs) >= MAX_LOGS:
+        raise AvmError("too many log calls")
+    if sum(len(v) for v in ev.logs) + len(value) > MAX_LOG_BYTES:
+        raise AvmError("total log size exceeds 1024 bytes")
+    ev.logs.append(value)
+
+
+# ledger access
+
+@_op("balance")
+def _op_balance(ev, imm):
+    ev.push(ev.ledger.balances.get(ev.account(ev.pop()), 0))
+
+
+@_op("min_balance")
+def _op_min_balance(ev, imm):
+    ev.push(ev.ledger.min_balance(ev.account(ev.pop())))
+
+
+@_op("app_opted_in")
+def _op_app_opted_in(ev, imm):
+    app_id = ev.app_ref(ev.pop_int())
+    addr = ev.account(ev.pop())
+    ev.push(int((addr, app_id) in ev.ledger.locals))
+
+
+@_op("app_global_get")
+def _op_app_global_get(ev, imm):
+    key = ev.pop_bytes()
+    ev.push(ev.ledger.globals.get(ev.app_id, {}).get(key, 0))
+
+
+@_op("app_global_get_ex")
+def _op_app_global_get_ex(ev, imm):
+    key = ev.pop_bytes()
+    app_id = ev.app_ref(ev.pop_int())
+    state = ev.ledger.globals.get(app_id, {})
+    ev.push(state.get(key, 0))
+    ev.push(int(key in state))
+
+
+@_op("app_global_put")
+def _op_app_global_put(ev, imm):
+    value = ev.pop()
+    key = ev.pop_bytes()
+    if len(key) > 64 or len(key) + (len(value) if isinstance(value, bytes) else 0) > 128:
+        raise AvmError("global key/value too long")
+    state = ev.ledger.globals.setdefault(ev.app_id, {})
+    ev.ledger._set(("global", ev.app_id), state, key, value)
+    ev.check_schema(ev.app_id, state, local=False)
+
+
+@_op("app_global_del")
+def _op_app_global_del(ev, imm):
+    key = ev.pop_bytes()
+    ev.ledger._del(("global", ev.app_id), ev.ledger.globals.setdefault(ev.app_id, {}), key)
+
+
+@_op("app_local_get")
+def _op_app_local_get(ev, imm):
+    key = ev.pop_bytes()
+    addr = ev.account(ev.pop())
+    ev.push(ev.local_map(addr, ev.app_id).get(key, 0))
+
+
+@_op("app_local_get_ex")
+def _op_app_local_get_ex(ev, imm):
+    key = ev.pop_bytes()
+    app_id = ev.app_ref(ev.pop_int())
+    addr = ev.account(ev.pop())
+    state = ev.ledger.locals.get((addr, app_id))
+    if state is None or key not in state:
+        ev.push(0)
+        ev.push(0)
+    else:
+        ev.push(state[key])
+        ev.push(1)
+
+
+@_op("app_local_put")
+def _op_app_local_put(ev, imm):
+    value = ev.pop()
+    key = ev.pop_bytes()
+    addr = ev.account(ev.pop())
+    if len(key) > 64 or len(key) + (len(value) if isinstance(value, bytes) else 0) > 128:
+        raise AvmError("local key/value too long")
+    state = ev.local_map(addr, ev.app_id)
+    ev.ledger._set(("local", (addr, ev.app_id)), state, key, value)
+    ev.check_schema(ev.app_id, state, local=True)
+
+
+@_op("app_local_del")
+def _op_app_local_del(ev, imm):
+    key = ev.pop_bytes()
+    addr = ev.account(ev.pop())
+    ev.ledger._del(("local", (addr, ev.app_id)), ev.local_map(addr, ev.app_id), key)
+
+
+@_op("asset_holding_get")
+def _op_asset_holding_get(ev, imm):
+    asset_id = ev.asset_ref(ev.pop_int())
+    addr = ev.account(ev.pop())
+    holding = ev.ledger.holdings.get((addr, asset_id))
+    if holding is None:
+        ev.push(0)
+        ev.push(0)
+        return
+    ev.push(holding if imm == "AssetBalance" else 0)
+    ev.push(1)
+
+
+@_op("asset_params_get")
+def _op_asset_params_get(ev, imm):
+    asset_id = ev.asset_ref(ev.pop_int())
+    params = ev.ledger.assets.get(asset_id)
+    if params is None:
+        ev.push(0)
+        ev.push(0)
+        return
+    ev.push(params.get(imm, _field_default(imm.replace("Asset", "ConfigAsset", 1))))
+    ev.push(1)
+
+
+@_op("app_params_get")
+def _op_app_params_get(ev, imm):
+    app_id = ev.app_ref(ev.pop_int())
+    params = ev.ledger.apps.get(app_id)
+    if params is None:
+        ev.push(0)
+        ev.push(0)
+        return
+    values = {
+        "AppApprovalProgram": params["approval"],
+        "AppClearStateProgram": params["clear"],
+        "AppGlobalNumUint": params["global_schema"][0],
+        "AppGlobalNumByteSlice": params["global_schema"][1],
+        "AppLocalNumUint": params["local_schema"][0],
+        "AppLocalNumByteSlice": params["local_schema"][1],
+        "AppExtraProgramPages": params["extra_pages"],
+        "AppCreator": params["creator"],
+        "AppAddress": params["address"],
+    }
+    ev.push(values[imm])
+    ev.push(1)
+
+
+@_op("acct_params_get")
+def _op_acct_params_get(ev, imm):
+    addr = ev.account(ev.pop())
+    ledger = ev.ledger
+    if imm == "AcctBalance":
+        value = ledger.balances.get(addr, 0)
+    elif imm == "AcctMinBalance":
+        value = ledger.min_balance(addr)
+    elif imm == "AcctAuthAddr":
+        value = ZERO_ADDRESS
+    elif imm == "AcctTotalBoxes":
+        value = sum(1 for (app_id, _) in ledger.boxes if ledger.apps.get(app_id, {}).get("address") == addr)
+    else:
+        raise AvmError(f"acct_params_get {imm} is not supported by the local AVM")
+    ev.push(value)
+    ev.push(int(ledger.balances.get(addr, 0) > 0))
+
+
+# boxes
+
+def _box_key(ev, name):
+    if not 1 <= len(name) <= 64:
+        raise AvmError("box names must be 1-64 bytes")
+    return (ev.app_id, name)
+
+
+@_op("box_create")
+def _op_box_create(ev, imm):
+    size = ev.pop_int()
+    key = _box_key(ev, ev.pop_bytes())
+    if size > MAX_BOX_SIZE:
+        raise AvmError("box size too large")
+    existing = ev.ledger.boxes.get(key)
+    if existing is not None:
+        if len(existing) != size:
+            raise AvmError("box_create with a different size than the existing box")
+        ev.push(0)
+        return
+    ev.ledger._set(("box", None), ev.ledger.boxes, key, bytes(size))
+    ev.push(1)
+
+
+@_op("box_extract")
+def _op_box_extract(ev, imm):
+    length = ev.pop_int()
+    start = ev.pop_int()
+    key = _box_key(ev, ev.pop_bytes())
+    value = ev.ledger.boxes.get(key)
+    if value is None:
+        raise AvmError("no such box")
+    _substring(ev, value, start, start + length)
+
+
+@_op("box_replace")
+def _op_box_replace(ev, imm):
+    replacement = ev.pop_bytes()
+    start = ev.pop_int()
+    key = _box_key(ev, ev.pop_bytes())
+    value = ev.ledger.boxes.get(key)
+    if value is None:
+        raise AvmError("no such box")
+    if start + len(replacement) > len(value):
+        raise AvmError("box_replace range beyond box")
+    ev.ledger._set(("box", None), ev.ledger.boxes, key,
+                   value[:start] + replacement + value[start + len(replacement):])
+
+
+@_op("box_del")
+def _op_box_del(ev, imm):
+    key = _box_key(ev, ev.pop_bytes())
+    existed = key in ev.ledger.boxes
+    ev.ledger._del(("box", None), ev.ledger.boxes, key)
+    ev.push(int(existed))
+
+
+@_op("box_len")
+def _op_box_len(ev, imm):
+    value = ev.ledger.boxes.get(_box_key(ev, ev.pop_bytes()))
+    ev.push(0 if value is None else len(value))
+    ev.push(int(value is not None))
+
+
+@_op("box_get")
+def _op_box_get(ev, imm):
+    value = ev.ledger.boxes.get(_box_key(ev, ev.pop_bytes()))
+    ev.push(b"" if value is None else value)
+    ev.push(int(value is not None))
+
+
+@_op("box_put")
+def _op_box_put(ev, imm):
+    value = ev.pop_bytes()
+    key = _box_key(ev, ev.pop_bytes())
+    existing = ev.ledger.boxes.get(key)
+    if existing is not None and len(existing) != len(value):
+        raise AvmError("box_put with a different size than the existing box")
+    ev.ledger._set(("box", None), ev.ledger.boxes, key, value)
+
+
+# inner transactions
+
+@_op("itxn_begin")
+def _op_itxn_begin(ev, imm):
+    if ev.inner_pending is not None:
+        raise AvmError("itxn_begin without itxn_submit")
+    ev.inner_pending = [_inner_defaults(ev)]
+
+
+@_op("itxn_next")
+def _op_itxn_next(ev, imm):
+    if ev.inner_pending is None:
+        raise AvmError("itxn_next without itxn_begin")
+    ev.inner_pending.append(_inner_defaults(ev))
+
+
+def _inner_defaults(ev):
+    ev.inner_count += 1
+    if ev.inner_count > MAX_INNER_TXNS:
+        raise AvmError("too many inner transactions")
+    group = ev.group
+    fee = 0 if group.fee_credit >= MIN_TXN_FEE else MIN_TXN_FEE
+    return {
+        "Sender": app_address_bytes(ev.app_id),
+        "Fee": fee,
+        "FirstValid": ev.txn.get("FirstValid", 0),
+        "LastValid": ev.txn.get("LastValid", 0),
+        "_caller": ev.app_id,
+    }
+
+
+@_op("itxn_field")
+def _op_itxn_field(ev, imm):
+    if ev.inner_pending is None:
+        raise AvmError("itxn_field without itxn_begin")
+    value = ev.pop()
+    current = ev.inner_pending[-1]
+    if imm in TXN_ARRAY_FIELDS:
+        if imm == "Accounts":
+            current.setdefault("Accounts", [current["Sender"]])
+        elif imm == "Applications":
+            current.setdefault("Applications", [0])
+        current.setdefault(imm, []).append(value)
+        return
+    expects_bytes = imm in BYTES_FIELDS
+    if expects_bytes != isinstance(value, bytes):
+        raise AvmError(f"itxn_field {imm} has the wrong type")
+    if imm in ADDRESS_FIELDS and len(value) != 32:
+        raise AvmError(f"itxn_field {imm} must be a 32 byte address")
+    if imm == "TypeEnum":
+        if value not in TYPE_NAMES:
+            raise AvmError(f"unknown TypeEnum {value}")
+        current["Type"] = TYPE_NAMES[value]
+    elif imm == "Type":
+        if value not in TYPE_ENUMS:
+            raise AvmError(f"unknown Type {value!r}")
+        current["TypeEnum"] = TYPE_ENUMS[value]
+    current[imm] = value
+
+
+@_op("itxn_submit")
+def _op_itxn_submit(ev, imm):
+    if ev.inner_pending is None:
+        raise AvmError("itxn_submit without itxn_begin")
+    pending, ev.inner_pending = ev.inner_pending, None
+    if ev.depth >= 8:
+        raise AvmError("inner transactions nested too deep")
+    submitted = []
+    for i, fields in enumerate(pending):
+        if "Type" not in fields:
+            raise AvmError("inner transaction has no type")
+        if fields["Type"] == b"appl":
+            fields.setdefault("ApplicationArgs", [])
+            fields.setdefault("Accounts", [fields["Sender"]])
+            fields.setdefault("Applications", [fields.get("ApplicationID", 0)])
+            fields.setdefault("Assets", [])
+        fields["GroupIndex"] = i
+        fields["TxID"] = hashlib.sha256(repr((ev.txn["TxID"], ev.inner_count, i)).encode()).digest()
+        result = _apply(ev.group, fields, None, ev.depth + 1)
+        submitted.append(result)
+    ev.inner_submitted.extend(submitted)
+    ev.last_inner_group = [r["_fields"] for r in submitted]
+
+
+def _inner(ev, index=None):
+    group = ev.last_inner_group
+    if not group:
+        raise AvmError("no inner transaction has been submitted")
+    if index is None:
+        return group[-1]
+    if index >= len(group):
+        raise AvmError("gitxn index beyond last inner group")
+    return group[index]
+
+
+@_op("itxn")
+def _op_itxn(ev, imm):
+    ev.push(_get_field(_inner(ev), imm))
+
+
+@_op("itxna")
+def _op_itxna(ev, imm):
+    ev.push(_get_field(_inner(ev), imm[0], imm[1]))
+
+
+@_op("itxnas")
+def _op_itxnas(ev, imm):
+    ev.push(_get_field(_inner(ev), imm, ev.pop_int()))
+
+
+@_op("gitxn")
+def _op_gitxn(ev, imm):
+    ev.push(_get_field(_inner(ev, imm[0]), imm[1]))
+
+
+@_op("gitxna")
+def _op_gitxna(ev, imm):
+    ev.push(_get_field(_inner(ev, imm[0]), imm[1], imm[2]))
+
+
+@_op("gitxnas")
+def _op_gitxnas(ev, imm):
+    ev.push(_get_field(_inner(ev, imm[0]), imm[1], ev.pop_int()))
+
+
+def _run_program(group, fields, index, app_id, program, depth):
+    ev = _Eval(group, fields, index, app_id, program, depth)
+    approved = ev.run()
+    return ev, approved
+
+
+# -- transaction application ------------------------------------------------
+
+def _apply(group, fields, index, depth):
+    """Apply one (outer or inner) transaction to the ledger"""
+    ledger = group.ledger
+    sender = fields["Sender"]
+    kind = fields["Type"]
+    result = {"_fields": fields, "type": kind.decode(), "sender": _b32(sender),
+              "logs": [], "inner_txns": []}
+
+    fee = fields.get("Fee", 0)
+    if index is None:
+        group.fee_credit += fee - MIN_TXN_FEE
+        if group.fee_credit < 0:
+            raise AvmError("fee too small: inner transaction fee is not covered by the group")
+    ledger.pay_fee(sender, fee)
+
+    if kind == b"pay":
+        receiver = fields.get("Receiver", ZERO_ADDRESS)
+        amount = fields.get("Amount", 0)
+        ledger._move(sender, receiver, amount)
+        result.update(receiver=_b32(receiver), amount=amount)
+        close_to = fields.get("CloseRemainderTo", ZERO_ADDRESS)
+        if close_to != ZERO_ADDRESS:
+            remaining = ledger.balances.get(sender, 0)
+            ledger._move(sender, close_to, remaining)
+            result["close_amount"] = remaining
+
+    elif kind == b"axfer":
+        _apply_axfer(ledger, fields, result)
+
+    elif kind == b"acfg":
+        if fields.get("ConfigAsset", 0):
+            raise AvmError("asset reconfiguration is not supported by the local AVM")
+        asset_id = ledger.next_id
+        ledger.next_id += 1
+        params = {
+            "AssetTotal": fields.get("ConfigAssetTotal", 0),
+            "AssetDecimals": fields.get("ConfigAssetDecimals", 0),
+            "AssetDefaultFrozen": fields.get("ConfigAssetDefaultFrozen", 0),
+            "AssetUnitName": fields.get("ConfigAssetUnitName", b""),
+            "AssetName": fields.get("ConfigAssetName", b""),
+            "AssetURL": fields.get("ConfigAssetURL", b""),
+            "AssetMetadataHash": fields.get("ConfigAssetMetadataHash", b""),
+            "AssetManager": fields.get("ConfigAssetManager", ZERO_ADDRESS),
+            "AssetReserve": fields.get("ConfigAssetReserve", ZERO_ADDRESS),
+            "AssetFreeze": fields.get("ConfigAssetFreeze", ZERO_ADDRESS),
+            "AssetClawback": fields.get("ConfigAssetClawback", ZERO_ADDRESS),
+            "AssetCreator": sender,
+        }
+        ledger._set(("assets", None), ledger.assets, asset_id, params)
+        ledger._set(("holdings", None), ledger.holdings, (sender, asset_id), params["AssetTotal"])
+        fields["CreatedAssetID"] = asset_id
+        result.update(asset_id=asset_id, created=True)
+
+    elif kind == b"appl":
+        _apply_appl(group, fields, index, depth, result)
+
+    else:
+        raise AvmError(f"transaction type {kind.decode()} is not supported by the local AVM")
+
+    for addr in _touched(fields):
+        balance = ledger.balances.get(addr, 0)
+        if balance < ledger.min_balance(addr) and not ledger._is_empty(addr):
+            raise AvmError(f"account {_b32(addr)} balance {balance} below min {ledger.min_balance(addr)}")
+    return result
+
+
+def _touched(fields):
+    touched = {fields["Sender"]}
+    for name in ("Receiver", "CloseRemainderTo", "AssetReceiver", "AssetSender", "AssetCloseTo"):
+        value = fields.get(name)
+        if value and value != ZERO_ADDRESS:
+            touched.add(value)
+    if fields["Type"] == b"appl" and fields.get("ApplicationID"):
+        touched.add(app_address_bytes(fields["ApplicationID"]))
+    return touched
+
+
+def _apply_axfer(ledger, fields, result):
+    sender = fields["Sender"]
+    asset_id = fields.get("XferAsset", 0)
+    if asset_id not in ledger.assets:
+        raise AvmError(f"asset {asset_id} does not exist")
+    receiver = fields.get("AssetReceiver", ZERO_ADDRESS)
+    amount = fields.get("AssetAmount", 0)
+    source = sender
+    clawback_from = fields.get("AssetSender", ZERO_ADDRESS)
+    if clawback_from != ZERO_ADDRESS:
+        if ledger.assets[asset_id]["AssetClawback"] != sender:
+            raise AvmError("only the clawback address can revoke")
+        source = clawback_from
+
+    if source == receiver and amount == 0 and (receiver, asset_id) not in ledger.holdings:
+        ledger._set(("holdings", None), ledger.holdings, (receiver, asset_id), 0)
+        result.update(asset_id=asset_id, opt_in=True)
+        return
+
+    for addr in (source, receiver):
+        if (addr, asset_id) not in ledger.holdings:
+            raise AvmError(f"{_b32(addr)} is not opted in to asset {asset_id}")
+    have = ledger.holdings[(source, asset_id)]
+    if have < amount:
+        raise AvmError(f"underflow on asset {asset_id}: {have} < {amount}")
+    ledger._set(("holdings", None), ledger.holdings, (source, asset_id), have - amount)
+    ledger._set(("holdings", None), ledger.holdings, (receiver, asset_id),
+                ledger.holdings[(receiver, asset_id)] + amount)
+    result.update(asset_id=asset_id, receiver=_b32(receiver), amount=amount)
+
+    close_to = fields.get("AssetCloseTo", ZERO_ADDRESS)
+    if close_to != ZERO_ADDRESS:
+        remaining = ledger.holdings[(source, asset_id)]
+        if (close_to, asset_id) not in ledger.holdings:
+            raise AvmError(f"{_b32(close_to)} is not opted in to asset {asset_id}")
+        ledger._set(("holdings", None), ledger.holdings, (close_to, asset_id),
+                    ledger.holdings[(close_to, asset_id)] + remaining)
+        ledger._del(("holdings", None), ledger.holdings, (source, asset_id))
+
+
+def _apply_appl(group, fields, index, depth, result):
+    ledger = group.ledger
+    sender = fields["Sender"]
+    app_id = fields.get("ApplicationID", 0)
+    on_complete = fields.get("OnCompletion", 0)
+    group.budget += 0 if index is not None else APP_BUDGET
+
+    if app_id == 0:
+        app_id = ledger.next_id
+        ledger.next_id += 1
+        params = {
+            "approval": fields.get("ApprovalProgram", b""),
+            "clear": fields.get("ClearStateProgram", b""),
+            "creator": sender,
+            "address": app_address_bytes(app_id),
+            "global_schema": (fields.get("GlobalNumUint", 0), fields.get("GlobalNumByteSlice", 0)),
+            "local_schema": (fields.get("LocalNumUint", 0), fields.get("LocalNumByteSlice", 0)),
+            "extra_pages": fields.get("ExtraProgramPages", 0),
+        }
+        ledger._set(("apps", None), ledger.apps, app_id, params)
+        ledger._set(("apps", None), ledger.globals, app_id, {})
+        fields["CreatedApplicationID"] = app_id
+        result["created"] = True
+    elif app_id not in ledger.apps:
+        raise AvmError(f"application {app_id} does not exist")
+    result["app_id"] = app_id
+
+    params = ledger.apps[app_id]
+    fields["Applications"] = [app_id] + fields.get("Applications", [0])[1:]
+    local_key = (sender, app_id)
+
+    if on_complete == 3:  # ClearState
+        if local_key not in ledger.locals:
+            raise AvmError("ClearState from an account that is not opted in")
+        # A failing ClearStateProgram still clears local state, minus its own writes
+        savepoint = ledger.savepoint()
+        try:
+            ev, approved = _run_program(group, fields, index, app_id, params["clear"], depth)
+            result["logs"] = ev.logs
+            if not approved:
+                ledger.rollback(savepoint)
+        except AvmError:
+            ledger.rollback(savepoint)
+        ledger._del(("apps", None), ledger.locals, local_key)
+        return
+
+    if on_complete == 1:  # OptIn
+        if local_key in ledger.locals:
+            raise AvmError(f"{_b32(sender)} has already opted in to app {app_id}")
+        ledger._set(("apps", None), ledger.locals, local_key, {})
+
+    ev, approved = _run_program(group, fields, index, app_id, params["approval"], depth)
+    if index is not None:
+        group.scratch[index] = ev.scratch
+    result["logs"] = ev.logs
+    result["inner_txns"] = [_public(r) for r in ev.inner_submitted]
+    fields["Logs"] = ev.logs
+    if not approved:
+        raise AvmError("transaction rejected by ApprovalProgram")
+
+    if on_complete == 2:  # CloseOut
+        if local_key not in ledger.locals:
+            raise AvmError("CloseOut from an account that is not opted in")
+        ledger._del(("apps", None), ledger.locals, local_key)
+    elif on_complete == 4:  # UpdateApplication
+        updated = dict(params, approval=fields.get("ApprovalProgram", b""),
+                       clear=fields.get("ClearStateProgram", b""))
+        ledger._set(("apps", None), ledger.apps, app_id, updated)
+    elif on_complete == 5:  # DeleteApplication
+        ledger._del(("apps", None), ledger.apps, app_id)
+        ledger._del(("apps", None), ledger.globals, app_id)
+
+
+def _public(result):
+    return {k: v for k, v in result.items() if not k.startswith("_")}
+
+
+def execute_group(ledger, txns):
+    """Execute an atomic group against the ledger; commit only if every txn passes"""
+    fields = [txn_fields(t, i) for i, t in enumerate(txns)]
+    if not 1 <= len(fields) <= 16:
+        raise AvmError("group must hold 1-16 transactions")
+    group_ids = {f["GroupID"] for f in fields}
+    if len(fields) > 1 and (len(group_ids) != 1 or bytes(32) in group_ids):
+        return {"ok": False, "error": "transactions are not grouped (assign_group_id)",
+                "failed_at": 0, "txns": []}
+
+    group = _Group(ledger, fields)
+    results = []
+    ledger.begin()
+    try:
+        if group.fee_credit < 0:
+            raise AvmError(f"fee too small: group is {-group.fee_credit} microALGO short")
+        for i, f in enumerate(fields):
+            if not f["FirstValid"] <= ledger.round + 1 <= f["LastValid"] and f["FirstValid"]:
+                raise AvmError(f"txn dead: round {ledger.round + 1} outside [{f['FirstValid']}, {f['LastValid']}]")
+            try:
+                results.append(_apply(group, f, i, 0))
+            except AvmError as e:
+                raise AvmError(f"transaction {i}: {e}")
+    except AvmError as e:
+        ledger.rollback()
+        return {"ok": False, "error": str(e), "failed_at": len(results), "txns": [_public(r) for r in results]}
+
+    deltas = ledger.commit()
+    for r, f in zip(results, fields):
+        r["txid"] = base64.b32encode(f["TxID"]).decode().rstrip("=")
+    return dict({"ok": True, "error": None, "failed_at": None,
+                 "txns": [_public(r) for r in results],
+                 "budget_used": group.budget_used}, **deltas)
+
+
+def _bench():
+    """Measure contribute groups per second against the governance contract"""
+    from algosdk import account
+    from governance_sender import GLOBAL_BYTES, GLOBAL_INTS, LOCAL_BYTES, LOCAL_INTS, get_governance_sender_teal
+    from teal_assembler import assemble
+
+    approval, clear = get_governance_sender_teal()
+    ledger = Ledger()
+    sp = transaction.SuggestedParams(MIN_TXN_FEE, ledger.round, ledger.round + MAX_TXN_LIFE,
+                                     base64.b64encode(bytes(32)).decode(), flat_fee=True)
+    sk, owner = account.generate_account()
+    ledger.fund(owner, 10_000_000)
+    create = transaction.ApplicationCreateTxn(
+        owner, sp, transaction.OnComplete.NoOpOC, assemble(approval), assemble(clear),
+        transaction.StateSchema(GLOBAL_INTS, GLOBAL_BYTES), transaction.StateSchema(LOCAL_INTS, LOCAL_BYTES))
+    app_id = execute_group(ledger, [create])["txns"][0]["app_id"]
+    app_addr = logic.get_application_address(app_id)
+    ledger.fund(app_addr, 1_000_000)
+
+    members = [account.generate_account()[1] for _ in range(50)]
+    for addr in members:
+        ledger.fund(addr, 100_000_000)
+        execute_group(ledger, [transaction.ApplicationOptInTxn(addr, sp, app_id)])
+
+    groups = []
+    for n in range(2000):
+        addr = members[n % len(members)]
+        pay = transaction.PaymentTxn(addr, sp, app_addr, 1000 + n)
+        call = transaction.ApplicationNoOpTxn(addr, sp, app_id, app_args=[b"contribute"])
+        transaction.assign_group_id([pay, call])
+        groups.append([pay, call])
+
+    start = time.perf_counter()
+    ok = sum(1 for g in groups if execute_group(ledger, g)["ok"])
+    elapsed = time.perf_counter() - start
+    print("⚡ Local AVM benchmark (governance contribute)")
+    print(f"   Groups: {len(groups)} ({ok} approved)")
+    print(f"   Elapsed: {elapsed:.3f} s")
+    print(f"   Throughput: {len(groups) / elapsed:,.0f} groups/s")
+    print(f"   total_contributors: {ledger.global_state(app_id)[b'total_contributors']}")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        _bench()
+    else:
+        print("Usage: python avm.py bench")
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Pipelined bulk submission for contributions and votes
+
+Keeps up to N groups in flight: the next group is submitted while earlier
+ones are still pending, and confirmations come back through the shared
+block follower (confirmations.py). Reports per-group outcome, throughput
+and latency percentiles.
+
+Usage:
+  python bulk_submit.py contribute governance <amount_algo> [in_flight]
+  python bulk_submit.py contribute vault <amount_algo> [in_flight]
+  python bulk_submit.py vote [in_flight]
+  python bulk_submit.py bench [members] [in_flight] [block_time] [pairs_per_group] [optin]   # against local_algod
+
+Members are the wallets.json accounts, or with BULK_ACCOUNTS=<prefix> the
+keystore accounts named <prefix>... (python keystore.py generate 5000).
+"""
+
+import os
+import sys
+import threading
+import time
+from algosdk import account, transaction
+from algod_client import get_algod_client
+from batch_signer import send_signed, sign_transactions
+from confirmations import get_confirmation_waiter
+from deployments import load_deployment
+from governance_sender import (GLOBAL_BYTES, GLOBAL_INTS, LOCAL_BYTES, LOCAL_INTS, PROPOSAL_BOX_REFS,
+                               get_governance_sender_teal, proposal_box_name)
+from params_cache import get_suggested_params
+from roster import join_box_refs, member_box_name
+from keystore import get_keystore
+
+# Configuration
+IN_FLIGHT = int(os.environ.get("BULK_IN_FLIGHT", "64"))  # groups submitted but unconfirmed
+WAIT_ROUNDS = 10  # rounds before an in-flight group counts as timed out
+PAIRS_PER_GROUP = 8  # [pay, contribute] pairs packed into one atomic group (16 txn limit)
+VOTES_PER_GROUP = 16  # vote calls packed into one atomic group
+BULK_ACCOUNTS = os.environ.get("BULK_ACCOUNTS")  # keystore name prefix; unset = wallets.json
+
+
+def submit_pipelined(algod_client, groups, in_flight=IN_FLIGHT, labels=None, wait_rounds=WAIT_ROUNDS):
+    """Submit signed groups keeping up to in_flight unconfirmed, returning one outcome per group.
+    A group is a list of SignedTransactions or of raw signed bytes (batch_signer)."""
+    waiter = get_confirmation_waiter(algod_client)
+    slots = threading.BoundedSemaphore(in_flight)
+    outcomes = [None] * len(groups)
+    remaining = [len(groups)]
+    lock = threading.Lock()
+    all_done = threading.Event()
+    if not groups:
+        all_done.set()
+
+    def finish(index, txid, started, confirmed_round=None, error=None):
+        outcomes[index] = {
+            "index": index,
+            "label": labels[index] if labels else None,
+            "txid": txid,
+            "ok": error is None,
+            "confirmed_round": confirmed_round,
+            "latency": time.perf_counter() - started,
+            "error": error,
+        }
+        slots.release()
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                all_done.set()
+
+    def on_confirmed(index, txid, started, future):
+        try:
+            finish(index, txid, started, confirmed_round=future.result()["confirmed-round"])
+        except Exception as e:
+            finish(index, txid, started, error=str(e))
+
+    for index, group in enumerate(groups):
+        slots.acquire()
+        started = time.perf_counter()
+        txid = None
+        try:
+            if isinstance(group[0], bytes):
+                txid = send_signed(algod_client, group)
+            else:
+                txid = algod_client.send_transactions(group)
+            waiter.watch(txid, wait_rounds,
+                         callback=lambda f, i=index, t=txid, s=started: on_confirmed(i, t, s, f))
+        except Exception as e:
+            # Failing to send or to watch still gives back the slot and counts the group
+            finish(index, txid, started, error=str(e))
+
+    all_done.wait()
+    return outcomes
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(outcomes, elapsed):
+    """Aggregate outcomes into counts, throughput and latency percentiles"""
+    latencies = sorted(o["latency"] for o in outcomes if o["ok"])
+    rounds = [o["confirmed_round"] for o in outcomes if o["ok"]]
+    return {
+        "groups": len(outcomes),
+        "confirmed": len(latencies),
+        "failed": len(outcomes) - len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50": _percentile(latencies, 50),
+        "p90": _percentile(latencies, 90),
+        "p99": _percentile(latencies, 99),
+        "rounds": (max(rounds) - min(rounds) + 1) if rounds else 0,
+    }
+
+
+def print_report(title, outcomes, elapsed, show_failures=10):
+    """Print a summary plus the first few failures"""
+    stats = summarize(outcomes, elapsed)
+    print(f"\n📊 {title}")
+    print(f"   Groups: {stats['groups']} ({stats['confirmed']} confirmed, {stats['failed']} failed)")
+    print(f"   Elapsed: {stats['elapsed']:.2f} s across {stats['rounds']} round(s)")
+    print(f"   Throughput: {stats['throughput']:.1f} groups/s")
+    print(f"   Latency p50/p90/p99: {stats['p50']:.2f} / {stats['p90']:.2f} / {stats['p99']:.2f} s")
+    failures = [o for o in outcomes if not o["ok"]]
+    for o in failures[:show_failures]:
+        print(f"   ❌ #{o['index']} {o['label'] or ''}: {o['error']}")
+    if len(failures) > show_failures:
+        print(f"   ... and {len(failures) - show_failures} more failures")
+    return stats
+
+
+def _sign_groups(unsigned_groups, keys):
+    """Batch-sign every transaction, keeping the group boundaries"""
+    blobs = iter(sign_transactions([txn for group in unsigned_groups for txn in group], keys))
+    return [[next(blobs) for _ in group] for group in unsigned_groups]
+
+
+def build_contribution_groups(sp, app_id, app_address, contributors, amount_micro,
+                              pairs_per_group=PAIRS_PER_GROUP, next_slot=None, opt_in=False):
+    """[Payment, AppCall("contribute")] per contributor, up to pairs_per_group pairs
+    per atomic group, signed (raw bytes, see batch_signer). Returns (groups, labels)
+    with one label per group.
+    A group is atomic: one bad contributor fails the whole group.
+    next_slot (the app's total_contributors) is needed when the list onboards new
+    governance members, whose first contribution writes the roster. With opt_in the
+    contribute calls are the members' governance OptIns as well."""
+    on_complete = transaction.OnComplete.OptInOC if opt_in else transaction.OnComplete.NoOpOC
+    unsigned, labels = [], []
+    for start in range(0, len(contributors), pairs_per_group):
+        batch = contributors[start:start + pairs_per_group]
+        roster = [] if next_slot is None else join_box_refs(app_id, next_slot, next_slot + start, len(batch))
+        txns = []
+        for i, contributor in enumerate(batch, start):
+            txns.append(transaction.PaymentTxn(
+                sender=contributor['addr'], sp=sp, receiver=app_address, amt=amount_micro,
+                note=f"ogc-bulk:{i}".encode()
+            ))
+            txns.append(transaction.ApplicationCallTxn(
+                sender=contributor['addr'], sp=sp, index=app_id, on_complete=on_complete, app_args=[b"contribute"],
+                boxes=[(app_id, member_box_name(contributor['addr']))] + (roster if i == start else [])
+            ))
+        transaction.assign_group_id(txns)
+        unsigned.append(txns)
+        labels.append(",".join(c.get('name', c['addr'][:8]) for c in batch))
+    return _sign_groups(unsigned, {c['addr']: c['sk'] for c in contributors}), labels
+
+
+def build_unsigned_vote_groups(sp, app_id, voter_addresses, votes_per_group=VOTES_PER_GROUP, proposal_id=None):
+    """AppCall("vote") per voter, up to votes_per_group calls per group, grouped but
+    unsigned - each member signs their own call before the group is submitted.
+    With proposal_id the calls vote on that concurrent proposal box instead."""
+    if proposal_id is None:
+        app_args, boxes = [b"vote"], []
+    else:
+        app_args = [b"vote_proposal", proposal_id.to_bytes(8, 'big')]
+        boxes = [(app_id, proposal_box_name(proposal_id))] * PROPOSAL_BOX_REFS
+    groups = []
+    for start in range(0, len(voter_addresses), votes_per_group):
+        txns = [transaction.ApplicationNoOpTxn(sender=address, sp=sp, index=app_id, app_args=app_args,
+                                               boxes=[(app_id, member_box_name(address))] + boxes)
+                for address in voter_addresses[start:start + votes_per_group]]
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        groups.append(txns)
+    return groups
+
+
+def build_vote_groups(sp, app_id, voters, votes_per_group=VOTES_PER_GROUP, proposal_id=None):
+    """Vote groups signed with the voters' own keys (raw bytes). Returns (groups, labels)."""
+    unsigned = build_unsigned_vote_groups(sp, app_id, [voter['addr'] for voter in voters], votes_per_group,
+                                          proposal_id)
+    groups = _sign_groups(unsigned, {voter['addr']: voter['sk'] for voter in voters})
+    labels = [",".join(v.get('name', v['addr'][:8]) for v in voters[i:i + votes_per_group])
+              for i in range(0, len(voters), votes_per_group)]
+    return groups, labels
+
+
+def build_opt_in_groups(sp, app_id, members):
+    """Single OptIn per member, signed"""
+    return [[transaction.ApplicationOptInTxn(
+        sender=member['addr'], sp=sp, index=app_id, boxes=[(app_id, member_box_name(member['addr']))]
+    ).sign(member['sk'])] for member in members]
+
+
+def load_all_wallets(prefix=BULK_ACCOUNTS):
+    """Every wallets.json entry with a usable mnemonic, or every keystore account
+    named prefix..., as {addr, sk, name}"""
+    keystore = get_keystore()
+    if prefix:
+        return [{"addr": w['addr'], "sk": w['sk'], "name": w['name']} for w in keystore.accounts(prefix)]
+    wallets = []
+    for name in keystore.wallets:
+        wallet = keystore.get(name)
+        if wallet['sk'] is None:
+            print(f"⚠️  Skipping {name}: no valid mnemonic")
+        else:
+            wallets.append({"addr": wallet['addr'], "sk": wallet['sk'], "name": name})
+    return wallets
+
+
+def bulk_contribute(kind, amount_algo, in_flight=IN_FLIGHT, pairs_per_group=PAIRS_PER_GROUP):
+    """Contribute from every wallet (load_all_wallets) to the governance or vault app"""
+    info = load_deployment(kind)
+    if not info:
+        return None
+    wallets = load_all_wallets()
+    algod_client = get_algod_client()
+    sp = get_suggested_params(algod_client)
+    next_slot = None
+    if kind == "governance":
+        from governance_interact import read_global_state
+        next_slot = read_global_state(algod_client, info['appId']).get('total_contributors', 0)
+    groups, labels = build_contribution_groups(sp, info['appId'], info['appAddress'], wallets,
+                                               int(amount_algo * 1_000_000), pairs_per_group, next_slot)
+    print(f"🚀 Submitting {len(wallets)} contribution(s) in {len(groups)} group(s) to {kind} app "
+          f"{info['appId']} ({in_flight} in flight)")
+    start = time.perf_counter()
+    outcomes = submit_pipelined(algod_client, groups, in_flight, labels=labels)
+    return print_report(f"Bulk {kind} contributions", outcomes, time.perf_counter() - start)
+
+
+def bulk_vote(in_flight=IN_FLIGHT, votes_per_group=VOTES_PER_GROUP):
+    """Vote YES from every wallet (load_all_wallets)"""
+    info = load_deployment("governance")
+    if not info:
+        return None
+    wallets = load_all_wallets()
+    algod_client = get_algod_client()
+    sp = get_suggested_params(algod_client)
+    groups, labels = build_vote_groups(sp, info['appId'], wallets, votes_per_group)
+    print(f"🗳️  Submitting {len(wallets)} vote(s) in {len(groups)} group(s) to app {info['appId']} "
+          f"({in_flight} in flight)")
+    start = time.perf_counter()
+    outcomes = submit_pipelined(algod_client, groups, in_flight, labels=labels)
+    return print_report("Bulk votes", outcomes, time.perf_counter() - start)
+
+
+def bench(members=200, in_flight=IN_FLIGHT, block_time=2.8, pairs_per_group=PAIRS_PER_GROUP, opt_in=False):
+    """Seed a governance pool with `members` contributions and votes on an in-process local_algod.
+    Members join through the box roster unless opt_in is set (OptIn carried by the contribute call)."""
+    from algosdk import encoding, logic
+    from algod_client import PooledAlgodClient
+    from local_algod import start_local_algod
+    from teal_compiler import compile_teal
+
+    node, server, url = start_local_algod(port=0, block_time=block_time, fund=[])
+    algod_client = PooledAlgodClient("", url)
+    print(f"🧪 Local algod at {url} ({block_time}s blocks), {members} members, {in_flight} in flight")
+
+    owner_sk, owner = account.generate_account()
+    node.fund(owner, 10_000_000)
+    accounts = [account.generate_account() for _ in range(members)]
+    member_wallets = [{"addr": addr, "sk": sk, "name": f"member{i}"} for i, (sk, addr) in enumerate(accounts)]
+    for wallet in member_wallets:
+        node.fund(wallet['addr'], 10_000_000)
+
+    sp = algod_client.suggested_params()
+    approval_teal, clear_teal = get_governance_sender_teal()
+    create_txn = transaction.ApplicationCreateTxn(
+        owner, sp, transaction.OnComplete.NoOpOC,
+        compile_teal(algod_client, approval_teal), compile_teal(algod_client, clear_teal),
+        transaction.StateSchema(GLOBAL_INTS, GLOBAL_BYTES), transaction.StateSchema(LOCAL_INTS, LOCAL_BYTES)
+    )
+    created = submit_pipelined(algod_client, [[create_txn.sign(owner_sk)]])[0]
+    app_id = algod_client.pending_transaction_info(created['txid'])['application-index']
+    app_address = logic.get_application_address(app_id)
+    node.fund(app_address, 1_000_000)  # box minimum balance until contributions arrive
+
+    groups, labels = build_contribution_groups(sp, app_id, app_address, member_wallets, 1_000_000,
+                                               pairs_per_group, next_slot=0, opt_in=opt_in)
+    start = time.perf_counter()
+    outcomes = submit_pipelined(algod_client, groups, in_flight, labels=labels)
+    stats = print_report(f"Contributions ({pairs_per_group} per group)", outcomes, time.perf_counter() - start)
+    print(f"   total_contributors on chain: {node.ledger.global_state(app_id).get(b'total_contributors')}")
+
+    propose_txn = transaction.ApplicationNoOpTxn(
+        owner, sp, app_id, app_args=[b"propose_send", encoding.decode_address(owner), (1_000_000).to_bytes(8, 'big')]
+    )
+    submit_pipelined(algod_client, [[propose_txn.sign(owner_sk)]])
+    groups, labels = build_vote_groups(sp, app_id, member_wallets)
+    start = time.perf_counter()
+    outcomes = submit_pipelined(algod_client, groups, in_flight, labels=labels)
+    print_report(f"Votes ({VOTES_PER_GROUP} per group)", outcomes, time.perf_counter() - start)
+    print(f"   proposal_votes on chain: {node.ledger.global_state(app_id).get(b'proposal_votes')}")
+    node.stop()
+    server.shutdown()
+    return stats
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) >= 3 and args[0] == "contribute" and args[1] in ("governance", "vault"):
+        bulk_contribute(args[1], float(args[2]), int(args[3]) if len(args) > 3 else IN_FLIGHT)
+    elif args and args[0] == "vote":
+        bulk_vote(int(args[1]) if len(args) > 1 else IN_FLIGHT)
+    elif args and args[0] == "bench":
+        bench(int(args[1]) if len(args) > 1 else 200,
+              int(args[2]) if len(args) > 2 else IN_FLIGHT,
+              float(args[3]) if len(args) > 3 else 2.8,
+              int(args[4]) if len(args) > 4 else PAIRS_PER_GROUP,
+              len(args) > 5 and args[5] == "optin")
+    else:
+        print("💡 Usage:")
+        print("  python bulk_submit.py contribute governance <amount_algo> [in_flight]")
+        print("  python bulk_submit.py contribute vault <amount_algo> [in_flight]")
+        print("  python bulk_submit.py vote [in_flight]")
+        print("  python bulk_submit.py bench [members] [in_flight] [block_time] [pairs_per_group] [optin]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Local SQLite index of OGC app activity
+
+Reads every block from each app's creation round, decodes the calls to the
+governance, vault, sender, echo and simple deposit apps and stores them in
+indexed tables, so member histories and vote trails are local queries instead
+of remote scans. Each app keeps its own checkpoint round, so a sync resumes
+where the last one stopped and an app registered later is backfilled on its
+own.
+
+  calls      one row per app call: method, sender, ALGO paid in with it (same
+             group), ALGO paid out by its inner payments, proposal id, the
+             recipient/amount it proposes or sends
+  transfers  every payment into an app address and every inner payment out
+
+Governance votes on the single global proposal carry the id of the proposal
+they were cast on (the contract's proposal_id counter, replayed from the
+creation round), so trails of old proposals stay separate. Concurrent (box)
+proposals have their own ids, logged by open_proposal.
+
+Apps come from the deployment registry (deployments.py), which records
+createdRound at deploy time; older deployments can be added by hand.
+
+Usage:
+  python chain_index.py sync                              # register deployments, catch up
+  python chain_index.py add <kind> <app_id> <created_round>
+  python chain_index.py history <address> [app_id]
+  python chain_index.py votes [--box] <proposal_id> [app_id]
+  python chain_index.py summary
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import msgpack
+from algosdk import encoding, logic, transaction
+from algod_client import get_algod_client
+from deployments import APP_TYPES, get_registry
+from payouts import decode_payouts
+
+# Configuration
+INDEX_PATH = os.environ.get("CHAIN_INDEX_DB", os.path.join(os.path.dirname(__file__), "ogc_index.sqlite"))
+FETCH_WORKERS = int(os.environ.get("CHAIN_INDEX_WORKERS", "8"))  # blocks fetched concurrently
+COMMIT_EVERY = 200  # rounds per SQLite transaction / checkpoint
+
+PROPOSING_METHODS = {"propose_send", "propose_batch"}  # bump governance proposal_id
+CURRENT_PROPOSAL_METHODS = {"vote", "execute_send"}  # act on the single global proposal
+PROPOSAL_ARG_METHODS = {"vote_proposal", "execute_proposal", "cancel_proposal"}  # id in args[1]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    app_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    app_address TEXT NOT NULL,
+    created_round INTEGER NOT NULL,
+    synced_round INTEGER NOT NULL,
+    proposal_counter INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS calls (
+    txid TEXT PRIMARY KEY,
+    app_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    intra INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    sender TEXT NOT NULL,
+    method TEXT,
+    on_completion INTEGER NOT NULL,
+    amount_in INTEGER NOT NULL,
+    amount_out INTEGER NOT NULL,
+    proposal_id INTEGER,
+    recipient TEXT,
+    proposed INTEGER
+);
+CREATE INDEX IF NOT EXISTS calls_by_sender ON calls (app_id, sender, round);
+CREATE INDEX IF NOT EXISTS calls_by_method ON calls (app_id, method, proposal_id, round);
+CREATE TABLE IF NOT EXISTS transfers (
+    txid TEXT NOT NULL,
+    inner_index INTEGER NOT NULL,
+    app_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    sender TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    PRIMARY KEY (txid, inner_index)
+);
+CREATE INDEX IF NOT EXISTS transfers_by_receiver ON transfers (app_id, receiver, round);
+CREATE INDEX IF NOT EXISTS transfers_by_sender ON transfers (app_id, sender, round);
+"""
+
+
+def open_index(path=INDEX_PATH):
+    """SQLite connection with the index schema in place"""
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+def add_app(db, kind, app_id, created_round):
+    """Start indexing app_id from created_round (no-op if it is already indexed)"""
+    if kind not in APP_TYPES:
+        raise ValueError(f"unknown app kind {kind!r} (one of {', '.join(APP_TYPES)})")
+    with db:
+        db.execute("INSERT OR IGNORE INTO apps (app_id, kind, app_address, created_round, synced_round) "
+                   "VALUES (?, ?, ?, ?, ?)",
+                   (app_id, kind, logic.get_application_address(app_id), created_round, created_round - 1))
+
+
+def register_deployments(db):
+    """Add every registered app whose deployment record has its creation round"""
+    for info in get_registry().find():
+        kind = info['type']
+        if kind not in APP_TYPES:
+            continue
+        if info.get('createdRound'):
+            add_app(db, kind, info['appId'], info['createdRound'])
+        elif not db.execute("SELECT 1 FROM apps WHERE app_id = ?", (info['appId'],)).fetchone():
+            print(f"⚠️  {kind} app {info['appId']} has no createdRound (deployed before it was recorded)")
+            print(f"   Add it by hand: python chain_index.py add {kind} {info['appId']} <created_round>")
+
+
+def fetch_block(algod_client, round_num):
+    """Block round_num as decoded msgpack"""
+    raw = algod_client.block_info(round_num=round_num, response_format="msgpack")
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)["block"]
+
+
+def _txid(block, signed):
+    """Id of a block transaction, with the genesis fields the block strips put back"""
+    txn = dict(signed["txn"], gh=block["gh"])
+    if signed.get("hgi"):
+        txn["gen"] = block["gen"]
+    return transaction.Transaction.undictify(txn).get_txid()
+
+
+def _inner_payments(signed):
+    """(sender, receiver, amount) of every inner payment under signed, depth first"""
+    payments = []
+    for inner in signed.get("dt", {}).get("itx", []):
+        txn = inner["txn"]
+        if txn.get("type") == "pay" and txn.get("amt"):
+            payments.append((txn["snd"], txn.get("rcv", bytes(32)), txn["amt"]))
+        payments += _inner_payments(inner)
+    return payments
+
+
+def _decode_call(method, args):
+    """(proposal_id, recipient, proposed amount) carried in a call's args"""
+    if method in PROPOSAL_ARG_METHODS and len(args) > 1:
+        return int.from_bytes(args[1], 'big'), None, None
+    if method in ("propose_send", "send_algo") and len(args) > 2:
+        return None, encoding.encode_address(args[1]), int.from_bytes(args[2], 'big')
+    if method in ("propose_batch", "open_proposal") and len(args) > 1:
+        return None, None, sum(amount for _, amount in decode_payouts(args[1]))
+    if method == "send_batch" and len(args) > 2:
+        return None, None, sum(int.from_bytes(args[2][i:i + 8], 'big') for i in range(0, len(args[2]), 8))
+    return None, None, None
+
+
+def index_block(db, block, apps):
+    """Record the activity of apps ({app_id: row dict}) in one block"""
+    round_num, ts = block["rnd"], block.get("ts", 0)
+    txns = block.get("txns", [])
+    by_address = {encoding.decode_address(app["app_address"]): app for app in apps.values()}
+    address_bytes = {app["app_id"]: address for address, app in by_address.items()}
+
+    # ALGO paid to an app address, per (group, sender, app address), for the calls grouped with it
+    paid_in = {}
+    for signed in txns:
+        txn = signed["txn"]
+        if txn.get("type") == "pay" and txn.get("rcv") in by_address:
+            key = (txn.get("grp"), txn["snd"], txn["rcv"])
+            paid_in[key] = paid_in.get(key, 0) + txn.get("amt", 0)
+
+    for intra, signed in enumerate(txns):
+        txn = signed["txn"]
+        if txn.get("type") == "pay" and txn.get("rcv") in by_address:
+            app = by_address[txn["rcv"]]
+            db.execute("INSERT OR REPLACE INTO transfers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (_txid(block, signed), -1, app["app_id"], round_num, ts,
+                        encoding.encode_address(txn["snd"]), app["app_address"], txn.get("amt", 0)))
+            continue
+        if txn.get("type") != "appl":
+            continue
+        app_id = txn.get("apid") or signed.get("apid")
+        app = apps.get(app_id)
+        if app is None:
+            continue
+
+        txid = _txid(block, signed)
+        args = txn.get("apaa", [])
+        method = args[0].decode('utf-8', errors='replace') if args else None
+        proposal_id, recipient, proposed = _decode_call(method, args)
+        if app["kind"] == "governance" and method in PROPOSING_METHODS | CURRENT_PROPOSAL_METHODS:
+            if method in PROPOSING_METHODS:
+                app["proposal_counter"] += 1
+            proposal_id = app["proposal_counter"]
+        elif app["kind"] == "governance" and method == "open_proposal" and signed.get("dt", {}).get("lg"):
+            proposal_id = int.from_bytes(signed["dt"]["lg"][0], 'big')
+
+        payments = _inner_payments(signed)
+        for inner_index, (sender, receiver, amount) in enumerate(payments):
+            db.execute("INSERT OR REPLACE INTO transfers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (txid, inner_index, app_id, round_num, ts, encoding.encode_address(sender),
+                        encoding.encode_address(receiver), amount))
+        db.execute("INSERT OR REPLACE INTO calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                   (txid, app_id, round_num, intra, ts, encoding.encode_address(txn["snd"]), method,
+                    txn.get("apan", 0),
+                    paid_in.get((txn.get("grp"), txn["snd"], address_bytes[app_id]), 0),
+                    sum(amount for _, _, amount in payments), proposal_id, recipient, proposed))
+
+
+def sync(db=None, algod_client=None, until=None, workers=FETCH_WORKERS, verbose=True):
+    """Index every round up to `until` (default: the last round) that an app has not
+    seen yet, returning the number of blocks read"""
+    db = db or open_index()
+    algod_client = algod_client or get_algod_client()
+    until = until or algod_client.status()["last-round"]
+    apps = {row["app_id"]: dict(row) for row in db.execute("SELECT * FROM apps")}
+    pending = [app for app in apps.values() if app["synced_round"] < until]
+    if not pending:
+        return 0
+    start = min(app["synced_round"] for app in pending) + 1
+    if verbose:
+        print(f"🔎 Indexing rounds {start}-{until} for {len(pending)} app(s)")
+
+    started = time.perf_counter()
+    read = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk_start in range(start, until + 1, COMMIT_EVERY):
+            rounds = range(chunk_start, min(chunk_start + COMMIT_EVERY, until + 1))
+            with db:
+                # Blocks are fetched concurrently but indexed in round order
+                for round_num, block in zip(rounds, pool.map(lambda r: fetch_block(algod_client, r), rounds)):
+                    behind = {app_id: app for app_id, app in apps.items() if app["synced_round"] < round_num}
+                    if behind:
+                        index_block(db, block, behind)
+                    for app in behind.values():
+                        app["synced_round"] = round_num
+                for app in apps.values():
+                    db.execute("UPDATE apps SET synced_round = ?, proposal_counter = ? WHERE app_id = ?",
+                               (app["synced_round"], app["proposal_counter"], app["app_id"]))
+            read += len(rounds)
+            if verbose and len(rounds) == COMMIT_EVERY:
+                print(f"   ...round {rounds[-1]} ({read / (time.perf_counter() - started):,.0f} blocks/s)")
+    if verbose:
+        print(f"✅ Indexed {read} block(s) in {time.perf_counter() - started:.2f} s")
+    return read
+
+
+def member_history(db, address, app_id=None):
+    """Calls sent by address, oldest first"""
+    query = "SELECT * FROM calls WHERE sender = ?" + (" AND app_id = ?" if app_id else "")
+    params = (address, app_id) if app_id else (address,)
+    return [dict(row) for row in db.execute(query + " ORDER BY round, intra", params)]
+
+
+def vote_trail(db, proposal_id, app_id=None, box=False):
+    """Governance votes on proposal_id (a concurrent box proposal with box), in the order they landed"""
+    query = ("SELECT * FROM calls WHERE method = ? AND proposal_id = ?"
+             + (" AND app_id = ?" if app_id else ""))
+    params = ("vote_proposal" if box else "vote", proposal_id) + ((app_id,) if app_id else ())
+    return [dict(row) for row in db.execute(query + " ORDER BY round, intra", params)]
+
+
+def app_summary(db):
+    """Per app: calls by method, ALGO in and out, distinct members"""
+    summary = []
+    for app in db.execute("SELECT * FROM apps ORDER BY app_id"):
+        methods = dict(db.execute("SELECT method, COUNT(*) FROM calls WHERE app_id = ? GROUP BY method",
+                                  (app["app_id"],)).fetchall())
+        totals = db.execute(
+            "SELECT COALESCE(SUM(CASE WHEN receiver = ? THEN amount END), 0),"
+            "       COALESCE(SUM(CASE WHEN sender = ? THEN amount END), 0)"
+            "  FROM transfers WHERE app_id = ?", (app["app_address"], app["app_address"], app["app_id"])).fetchone()
+        members = db.execute("SELECT COUNT(DISTINCT sender) FROM transfers WHERE app_id = ? AND receiver = ?",
+                             (app["app_id"], app["app_address"])).fetchone()[0]
+        summary.append(dict(app, methods=methods, total_in=totals[0], total_out=totals[1], members=members))
+    return summary
+
+
+def _print_calls(rows):
+    for row in rows:
+        detail = []
+        if row["amount_in"]:
+            detail.append(f"in {row['amount_in'] / 1_000_000} ALGO")
+        if row["amount_out"]:
+            detail.append(f"out {row['amount_out'] / 1_000_000} ALGO")
+        if row["proposal_id"] is not None:
+            detail.append(f"proposal {row['proposal_id']}")
+        if row["proposed"]:
+            detail.append(f"{row['proposed'] / 1_000_000} ALGO" + (f" to {row['recipient']}" if row["recipient"] else ""))
+        print(f"   round {row['round']}: app {row['app_id']} {row['method'] or '(no args)'} "
+              f"{' | '.join(detail)}")
+
+
+def main():
+    args = sys.argv[1:]
+    db = open_index()
+    if args and args[0] == "sync":
+        register_deployments(db)
+        sync(db)
+    elif len(args) == 4 and args[0] == "add":
+        add_app(db, args[1], int(args[2]), int(args[3]))
+        print(f"✅ Indexing {args[1]} app {args[2]} from round {args[3]} (run: python chain_index.py sync)")
+    elif len(args) >= 2 and args[0] == "history":
+        rows = member_history(db, args[1], int(args[2]) if len(args) > 2 else None)
+        print(f"📜 {len(rows)} call(s) from {args[1]}")
+        _print_calls(rows)
+    elif len(args) >= 2 and args[0] == "votes":
+        box = args[1] == "--box"
+        args = args[1:] if box else args
+        rows = vote_trail(db, int(args[1]), int(args[2]) if len(args) > 2 else None, box=box)
+        print(f"🗳️  {len(rows)} vote(s) on {'box ' if box else ''}proposal {args[1]}")
+        for row in rows:
+            print(f"   round {row['round']}: {row['sender']}")
+    elif args and args[0] == "summary":
+        for app in app_summary(db):
+            print(f"📊 {app['kind']} app {app['app_id']} (synced to round {app['synced_round']})")
+            print(f"   In: {app['total_in'] / 1_000_000} ALGO from {app['members']} account(s), "
+                  f"out: {app['total_out'] / 1_000_000} ALGO")
+            for method, count in sorted(app['methods'].items(), key=lambda m: str(m[0])):
+                print(f"   {method or '(no args)'}: {count}")
+    else:
+        print("💡 Usage:")
+        print("  python chain_index.py sync")
+        print("  python chain_index.py add <kind> <app_id> <created_round>")
+        print("  python chain_index.py history <address> [app_id]")
+        print("  python chain_index.py votes [--box] <proposal_id> [app_id]")
+        print("  python chain_index.py summary")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,66 @@
 """
 Check balance of any address, contract, or wallet
 Inherits from existing wallet system
+
+Answers come from the balance watcher (watcher.py) when one is running;
+otherwise each lookup goes to algod.
 """
 
-import json
 import os
-from algosdk.v2client import algod
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from algosdk import logic, encoding
+from algod_client import get_algod_client
+from deployments import LABELS, get_registry
+from keystore import get_keystore
 from wallet_selector import select_wallet, load_wallets
+from watcher_client import watched_account, watched_accounts
 
 # Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
+FANOUT_WORKERS = int(os.environ.get("BALANCE_FANOUT_WORKERS", "16"))  # concurrent account lookups
+
+
+def _timed_account_info(algod_client, address):
+    started = time.perf_counter()
+    try:
+        return algod_client.account_info(address), None, time.perf_counter() - started
+    except Exception as e:
+        return None, e, time.perf_counter() - started
+
+
+def _account_info(algod_client, address):
+    """account_info for address, from the watcher if it has it"""
+    return watched_account(address) or algod_client.account_info(address)
+
+
+def fetch_account_infos(algod_client, entries, max_workers=FANOUT_WORKERS):
+    """Look up (key, address) entries concurrently, yielding
+    (key, address, account_info, error, latency) as each one completes.
+    Addresses the watcher holds are answered by one request to it."""
+    if not entries:
+        return
+    started = time.perf_counter()
+    watched = watched_accounts()
+    latency = time.perf_counter() - started
+    for key, address in entries:
+        if address in watched:
+            yield key, address, watched[address], None, latency
+    entries = [(key, address) for key, address in entries if address not in watched]
+    if not entries:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(entries))) as pool:
+        futures = {pool.submit(_timed_account_info, algod_client, address): (key, address)
+                   for key, address in entries}
+        for future in as_completed(futures):
+            key, address = futures[future]
+            account_info, error, latency = future.result()
+            yield key, address, account_info, error, latency
+
+
+def _print_sweep_summary(count, started, latencies):
+    if latencies:
+        print(f"\n⏱️  {count} account(s) in {time.perf_counter() - started:.2f} s "
+              f"(slowest lookup {max(latencies):.2f} s)")
 
 def check_wallet_balance():
     """Check balance of a wallet from wallet selector"""
@@ -24,10 +73,10 @@ def check_wallet_balance():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     try:
-        account_info = algod_client.account_info(wallet['addr'])
+        account_info = _account_info(algod_client, wallet['addr'])
         balance = account_info['amount'] / 1_000_000
         
         print(f"\n💰 {wallet['name']} Balance:")
@@ -58,10 +107,10 @@ def check_address_balance():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     try:
-        account_info = algod_client.account_info(address)
+        account_info = _account_info(algod_client, address)
         balance = account_info['amount'] / 1_000_000
         
         print(f"\n💰 Address Balance:")
@@ -96,10 +145,10 @@ def check_contract_balance():
     app_addr = logic.get_application_address(app_id)
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     try:
-        account_info = algod_client.account_info(app_addr)
+        account_info = _account_info(algod_client, app_addr)
         balance = account_info['amount'] / 1_000_000
         
         print(f"\n💰 Contract Balance:")
@@ -124,65 +173,75 @@ def check_deployment_balances():
     """Check balances of all deployed contracts"""
     print("📊 Check All Deployment Balances")
     
-    # Check for deployment files
-    deployment_files = [
-        ("Simple Contract", "simple_deployment.json"),
-        ("Advanced Vault", "advanced_vault_deployment.json"),
-        ("Sender Contract", "sender_contract_deployment.json"),
-        ("OGC Token", "ogc_token_info.json")
-    ]
-    
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
-    found_any = False
+    deployments = get_registry().find()
+    if not deployments:
+        print("❌ No deployments found")
+        print("Deploy contracts first to see their balances")
+        return
     
-    for name, filename in deployment_files:
-        if os.path.exists(filename):
-            found_any = True
-            try:
-                with open(filename, 'r') as f:
-                    info = json.load(f)
-                
-                if 'appId' in info:
-                    # It's a contract
-                    app_addr = logic.get_application_address(info['appId'])
-                    account_info = algod_client.account_info(app_addr)
-                    balance = account_info['amount'] / 1_000_000
-                    
-                    print(f"\n🏦 {name}:")
-                    print(f"   APP_ID: {info['appId']}")
-                    print(f"   Balance: {balance} ALGO")
-                    
-                elif 'assetId' in info:
-                    # It's a token
-                    print(f"\n🪙 {name}:")
-                    print(f"   Asset ID: {info['assetId']}")
-                    print(f"   Creator: {info['creator']}")
-                    
-            except Exception as e:
-                print(f"\n❌ {name}: Could not check - {e}")
+    contracts = {}
+    for info in deployments:
+        name = LABELS[info['type']] + (f" [{info['tag']}]" if info.get('tag') else "")
+        if info['type'] == "token":
+            print(f"\n🪙 {name}:")
+            print(f"   Asset ID: {info['assetId']}")
+            print(f"   Creator: {info['creator']}")
+        else:
+            # It's a contract - balance is fetched below, concurrently
+            contracts[f"{name} {info['appId']}"] = info
     
-    if not found_any:
-        print("❌ No deployment files found")
-        print("Deploy contracts first to see their balances")
+    algod_client = get_algod_client()
+    entries = [(name, logic.get_application_address(info['appId'])) for name, info in contracts.items()]
+    started = time.perf_counter()
+    latencies = []
+    for name, app_addr, account_info, error, latency in fetch_account_infos(algod_client, entries):
+        latencies.append(latency)
+        if error is not None:
+            print(f"\n❌ {name}: Could not check - {error} ({latency:.2f} s)")
+            continue
+        balance = account_info['amount'] / 1_000_000
+        
+        print(f"\n🏦 {name}:")
+        print(f"   APP_ID: {contracts[name]['appId']}")
+        print(f"   Balance: {balance} ALGO ({latency:.2f} s)")
+    _print_sweep_summary(len(entries), started, latencies)
+
+def _print_wallet_balances(entries):
+    algod_client = get_algod_client()
+    started = time.perf_counter()
+    latencies = []
+    for name, address, account_info, error, latency in fetch_account_infos(algod_client, entries):
+        latencies.append(latency)
+        if error is not None:
+            print(f"\n❌ {name}: Could not check - {error} ({latency:.2f} s)")
+            continue
+        balance = account_info['amount'] / 1_000_000
+        
+        print(f"\n💳 {name}:")
+        print(f"   Address: {address}")
+        print(f"   Balance: {balance} ALGO ({latency:.2f} s)")
+    _print_sweep_summary(len(entries), started, latencies)
 
 def check_all_wallets():
     """Check balances of all wallets"""
     print("👥 Check All Wallet Balances")
     
     wallets = load_wallets()
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
-    
-    for name, wallet_info in wallets.items():
-        try:
-            account_info = algod_client.account_info(wallet_info['addr'])
-            balance = account_info['amount'] / 1_000_000
-            
-            print(f"\n💳 {name}:")
-            print(f"   Address: {wallet_info['addr']}")
-            print(f"   Balance: {balance} ALGO")
-            
-        except Exception as e:
-            print(f"\n❌ {name}: Could not check - {e}")
+    _print_wallet_balances([(name, wallet_info['addr']) for name, wallet_info in wallets.items()])
+
+def check_balances(targets):
+    """Check balances of wallet/keystore account names or addresses"""
+    keystore = get_keystore()
+    entries = []
+    for target in targets:
+        wallet = keystore.get(target)
+        if wallet is not None:
+            entries.append((target, wallet['addr']))
+        elif encoding.is_valid_address(target):
+            entries.append((target, target))
+        else:
+            print(f"❌ {target}: not a wallet name or address")
+    _print_wallet_balances(entries)
 
 def main():
     """Main balance checking menu"""
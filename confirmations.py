@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Block-follower confirmation service
+
+Instead of one polling loop per transaction, a single background thread
+long-polls /v2/status/wait-for-block-after once per round, fetches that
+block's transaction ids and resolves every outstanding waiter found in it.
+500 in-flight contributions cost one status + one txids request per round.
+
+  waiter = get_confirmation_waiter(algod_client)
+  future = waiter.watch(tx_id)            # concurrent.futures.Future
+  future.add_done_callback(...)           # or block: future.result()
+
+wait_for_confirmation() is a drop-in for transaction.wait_for_confirmation
+that rides on the shared follower.
+"""
+
+import collections
+import concurrent.futures
+import threading
+import time
+from algosdk import error
+from algod_client import get_algod_client
+
+# Configuration
+DEFAULT_WAIT_ROUNDS = 4  # same default the scripts pass to wait_for_confirmation
+RECENT_ROUNDS = 64  # rounds of confirmed txids kept for late watch() calls
+RETRY_DELAY = 1.0  # seconds to back off after an algod error
+
+_waiters = {}
+_waiters_lock = threading.Lock()
+
+
+class ConfirmationWaiter:
+    """Follows blocks for one algod client and resolves confirmation futures"""
+
+    def __init__(self, algod_client):
+        self.algod_client = algod_client
+        self._lock = threading.Lock()
+        self._watched = {}   # txid -> (future, deadline round)
+        self._recent = {}    # txid -> confirmed round, for the last RECENT_ROUNDS
+        self._recent_blocks = collections.deque()  # (round, txids) backing _recent
+        self._round = None   # last round whose txids have been processed
+        self._thread = None
+
+    def _start(self):
+        if self._thread is None:
+            self._round = self.algod_client.status()["last-round"] - 1
+            self._thread = threading.Thread(target=self._follow, daemon=True)
+            self._thread.start()
+
+    def watch(self, txid, wait_rounds=DEFAULT_WAIT_ROUNDS, callback=None):
+        """Return a Future resolving to {"txid", "confirmed-round"} once txid is in a block"""
+        future = concurrent.futures.Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        with self._lock:
+            self._start()
+            confirmed_round = self._recent.get(txid)
+            if confirmed_round is None:
+                self._watched[txid] = (future, self._round + 1 + wait_rounds)
+        if confirmed_round is not None:
+            future.set_result({"txid": txid, "confirmed-round": confirmed_round})
+        return future
+
+    def watch_many(self, txids, wait_rounds=DEFAULT_WAIT_ROUNDS):
+        """Watch several transactions, returning {txid: Future}"""
+        return {txid: self.watch(txid, wait_rounds) for txid in txids}
+
+    def last_round(self):
+        """Last round the follower has seen (starts it on first use)"""
+        with self._lock:
+            self._start()
+            return self._round
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._watched)
+
+    def _follow(self):
+        while True:
+            try:
+                status = self.algod_client.status_after_block(self._round)
+                last_round = status["last-round"]
+                if last_round <= self._round:
+                    # Long-poll timed out with no new block; look the stragglers up directly
+                    self._expire(force=True)
+                    continue
+                # Every round since the last one seen: a waiter's txid may be in any of them.
+                # Advancing per round lets an algod error resume where it stopped
+                for round_num in range(self._round + 1, last_round + 1):
+                    txids = self.algod_client.get_block_txids(round_num).get("blockTxids") or []
+                    self._process_round(round_num, txids)
+                    self._round = round_num
+                self._expire()
+            except Exception as e:
+                print(f"⚠️  Block follower error: {e}")
+                time.sleep(RETRY_DELAY)
+
+    def _process_round(self, round_num, txids):
+        resolved = []
+        with self._lock:
+            for txid in txids:
+                self._recent[txid] = round_num
+                watched = self._watched.pop(txid, None)
+                if watched is not None:
+                    resolved.append((watched[0], txid))
+            self._recent_blocks.append((round_num, txids))
+            while len(self._recent_blocks) > RECENT_ROUNDS:
+                _, old_txids = self._recent_blocks.popleft()
+                for txid in old_txids:
+                    self._recent.pop(txid, None)
+        # Resolve outside the lock so callbacks can watch() again
+        for future, txid in resolved:
+            future.set_result({"txid": txid, "confirmed-round": round_num})
+
+    def _expire(self, force=False):
+        """Settle waiters whose deadline passed (or all of them), one pending lookup each"""
+        with self._lock:
+            expired = [(txid, future, deadline) for txid, (future, deadline) in self._watched.items()
+                       if force or deadline <= self._round]
+            for txid, _, _ in expired:
+                del self._watched[txid]
+        for txid, future, deadline in expired:
+            try:
+                info = self.algod_client.pending_transaction_info(txid)
+            except error.AlgodHTTPError:
+                info = {}
+            if info.get("confirmed-round"):
+                future.set_result({"txid": txid, "confirmed-round": info["confirmed-round"]})
+            elif info.get("pool-error"):
+                future.set_exception(error.TransactionRejectedError(
+                    "Transaction rejected: " + info["pool-error"]))
+            elif deadline > self._round:
+                with self._lock:
+                    self._watched[txid] = (future, deadline)
+            else:
+                future.set_exception(error.ConfirmationTimeoutError(
+                    f"Wait for transaction id {txid} timed out"))
+
+
+def get_confirmation_waiter(algod_client=None):
+    """Return the shared waiter for an algod client (default: the process-wide one)"""
+    if algod_client is None:
+        algod_client = get_algod_client()
+    key = id(algod_client)
+    with _waiters_lock:
+        waiter = _waiters.get(key)
+        if waiter is None or waiter.algod_client is not algod_client:
+            waiter = ConfirmationWaiter(algod_client)
+            _waiters[key] = waiter
+        return waiter
+
+
+def wait_for_confirmation(algod_client, txid, wait_rounds=DEFAULT_WAIT_ROUNDS):
+    """Drop-in for transaction.wait_for_confirmation backed by the block follower"""
+    get_confirmation_waiter(algod_client).watch(txid, wait_rounds).result()
+    return algod_client.pending_transaction_info(txid)
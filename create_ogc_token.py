@@ -3,16 +3,12 @@
 Create OGC Token (ASA) - Inherits wallet system from existing branch
 """
 
-import json
-import os
-from algosdk.v2client import algod
 from algosdk import transaction
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import load_deployment, record_deployment
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 def create_ogc_token():
     """Create OGC token (ASA)"""
     print("🪙 Create OGC Token")
@@ -42,7 +38,7 @@ def create_ogc_token():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
     sp = algod_client.suggested_params()
@@ -73,7 +69,7 @@ def create_ogc_token():
         print(f"Sent asset create tx: {tx_id}")
         
         # Wait for confirmation
-        confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
         asset_id = confirmed_txn["asset-index"]
         
         if not asset_id:
@@ -93,15 +89,12 @@ def create_ogc_token():
             "total": total_supply,
             "decimals": decimals,
             "creator": creator['addr'],
-            "network": "testnet",
             "createdBy": creator['name'],
             "txId": tx_id
         }
         
-        with open("ogc_token_info.json", 'w') as f:
-            json.dump(token_info, f, indent=2)
-        
-        print(f"Wrote ogc_token_info.json")
+        record = record_deployment("token", token_info)
+        print("Recorded in deployments.json" + (f" (tag: {record['tag']})" if record['tag'] else ""))
         
         print(f"\n🔗 Links:")
         print(f"   TX: https://testnet.algoexplorer.io/tx/{tx_id}")
@@ -117,14 +110,11 @@ def create_ogc_token():
 
 def check_ogc_token():
     """Check existing OGC token info"""
-    if not os.path.exists("ogc_token_info.json"):
-        print("❌ No ogc_token_info.json found")
+    token_info = load_deployment("token")
+    if not token_info:
         print("Create token first: python create_ogc_token.py")
         return
     
-    with open("ogc_token_info.json", 'r') as f:
-        token_info = json.load(f)
-    
     print("🪙 OGC Token Info")
     print(f"   Asset ID: {token_info['assetId']}")
     print(f"   Name: {token_info['name']}")
@@ -138,7 +128,7 @@ def check_ogc_token():
     print(f"   Asset: https://testnet.algoexplorer.io/asset/{token_info['assetId']}")
     
     # Check if token exists on chain
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     try:
         asset_info = algod_client.asset_info(token_info['assetId'])
         params = asset_info["params"]
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Deployment registry - every contract and token deployment in one file
+
+Replaces the one-per-type *_deployment.json / ogc_token_info.json files,
+which could only remember a single deployment of each type. deployments.json
+holds any number per type and network (hundreds of trip vaults, say), one
+compact record per line, indexed in memory by type, network, app/asset id
+and tag. Each record keeps the fields the old files had (appId, appAddress,
+owner, goal, ...) plus type, network, tag, deployedAt and the sha256 of the
+approval and clear programs, so a deployment can be checked against chain.
+
+Writes are serialized across processes with a lock file and land atomically
+(temp file + os.replace), so concurrent deploy scripts never lose a record.
+Legacy files are imported the first time the registry is read. Imported
+records get contractVersion 1: those apps run the programs from before the
+registry, and clients that need a newer contract (simple_deposit needs the
+box roster of version 2) refuse them and ask for a redeploy.
+
+  registry = get_registry()
+  registry.latest("vault")                     # newest vault on NETWORK (honours DEPLOYMENT_TAG)
+  registry.find("vault", tag="paris-2026")     # every match, oldest first
+  registry.get(app_id)
+
+  DEPLOYMENT_TAG=paris-2026 python advanced_vault.py     # deploy a tagged vault
+  DEPLOYMENT_TAG=paris-2026 python vault_interact.py     # and work with it
+
+Usage:
+  python deployments.py list [type] [tag]
+  python deployments.py show <app_or_asset_id>
+  python deployments.py import                 # pull in legacy *_deployment.json files
+  python deployments.py verify [type]          # compare program hashes with chain
+  python deployments.py bench [count]
+"""
+
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, just not serialized across processes
+    fcntl = None
+
+# Configuration
+HERE = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_PATH = os.environ.get("DEPLOYMENTS_PATH", os.path.join(HERE, "deployments.json"))
+NETWORK = os.environ.get("OGC_NETWORK", "testnet")
+DEPLOYMENT_TAG = os.environ.get("DEPLOYMENT_TAG") or None  # pick (and label) one of several deployments
+FORMAT_VERSION = 1
+
+LEGACY_FILES = {
+    "token": "ogc_token_info.json",
+    "simple": "simple_deployment.json",
+    "vault": "advanced_vault_deployment.json",
+    "sender": "sender_contract_deployment.json",
+    "governance": "governance_sender_deployment.json",
+    "echo": "echo_contract_deployment.json",
+}
+LABELS = {
+    "token": "OGC Token",
+    "simple": "Simple Contract",
+    "vault": "Advanced Vault",
+    "sender": "Sender Contract",
+    "governance": "Governance Contract",
+    "echo": "Echo Contract",
+}
+TYPES = tuple(LABELS)
+APP_TYPES = tuple(kind for kind in TYPES if kind != "token")
+
+_registry = None
+_registry_stamp = None
+_registry_lock = threading.Lock()
+
+
+def deployment_id(record):
+    """App id of an app deployment, asset id of a token"""
+    return record.get('appId') or record.get('assetId')
+
+
+def program_hash(program):
+    """sha256 hex of compiled program bytes"""
+    return hashlib.sha256(program).hexdigest()
+
+
+class Registry:
+    """Deployment records indexed by (type, network), (type, network, tag) and id"""
+
+    def __init__(self, records=()):
+        self.records = []
+        self._by_type = {}
+        self._by_tag = {}
+        self._by_id = {}
+        for record in records:
+            self._add(record)
+
+    def _add(self, record):
+        kind, network = record['type'], record.get('network')
+        self.records.append(record)
+        self._by_type.setdefault((kind, network), []).append(record)
+        if record.get('tag'):
+            self._by_tag.setdefault((kind, network, record['tag']), []).append(record)
+        self._by_id[deployment_id(record)] = record
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, deployment_id):
+        """Record for an app or asset id, or None"""
+        return self._by_id.get(deployment_id)
+
+    def find(self, kind=None, network=NETWORK, tag=None):
+        """Records matching every given filter (None = any), oldest first"""
+        if kind is not None and network is not None:
+            records = self._by_tag.get((kind, network, tag), []) if tag else self._by_type.get((kind, network), [])
+            return list(records)
+        return [record for record in self.records
+                if (kind is None or record['type'] == kind) and (network is None or record.get('network') == network)
+                and (tag is None or record.get('tag') == tag)]
+
+    def latest(self, kind, network=NETWORK, tag=DEPLOYMENT_TAG):
+        """Newest deployment of kind (with tag, if one is given), or None"""
+        records = self._by_tag.get((kind, network, tag), []) if tag else self._by_type.get((kind, network), [])
+        return records[-1] if records else None
+
+
+def _read_records(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} deployment registry")
+    return data['deployments']
+
+
+def _write_records(records, path):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        # One deployment per line: diffable without pretty-printing thousands of records
+        f.write(f'{{"version": {FORMAT_VERSION}, "deployments": [\n')
+        f.write(",\n".join(json.dumps(record, separators=(",", ":")) for record in records))
+        f.write("\n]}\n")
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def _locked(path):
+    """Hold an exclusive lock on path's .lock file (a no-op without fcntl)"""
+    with open(path + ".lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def add_records(records, path=REGISTRY_PATH):
+    """Append records under the registry lock. A record whose id is already
+    registered replaces the old one in place."""
+    with _locked(path):
+        existing = _read_records(path)
+        positions = {deployment_id(record): i for i, record in enumerate(existing)}
+        for record in records:
+            i = positions.get(deployment_id(record))
+            if i is None:
+                positions[deployment_id(record)] = len(existing)
+                existing.append(record)
+            else:
+                existing[i] = record
+        _write_records(existing, path)
+
+
+def record_deployment(kind, info, approval=None, clear=None, tag=DEPLOYMENT_TAG, network=NETWORK,
+                      path=REGISTRY_PATH):
+    """Register a deployment; info carries appId (or assetId) and any type-specific
+    fields. approval/clear are the compiled program bytes."""
+    if kind not in TYPES:
+        raise ValueError(f"unknown deployment type {kind!r} (one of {', '.join(TYPES)})")
+    if not deployment_id(info):
+        raise ValueError(f"{kind} deployment needs an appId or assetId")
+    record = dict(info, type=kind, network=network, tag=tag, deployedAt=datetime.now().isoformat())
+    if approval is not None:
+        record['approvalHash'] = program_hash(approval)
+    if clear is not None:
+        record['clearHash'] = program_hash(clear)
+    add_records([record], path)
+    return record
+
+
+def contract_version(record):
+    """Contract version a deployment was recorded with (1 for records from
+    before the deploy scripts stored one)"""
+    return record.get('contractVersion', 1)
+
+
+def warn_outdated(record, current):
+    """Say so when a deployment runs an older contract than this checkout
+    deploys; returns whether it does"""
+    if contract_version(record) >= current:
+        return False
+    print(f"⚠️  {LABELS[record['type']]} {deployment_id(record)} runs contract version {contract_version(record)} "
+          f"(this checkout deploys {current}): redeploy for the fixes under 'Contract versions' in README.md")
+    return True
+
+
+def load_deployment(kind, network=NETWORK, tag=DEPLOYMENT_TAG):
+    """Newest deployment of kind, or None after saying what is missing"""
+    record = get_registry().latest(kind, network, tag)
+    if record is None:
+        print(f"❌ No {LABELS[kind]} deployment on {network}" + (f" tagged '{tag}'" if tag else ""))
+    return record
+
+
+def import_legacy(path=REGISTRY_PATH, directory=HERE):
+    """Register the deployments in legacy per-type files that the registry lacks"""
+    with _locked(path):
+        existing = _read_records(path)
+        known = {deployment_id(record) for record in existing}
+        imported = []
+        for kind, name in LEGACY_FILES.items():
+            legacy_path = os.path.join(directory, name)
+            if not os.path.exists(legacy_path):
+                continue
+            with open(legacy_path, 'r') as f:
+                info = json.load(f)
+            if not deployment_id(info) or deployment_id(info) in known:
+                continue
+            deployed_at = info.get('createdAt') or datetime.fromtimestamp(os.path.getmtime(legacy_path)).isoformat()
+            imported.append(dict(info, type=kind, network=info.get('network', NETWORK), tag=None,
+                                 deployedAt=deployed_at, legacyFile=name, contractVersion=1))
+        if imported:
+            _write_records(existing + imported, path)
+    return imported
+
+
+def load_registry(path=REGISTRY_PATH):
+    return Registry(_read_records(path))
+
+
+def _stamp(path):
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+def get_registry():
+    """Shared registry, reloaded when deployments.json changes. The first read
+    without a deployments.json imports any legacy deployment files."""
+    global _registry, _registry_stamp
+    with _registry_lock:
+        if _stamp(REGISTRY_PATH) is None and any(
+                os.path.exists(os.path.join(HERE, name)) for name in LEGACY_FILES.values()):
+            imported = import_legacy()
+            if imported:
+                print(f"📦 Imported {len(imported)} legacy deployment file(s) into {REGISTRY_PATH}")
+        stamp = _stamp(REGISTRY_PATH)
+        if _registry is None or stamp != _registry_stamp:
+            _registry = load_registry()
+            _registry_stamp = stamp
+        return _registry
+
+
+def verify(kind=None, algod_client=None):
+    """Compare recorded program hashes with the programs on chain"""
+    if algod_client is None:
+        from algod_client import get_algod_client
+        algod_client = get_algod_client()
+    for record in get_registry().find(kind):
+        if record['type'] == "token":
+            continue
+        name = f"{record['type']} {record['appId']}" + (f" ({record['tag']})" if record.get('tag') else "")
+        if not record.get('approvalHash'):
+            print(f"⚪ {name}: no program hash recorded")
+            continue
+        try:
+            params = algod_client.application_info(record['appId'])['params']
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+            continue
+        matches = (program_hash(base64.b64decode(params['approval-program'])) == record['approvalHash']
+                   and program_hash(base64.b64decode(params['clear-state-program'])) == record.get('clearHash'))
+        print(f"{'✅' if matches else '❌'} {name}: {'programs match' if matches else 'programs differ from the recorded hashes'}")
+
+
+def bench(count=5000):
+    """Load and lookups for a registry of count vaults, plus one more deploy"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "deployments.json")
+        records = [{"appId": 1000 + i, "appAddress": "A" * 58, "goal": 10_000_000, "receiver": "B" * 58,
+                    "type": "vault", "network": NETWORK, "tag": f"trip-{i % 500:03d}",
+                    "approvalHash": program_hash(str(i).encode()), "clearHash": program_hash(b"clear")}
+                   for i in range(count)]
+        _write_records(records, path)
+        print(f"📦 {count} deployments: {os.path.getsize(path) / 1e6:.1f} MB")
+
+        started = time.perf_counter()
+        registry = load_registry(path)
+        print(f"   Cold load: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        started = time.perf_counter()
+        for i in range(1000):
+            registry.get(1000 + i * count // 1000)
+            registry.latest("vault", tag=f"trip-{i % 500:03d}")
+        print(f"   Lookups: {(time.perf_counter() - started) / 2000 * 1e6:.1f} µs each (id, tag)")
+
+        started = time.perf_counter()
+        listed = registry.find("vault")
+        print(f"   List all vaults: {(time.perf_counter() - started) * 1000:.2f} ms ({len(listed)} records)")
+
+        started = time.perf_counter()
+        record_deployment("vault", {"appId": 1000 + count}, approval=b"approval", clear=b"clear", path=path)
+        print(f"   Register one more: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+def _print_record(record):
+    ident = f"APP_ID {record['appId']}" if record.get('appId') else f"Asset {record['assetId']}"
+    tag = f" [{record['tag']}]" if record.get('tag') else ""
+    print(f"   {LABELS.get(record['type'], record['type'])}{tag}: {ident} ({record.get('network')}, "
+          f"{record.get('deployedAt', '?')[:19]})")
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "list":
+        kind = args[1] if len(args) > 1 else None
+        tag = args[2] if len(args) > 2 else None
+        if kind is not None and kind not in TYPES:
+            print(f"❌ Unknown type {kind} (one of {', '.join(TYPES)})")
+            return
+        records = get_registry().find(kind, tag=tag)
+        print(f"📦 Deployments on {NETWORK}: {len(records)}")
+        for record in records:
+            _print_record(record)
+    elif len(args) == 2 and args[0] == "show":
+        record = get_registry().get(int(args[1]))
+        if record is None:
+            print(f"❌ No deployment with id {args[1]}")
+            return
+        print(json.dumps(record, indent=2))
+    elif args and args[0] == "import":
+        imported = import_legacy()
+        print(f"📦 Imported {len(imported)} legacy deployment file(s) into {REGISTRY_PATH}")
+        for record in imported:
+            _print_record(record)
+    elif args and args[0] == "verify":
+        verify(args[1] if len(args) > 1 else None)
+    elif args and args[0] == "bench":
+        bench(int(args[1]) if len(args) > 1 else 5000)
+    else:
+        print("💡 Usage:")
+        print("  python deployments.py list [type] [tag]")
+        print("  python deployments.py show <app_or_asset_id>")
+        print("  python deployments.py import")
+        print("  python deployments.py verify [type]")
+        print("  python deployments.py bench [count]")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,15 @@ Echo Contract - Automatically bounces ALGO back to sender
 Perfect for testing and demos
 """
 
-import json
 import os
-import base64
-from algosdk.v2client import algod
 from algosdk import transaction, logic
 from algosdk.transaction import ApplicationCreateTxn, OnComplete
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import record_deployment
+from teal_compiler import compile_teal
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 def get_echo_contract_teal():
     """Generate echo contract TEAL code"""
     approval_teal = """#pragma version 8
@@ -130,11 +127,6 @@ return
     
     return approval_teal, clear_teal
 
-def compile_teal(algod_client, teal_source):
-    """Compile TEAL source code"""
-    compile_response = algod_client.compile(teal_source)
-    return base64.b64decode(compile_response['result'])
-
 def deploy_echo_contract():
     """Deploy echo contract"""
     print("🔄 Deploy Echo Contract")
@@ -149,7 +141,7 @@ def deploy_echo_contract():
     print(f"Deploying echo contract with: {creator['addr']}")
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get TEAL code
     approval_teal, clear_teal = get_echo_contract_teal()
@@ -186,7 +178,7 @@ def deploy_echo_contract():
     print(f"Sent app create tx: {tx_id}")
     
     # Wait for confirmation
-    confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
     app_id = confirmed_txn["application-index"]
     
     if not app_id:
@@ -216,23 +208,20 @@ def deploy_echo_contract():
         
         signed_fund = fund_txn.sign(creator['sk'])
         fund_tx_id = algod_client.send_transaction(signed_fund)
-        transaction.wait_for_confirmation(algod_client, fund_tx_id, 4)
+        wait_for_confirmation(algod_client, fund_tx_id, 4)
         print(f"✅ Funded contract with {amount} ALGO")
     
     # Save deployment info
     deployment_info = {
         "appId": app_id,
         "appAddress": app_addr,
-        "network": "testnet",
+        "createdRound": confirmed_txn["confirmed-round"],
         "deployedBy": creator['name'],
-        "type": "echo_contract",
         "description": "Bounces ALGO back to sender"
     }
     
-    with open("echo_contract_deployment.json", 'w') as f:
-        json.dump(deployment_info, f, indent=2)
-    
-    print(f"Wrote echo_contract_deployment.json")
+    record = record_deployment("echo", deployment_info, approval_prog, clear_prog)
+    print("Recorded in deployments.json" + (f" (tag: {record['tag']})" if record['tag'] else ""))
     print(f"\n🎯 How to Test:")
     print(f"1. Send ALGO to: {app_addr}")
     print(f"2. Use: python echo_interact.py")
@@ -3,25 +3,20 @@
 Interact with Echo Contract - Test automatic ALGO bounce-back
 """
 
-import json
-import os
-from algosdk.v2client import algod
 from algosdk import transaction
+from algod_client import get_algod_client
+from app_state import get_state_reader
+from confirmations import wait_for_confirmation
+from deployments import load_deployment
+from params_cache import get_suggested_params
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 def load_echo_deployment():
     """Load echo deployment info"""
-    if not os.path.exists("echo_contract_deployment.json"):
-        print("❌ No echo_contract_deployment.json found")
+    info = load_deployment("echo")
+    if not info:
         print("Deploy echo contract first: python echo_contract.py")
-        return None
-    
-    with open("echo_contract_deployment.json", 'r') as f:
-        return json.load(f)
+    return info
 
 def test_echo():
     """Test echo functionality - send ALGO and get it back"""
@@ -48,7 +43,7 @@ def test_echo():
     print(f"   Fee: 0.001 ALGO")
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Check balance before
     try:
@@ -60,7 +55,7 @@ def test_echo():
         return
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create payment transaction
     pay_txn = transaction.PaymentTxn(
@@ -92,7 +87,7 @@ def test_echo():
         
         # Wait for confirmation
         print("⏳ Waiting for echo...")
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         
         # Check balance after
         after_info = algod_client.account_info(tester['addr'])
@@ -123,13 +118,14 @@ def check_echo_stats():
     print(f"   APP_ID: {echo_info['appId']}")
     print(f"   Address: {echo_info['appAddress']}")
     
-    # Check contract balance
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    # Check contract balance and counters
+    reader = get_state_reader()
     try:
-        account_info = algod_client.account_info(echo_info['appAddress'])
-        balance = account_info['amount'] / 1_000_000
+        balance = reader.balance(echo_info['appAddress']) / 1_000_000
+        state = reader.global_state(echo_info['appId'], "echo")
         
         print(f"   Contract Balance: {balance} ALGO")
+        print(f"   Echoes: {state['echo_count']} ({state['total_echoed']/1_000_000} ALGO bounced back)")
         print(f"   Status: {'✅ Ready' if balance > 0.1 else '⚠️ Low balance'}")
         
         print(f"   Explorer: https://testnet.algoexplorer.io/address/{echo_info['appAddress']}")
@@ -157,10 +153,10 @@ def fund_echo_contract():
     amount_micro = int(amount_algo * 1_000_000)
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create funding transaction
     fund_txn = transaction.PaymentTxn(
@@ -179,7 +175,7 @@ def fund_echo_contract():
         print(f"Sent funding tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ Funded echo contract with {amount_algo} ALGO")
         
     except Exception as e:
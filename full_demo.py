@@ -4,20 +4,15 @@ OGC Complete Ecosystem Demo
 Showcases all features: Token, Vault, Governance, Echo
 """
 
-import json
-import os
 import time
-from algosdk.v2client import algod
 from algosdk import transaction, logic
+from algod_client import get_algod_client
+from deployments import get_registry
 from wallet_selector import load_wallets
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 class OGCDemo:
     def __init__(self):
-        self.algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+        self.algod_client = get_algod_client()
         self.wallets = load_wallets()
         self.demo_results = {}
         
@@ -57,9 +52,8 @@ class OGCDemo:
             print("   Decimals: 6")
             
             # Check if token already exists
-            if os.path.exists("ogc_token_info.json"):
-                with open("ogc_token_info.json", 'r') as f:
-                    token_info = json.load(f)
+            token_info = get_registry().latest("token")
+            if token_info:
                 print(f"✅ OGC Token Found: Asset ID {token_info['assetId']}")
                 self.demo_results['token'] = token_info
             else:
@@ -82,9 +76,8 @@ class OGCDemo:
             print("📅 Deadline: 24 hours from now")
             
             # Check if vault exists
-            if os.path.exists("advanced_vault_deployment.json"):
-                with open("advanced_vault_deployment.json", 'r') as f:
-                    vault_info = json.load(f)
+            vault_info = get_registry().latest("vault")
+            if vault_info:
                 print(f"✅ Vault Found: APP_ID {vault_info['appId']}")
                 
                 # Simulate contributions
@@ -129,9 +122,8 @@ class OGCDemo:
         try:
             self.print_step("Setting up governance contract...")
             
-            if os.path.exists("governance_sender_deployment.json"):
-                with open("governance_sender_deployment.json", 'r') as f:
-                    gov_info = json.load(f)
+            gov_info = get_registry().latest("governance")
+            if gov_info:
                 print(f"✅ Governance Contract: APP_ID {gov_info['appId']}")
                 
                 # Simulate governance flow
@@ -188,9 +180,8 @@ class OGCDemo:
         try:
             self.print_step("Testing echo contract...")
             
-            if os.path.exists("echo_contract_deployment.json"):
-                with open("echo_contract_deployment.json", 'r') as f:
-                    echo_info = json.load(f)
+            echo_info = get_registry().latest("echo")
+            if echo_info:
                 print(f"✅ Echo Contract: APP_ID {echo_info['appId']}")
                 
                 # Simulate echo test
@@ -294,5 +285,4 @@ def main():
         print(f"\n\n❌ Demo failed: {e}")
 
 if __name__ == "__main__":
-    import os
     main()
\ No newline at end of file
@@ -3,75 +3,39 @@
 Interact with Governance Sender Contract
 """
 
-import json
-import os
-from algosdk.v2client import algod
+import base64
+import time
 from algosdk import transaction, encoding
+from algod_client import get_algod_client
+from app_state import get_state_reader, read_global_state
+from bulk_submit import print_report, submit_pipelined
+from confirmations import wait_for_confirmation
+from deployments import load_deployment, warn_outdated
+from governance_sender import CONTRACT_VERSION, MAX_PAYOUTS, MEMBER_RECORD_SIZE, PAYOUTS_PER_CALL
+from params_cache import get_suggested_params
+from roster import join_box_refs, join_cost, join_shortfall, member_box_name
+from payouts import PAYOUT_ENTRY_SIZE, decode_payouts, encode_payouts, load_payouts_csv, payout_calls
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
+BOX_REF_SIZE = 1024  # box bytes each box reference lets a group read or write
 
 def load_governance_deployment():
     """Load governance deployment info"""
-    if not os.path.exists("governance_sender_deployment.json"):
-        print("❌ No governance_sender_deployment.json found")
+    info = load_deployment("governance")
+    if not info:
         print("Deploy governance contract first: python governance_sender.py")
-        return None
-    
-    with open("governance_sender_deployment.json", 'r') as f:
-        return json.load(f)
+    else:
+        warn_outdated(info, CONTRACT_VERSION)
+    return info
 
-def opt_in_contributor():
-    """Opt into governance contract as contributor"""
+def contribute_to_governance(opt_in=False):
+    """Contribute ALGO to governance contract; with opt_in the contribute call is
+    also the OptIn, so a member keeping local state joins in one group"""
     gov_info = load_governance_deployment()
     if not gov_info:
         return
     
-    print("🔗 Opt into Governance Contract")
-    print(f"   APP_ID: {gov_info['appId']}")
-    
-    # Select wallet
-    contributor = select_wallet()
-    if not contributor:
-        return
-    
-    # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
-    
-    # Get suggested parameters
-    sp = algod_client.suggested_params()
-    
-    # Create opt-in transaction
-    txn = transaction.ApplicationOptInTxn(
-        sender=contributor['addr'],
-        sp=sp,
-        index=gov_info['appId']
-    )
-    
-    # Sign transaction
-    signed_txn = txn.sign(contributor['sk'])
-    
-    try:
-        # Send transaction
-        tx_id = algod_client.send_transaction(signed_txn)
-        print(f"Sent opt-in tx: {tx_id}")
-        
-        # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
-        print(f"✅ {contributor['name']} opted into governance contract!")
-        
-    except Exception as e:
-        print(f"❌ Opt-in failed: {e}")
-
-def contribute_to_governance():
-    """Contribute ALGO to governance contract"""
-    gov_info = load_governance_deployment()
-    if not gov_info:
-        return
-    
-    print("💰 Contribute to Governance Contract")
+    print("🔗 Opt in and contribute (one group)" if opt_in else "💰 Contribute to Governance Contract")
     print(f"   APP_ID: {gov_info['appId']}")
     
     # Select wallet
@@ -84,10 +48,10 @@ def contribute_to_governance():
     amount_micro = int(amount_algo * 1_000_000)
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create payment transaction
     pay_txn = transaction.PaymentTxn(
@@ -97,12 +61,34 @@ def contribute_to_governance():
         amt=amount_micro
     )
     
+    # A first contribution writes the member record and roster page, and
+    # must cover the minimum balance they add to the app
+    try:
+        next_slot = read_global_state(algod_client, gov_info['appId']).get('total_contributors', 0)
+        shortfall = 0
+        if amount_micro < join_cost(next_slot, MEMBER_RECORD_SIZE):
+            member = get_state_reader(algod_client).member(gov_info['appId'], "governance", contributor['addr'])
+            if not member or not member['contributed']:
+                box_member = not opt_in and (member is None or member['storage'] == "box")
+                shortfall = join_shortfall(algod_client, gov_info['appAddress'], next_slot, amount_micro,
+                                           MEMBER_RECORD_SIZE if box_member else 0)
+    except Exception as e:
+        print(f"❌ Could not read contract state: {e}")
+        return
+    if shortfall:
+        print(f"❌ A first contribution must cover the app's added minimum balance: "
+              f"contribute at least {(amount_micro + shortfall) / 1_000_000} ALGO")
+        return
+    
     # Create app call transaction
-    app_call_txn = transaction.ApplicationNoOpTxn(
+    app_call_txn = transaction.ApplicationCallTxn(
         sender=contributor['addr'],
         sp=sp,
         index=gov_info['appId'],
-        app_args=[b"contribute"]
+        on_complete=transaction.OnComplete.OptInOC if opt_in else transaction.OnComplete.NoOpOC,
+        app_args=[b"contribute"],
+        boxes=[(gov_info['appId'], member_box_name(contributor['addr']))]
+              + join_box_refs(gov_info['appId'], next_slot)
     )
     
     # Group transactions
@@ -118,7 +104,7 @@ def contribute_to_governance():
         print(f"Sent contribution tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ {contributor['name']} contributed {amount_algo} ALGO!")
         
     except Exception as e:
@@ -167,10 +153,10 @@ def propose_send():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create proposal transaction
     app_args = [
@@ -195,13 +181,97 @@ def propose_send():
         print(f"Sent proposal tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ Proposal created!")
         print(f"   Contributors can now vote")
         
     except Exception as e:
         print(f"❌ Proposal failed: {e}")
 
+def read_proposal_payouts(algod_client, app_id):
+    """Recipient/amount list of the active batch proposal"""
+    box = algod_client.application_box_by_name(app_id, b"payouts")
+    return decode_payouts(base64.b64decode(box['value']))
+
+def _payouts_box_refs(app_id, payout_count):
+    refs = -(-payout_count * PAYOUT_ENTRY_SIZE // BOX_REF_SIZE)
+    return [(app_id, b"payouts")] * refs
+
+def build_batch_proposal(sp, app_id, owner, payouts):
+    """propose_batch call storing the payout list in the "payouts" box"""
+    if not 1 <= len(payouts) <= MAX_PAYOUTS:
+        raise ValueError(f"a batch proposal holds 1-{MAX_PAYOUTS} payouts")
+    return transaction.ApplicationNoOpTxn(
+        sender=owner, sp=sp, index=app_id,
+        app_args=[b"propose_batch", encode_payouts(payouts)],
+        boxes=_payouts_box_refs(app_id, len(payouts))
+    )
+
+def build_execute_group(sp, app_id, executor, payouts):
+    """execute_send calls (PAYOUTS_PER_CALL payouts each) plus their ref_accounts calls,
+    as one unsigned atomic group that pays the whole list"""
+    txns = []
+    for start in range(0, len(payouts), PAYOUTS_PER_CALL):
+        txns += payout_calls(sp, app_id, executor, payouts[start:start + PAYOUTS_PER_CALL],
+                             [b"execute_send"], boxes=[(app_id, b"payouts")])
+    if len(txns) > 1:
+        transaction.assign_group_id(txns)
+    return txns
+
+def propose_batch_send():
+    """Propose paying a list of recipients (owner only)"""
+    gov_info = load_governance_deployment()
+    if not gov_info:
+        return
+    
+    print("📝 Propose Batch Payout")
+    print(f"   APP_ID: {gov_info['appId']}")
+    print(f"   CSV rows: address,amount_algo (up to {MAX_PAYOUTS})")
+    
+    # Select wallet (must be owner)
+    proposer = select_wallet()
+    if not proposer:
+        return
+    
+    if proposer['addr'] != gov_info['owner']:
+        print("❌ Only owner can propose sends")
+        print(f"   Owner: {gov_info['owner']}")
+        print(f"   You: {proposer['addr']}")
+        return
+    
+    path = input("Payouts CSV path: ").strip()
+    try:
+        payouts = load_payouts_csv(path)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"❌ Could not read payouts: {e}")
+        return
+    
+    print("\n📋 Proposal:")
+    for address, amount in payouts:
+        print(f"   {address}: {amount/1_000_000} ALGO")
+    print(f"   Total: {sum(a for _, a in payouts)/1_000_000} ALGO to {len(payouts)} recipient(s)")
+    print("   Requires 75% contributor approval")
+    
+    confirm = input("Create proposal? (y/N): ").strip().lower()
+    if confirm != 'y':
+        print("Cancelled")
+        return
+    
+    algod_client = get_algod_client()
+    sp = get_suggested_params(algod_client)
+    
+    try:
+        signed_call = build_batch_proposal(sp, gov_info['appId'], proposer['addr'], payouts).sign(proposer['sk'])
+        tx_id = algod_client.send_transaction(signed_call)
+        print(f"Sent proposal tx: {tx_id}")
+        
+        wait_for_confirmation(algod_client, tx_id, 4)
+        print("✅ Batch proposal created!")
+        print("   Contributors can now vote")
+        
+    except Exception as e:
+        print(f"❌ Proposal failed: {e}")
+
 def vote_on_proposal():
     """Vote on active proposal (contributors only)"""
     gov_info = load_governance_deployment()
@@ -219,17 +289,18 @@ def vote_on_proposal():
     print(f"Voting as: {voter['name']}")
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create vote transaction
     app_call_txn = transaction.ApplicationNoOpTxn(
         sender=voter['addr'],
         sp=sp,
         index=gov_info['appId'],
-        app_args=[b"vote"]
+        app_args=[b"vote"],
+        boxes=[(gov_info['appId'], member_box_name(voter['addr']))]
     )
     
     # Sign transaction
@@ -241,7 +312,7 @@ def vote_on_proposal():
         print(f"Sent vote tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ {voter['name']} voted YES!")
         
     except Exception as e:
@@ -266,10 +337,19 @@ def execute_proposal():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
+    
+    try:
+        state = read_global_state(algod_client, gov_info['appId'])
+    except Exception as e:
+        print(f"❌ Could not read contract state: {e}")
+        return
+    if state.get('payout_count'):
+        execute_batch_proposal(algod_client, sp, gov_info, executor, state)
+        return
     
     # Create execute transaction
     app_call_txn = transaction.ApplicationNoOpTxn(
@@ -288,7 +368,7 @@ def execute_proposal():
         print(f"Sent execute tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ Proposal executed!")
         print(f"   ALGO sent to recipient")
         
@@ -297,6 +377,47 @@ def execute_proposal():
         if "75%" in str(e).lower() or "approval" in str(e).lower():
             print("   Need 75% contributor approval")
 
+def execute_batch_proposal(algod_client, sp, gov_info, executor, state):
+    """Pay the remaining batch payouts in one atomic group"""
+    payouts = read_proposal_payouts(algod_client, gov_info['appId'])[state.get('payout_cursor', 0):]
+    group = build_execute_group(sp, gov_info['appId'], executor['addr'], payouts)
+    print(f"   Paying {len(payouts)} recipient(s) in {len(group)} transaction(s)")
+    
+    start = time.perf_counter()
+    outcome = submit_pipelined(algod_client, [[txn.sign(executor['sk']) for txn in group]])
+    print_report("Batch execution", outcome, time.perf_counter() - start)
+    if outcome[0]['ok']:
+        print("✅ Proposal executed!")
+        print(f"   ALGO sent to {len(payouts)} recipient(s)")
+    else:
+        print(f"❌ Execution failed: {outcome[0]['error']}")
+
+def read_member(algod_client, app_id, address):
+    """Member record (contributed, voted, slot, storage) from the member box or local state, or None"""
+    return get_state_reader(algod_client).member(app_id, "governance", address)
+
+def list_members():
+    """List every contributor from the on-chain roster"""
+    gov_info = load_governance_deployment()
+    if not gov_info:
+        return
+    
+    reader = get_state_reader()
+    try:
+        state = reader.global_state(gov_info['appId'], "governance")
+        members = reader.members(gov_info['appId'], "governance")
+    except Exception as e:
+        print(f"❌ Could not read roster: {e}")
+        return
+    
+    print(f"👥 Members ({len(members)})")
+    for slot, (address, member) in enumerate(members.items()):
+        if member is None:
+            print(f"   #{slot} {address}: no member record")
+            continue
+        voted = "✅ voted" if member['voted'] == state['proposal_id'] else ""
+        print(f"   #{slot} {address}: {member['contributed']/1_000_000} ALGO ({member['storage']}) {voted}")
+
 def check_governance_status():
     """Check governance contract status"""
     gov_info = load_governance_deployment()
@@ -309,12 +430,25 @@ def check_governance_status():
     print(f"   Owner: {gov_info['owner']}")
     print(f"   Governance: {gov_info['governance']}")
     
-    # Check balance
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    # Check balance and state
+    reader = get_state_reader()
     try:
-        account_info = algod_client.account_info(gov_info['appAddress'])
-        balance = account_info['amount'] / 1_000_000
+        balance = reader.balance(gov_info['appAddress']) / 1_000_000
+        state = reader.global_state(gov_info['appId'], "governance")
         print(f"   Balance: {balance} ALGO")
+        print(f"   Contributors: {state['total_contributors']}")
+        print(f"   Total sent: {state['total_sent']/1_000_000} ALGO")
+        
+        if state['active_proposal']:
+            quorum = -(-state['total_contributors'] * 3 // 4)
+            print(f"   Proposal #{state['proposal_id']}: {state['proposal_votes']}/{quorum} votes needed")
+            if state['payout_count']:
+                print(f"     Batch: {state['payout_count']} recipient(s), "
+                      f"{state['payout_cursor']} paid, {state['proposal_amount']/1_000_000} ALGO")
+            else:
+                print(f"     {state['proposal_amount']/1_000_000} ALGO to {state['proposal_recipient']}")
+        else:
+            print(f"   No active proposal (last: #{state['proposal_id']})")
         
         print(f"   Explorer: https://testnet.algoexplorer.io/address/{gov_info['appAddress']}")
         
@@ -325,29 +459,35 @@ def main():
     """Main governance interaction menu"""
     while True:
         print("\n🗳️  Governance Sender Interaction")
-        print("1. Opt in as contributor")
+        print("1. Opt in and contribute (one group)")
         print("2. Contribute ALGO")
         print("3. Propose send (owner only)")
-        print("4. Vote on proposal")
-        print("5. Execute approved proposal")
-        print("6. Check contract status")
-        print("7. Exit")
+        print("4. Propose batch payout from CSV (owner only)")
+        print("5. Vote on proposal")
+        print("6. Execute approved proposal")
+        print("7. Check contract status")
+        print("8. List members")
+        print("9. Exit")
         
-        choice = input("Choose (1-7): ").strip()
+        choice = input("Choose (1-9): ").strip()
         
         if choice == "1":
-            opt_in_contributor()
+            contribute_to_governance(opt_in=True)
         elif choice == "2":
             contribute_to_governance()
         elif choice == "3":
             propose_send()
         elif choice == "4":
-            vote_on_proposal()
+            propose_batch_send()
         elif choice == "5":
-            execute_proposal()
+            vote_on_proposal()
         elif choice == "6":
-            check_governance_status()
+            execute_proposal()
         elif choice == "7":
+            check_governance_status()
+        elif choice == "8":
+            list_members()
+        elif choice == "9":
             break
         else:
             print("❌ Invalid choice")
@@ -3,25 +3,47 @@
 Governance Sender Contract - Requires 75% contributor approval before sending
 """
 
-import json
 import os
-import base64
-from algosdk.v2client import algod
 from algosdk import transaction, logic
 from algosdk.transaction import ApplicationCreateTxn, OnComplete
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import record_deployment
+from roster import APP_FUNDING
+from teal_compiler import compile_teal
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
+# State schema
+GLOBAL_INTS = 9  # total_contributors, total_sent, active_proposal, proposal_votes, proposal_amount,
+                 # payout_count, payout_cursor, proposal_id, box_proposal_id
+GLOBAL_BYTES = 2  # owner, proposal_recipient
+LOCAL_INTS = 3  # contributed, voted (id of the last proposal voted on), slot
+LOCAL_BYTES = 0
+MAX_PAYOUTS = 32  # recipients per batch proposal (40 bytes each in the "payouts" box)
+PAYOUTS_PER_CALL = 16  # inner payments one execute_send call makes
+MAX_MEMBERS = 1024  # contributor slots; each proposal box has a 128-byte vote bitmap
+PROPOSAL_HEADER_SIZE = 160  # votes, payout_count, payout_cursor, total, bitmap
+PROPOSAL_BOX_REFS = 2  # box references covering the largest proposal box (160 + 32 * 40 bytes)
+MEMBER_RECORD_SIZE = 24  # contributed, voted, slot in a box member's record
+CONTRACT_VERSION = 3  # recorded with each deployment; see "Contract versions" in README.md
+
+
+def proposal_box_name(proposal_id):
+    """Box holding concurrent proposal proposal_id"""
+    return b"p" + proposal_id.to_bytes(8, 'big')
+
 
 def get_governance_sender_teal():
     """Generate governance sender contract TEAL code"""
-    approval_teal = """#pragma version 8
+    approval_teal = """#pragma version 9
 
 // Governance Sender Contract
 // Global state: owner, total_contributors, total_sent
-// Local state: contributed_amount, voted_for_proposal
+// Local state: contributed_amount, voted (id of the last proposal voted on), slot
+// Box <member address>: the same record for members who did not opt in
+// Box "r" + page: roster, member addresses in slot order (32 per page)
+// Box "payouts": recipient (32) + amount (8) per entry of a batch proposal
+// Box "p" + id: one concurrently open proposal (open_proposal/vote_proposal/execute_proposal)
 
 txn ApplicationID
 int 0
@@ -62,10 +84,34 @@ create_app:
     int 0
     app_global_put
     
+    byte "payout_count"
+    int 0
+    app_global_put
+    
+    byte "payout_cursor"
+    int 0
+    app_global_put
+    
+    byte "proposal_id"
+    int 0
+    app_global_put
+    
+    byte "box_proposal_id"
+    int 0
+    app_global_put
+    
     int 1
     return
 
 opt_in:
+    // Box members keep their record in the box - no second membership
+    txn Sender
+    box_len
+    swap
+    pop
+    !
+    assert
+    
     // Initialize local state for new contributor
     txn Sender
     byte "contributed"
@@ -77,6 +123,17 @@ opt_in:
     int 0
     app_local_put
     
+    // The OptIn may carry the first contribution: [pay, OptIn("contribute")]
+    txn NumAppArgs
+    bz opt_in_done
+    
+    txn ApplicationArgs 0
+    byte "contribute"
+    ==
+    assert
+    b contribute
+
+opt_in_done:
     int 1
     return
 
@@ -92,6 +149,11 @@ handle_noop:
     ==
     bnz propose_send
     
+    txn ApplicationArgs 0
+    byte "propose_batch"
+    ==
+    bnz propose_batch
+    
     txn ApplicationArgs 0
     byte "vote"
     ==
@@ -102,44 +164,131 @@ handle_noop:
     ==
     bnz execute_send
     
+    txn ApplicationArgs 0
+    byte "open_proposal"
+    ==
+    bnz open_proposal
+    
+    txn ApplicationArgs 0
+    byte "vote_proposal"
+    ==
+    bnz vote_proposal
+    
+    txn ApplicationArgs 0
+    byte "execute_proposal"
+    ==
+    bnz execute_proposal
+    
+    txn ApplicationArgs 0
+    byte "cancel_proposal"
+    ==
+    bnz cancel_proposal
+    
+    // Carries extra foreign accounts for execute_send/execute_proposal in the same group
+    txn ApplicationArgs 0
+    byte "ref_accounts"
+    ==
+    bnz execute_done
+    
     int 0
     return
 
 contribute:
+    // The payment is the transaction just before this call, so a group
+    // can carry several [pay, contribute] pairs
+    txn GroupIndex
+    int 1
+    -
+    store 0
+    
     // Verify payment transaction in group
-    gtxn 0 TypeEnum
+    load 0
+    gtxns TypeEnum
     int pay
     ==
     assert
     
-    gtxn 0 Receiver
+    load 0
+    gtxns Receiver
     global CurrentApplicationAddress
     ==
     assert
     
-    gtxn 0 Amount
+    load 0
+    gtxns Amount
     int 0
     >
     assert
     
+    load 0
+    gtxns Sender
+    txn Sender
+    ==
+    assert
+    
     // Check if first contribution from this user
     byte "contributed"
-    app_local_get
+    int 0
+    callsub member_get
     int 0
     ==
     bnz first_contribution
     
     // Update existing contribution
     byte "contributed"
+    int 0
     byte "contributed"
-    app_local_get
-    gtxn 0 Amount
+    int 0
+    callsub member_get
+    load 0
+    gtxns Amount
     +
-    app_local_put
+    callsub member_put
     
     b contribution_done
 
 first_contribution:
+    // Member slot = join order, indexes the proposal vote bitmaps
+    byte "total_contributors"
+    app_global_get
+    int 1024
+    <
+    assert
+    
+    byte "slot"
+    int 16
+    byte "total_contributors"
+    app_global_get
+    callsub member_put
+    
+    // Dense roster: the address goes at slot % 32 of page box "r" + slot / 32.
+    // Slots fill in order, so it is always the page's next entry: the page is
+    // rewritten one entry longer (v9 has no box_resize) and its minimum
+    // balance grows with the members instead of a full 1 KB up front
+    byte "r"
+    byte "total_contributors"
+    app_global_get
+    int 32
+    /
+    itob
+    concat
+    store 13
+    
+    load 13
+    box_get
+    pop
+    txn Sender
+    concat
+    store 14
+    
+    load 13
+    box_del
+    pop
+    
+    load 13
+    load 14
+    box_put
+    
     // First contribution - increment contributor count
     byte "total_contributors"
     byte "total_contributors"
@@ -150,8 +299,10 @@ first_contribution:
     
     // Set contribution amount
     byte "contributed"
-    gtxn 0 Amount
-    app_local_put
+    int 0
+    load 0
+    gtxns Amount
+    callsub member_put
 
 contribution_done:
     int 1
@@ -186,6 +337,68 @@ propose_send:
     int 0
     app_global_put
     
+    // A new proposal id makes every earlier vote stale - no per-member reset
+    byte "proposal_id"
+    byte "proposal_id"
+    app_global_get
+    int 1
+    +
+    app_global_put
+    
+    byte "active_proposal"
+    int 1
+    app_global_put
+    
+    int 1
+    return
+
+propose_batch:
+    // Only owner can propose
+    txn Sender
+    byte "owner"
+    app_global_get
+    ==
+    assert
+    
+    // Check no active proposal
+    byte "active_proposal"
+    app_global_get
+    int 0
+    ==
+    assert
+    
+    // Validate args[1]: scratch 0 = payout count, 2 = total amount
+    callsub check_payouts
+    
+    // Keep the list in a box until it has been paid out
+    byte "payouts"
+    txn ApplicationArgs 1
+    box_put
+    
+    byte "payout_count"
+    load 0
+    app_global_put
+    
+    byte "payout_cursor"
+    int 0
+    app_global_put
+    
+    byte "proposal_amount"
+    load 2
+    app_global_put
+    
+    byte "proposal_votes"
+    int 0
+    app_global_put
+    
+    // A new proposal id makes every earlier vote stale - no per-member reset
+    byte "proposal_id"
+    byte "proposal_id"
+    app_global_get
+    int 1
+    +
+    app_global_put
+    
     byte "active_proposal"
     int 1
     app_global_put
@@ -203,22 +416,27 @@ vote:
     
     // Check user is a contributor
     byte "contributed"
-    app_local_get
+    int 0
+    callsub member_get
     int 0
     >
     assert
     
-    // Check user hasn't voted yet
+    // Check user hasn't voted on this proposal yet
     byte "voted"
-    app_local_get
-    int 0
-    ==
+    int 8
+    callsub member_get
+    byte "proposal_id"
+    app_global_get
+    !=
     assert
     
     // Record vote
     byte "voted"
-    int 1
-    app_local_put
+    int 8
+    byte "proposal_id"
+    app_global_get
+    callsub member_put
     
     // Increment vote count
     byte "proposal_votes"
@@ -254,6 +472,10 @@ execute_send:
     >=
     assert
     
+    byte "payout_count"
+    app_global_get
+    bnz execute_batch
+    
     // Execute the send
     itxn_begin
     int pay
@@ -265,7 +487,8 @@ execute_send:
     app_global_get
     itxn_field Amount
     itxn_submit
-    
+
+execute_finish:
     // Update total sent
     byte "total_sent"
     byte "total_sent"
@@ -283,23 +506,513 @@ execute_send:
     byte "proposal_votes"
     int 0
     app_global_put
+
+execute_done:
+    int 1
+    return
+
+execute_batch:
+    // Pay the next (up to) 16 payouts from the box; fees are pooled from the outer call
+    byte "payout_cursor"
+    app_global_get
+    dup
+    store 1
+    
+    // end = min(cursor + 16, payout_count)
+    int 16
+    +
+    byte "payout_count"
+    app_global_get
+    dup2
+    >
+    select
+    store 0
+    
+    itxn_begin
+    b execute_batch_fields
+
+execute_batch_next:
+    itxn_next
+
+execute_batch_fields:
+    int pay
+    itxn_field TypeEnum
+    
+    byte "payouts"
+    load 1
+    int 40
+    *
+    int 32
+    box_extract
+    itxn_field Receiver
+    
+    byte "payouts"
+    load 1
+    int 40
+    *
+    int 32
+    +
+    int 8
+    box_extract
+    btoi
+    itxn_field Amount
+    
+    int 0
+    itxn_field Fee
+    
+    load 1
+    int 1
+    +
+    dup
+    store 1
+    load 0
+    <
+    bnz execute_batch_next
+    
+    itxn_submit
+    
+    byte "payout_cursor"
+    load 0
+    app_global_put
+    
+    // More execute_send calls follow until the whole list is paid
+    load 0
+    byte "payout_count"
+    app_global_get
+    <
+    bnz execute_done
+    
+    // All paid: drop the list and close the proposal
+    byte "payouts"
+    box_del
+    pop
+    
+    byte "payout_count"
+    int 0
+    app_global_put
+    
+    byte "payout_cursor"
+    int 0
+    app_global_put
+    
+    b execute_finish
+
+open_proposal:
+    // Only owner can propose
+    txn Sender
+    byte "owner"
+    app_global_get
+    ==
+    assert
+    
+    callsub check_payouts
+    
+    // Next box proposal id. Box proposals keep their own counter: votes on
+    // the global proposal are unique per proposal_id, so bumping that one
+    // while it is open would let every member vote on it again
+    byte "box_proposal_id"
+    byte "box_proposal_id"
+    app_global_get
+    int 1
+    +
+    app_global_put
+    
+    byte "box_proposal_id"
+    app_global_get
+    store 3
+    
+    // Box "p" + id: votes (8) | payout_count (8) | payout_cursor (8) | total (8)
+    //               | vote bitmap (128, bit per member slot) | payouts (40 each)
+    byte "p"
+    load 3
+    itob
+    concat
+    store 4
+    
+    load 4
+    int 160
+    load 0
+    int 40
+    *
+    +
+    box_create
+    assert
+    
+    load 4
+    int 8
+    load 0
+    itob
+    box_replace
+    
+    load 4
+    int 24
+    load 2
+    itob
+    box_replace
+    
+    load 4
+    int 160
+    txn ApplicationArgs 1
+    box_replace
+    
+    // Return the new id to the caller
+    load 3
+    itob
+    log
+    
+    int 1
+    return
+
+vote_proposal:
+    // Check user is a contributor
+    byte "contributed"
+    int 0
+    callsub member_get
+    int 0
+    >
+    assert
+    
+    // args[1] = proposal id (8 bytes)
+    txn ApplicationArgs 1
+    len
+    int 8
+    ==
+    assert
+    
+    byte "p"
+    txn ApplicationArgs 1
+    concat
+    store 4
+    
+    // The member's bit lives in byte 32 + slot / 8 (box_extract fails if
+    // the proposal does not exist or was already executed)
+    byte "slot"
+    int 16
+    callsub member_get
+    store 5
+    
+    load 5
+    int 8
+    /
+    int 32
+    +
+    store 6
+    
+    load 4
+    load 6
+    int 1
+    box_extract
+    store 7
+    
+    // Not voted yet
+    load 7
+    load 5
+    int 8
+    %
+    getbit
+    !
+    assert
+    
+    load 4
+    load 6
+    load 7
+    load 5
+    int 8
+    %
+    int 1
+    setbit
+    box_replace
+    
+    // votes += 1
+    load 4
+    int 0
+    load 4
+    int 0
+    int 8
+    box_extract
+    btoi
+    int 1
+    +
+    itob
+    box_replace
+    
+    int 1
+    return
+
+execute_proposal:
+    // args[1] = proposal id (8 bytes)
+    byte "p"
+    txn ApplicationArgs 1
+    concat
+    store 4
+    
+    // Check 75% approval: votes * 4 >= contributors * 3
+    load 4
+    int 0
+    int 8
+    box_extract
+    btoi
+    int 4
+    *
+    
+    byte "total_contributors"
+    app_global_get
+    int 3
+    *
+    
+    >=
+    assert
+    
+    // i = cursor, end = min(cursor + 16, payout_count)
+    load 4
+    int 16
+    int 8
+    box_extract
+    btoi
+    dup
+    store 1
+    
+    int 16
+    +
+    load 4
+    int 8
+    int 8
+    box_extract
+    btoi
+    dup
+    store 8
+    dup2
+    >
+    select
+    store 0
+    
+    itxn_begin
+    b execute_proposal_fields
+
+execute_proposal_next:
+    itxn_next
+
+execute_proposal_fields:
+    int pay
+    itxn_field TypeEnum
+    
+    load 4
+    load 1
+    int 40
+    *
+    int 160
+    +
+    int 32
+    box_extract
+    itxn_field Receiver
+    
+    load 4
+    load 1
+    int 40
+    *
+    int 192
+    +
+    int 8
+    box_extract
+    btoi
+    itxn_field Amount
+    
+    // Fees are pooled from the outer call
+    int 0
+    itxn_field Fee
+    
+    load 1
+    int 1
+    +
+    dup
+    store 1
+    load 0
+    <
+    bnz execute_proposal_next
+    
+    itxn_submit
+    
+    // All paid?
+    load 0
+    load 8
+    <
+    bz execute_proposal_finish
+    
+    load 4
+    int 16
+    load 0
+    itob
+    box_replace
+    
+    int 1
+    return
+
+execute_proposal_finish:
+    byte "total_sent"
+    byte "total_sent"
+    app_global_get
+    load 4
+    int 24
+    int 8
+    box_extract
+    btoi
+    +
+    app_global_put
+    
+    load 4
+    box_del
+    pop
+    
+    int 1
+    return
+
+cancel_proposal:
+    // Only owner can cancel
+    txn Sender
+    byte "owner"
+    app_global_get
+    ==
+    assert
+    
+    byte "p"
+    txn ApplicationArgs 1
+    concat
+    box_del
+    assert
     
     int 1
     return
+
+// Validates the payout list in args[1] (recipient (32) + amount (8) each,
+// 1..32 entries); leaves the count in scratch 0 and the total in scratch 2
+check_payouts:
+    txn ApplicationArgs 1
+    len
+    int 40
+    /
+    store 0
+    
+    load 0
+    int 0
+    >
+    assert
+    
+    load 0
+    int 32
+    <=
+    assert
+    
+    txn ApplicationArgs 1
+    len
+    load 0
+    int 40
+    *
+    ==
+    assert
+    
+    // Sum the amounts
+    int 0
+    store 1
+    int 0
+    store 2
+
+check_payouts_sum:
+    txn ApplicationArgs 1
+    load 1
+    int 40
+    *
+    int 32
+    +
+    extract_uint64
+    load 2
+    +
+    store 2
+    
+    load 1
+    int 1
+    +
+    dup
+    store 1
+    load 0
+    <
+    bnz check_payouts_sum
+    
+    retsub
+
+// Member data lives in local state for opted-in members, otherwise in the
+// box named by their address: contributed (0..8) | voted (8..16) | slot (16..24)
+// member_get: local key, box offset -> value (0 for non-members)
+member_get:
+    store 11
+    store 10
+    
+    txn Sender
+    global CurrentApplicationID
+    app_opted_in
+    bz member_get_box
+    
+    txn Sender
+    load 10
+    app_local_get
+    retsub
+
+member_get_box:
+    txn Sender
+    box_len
+    bz member_get_missing
+    pop
+    
+    txn Sender
+    load 11
+    int 8
+    box_extract
+    btoi
+    retsub
+
+member_get_missing:
+    pop
+    int 0
+    retsub
+
+// member_put: local key, box offset, value ->
+member_put:
+    store 12
+    store 11
+    store 10
+    
+    txn Sender
+    global CurrentApplicationID
+    app_opted_in
+    bz member_put_box
+    
+    txn Sender
+    load 10
+    load 12
+    app_local_put
+    retsub
+
+member_put_box:
+    // Creates the record on first write (box_create is a no-op afterwards)
+    txn Sender
+    int 24
+    box_create
+    pop
+    
+    txn Sender
+    load 11
+    load 12
+    itob
+    box_replace
+    retsub
 """
 
-    clear_teal = """#pragma version 8
+    clear_teal = """#pragma version 9
 int 1
 return
 """
     
     return approval_teal, clear_teal
 
-def compile_teal(algod_client, teal_source):
-    """Compile TEAL source code"""
-    compile_response = algod_client.compile(teal_source)
-    return base64.b64decode(compile_response['result'])
-
 def deploy_governance_sender():
     """Deploy governance sender contract"""
     print("🗳️  Deploy Governance Sender Contract")
@@ -314,7 +1027,7 @@ def deploy_governance_sender():
     print(f"Deploying governance contract with owner: {creator['addr']}")
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get TEAL code
     approval_teal, clear_teal = get_governance_sender_teal()
@@ -323,12 +1036,6 @@ def deploy_governance_sender():
     approval_prog = compile_teal(algod_client, approval_teal)
     clear_prog = compile_teal(algod_client, clear_teal)
     
-    # Schema: global and local state
-    local_ints = 2  # contributed, voted
-    local_bytes = 0
-    global_ints = 4  # total_contributors, total_sent, active_proposal, proposal_votes, proposal_amount
-    global_bytes = 2  # owner, proposal_recipient
-    
     # Get suggested parameters
     sp = algod_client.suggested_params()
     
@@ -339,8 +1046,8 @@ def deploy_governance_sender():
         on_complete=OnComplete.NoOpOC,
         approval_program=approval_prog,
         clear_program=clear_prog,
-        global_schema=transaction.StateSchema(global_ints, global_bytes),
-        local_schema=transaction.StateSchema(local_ints, local_bytes)
+        global_schema=transaction.StateSchema(GLOBAL_INTS, GLOBAL_BYTES),
+        local_schema=transaction.StateSchema(LOCAL_INTS, LOCAL_BYTES)
     )
     
     # Sign transaction
@@ -351,7 +1058,7 @@ def deploy_governance_sender():
     print(f"Sent app create tx: {tx_id}")
     
     # Wait for confirmation
-    confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
     app_id = confirmed_txn["application-index"]
     
     if not app_id:
@@ -360,6 +1067,13 @@ def deploy_governance_sender():
     # Get app address
     app_addr = logic.get_application_address(app_id)
     
+    # Fund the app account's own minimum balance; each member's first
+    # contribution/deposit pays for the roster boxes they add (roster.py)
+    fund_txn = transaction.PaymentTxn(creator['addr'], sp, app_addr, APP_FUNDING)
+    fund_tx_id = algod_client.send_transaction(fund_txn.sign(creator['sk']))
+    wait_for_confirmation(algod_client, fund_tx_id, 4)
+    print(f"Funded app account with {APP_FUNDING / 1_000_000} ALGO (its minimum balance)")
+    
     print(f"✅ Governance Sender Deployed!")
     print(f"   APP_ID: {app_id}")
     print(f"   App Address: {app_addr}")
@@ -370,17 +1084,15 @@ def deploy_governance_sender():
     deployment_info = {
         "appId": app_id,
         "appAddress": app_addr,
+        "createdRound": confirmed_txn["confirmed-round"],
         "owner": creator['addr'],
-        "network": "testnet",
         "deployedBy": creator['name'],
-        "type": "governance_sender",
-        "governance": "75% contributor approval"
+        "governance": "75% contributor approval",
+        "contractVersion": CONTRACT_VERSION
     }
     
-    with open("governance_sender_deployment.json", 'w') as f:
-        json.dump(deployment_info, f, indent=2)
-    
-    print(f"Wrote governance_sender_deployment.json")
+    record = record_deployment("governance", deployment_info, approval_prog, clear_prog)
+    print("Recorded in deployments.json" + (f" (tag: {record['tag']})" if record['tag'] else ""))
     print(f"\n🎯 Next Steps:")
     print(f"1. Contributors opt in: python governance_interact.py")
     print(f"2. Contributors contribute ALGO")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Indexed keystore for wallets.json and bulk-generated test accounts
+
+Every select_wallet() / get_wallet_by_name() used to re-read wallets.json and
+turn a 25-word mnemonic back into a key. The keystore loads once per process,
+indexes every account by name and by address, and keeps the decoded keys:
+
+  - wallets.json entries are decoded once, on load
+  - load-test accounts live in keystore.json as compact rows of
+    [name, address, private key, network, note], the private key already in
+    algosdk's base64 form, so tens of thousands of them load in milliseconds
+
+Both files are re-read only when they change on disk.
+
+  keystore = get_keystore()
+  keystore.get("elton")           # {"name", "addr", "sk", "network", "note"} or None
+  keystore.find(address)
+  keystore.accounts("load-")      # every account whose name starts with "load-"
+
+Usage:
+  python keystore.py generate <count> [prefix]   # append load-test accounts
+  python keystore.py list [prefix]
+  python keystore.py bench [count]               # cold load and lookups vs wallets.json
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from algosdk import account, mnemonic
+
+# Configuration
+KEYSTORE_PATH = os.environ.get("KEYSTORE_PATH", os.path.join(os.path.dirname(__file__), "keystore.json"))
+WALLETS_PATH = os.path.join(os.path.dirname(__file__), "wallets.json")
+PLACEHOLDER_MNEMONIC = "YOUR_24_OR_25_WORD_MNEMONIC_HERE"
+FORMAT_VERSION = 1
+FIELDS = ["name", "addr", "sk", "network", "note"]
+
+_keystore = None
+_keystore_stamp = None
+_keystore_lock = threading.Lock()
+
+
+class Keystore:
+    """Accounts indexed by name and by address"""
+
+    def __init__(self, wallets=None):
+        self.wallets = wallets or {}  # wallets.json as parsed, name -> {addr, mnemonic, network, note}
+        self._by_name = {}
+        self._by_addr = {}
+
+    def _extend(self, rows):
+        # Earlier rows (wallets.json) win on a name or address clash
+        by_name, by_addr = self._by_name, self._by_addr
+        rows = [row for row in rows if row[0] not in by_name]
+        by_name.update((row[0], row) for row in rows)
+        by_addr.update((row[1], row) for row in rows if row[1] not in by_addr)
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def get(self, name):
+        """Account called name, or None. sk is None for a wallets.json entry without a valid mnemonic."""
+        row = self._by_name.get(name)
+        return dict(zip(FIELDS, row)) if row else None
+
+    def find(self, address):
+        """Account with address, or None"""
+        row = self._by_addr.get(address)
+        return dict(zip(FIELDS, row)) if row else None
+
+    def names(self, prefix=""):
+        return [name for name in self._by_name if name.startswith(prefix)]
+
+    def accounts(self, prefix=""):
+        """Every signable account whose name starts with prefix, in file order"""
+        return [dict(zip(FIELDS, row)) for name, row in self._by_name.items()
+                if name.startswith(prefix) and row[2]]
+
+
+def _wallet_row(name, wallet):
+    try:
+        private_key = mnemonic.to_private_key(wallet['mnemonic'])
+    except Exception:
+        private_key = None  # placeholder or mistyped mnemonic; select_wallet() reports it
+    return [name, wallet['addr'], private_key, wallet.get('network'), wallet.get('note')]
+
+
+def _read_rows(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != FORMAT_VERSION or data.get('fields') != FIELDS:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} keystore")
+    return data['accounts']
+
+
+def load_keystore(keystore_path=KEYSTORE_PATH, wallets_path=WALLETS_PATH):
+    """Build a Keystore from wallets.json and keystore.json (either may be missing)"""
+    wallets = {}
+    if os.path.exists(wallets_path):
+        with open(wallets_path, 'r') as f:
+            wallets = json.load(f)
+    keystore = Keystore(wallets)
+    keystore._extend([_wallet_row(name, wallet) for name, wallet in wallets.items()])
+    keystore._extend(_read_rows(keystore_path))
+    return keystore
+
+
+def _stamp(*paths):
+    return tuple(os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in paths)
+
+
+def get_keystore():
+    """Shared keystore, reloaded when wallets.json or keystore.json changes"""
+    global _keystore, _keystore_stamp
+    stamp = _stamp(WALLETS_PATH, KEYSTORE_PATH)
+    with _keystore_lock:
+        if _keystore is None or stamp != _keystore_stamp:
+            _keystore = load_keystore(KEYSTORE_PATH, WALLETS_PATH)
+            _keystore_stamp = stamp
+        return _keystore
+
+
+def add_accounts(rows, keystore_path=KEYSTORE_PATH):
+    """Append [name, addr, sk, network, note] rows to keystore.json (written atomically)"""
+    existing = _read_rows(keystore_path)
+    taken = {row[0] for row in existing}
+    if keystore_path == KEYSTORE_PATH:
+        taken |= set(get_keystore().wallets)
+    clashes = [row[0] for row in rows if row[0] in taken]
+    if clashes:
+        raise ValueError(f"account name(s) already in use: {', '.join(clashes[:5])}")
+
+    directory = os.path.dirname(os.path.abspath(keystore_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        # One account per line keeps the file diffable without pretty-printing 20k rows
+        f.write(f'{{"version": {FORMAT_VERSION}, "fields": {json.dumps(FIELDS)}, "accounts": [\n')
+        f.write(",\n".join(json.dumps(row, separators=(",", ":")) for row in existing + rows))
+        f.write("\n]}\n")
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, keystore_path)
+
+
+def generate_accounts(count, prefix="load-", network="localnet", keystore_path=KEYSTORE_PATH):
+    """Create count new accounts named prefix00000, prefix00001, ... and store them"""
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    start = sum(1 for row in _read_rows(keystore_path) if row[0].startswith(prefix))
+    rows = []
+    for i in range(start, start + count):
+        private_key, address = account.generate_account()
+        rows.append([f"{prefix}{i:05d}", address, private_key, network, None])
+    add_accounts(rows, keystore_path)
+    return rows
+
+
+def bench(count=20000):
+    """Cold load and lookups of count generated accounts vs re-parsing a wallets.json of mnemonics"""
+    with tempfile.TemporaryDirectory() as directory:
+        keystore_path = os.path.join(directory, "keystore.json")
+        wallets_path = os.path.join(directory, "wallets.json")
+        print(f"🔑 Generating {count} accounts...")
+        rows = generate_accounts(count, keystore_path=keystore_path)
+        with open(wallets_path, 'w') as f:
+            json.dump({row[0]: {"addr": row[1], "mnemonic": mnemonic.from_private_key(row[2])} for row in rows}, f)
+        print(f"   keystore.json: {os.path.getsize(keystore_path) / 1e6:.1f} MB, "
+              f"wallets.json: {os.path.getsize(wallets_path) / 1e6:.1f} MB")
+
+        started = time.perf_counter()
+        keystore = load_keystore(keystore_path, os.path.join(directory, "missing.json"))
+        load_elapsed = time.perf_counter() - started
+        print(f"   Keystore cold load: {load_elapsed * 1000:.1f} ms ({len(keystore)} accounts)")
+
+        lookups = [row[0] for row in rows[::max(count // 1000, 1)]]
+        started = time.perf_counter()
+        for name in lookups:
+            keystore.find(keystore.get(name)['addr'])
+        lookup_elapsed = time.perf_counter() - started
+        print(f"   Keystore lookups: {lookup_elapsed / len(lookups) * 1e6:.1f} µs each (name + address)")
+
+        # What get_wallet_by_name() used to do per call: parse the file, decode the mnemonic
+        sample = lookups[:20]
+        started = time.perf_counter()
+        for name in sample:
+            with open(wallets_path, 'r') as f:
+                mnemonic.to_private_key(json.load(f)[name]['mnemonic'])
+        legacy_elapsed = (time.perf_counter() - started) / len(sample)
+        print(f"   wallets.json re-parse + mnemonic: {legacy_elapsed * 1000:.1f} ms per lookup")
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == "generate":
+        prefix = args[2] if len(args) > 2 else "load-"
+        try:
+            rows = generate_accounts(int(args[1]), prefix)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ Added {len(rows)} account(s) to {KEYSTORE_PATH} ({rows[0][0]} .. {rows[-1][0]})")
+        print("   local_algod funds them at startup; on TestNet fund them before use")
+    elif args and args[0] == "list":
+        keystore = get_keystore()
+        names = keystore.names(args[1] if len(args) > 1 else "")
+        for name in names:
+            wallet = keystore.get(name)
+            print(f"{'🔑' if wallet['sk'] else '⚠️ '} {name}: {wallet['addr']} ({wallet['note'] or 'no note'})")
+        print(f"\n{len(names)} account(s)")
+    elif args and args[0] == "bench":
+        bench(int(args[1]) if len(args) > 1 else 20000)
+    else:
+        print("💡 Usage:")
+        print("  python keystore.py generate <count> [prefix]")
+        print("  python keystore.py list [prefix]")
+        print("  python keystore.py bench [count]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+Local algod stand-in backed by the in-process AVM
+
+Serves the algod v2 endpoints our scripts use from an in-memory ledger, so
+any script can run against it by pointing ALGOD_URL at it - no testnet,
+no rate limits, reproducible benchmarks.
+
+  python local_algod.py                 # instant seal: one block per group
+  LOCAL_ALGOD_BLOCK_TIME=2.8 python local_algod.py   # testnet-like rounds
+
+Every address in wallets.json / permanent_wallet.json / keystore.json (plus
+LOCAL_ALGOD_FUND, comma separated) starts with LOCAL_ALGOD_GENESIS_ALGO ALGO.
+State is lost on exit.
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+import msgpack
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+from algosdk import constants, encoding, transaction
+from avm import Ledger, execute_group
+from teal_assembler import TealAssemblyError, compile_offline
+
+# Configuration
+HOST = os.environ.get("LOCAL_ALGOD_HOST", "127.0.0.1")
+PORT = int(os.environ.get("LOCAL_ALGOD_PORT", "4001"))
+BLOCK_TIME = float(os.environ.get("LOCAL_ALGOD_BLOCK_TIME", "0"))  # 0 = instant seal
+GENESIS_ALGO = int(os.environ.get("LOCAL_ALGOD_GENESIS_ALGO", "10000"))
+FUND_ADDRESSES = [a.strip() for a in os.environ.get("LOCAL_ALGOD_FUND", "").split(",") if a.strip()]
+
+GENESIS_ID = "local-v1"
+GENESIS_HASH = base64.b64encode(encoding.checksum(b"ogc-local-algod")).decode()
+WAIT_FOR_BLOCK_TIMEOUT = 60  # seconds, matches algod
+INSTANT_SEAL_WAIT_TIMEOUT = 1  # instant seal makes no empty blocks, so don't hold long-polls
+
+# msgpack keys holding addresses, rendered as base32 in JSON like algod does
+_ADDRESS_KEYS = {"snd", "rcv", "close", "arcv", "asnd", "aclose", "rekey", "fadd",
+                 "sgnr", "apat", "m", "r", "f", "c"}
+
+
+class LocalAlgodError(Exception):
+    """An error returned to the client as {"message": ...}"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _b64(value):
+    return base64.b64encode(value).decode()
+
+
+def _to_json(value, key=None):
+    """Render a dictified (msgpack) object the way algod's JSON does"""
+    if isinstance(value, dict):
+        return {k: _to_json(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_json(v, key) for v in value]
+    if isinstance(value, bytes):
+        if key in _ADDRESS_KEYS and len(value) == 32:
+            return encoding.encode_address(value)
+        return _b64(value)
+    return value
+
+
+def _state_json(state):
+    """Global/local state as algod's TealKeyValue list"""
+    entries = []
+    for key, value in state.items():
+        if isinstance(value, int):
+            entries.append({"key": _b64(key), "value": {"type": 2, "bytes": "", "uint": value}})
+        else:
+            entries.append({"key": _b64(key), "value": {"type": 1, "bytes": _b64(value), "uint": 0}})
+    return entries
+
+
+def _schema_json(schema):
+    return {"num-uint": schema[0], "num-byte-slice": schema[1]}
+
+
+def _inner_json(result):
+    """Convert an avm inner transaction result into algod's pending-txn shape"""
+    txn = {"type": result["type"], "snd": result["sender"]}
+    if result["type"] == "pay":
+        txn.update(rcv=result["receiver"], amt=result["amount"])
+    elif result["type"] == "axfer":
+        txn["xaid"] = result["asset_id"]
+        if "receiver" in result:
+            txn.update(arcv=result["receiver"], aamt=result["amount"])
+    elif result["type"] == "appl":
+        txn["apid"] = 0 if result.get("created") else result["app_id"]
+    entry = {"pool-error": "", "txn": {"txn": txn}}
+    if result["type"] == "appl" and result.get("created"):
+        entry["application-index"] = result["app_id"]
+    if result["type"] == "acfg":
+        entry["asset-index"] = result["asset_id"]
+    if result.get("logs"):
+        entry["logs"] = [_b64(v) for v in result["logs"]]
+    if result.get("inner_txns"):
+        entry["inner-txns"] = [_inner_json(r) for r in result["inner_txns"]]
+    return entry
+
+
+def _inner_block(result):
+    """An avm inner transaction result as a block's ApplyData inner transaction"""
+    txn = _inner_json(result)["txn"]["txn"]
+    entry = {"txn": {k: encoding.decode_address(v) if k in _ADDRESS_KEYS else v for k, v in txn.items()}}
+    delta = {}
+    if result.get("logs"):
+        delta["lg"] = list(result["logs"])
+    if result.get("inner_txns"):
+        delta["itx"] = [_inner_block(r) for r in result["inner_txns"]]
+    if delta:
+        entry["dt"] = delta
+    return entry
+
+
+def _block_txn(stxn, txn_result):
+    """A SignedTxnInBlock: the signed transaction without its genesis fields, plus apply data"""
+    signed = stxn.dictify()
+    txn = dict(signed["txn"])
+    txn.pop("gh", None)
+    signed["txn"] = txn
+    if txn.pop("gen", None):
+        signed["hgi"] = True
+    if txn_result["type"] == "appl" and txn_result.get("created"):
+        signed["apid"] = txn_result["app_id"]
+    if txn_result["type"] == "acfg" and txn_result.get("created"):
+        signed["caid"] = txn_result["asset_id"]
+    delta = {}
+    if txn_result.get("logs"):
+        delta["lg"] = list(txn_result["logs"])
+    if txn_result.get("inner_txns"):
+        delta["itx"] = [_inner_block(r) for r in txn_result["inner_txns"]]
+    if delta:
+        signed["dt"] = delta
+    return signed
+
+
+def _verify_signature(stxn):
+    """Check a SignedTransaction's ed25519 signature"""
+    if not isinstance(stxn, transaction.SignedTransaction):
+        raise LocalAlgodError("only single-signature transactions are supported locally")
+    if not stxn.signature:
+        raise LocalAlgodError(f"transaction {stxn.get_txid()} is not signed")
+    signer = stxn.authorizing_address or stxn.transaction.sender
+    if signer != stxn.transaction.sender:
+        # The local ledger does not track rekeys, so only the sender may sign
+        raise LocalAlgodError(f"transaction {stxn.get_txid()}: should have been authorized by "
+                              f"{stxn.transaction.sender} but was actually authorized by {signer}")
+    message = constants.txid_prefix + base64.b64decode(encoding.msgpack_encode(stxn.transaction))
+    try:
+        VerifyKey(encoding.decode_address(signer)).verify(message, base64.b64decode(stxn.signature))
+    except BadSignatureError:
+        raise LocalAlgodError(f"transaction {stxn.get_txid()}: invalid signature")
+
+
+class LocalAlgod:
+    """In-memory chain: validates groups with the AVM and seals them into rounds"""
+
+    def __init__(self, block_time=BLOCK_TIME):
+        self.block_time = block_time
+        self.ledger = Ledger(round=1)
+        self.cond = threading.Condition(threading.RLock())
+        self.txns = {}          # txid -> pending transaction response
+        self.blocks = {1: []}   # round -> txids
+        self.block_times = {1: self.ledger.timestamp}
+        self.block_txns = {}    # txid -> SignedTxnInBlock (msgpack shape) for /v2/blocks
+        self.unsealed = []
+        self.timestamp_offset = 0
+        self.last_seal = time.monotonic()
+        self._stopped = threading.Event()
+
+    # -- chain ------------------------------------------------------------
+
+    def fund(self, address, micro_algo):
+        with self.cond:
+            self.ledger.fund(address, micro_algo)
+
+    def seal(self):
+        """Close the current round, confirming everything submitted since the last one"""
+        with self.cond:
+            ledger = self.ledger
+            ledger.round += 1
+            ledger.timestamp = max(ledger.timestamp, int(time.time()) + self.timestamp_offset)
+            for txid in self.unsealed:
+                self.txns[txid]["confirmed-round"] = ledger.round
+            self.blocks[ledger.round] = self.unsealed
+            self.block_times[ledger.round] = ledger.timestamp
+            self.unsealed = []
+            self.last_seal = time.monotonic()
+            self.cond.notify_all()
+
+    def _block_loop(self):
+        while not self._stopped.wait(self.block_time):
+            self.seal()
+
+    def start(self):
+        if self.block_time > 0:
+            threading.Thread(target=self._block_loop, daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def submit(self, raw):
+        """Accept a msgpack-encoded signed transaction group, returning the first txid"""
+        try:
+            unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+            unpacker.feed(raw)
+            stxns = [encoding.msgpack_decode(obj) for obj in unpacker]
+        except Exception as e:
+            raise LocalAlgodError(f"could not decode transactions: {e}")
+        if not stxns:
+            raise LocalAlgodError("empty transaction group")
+
+        for stxn in stxns:
+            _verify_signature(stxn)
+            gh = stxn.transaction.genesis_hash
+            if gh and gh != GENESIS_HASH:
+                raise LocalAlgodError("transaction genesis hash does not match the local network "
+                                      "(suggested params from another algod?)")
+
+        txids = [stxn.get_txid() for stxn in stxns]
+        with self.cond:
+            for txid in txids:
+                if txid in self.txns:
+                    raise LocalAlgodError(f"transaction already in ledger: {txid}")
+            result = execute_group(self.ledger, stxns)
+            if not result["ok"]:
+                failed = txids[min(result["failed_at"], len(txids) - 1)]
+                raise LocalAlgodError(f"TransactionPool.Remember: transaction {failed}: {result['error']}")
+
+            for txid, stxn, txn_result in zip(txids, stxns, result["txns"]):
+                entry = {
+                    "confirmed-round": 0,
+                    "pool-error": "",
+                    "txn": _to_json(stxn.dictify()),
+                }
+                if txn_result["type"] == "appl" and txn_result.get("created"):
+                    entry["application-index"] = txn_result["app_id"]
+                if txn_result["type"] == "acfg" and txn_result.get("created"):
+                    entry["asset-index"] = txn_result["asset_id"]
+                if txn_result.get("logs"):
+                    entry["logs"] = [_b64(v) for v in txn_result["logs"]]
+                if txn_result.get("inner_txns"):
+                    entry["inner-txns"] = [_inner_json(r) for r in txn_result["inner_txns"]]
+                self.txns[txid] = entry
+                self.block_txns[txid] = _block_txn(stxn, txn_result)
+            self.unsealed.extend(txids)
+            if self.block_time <= 0:
+                self.seal()
+        return txids[0]
+
+    def wait_for_block_after(self, round_num):
+        timeout = WAIT_FOR_BLOCK_TIMEOUT if self.block_time > 0 else INSTANT_SEAL_WAIT_TIMEOUT
+        with self.cond:
+            self.cond.wait_for(lambda: self.ledger.round > round_num or self._stopped.is_set(),
+                               timeout=timeout)
+            return self.status()
+
+    # -- views --------------------------------------------------------------
+
+    def status(self):
+        with self.cond:
+            since = int((time.monotonic() - self.last_seal) * 1e9)
+            return {
+                "last-round": self.ledger.round,
+                "last-version": "future",
+                "next-version": "future",
+                "next-version-round": self.ledger.round + 1,
+                "next-version-supported": True,
+                "time-since-last-round": since,
+                "catchup-time": 0,
+                "stopped-at-unsupported-round": False,
+            }
+
+    def params(self):
+        with self.cond:
+            return {
+                "consensus-version": "future",
+                "fee": 0,
+                "genesis-hash": GENESIS_HASH,
+                "genesis-id": GENESIS_ID,
+                "last-round": self.ledger.round,
+                "min-fee": constants.MIN_TXN_FEE,
+            }
+
+    def block_txids(self, round_num):
+        with self.cond:
+            if round_num not in self.blocks:
+                raise LocalAlgodError(f"round {round_num} is not available", 404)
+            return {"blockTxids": list(self.blocks[round_num])}
+
+    def block(self, round_num, response_format="json"):
+        """Block header fields the scripts read, plus the payset"""
+        with self.cond:
+            if round_num not in self.blocks:
+                raise LocalAlgodError(f"round {round_num} is not available", 404)
+            block = {"rnd": round_num, "ts": self.block_times[round_num],
+                     "gh": base64.b64decode(GENESIS_HASH), "gen": GENESIS_ID}
+            if self.blocks[round_num]:
+                block["txns"] = [self.block_txns[txid] for txid in self.blocks[round_num]]
+        if response_format == "msgpack":
+            return msgpack.packb({"block": block}, use_bin_type=True)
+        return {"block": _to_json(block)}
+
+    def pending(self, txid):
+        with self.cond:
+            entry = self.txns.get(txid)
+            if entry is None:
+                raise LocalAlgodError("txn does not exist", 404)
+            return dict(entry)
+
+    def _app_params_json(self, app_id):
+        ledger = self.ledger
+        params = ledger.apps[app_id]
+        return {
+            "creator": encoding.encode_address(params["creator"]),
+            "approval-program": _b64(params["approval"]),
+            "clear-state-program": _b64(params["clear"]),
+            "extra-program-pages": params["extra_pages"],
+            "global-state": _state_json(ledger.globals.get(app_id, {})),
+            "global-state-schema": _schema_json(params["global_schema"]),
+            "local-state-schema": _schema_json(params["local_schema"]),
+        }
+
+    def _asset_params_json(self, asset_id):
+        params = self.ledger.assets[asset_id]
+        result = {
+            "creator": encoding.encode_address(params["AssetCreator"]),
+            "total": params["AssetTotal"],
+            "decimals": params["AssetDecimals"],
+            "default-frozen": bool(params["AssetDefaultFrozen"]),
+            "name": params["AssetName"].decode("utf-8", errors="replace"),
+            "unit-name": params["AssetUnitName"].decode("utf-8", errors="replace"),
+            "url": params["AssetURL"].decode("utf-8", errors="replace"),
+        }
+        if params["AssetMetadataHash"]:
+            result["metadata-hash"] = _b64(params["AssetMetadataHash"])
+        for key, field in (("manager", "AssetManager"), ("reserve", "AssetReserve"),
+                           ("freeze", "AssetFreeze"), ("clawback", "AssetClawback")):
+            if params[field] != bytes(32):
+                result[key] = encoding.encode_address(params[field])
+        return result
+
+    def account(self, address):
+        if not encoding.is_valid_address(address):
+            raise LocalAlgodError(f"failed to parse the address: {address}")
+        with self.cond:
+            ledger = self.ledger
+            addr = encoding.decode_address(address)
+            amount = ledger.balances.get(addr, 0)
+            assets = [{"asset-id": asset_id, "amount": amount_held, "is-frozen": False}
+                      for (holder, asset_id), amount_held in ledger.holdings.items() if holder == addr]
+            local_states = []
+            total_ints = total_bytes = 0
+            for (holder, app_id), state in ledger.locals.items():
+                if holder != addr or app_id not in ledger.apps:
+                    continue
+                schema = ledger.apps[app_id]["local_schema"]
+                total_ints += schema[0]
+                total_bytes += schema[1]
+                local_states.append({"id": app_id, "key-value": _state_json(state),
+                                     "schema": _schema_json(schema)})
+            created_apps = []
+            for app_id, params in ledger.apps.items():
+                if params["creator"] == addr:
+                    total_ints += params["global_schema"][0]
+                    total_bytes += params["global_schema"][1]
+                    created_apps.append({"id": app_id, "params": self._app_params_json(app_id)})
+            created_assets = [{"index": asset_id, "params": self._asset_params_json(asset_id)}
+                              for asset_id, params in ledger.assets.items() if params["AssetCreator"] == addr]
+            boxes = [(name, value) for (app_id, name), value in ledger.boxes.items()
+                     if ledger.apps.get(app_id, {}).get("address") == addr]
+            return {
+                "address": address,
+                "amount": amount,
+                "amount-without-pending-rewards": amount,
+                "min-balance": ledger.min_balance(addr) if not ledger._is_empty(addr) else 0,
+                "pending-rewards": 0,
+                "rewards": 0,
+                "reward-base": 0,
+                "round": ledger.round,
+                "status": "Offline",
+                "assets": assets,
+                "apps-local-state": local_states,
+                "created-apps": created_apps,
+                "created-assets": created_assets,
+                "apps-total-schema": {"num-uint": total_ints, "num-byte-slice": total_bytes},
+                "total-apps-opted-in": len(local_states),
+                "total-assets-opted-in": len(assets),
+                "total-created-apps": len(created_apps),
+                "total-created-assets": len(created_assets),
+                "total-boxes": len(boxes),
+                "total-box-bytes": sum(len(n) + len(v) for n, v in boxes),
+            }
+
+    def account_application(self, address, app_id):
+        """An account's local state in (and params of, if it created) one app"""
+        if not encoding.is_valid_address(address):
+            raise LocalAlgodError(f"failed to parse the address: {address}")
+        with self.cond:
+            ledger = self.ledger
+            addr = encoding.decode_address(address)
+            result = {"round": ledger.round}
+            if (addr, app_id) in ledger.locals and app_id in ledger.apps:
+                result["app-local-state"] = {"id": app_id, "key-value": _state_json(ledger.locals[(addr, app_id)]),
+                                             "schema": _schema_json(ledger.apps[app_id]["local_schema"])}
+            if app_id in ledger.apps and ledger.apps[app_id]["creator"] == addr:
+                result["created-app"] = self._app_params_json(app_id)
+            if len(result) == 1:
+                raise LocalAlgodError("account application info not found", 404)
+            return result
+
+    def application(self, app_id):
+        with self.cond:
+            if app_id not in self.ledger.apps:
+                raise LocalAlgodError("application does not exist", 404)
+            return {"id": app_id, "params": self._app_params_json(app_id)}
+
+    def asset(self, asset_id):
+        with self.cond:
+            if asset_id not in self.ledger.assets:
+                raise LocalAlgodError("asset does not exist", 404)
+            return {"index": asset_id, "params": self._asset_params_json(asset_id)}
+
+    def boxes(self, app_id):
+        with self.cond:
+            if app_id not in self.ledger.apps:
+                raise LocalAlgodError("application does not exist", 404)
+            return {"boxes": [{"name": _b64(name)} for (box_app, name) in self.ledger.boxes if box_app == app_id]}
+
+    def box(self, app_id, encoded_name):
+        encoding_name, _, value = encoded_name.partition(":")
+        try:
+            name = {"b64": lambda v: base64.b64decode(v), "str": lambda v: v.encode(),
+                    "int": lambda v: int(v).to_bytes(8, "big")}[encoding_name](value)
+        except (KeyError, ValueError):
+            raise LocalAlgodError(f"invalid box name {encoded_name!r}")
+        with self.cond:
+            box = self.ledger.box(app_id, name)
+            if box is None:
+                raise LocalAlgodError("box not found", 404)
+            return {"name": _b64(name), "round": self.ledger.round, "value": _b64(box)}
+
+    def compile(self, source):
+        try:
+            result = compile_offline(source)
+        except TealAssemblyError as e:
+            raise LocalAlgodError(str(e))
+        return {"hash": result["hash"], "result": _b64(result["bytecode"])}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes algod v2 requests to a LocalAlgod"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the pooled client expects
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    node = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        msgpack_body = isinstance(payload, bytes)
+        body = payload if msgpack_body else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/msgpack" if msgpack_body else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self, method):
+        url = parse.urlsplit(self.path)
+        query = self.query = parse.parse_qs(url.query)
+        response_format = query.get("format", ["json"])[0]
+        if response_format != "json" and not (response_format == "msgpack" and _BLOCK_PATH.fullmatch(url.path)):
+            return self._send(400, {"message": "only format=json (and msgpack blocks) is supported locally"})
+        for route_method, pattern, handler in _ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(url.path)
+            if match:
+                try:
+                    return self._send(200, handler(self, *match.groups()))
+                except LocalAlgodError as e:
+                    return self._send(e.status, {"message": str(e)})
+                except Exception as e:
+                    return self._send(500, {"message": f"{type(e).__name__}: {e}"})
+        self._send(404, {"message": f"unknown endpoint {method} {url.path}"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+_BLOCK_PATH = re.compile(r"/v2/blocks/(\d+)")
+_ROUTES = [
+    ("GET", re.compile(r"/health"), lambda h: {}),
+    ("GET", re.compile(r"/v2/status"), lambda h: h.node.status()),
+    ("GET", re.compile(r"/v2/status/wait-for-block-after/(\d+)"),
+     lambda h, r: h.node.wait_for_block_after(int(r))),
+    ("GET", _BLOCK_PATH, lambda h, r: h.node.block(int(r), h.query.get("format", ["json"])[0])),
+    ("GET", re.compile(r"/v2/blocks/(\d+)/txids"), lambda h, r: h.node.block_txids(int(r))),
+    ("GET", re.compile(r"/v2/transactions/params"), lambda h: h.node.params()),
+    ("POST", re.compile(r"/v2/transactions"), lambda h: {"txId": h.node.submit(h._body())}),
+    ("GET", re.compile(r"/v2/transactions/pending/([A-Z2-7]+)"), lambda h, txid: h.node.pending(txid)),
+    ("GET", re.compile(r"/v2/accounts/([A-Z2-7]+)"), lambda h, addr: h.node.account(addr)),
+    ("GET", re.compile(r"/v2/accounts/([A-Z2-7]+)/applications/(\d+)"),
+     lambda h, addr, app_id: h.node.account_application(addr, int(app_id))),
+    ("GET", re.compile(r"/v2/applications/(\d+)"), lambda h, app_id: h.node.application(int(app_id))),
+    ("GET", re.compile(r"/v2/applications/(\d+)/boxes"), lambda h, app_id: h.node.boxes(int(app_id))),
+    ("GET", re.compile(r"/v2/applications/(\d+)/box"),
+     lambda h, app_id: h.node.box(int(app_id), h.query.get("name", [""])[0])),
+    ("GET", re.compile(r"/v2/assets/(\d+)"), lambda h, asset_id: h.node.asset(int(asset_id))),
+    ("POST", re.compile(r"/v2/teal/compile"), lambda h: h.node.compile(h._body().decode("utf-8"))),
+    ("GET", re.compile(r"/v2/devmode/blocks/offset"), lambda h: {"offset": h.node.timestamp_offset}),
+    ("POST", re.compile(r"/v2/devmode/blocks/offset/(\d+)"),
+     lambda h, offset: setattr(h.node, "timestamp_offset", int(offset)) or {}),
+]
+
+
+def _default_fund_addresses():
+    """Addresses from the project's wallet files"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    addresses = []
+    for name in ("wallets.json", "permanent_wallet.json"):
+        try:
+            with open(os.path.join(here, name), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        wallets = data.values() if name == "wallets.json" else [data]
+        for wallet in wallets:
+            address = wallet.get('addr') or wallet.get('address')
+            if address and encoding.is_valid_address(address):
+                addresses.append(address)
+    try:
+        from keystore import get_keystore
+        addresses += [wallet['addr'] for wallet in get_keystore().accounts() if wallet['addr'] not in addresses]
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Not funding keystore accounts: {e}")
+    return addresses
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 drops bursts of concurrent connects
+
+
+def start_local_algod(host=HOST, port=PORT, block_time=BLOCK_TIME, fund=None):
+    """Start a LocalAlgod server on a background thread, returning (node, server, url)"""
+    node = LocalAlgod(block_time)
+    for address in (_default_fund_addresses() if fund is None else fund) + FUND_ADDRESSES:
+        node.fund(address, GENESIS_ALGO * 1_000_000)
+    handler = type("LocalAlgodHandler", (_Handler,), {"node": node})
+    server = _Server((host, port), handler)
+    node.start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{host}:{server.server_address[1]}"
+    return node, server, url
+
+
+def main():
+    node, server, url = start_local_algod()
+    mode = "instant seal" if node.block_time <= 0 else f"{node.block_time}s blocks"
+    print(f"🧪 Local algod listening on {url} ({mode})")
+    print(f"   Funded accounts: {len(node.ledger.balances)} x {GENESIS_ALGO} ALGO")
+    print(f"   Point scripts at it: ALGOD_URL={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n👋 Stopping local algod")
+        node.stop()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+asyncio API for OGC operations
+
+Mirrors what the interactive scripts do - opt-in, contribute, propose, vote,
+execute, release, echo, send_algo/send_batch, token opt-in/transfer and balances - as
+coroutines, so a backend can drive many groups from one event loop:
+
+  async with OGCAsync() as ogc:
+      await asyncio.gather(*(ogc.contribute(w, app_id, app_address, 1_000_000)
+                             for w in wallets))
+
+HTTP goes through AsyncAlgodClient, a small HTTP/1.1 client on asyncio
+streams with a shared keep-alive connection pool (no extra dependencies).
+Confirmations come from one block-follower task per client, the asyncio
+twin of confirmations.py: waiting on 500 transactions costs one status and
+one txids request per round, and no thread.
+
+Usage:
+  python ogc_async.py balances          # all wallets.json balances, concurrently
+  python ogc_async.py bench [members] [block_time] [optin]   # concurrent contributions against local_algod
+"""
+
+import asyncio
+import base64
+import collections
+import copy
+import json
+import ssl
+import sys
+import time
+from urllib import parse
+from algosdk import constants, encoding, error, transaction
+from algod_client import ALGOD_TOKEN, ALGOD_URL, ALGOD_TIMEOUT
+from app_state import decode_key_values
+from bulk_submit import PAIRS_PER_GROUP, VOTES_PER_GROUP, build_contribution_groups, build_vote_groups
+from confirmations import DEFAULT_WAIT_ROUNDS, RECENT_ROUNDS, RETRY_DELAY
+from governance_interact import build_batch_proposal, build_execute_group
+from params_cache import BLOCK_TIME, MAX_TXN_LIFE, ROUND_WINDOW
+from roster import join_box_refs, member_box_name
+from sender_interact import build_payout_groups
+from token_interact import build_opt_in_transfer
+
+# Configuration
+MAX_CONNECTIONS = 16  # concurrent requests per client; more callers queue for a connection
+
+
+class AsyncAlgodClient:
+    """Non-blocking algod client over a pool of keep-alive HTTP/1.1 connections"""
+
+    def __init__(self, algod_token=ALGOD_TOKEN, algod_address=ALGOD_URL,
+                 timeout=ALGOD_TIMEOUT, max_connections=MAX_CONNECTIONS):
+        url = parse.urlsplit(algod_address)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported algod URL scheme: {algod_address}")
+        self.algod_token = algod_token
+        self.timeout = timeout
+        self._host = url.hostname
+        self._port = url.port or (443 if url.scheme == "https" else 80)
+        self._ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self._base_path = url.path.rstrip("/")
+        self._host_header = url.netloc
+        self._idle = []  # (reader, writer) ready for reuse
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def close(self):
+        """Close every idle connection"""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+    async def _open(self):
+        return await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+
+    async def _roundtrip(self, reader, writer, method, path, body, headers):
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self._host_header}",
+                 f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("algod closed the connection")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            payload = b"".join(chunks)
+            keep_alive = True
+        elif "content-length" in response_headers:
+            payload = await reader.readexactly(int(response_headers["content-length"]))
+            keep_alive = True
+        else:
+            payload = await reader.read()
+            keep_alive = False
+        if response_headers.get("connection", "").lower() == "close":
+            keep_alive = False
+        return status, payload, keep_alive
+
+    async def request(self, method, requrl, params=None, data=None, headers=None,
+                      response_format="json"):
+        """Same contract as AlgodClient.algod_request, awaited"""
+        header = {"User-Agent": "py-algorand-sdk", "Connection": "keep-alive"}
+        if headers:
+            header.update(headers)
+        if requrl not in constants.no_auth:
+            header[constants.algod_auth_header] = self.algod_token
+        if requrl not in constants.unversioned_paths:
+            requrl = "/v2" + requrl
+        if params:
+            requrl = requrl + "?" + parse.urlencode(params)
+        body = data or b""
+
+        async with self._slots:
+            # One retry covers a keep-alive socket the server closed while idle
+            for attempt in range(2):
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await asyncio.wait_for(self._open(), self.timeout)
+                try:
+                    status, payload, keep_alive = await asyncio.wait_for(
+                        self._roundtrip(reader, writer, method, self._base_path + requrl, body, header),
+                        self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if not reused or attempt == 1:
+                        raise
+                    continue
+                except BaseException:
+                    writer.close()
+                    raise
+                break
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+
+        if status >= 400:
+            message = payload.decode("utf-8", errors="replace")
+            try:
+                message = json.loads(message)["message"]
+            except (ValueError, KeyError, TypeError):
+                pass
+            raise error.AlgodHTTPError(message, status)
+        if response_format == "json":
+            return json.loads(payload) if payload else {}
+        return payload
+
+    async def status(self):
+        return await self.request("GET", "/status")
+
+    async def status_after_block(self, round_num):
+        return await self.request("GET", f"/status/wait-for-block-after/{round_num}")
+
+    async def suggested_params(self):
+        params = await self.request("GET", "/transactions/params")
+        return transaction.SuggestedParams(
+            params["fee"], params["last-round"], params["last-round"] + 1000,
+            params["genesis-hash"], params["genesis-id"], False,
+            params["consensus-version"], params["min-fee"]
+        )
+
+    async def send_transactions(self, signed_txns):
+        """Submit a signed group (or a single signed txn), returning the first txid.
+        Raw signed bytes from batch_signer are sent as they are."""
+        if not isinstance(signed_txns, (list, tuple)):
+            signed_txns = [signed_txns]
+        raw = b"".join(stxn if isinstance(stxn, bytes) else base64.b64decode(encoding.msgpack_encode(stxn))
+                       for stxn in signed_txns)
+        response = await self.request("POST", "/transactions", data=raw,
+                                      headers={"Content-Type": "application/x-binary"})
+        return response["txId"]
+
+    async def pending_transaction_info(self, txid):
+        return await self.request("GET", f"/transactions/pending/{txid}")
+
+    async def get_block_txids(self, round_num):
+        return await self.request("GET", f"/blocks/{round_num}/txids")
+
+    async def account_info(self, address):
+        return await self.request("GET", f"/accounts/{address}")
+
+    async def application_info(self, app_id):
+        return await self.request("GET", f"/applications/{app_id}")
+
+    async def asset_info(self, asset_id):
+        return await self.request("GET", f"/assets/{asset_id}")
+
+
+class AsyncConfirmationWaiter:
+    """Follows blocks on one event loop and resolves confirmation futures"""
+
+    def __init__(self, algod_client):
+        self.algod_client = algod_client
+        self._watched = {}   # txid -> (future, deadline round)
+        self._recent = {}    # txid -> confirmed round, for the last RECENT_ROUNDS
+        self._recent_blocks = collections.deque()
+        self._round = None
+        self._task = None
+        self._starting = None
+
+    async def _start(self):
+        if self._task is None:
+            if self._starting is None:
+                self._starting = asyncio.ensure_future(self.algod_client.status())
+            status = await self._starting
+            if self._task is None:
+                self._round = status["last-round"] - 1
+                self._task = asyncio.ensure_future(self._follow())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def watch(self, txid, wait_rounds=DEFAULT_WAIT_ROUNDS):
+        """Return a Future resolving to {"txid", "confirmed-round"} once txid is in a block"""
+        await self._start()
+        future = asyncio.get_running_loop().create_future()
+        confirmed_round = self._recent.get(txid)
+        if confirmed_round is not None:
+            future.set_result({"txid": txid, "confirmed-round": confirmed_round})
+        else:
+            self._watched[txid] = (future, self._round + 1 + wait_rounds)
+        return future
+
+    async def wait(self, txid, wait_rounds=DEFAULT_WAIT_ROUNDS):
+        """Await confirmation of txid"""
+        return await (await self.watch(txid, wait_rounds))
+
+    def pending_count(self):
+        return len(self._watched)
+
+    async def _follow(self):
+        while True:
+            try:
+                status = await self.algod_client.status_after_block(self._round)
+                last_round = status["last-round"]
+                if last_round <= self._round:
+                    # Long-poll timed out with no new block; look the stragglers up directly
+                    await self._expire(force=True)
+                    continue
+                for round_num in range(max(self._round + 1, last_round - RECENT_ROUNDS + 1), last_round + 1):
+                    txids = (await self.algod_client.get_block_txids(round_num)).get("blockTxids") or []
+                    self._process_round(round_num, txids)
+                self._round = max(self._round, last_round)
+                await self._expire()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Block follower error: {e}")
+                await asyncio.sleep(RETRY_DELAY)
+
+    def _process_round(self, round_num, txids):
+        for txid in txids:
+            self._recent[txid] = round_num
+            watched = self._watched.pop(txid, None)
+            if watched is not None and not watched[0].done():
+                watched[0].set_result({"txid": txid, "confirmed-round": round_num})
+        self._recent_blocks.append((round_num, txids))
+        while len(self._recent_blocks) > RECENT_ROUNDS:
+            _, old_txids = self._recent_blocks.popleft()
+            for txid in old_txids:
+                self._recent.pop(txid, None)
+
+    async def _expire(self, force=False):
+        """Settle waiters whose deadline passed (or all of them), one pending lookup each"""
+        expired = [(txid, future, deadline) for txid, (future, deadline) in self._watched.items()
+                   if force or deadline <= self._round]
+        for txid, _, _ in expired:
+            del self._watched[txid]
+
+        async def settle(txid, future, deadline):
+            try:
+                info = await self.algod_client.pending_transaction_info(txid)
+            except error.AlgodHTTPError:
+                info = {}
+            if future.done():
+                return
+            if info.get("confirmed-round"):
+                future.set_result({"txid": txid, "confirmed-round": info["confirmed-round"]})
+            elif info.get("pool-error"):
+                future.set_exception(error.TransactionRejectedError(
+                    "Transaction rejected: " + info["pool-error"]))
+            elif deadline > self._round:
+                self._watched[txid] = (future, deadline)
+            else:
+                future.set_exception(error.ConfirmationTimeoutError(
+                    f"Wait for transaction id {txid} timed out"))
+
+        await asyncio.gather(*(settle(*entry) for entry in expired))
+
+
+class OGCAsync:
+    """Async OGC operations; accounts are {"addr", "sk"} dicts as from wallet_selector"""
+
+    def __init__(self, algod_client=None):
+        self.algod_client = algod_client or AsyncAlgodClient()
+        self.waiter = AsyncConfirmationWaiter(self.algod_client)
+        self._params = None
+        self._params_at = 0.0
+        self._params_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.waiter.close()
+        await self.algod_client.close()
+
+    async def suggested_params(self):
+        """Suggested params shared across a round window, like params_cache"""
+        async with self._params_lock:
+            if self._params is None or time.monotonic() - self._params_at >= ROUND_WINDOW * BLOCK_TIME:
+                sp = await self.algod_client.suggested_params()
+                sp.last = sp.first + MAX_TXN_LIFE
+                self._params, self._params_at = sp, time.monotonic()
+            return copy.copy(self._params)
+
+    async def submit(self, txns, signer, wait=True, wait_rounds=DEFAULT_WAIT_ROUNDS):
+        """Group, sign and send txns; returns {"txid", "confirmed-round"} (or just txid if wait=False)"""
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        return await self.submit_signed([txn.sign(signer['sk']) for txn in txns], wait, wait_rounds)
+
+    async def submit_signed(self, signed_group, wait=True, wait_rounds=DEFAULT_WAIT_ROUNDS):
+        """Send an already signed group, optionally awaiting its confirmation"""
+        txid = await self.algod_client.send_transactions(signed_group)
+        if not wait:
+            return {"txid": txid, "confirmed-round": None}
+        return await self.waiter.wait(txid, wait_rounds)
+
+    # Governance / vault / echo apps
+
+    async def global_state(self, app_id):
+        """Global state as {key: int or bytes}"""
+        return decode_key_values((await self.algod_client.application_info(app_id))['params'].get('global-state', []))
+
+    async def opt_in(self, account, app_id, **kwargs):
+        sp = await self.suggested_params()
+        return await self.submit([transaction.ApplicationOptInTxn(
+            account['addr'], sp, app_id, boxes=[(app_id, member_box_name(account['addr']))]
+        )], account, **kwargs)
+
+    async def contribute(self, account, app_id, app_address, amount_micro, next_slot=None, first=None,
+                         opt_in=False, **kwargs):
+        """[Payment, AppCall("contribute")] - governance and vault apps. A governance member's
+        first contribution writes the roster; next_slot/first as in roster.join_box_refs
+        (next_slot is read from the app when not given). With opt_in the call is also
+        the member's governance OptIn."""
+        sp = await self.suggested_params()
+        if next_slot is None:
+            next_slot = (await self.global_state(app_id)).get('total_contributors', 0)
+        return await self.submit([
+            transaction.PaymentTxn(account['addr'], sp, app_address, amount_micro),
+            transaction.ApplicationCallTxn(account['addr'], sp, app_id,
+                                           transaction.OnComplete.OptInOC if opt_in else transaction.OnComplete.NoOpOC,
+                                           app_args=[b"contribute"],
+                                           boxes=[(app_id, member_box_name(account['addr']))]
+                                                 + join_box_refs(app_id, next_slot, first)),
+        ], account, **kwargs)
+
+    async def contribute_many(self, contributors, app_id, app_address, amount_micro,
+                              pairs_per_group=PAIRS_PER_GROUP, **kwargs):
+        """Contribute from every account, packing pairs_per_group [pay, contribute] pairs per group"""
+        sp = await self.suggested_params()
+        next_slot = (await self.global_state(app_id)).get('total_contributors', 0)
+        groups, _ = build_contribution_groups(sp, app_id, app_address, contributors, amount_micro,
+                                              pairs_per_group, next_slot)
+        return await asyncio.gather(*(self.submit_signed(group, **kwargs) for group in groups))
+
+    async def propose_send(self, owner, app_id, recipient, amount_micro, **kwargs):
+        sp = await self.suggested_params()
+        app_args = [b"propose_send", encoding.decode_address(recipient), amount_micro.to_bytes(8, 'big')]
+        return await self.submit([transaction.ApplicationNoOpTxn(owner['addr'], sp, app_id, app_args=app_args)],
+                                 owner, **kwargs)
+
+    async def propose_batch(self, owner, app_id, payouts, **kwargs):
+        """Governance: propose paying [(recipient, microAlgos)], stored in the payouts box"""
+        sp = await self.suggested_params()
+        return await self.submit([build_batch_proposal(sp, app_id, owner['addr'], payouts)], owner, **kwargs)
+
+    async def vote(self, voter, app_id, **kwargs):
+        sp = await self.suggested_params()
+        return await self.submit([transaction.ApplicationNoOpTxn(
+            voter['addr'], sp, app_id, app_args=[b"vote"], boxes=[(app_id, member_box_name(voter['addr']))]
+        )], voter, **kwargs)
+
+    async def vote_many(self, voters, app_id, votes_per_group=VOTES_PER_GROUP, proposal_id=None, **kwargs):
+        """Vote from every account, votes_per_group calls per atomic group (on proposal_id if given)"""
+        sp = await self.suggested_params()
+        groups, _ = build_vote_groups(sp, app_id, voters, votes_per_group, proposal_id)
+        return await asyncio.gather(*(self.submit_signed(group, **kwargs) for group in groups))
+
+    async def execute_send(self, executor, app_id, recipient=None, **kwargs):
+        """recipient goes in the accounts array so the inner payment can reach it"""
+        sp = await self.suggested_params()
+        return await self.submit([transaction.ApplicationNoOpTxn(
+            executor['addr'], sp, app_id, app_args=[b"execute_send"],
+            accounts=[recipient] if recipient else None
+        )], executor, **kwargs)
+
+    async def execute_batch(self, executor, app_id, payouts, **kwargs):
+        """Governance: pay an approved batch proposal (payouts as proposed) in one group"""
+        sp = await self.suggested_params()
+        group = build_execute_group(sp, app_id, executor['addr'], payouts)
+        return await self.submit_signed([txn.sign(executor['sk']) for txn in group], **kwargs)
+
+    async def release(self, caller, app_id, receiver=None, **kwargs):
+        sp = await self.suggested_params()
+        return await self.submit([transaction.ApplicationNoOpTxn(
+            caller['addr'], sp, app_id, app_args=[b"release"],
+            accounts=[receiver] if receiver else None
+        )], caller, **kwargs)
+
+    async def echo(self, account, app_id, app_address, amount_micro, **kwargs):
+        """[Payment, AppCall("echo")] - the echo app pays the amount back"""
+        sp = await self.suggested_params()
+        return await self.submit([
+            transaction.PaymentTxn(account['addr'], sp, app_address, amount_micro),
+            transaction.ApplicationNoOpTxn(account['addr'], sp, app_id, app_args=[b"echo"]),
+        ], account, **kwargs)
+
+    async def send_algo(self, caller, app_id, recipient, amount_micro, **kwargs):
+        """Sender contract: pay amount_micro from the app account to recipient"""
+        sp = await self.suggested_params()
+        app_args = [b"send_algo", encoding.decode_address(recipient), amount_micro.to_bytes(8, 'big')]
+        return await self.submit([transaction.ApplicationNoOpTxn(
+            caller['addr'], sp, app_id, app_args=app_args, accounts=[recipient]
+        )], caller, **kwargs)
+
+    async def send_batch(self, owner, app_id, payouts, **kwargs):
+        """Sender contract: pay [(recipient, microAlgos)] in the fewest send_batch groups"""
+        sp = await self.suggested_params()
+        groups = build_payout_groups(sp, app_id, owner['addr'], payouts)
+        return await asyncio.gather(*(self.submit_signed([txn.sign(owner['sk']) for txn in group], **kwargs)
+                                      for group in groups))
+
+    # OGC token
+
+    async def token_opt_in(self, account, asset_id, **kwargs):
+        sp = await self.suggested_params()
+        return await self.submit([transaction.AssetTransferTxn(account['addr'], sp, account['addr'], 0, asset_id)],
+                                 account, **kwargs)
+
+    async def token_transfer(self, sender, asset_id, receiver, amount, receiver_account=None, **kwargs):
+        """amount is in base units (already scaled by the token decimals). With receiver_account
+        (the receiver's keys) its opt-in goes in the same group, co-signed."""
+        sp = await self.suggested_params()
+        if receiver_account:
+            opt_in, transfer = build_opt_in_transfer(sp, asset_id, sender['addr'], receiver_account['addr'], amount)
+            return await self.submit_signed([opt_in.sign(receiver_account['sk']), transfer.sign(sender['sk'])],
+                                            **kwargs)
+        return await self.submit([transaction.AssetTransferTxn(sender['addr'], sp, receiver, amount, asset_id)],
+                                 sender, **kwargs)
+
+    # Queries
+
+    async def balance(self, address):
+        """ALGO balance in microAlgos"""
+        return (await self.algod_client.account_info(address))['amount']
+
+    async def token_balance(self, address, asset_id):
+        """Asset holding in base units, None if not opted in"""
+        info = await self.algod_client.account_info(address)
+        for holding in info.get('assets', []):
+            if holding['asset-id'] == asset_id:
+                return holding['amount']
+        return None
+
+    async def balances(self, addresses):
+        """{address: microAlgos or the exception raised looking it up}, fetched concurrently"""
+        results = await asyncio.gather(*(self.balance(a) for a in addresses), return_exceptions=True)
+        return dict(zip(addresses, results))
+
+
+async def _print_all_balances():
+    from wallet_selector import load_wallets
+    wallets = load_wallets()
+    async with OGCAsync() as ogc:
+        started = time.perf_counter()
+        balances = await ogc.balances([w['addr'] for w in wallets.values()])
+        for name, wallet in wallets.items():
+            balance = balances[wallet['addr']]
+            if isinstance(balance, Exception):
+                print(f"❌ {name}: Could not check - {balance}")
+            else:
+                print(f"💳 {name}: {balance / 1_000_000} ALGO")
+        print(f"\n⏱️  {len(wallets)} account(s) in {time.perf_counter() - started:.2f} s")
+
+
+async def bench(members=200, block_time=2.8, opt_in=False):
+    """Contribute from `members` accounts concurrently on an in-process local_algod, joining
+    through the box roster (or opting in with the contribute call when opt_in is set)"""
+    from algosdk import account, logic
+    from algod_client import PooledAlgodClient
+    from governance_sender import GLOBAL_BYTES, GLOBAL_INTS, LOCAL_BYTES, LOCAL_INTS, get_governance_sender_teal
+    from local_algod import start_local_algod
+    from teal_compiler import compile_teal
+
+    node, server, url = start_local_algod(port=0, block_time=block_time, fund=[])
+    print(f"🧪 Local algod at {url} ({block_time}s blocks), {members} members")
+    owner_sk, owner_addr = account.generate_account()
+    owner = {"addr": owner_addr, "sk": owner_sk}
+    node.fund(owner_addr, 10_000_000)
+    wallets = []
+    for _ in range(members):
+        sk, addr = account.generate_account()
+        node.fund(addr, 10_000_000)
+        wallets.append({"addr": addr, "sk": sk})
+
+    sync_client = PooledAlgodClient("", url)
+    approval_teal, clear_teal = get_governance_sender_teal()
+    async with OGCAsync(AsyncAlgodClient("", url)) as ogc:
+        sp = await ogc.suggested_params()
+        create = transaction.ApplicationCreateTxn(
+            owner_addr, sp, transaction.OnComplete.NoOpOC,
+            compile_teal(sync_client, approval_teal), compile_teal(sync_client, clear_teal),
+            transaction.StateSchema(GLOBAL_INTS, GLOBAL_BYTES), transaction.StateSchema(LOCAL_INTS, LOCAL_BYTES)
+        )
+        created = await ogc.submit([create], owner)
+        app_id = (await ogc.algod_client.pending_transaction_info(created['txid']))['application-index']
+        app_address = logic.get_application_address(app_id)
+        node.fund(app_address, 1_000_000)  # box minimum balance until contributions arrive
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(ogc.contribute(w, app_id, app_address, 1_000_000, next_slot=0, first=i,
+                                                        opt_in=opt_in, wait_rounds=10)
+                                         for i, w in enumerate(wallets)), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        failed = [r for r in results if isinstance(r, Exception)]
+        label = "Opt-in contributions" if opt_in else "Contributions"
+        print(f"\n📊 {label}: {len(results) - len(failed)}/{len(results)} confirmed in {elapsed:.2f} s "
+              f"({(len(results) - len(failed)) / elapsed:.1f} groups/s)")
+        for e in failed[:5]:
+            print(f"   ❌ {e}")
+        print(f"   total_contributors on chain: {node.ledger.global_state(app_id).get(b'total_contributors')}")
+    node.stop()
+    server.shutdown()
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "balances":
+        asyncio.run(_print_all_balances())
+    elif args and args[0] == "bench":
+        asyncio.run(bench(int(args[1]) if len(args) > 1 else 200,
+                          float(args[2]) if len(args) > 2 else 2.8,
+                          len(args) > 3 and args[3] == "optin"))
+    else:
+        print("💡 Usage:")
+        print("  python ogc_async.py balances")
+        print("  python ogc_async.py bench [members] [block_time] [optin]")
+
+
+if __name__ == "__main__":
+    main()
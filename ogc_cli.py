@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+ogc - one entry point for every OGC script
+
+Each subcommand runs one of the existing scripts exactly as
+`python <script>.py [args...]` would, but its module is imported only when
+that subcommand is chosen: `ogc help` loads nothing beyond this file, and
+`ogc governance` loads governance_interact and what it needs, not the token,
+vault or TEAL tooling. `ogc balance` asks a running watcher (watcher.py)
+first and only falls back to algod - and algosdk - when none answers.
+
+Installed by setup.py as the `ogc` console script (pip install -e .), or run
+in place with `python ogc_cli.py`.
+
+Usage:
+  ogc help
+  ogc <command> [args...]
+  ogc bench [runs]              # cold-start import cost per command (-X importtime)
+"""
+
+import os
+import sys
+
+# Configuration
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (command, module, arguments, summary) in help order, under section headings
+COMMANDS = [
+    "Wallets & balances",
+    ("balance", "check_any_balance", "[name|address ...]", "Balances, from the watcher when it runs"),
+    ("balances", "check_any_balance", "", "Interactive balance checker"),
+    ("wallet", "simple_wallet", "[balance|send <addr> <algo>|fund]", "Permanent wallet"),
+    ("keystore", "keystore", "<generate|list|bench> ...", "Load-test accounts"),
+    "Deploy",
+    ("deploy", None, "<type>", "Deploy simple|simple-multi|vault|sender|governance|echo|token"),
+    ("deployments", "deployments", "<list|show|import|verify|bench> ...", "Deployment registry"),
+    "Interact",
+    ("deposit", "simple_deposit", "<optin|info|members|deposit <algo>>", "Simple deposit app"),
+    ("vault", "vault_interact", "", "Crowdfunding vault menu"),
+    ("sender", "sender_interact", "", "Sender contract menu"),
+    ("governance", "governance_interact", "", "Governance contract menu"),
+    ("proposals", "proposals_interact", "", "Concurrent governance proposals"),
+    ("echo", "echo_interact", "", "Echo contract menu"),
+    ("token", "token_interact", "", "OGC token menu"),
+    ("votes", "vote_batch", "<create|sign|submit|status> ...", "Batched governance votes"),
+    ("bulk", "bulk_submit", "<contribute|vote|bench> ...", "Pipelined bulk contributions and votes"),
+    "Demos",
+    ("demo", "ogc_demo", "", "Interactive demo"),
+    ("full-demo", "full_demo", "", "Automated ecosystem demo"),
+    "Chain data & tooling",
+    ("state", "app_state", "<kind> [app_id]", "Decoded contract state"),
+    ("index", "chain_index", "<sync|add|history|votes|summary> ...", "Local activity index"),
+    ("watch", "watcher", "[status]", "Balance and app state watcher"),
+    ("localnet", "local_algod", "", "In-process algod for local runs"),
+    ("async", "ogc_async", "<balances|bench> ...", "asyncio API tools"),
+    ("sign", "batch_signer", "bench [count] [workers]", "Batch signer benchmark"),
+    ("avm", "avm", "bench", "In-process AVM benchmark"),
+    ("teal", "teal_assembler", "<assemble|disassemble> <file.teal>", "Offline TEAL assembler"),
+]
+DEPLOY_MODULES = {
+    "simple": "simple_deploy",
+    "simple-multi": "simple_deploy_multi",
+    "vault": "advanced_vault",
+    "sender": "sender_contract",
+    "governance": "governance_sender",
+    "echo": "echo_contract",
+    "token": "create_ogc_token",
+}
+
+
+def _commands():
+    return {entry[0]: entry for entry in COMMANDS if isinstance(entry, tuple)}
+
+
+def print_help():
+    print("🌟 OGC command line\n")
+    print("Usage: ogc <command> [args...]")
+    width = max(len(f"{name} {args}") for name, _, args, _ in _commands().values())
+    for entry in COMMANDS:
+        if isinstance(entry, str):
+            print(f"\n{entry}:")
+        else:
+            name, _, args, summary = entry
+            print(f"  {f'{name} {args}'.strip():<{width}}  {summary}")
+    print(f"\n  {'help':<{width}}  This list")
+    print(f"  {'bench [runs]':<{width}}  Cold-start import cost per command")
+
+
+def run_script(module, args):
+    """Run module as __main__ with args, the way `python module.py args` does"""
+    import runpy
+    sys.argv = [f"{module}.py"] + list(args)
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+
+
+def balance(args):
+    """Balances from a running watcher (no algosdk import); algod otherwise"""
+    from watcher_client import watched_accounts
+    accounts = watched_accounts()
+    chosen = [account for account in accounts.values()
+              if not args or account['address'] in args or account.get('name') in args]
+    # Every requested name or address must be watched, or algod answers for all of them
+    missing = [arg for arg in args if not any(arg in (account['address'], account.get('name')) for account in chosen)]
+    if chosen and not missing:
+        print(f"👀 From the watcher (round {max(account.get('round') or 0 for account in chosen)})")
+        for account in chosen:
+            print(f"\n💳 {account.get('name') or account['address']}:")
+            print(f"   Address: {account['address']}")
+            print(f"   Balance: {account['amount'] / 1_000_000} ALGO")
+        return
+    import check_any_balance
+    if args:
+        check_any_balance.check_balances(args)
+    else:
+        check_any_balance.check_all_wallets()
+
+
+def _import_cost(modules):
+    """(µs of imports reported by -X importtime, wall seconds) for a fresh
+    interpreter that imports modules"""
+    import subprocess
+    import time
+    code = "; ".join(f"import {module}" for module in modules)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=HERE)
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    total = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if line.startswith("import time:") and len(fields) == 3 and fields[1].strip().isdigit():
+            if not fields[2].startswith("  "):  # top level; nested imports are indented further
+                total += int(fields[1])
+    return total, wall
+
+
+def bench(runs=5):
+    """Median cold-start import cost of ogc commands vs the scripts and an eager CLI"""
+    eager = sorted({entry[1] for entry in _commands().values() if entry[1]} | set(DEPLOY_MODULES.values()))
+    scenarios = [
+        ("ogc help", ["ogc_cli"]),
+        ("ogc balance (watcher running)", ["ogc_cli", "watcher_client"]),
+        ("python check_any_balance.py", ["check_any_balance"]),
+        ("ogc governance", ["ogc_cli", "governance_interact"]),
+        ("python governance_interact.py", ["governance_interact"]),
+        ("ogc deployments", ["ogc_cli", "deployments"]),
+        (f"eager CLI (all {len(eager)} modules)", ["ogc_cli"] + eager),
+    ]
+    print(f"⏱️  Cold start, median of {runs} fresh interpreters")
+    print(f"   {'command':<36}{'imports':>10}{'wall':>10}")
+    for name, modules in scenarios:
+        samples = sorted(_import_cost(modules) for _ in range(runs))
+        imports, _ = samples[len(samples) // 2]
+        wall = sorted(wall for _, wall in samples)[len(samples) // 2]
+        print(f"   {name:<36}{imports / 1000:>8.1f}ms{wall * 1000:>8.1f}ms")
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    if not args or args[0] in ("help", "-h", "--help"):
+        print_help()
+        return
+    command, args = args[0], args[1:]
+    if command == "bench":
+        bench(int(args[0]) if args else 5)
+        return
+    if command == "balance":
+        balance(args)
+        return
+    if command == "deploy":
+        if not args or args[0] not in DEPLOY_MODULES:
+            print(f"💡 Usage: ogc deploy <{'|'.join(DEPLOY_MODULES)}>")
+            return
+        run_script(DEPLOY_MODULES[args[0]], args[1:])
+        return
+    entry = _commands().get(command)
+    if entry is None:
+        import difflib
+        print(f"❌ Unknown command: {command}")
+        close = difflib.get_close_matches(command, list(_commands()) + ["help", "bench"], n=3)
+        if close:
+            print(f"   Did you mean: {', '.join(close)}?")
+        print("   ogc help lists every command")
+        sys.exit(2)
+    run_script(entry[1], args)
+
+
+if __name__ == "__main__":
+    main()
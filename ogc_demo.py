@@ -4,19 +4,14 @@ OGC Interactive Demo
 Choose your own adventure through OGC features
 """
 
-import json
-import os
 import time
-from algosdk.v2client import algod
+from algod_client import get_algod_client
+from deployments import LABELS, NETWORK, TYPES, deployment_id, get_registry
 from wallet_selector import load_wallets
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 class InteractiveDemo:
     def __init__(self):
-        self.algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+        self.algod_client = get_algod_client()
         self.wallets = load_wallets()
         
     def print_banner(self):
@@ -44,10 +39,8 @@ class InteractiveDemo:
         print("\n🪙 OGC Token Demo")
         print("═" * 30)
         
-        if os.path.exists("ogc_token_info.json"):
-            with open("ogc_token_info.json", 'r') as f:
-                token_info = json.load(f)
-            
+        token_info = get_registry().latest("token")
+        if token_info:
             print(f"✅ OGC Token Found!")
             print(f"   Asset ID: {token_info['assetId']}")
             print(f"   Name: {token_info['name']}")
@@ -74,10 +67,8 @@ class InteractiveDemo:
         print("\n🏦 Advanced Vault Demo")
         print("═" * 30)
         
-        if os.path.exists("advanced_vault_deployment.json"):
-            with open("advanced_vault_deployment.json", 'r') as f:
-                vault_info = json.load(f)
-            
+        vault_info = get_registry().latest("vault")
+        if vault_info:
             print(f"✅ Advanced Vault Found!")
             print(f"   APP_ID: {vault_info['appId']}")
             print(f"   Goal: {vault_info['goal']/1_000_000} ALGO")
@@ -117,10 +108,8 @@ class InteractiveDemo:
         print("\n🗳️  Governance Demo")
         print("═" * 30)
         
-        if os.path.exists("governance_sender_deployment.json"):
-            with open("governance_sender_deployment.json", 'r') as f:
-                gov_info = json.load(f)
-            
+        gov_info = get_registry().latest("governance")
+        if gov_info:
             print(f"✅ Governance Contract Found!")
             print(f"   APP_ID: {gov_info['appId']}")
             print(f"   Owner: {gov_info['owner']}")
@@ -153,10 +142,8 @@ class InteractiveDemo:
         print("\n🔄 Echo Contract Demo")
         print("═" * 30)
         
-        if os.path.exists("echo_contract_deployment.json"):
-            with open("echo_contract_deployment.json", 'r') as f:
-                echo_info = json.load(f)
-            
+        echo_info = get_registry().latest("echo")
+        if echo_info:
             print(f"✅ Echo Contract Found!")
             print(f"   APP_ID: {echo_info['appId']}")
             print(f"   Address: {echo_info['appAddress']}")
@@ -247,47 +234,33 @@ class InteractiveDemo:
         print("\n📋 Deployment Status Check")
         print("═" * 40)
         
-        deployments = [
-            ("OGC Token", "ogc_token_info.json", "assetId"),
-            ("Simple Contract", "simple_deployment.json", "appId"),
-            ("Advanced Vault", "advanced_vault_deployment.json", "appId"),
-            ("Sender Contract", "sender_contract_deployment.json", "appId"),
-            ("Governance Contract", "governance_sender_deployment.json", "appId"),
-            ("Echo Contract", "echo_contract_deployment.json", "appId")
-        ]
-        
-        deployed_count = 0
-        total_count = len(deployments)
+        registry = get_registry()
+        deploy_commands = {
+            "token": "python create_ogc_token.py",
+            "simple": "python simple_deploy_multi.py",
+            "vault": "python advanced_vault.py",
+            "sender": "python sender_contract.py",
+            "governance": "python governance_sender.py",
+            "echo": "python echo_contract.py"
+        }
         
-        for name, filename, id_key in deployments:
-            if os.path.exists(filename):
-                try:
-                    with open(filename, 'r') as f:
-                        info = json.load(f)
-                    
-                    print(f"✅ {name}: {id_key.upper()} {info[id_key]}")
-                    deployed_count += 1
-                except Exception as e:
-                    print(f"❌ {name}: Error reading file - {e}")
-            else:
-                print(f"❌ {name}: Not deployed")
+        missing = []
+        for kind in TYPES:
+            records = registry.find(kind)
+            if not records:
+                print(f"❌ {LABELS[kind]}: Not deployed")
+                missing.append(kind)
+                continue
+            id_key = "assetId" if kind == "token" else "appId"
+            more = f" (+{len(records) - 1} older/tagged)" if len(records) > 1 else ""
+            print(f"✅ {LABELS[kind]}: {id_key.upper()} {deployment_id(records[-1])}{more}")
         
-        print(f"\n📊 Summary: {deployed_count}/{total_count} contracts deployed")
+        print(f"\n📊 Summary: {len(TYPES) - len(missing)}/{len(TYPES)} contracts deployed on {NETWORK}")
         
-        if deployed_count < total_count:
+        if missing:
             print(f"\n💡 To deploy missing contracts:")
-            missing = [
-                ("OGC Token", "python create_ogc_token.py"),
-                ("Simple Contract", "python simple_deploy_multi.py"),
-                ("Advanced Vault", "python advanced_vault.py"),
-                ("Sender Contract", "python sender_contract.py"),
-                ("Governance Contract", "python governance_sender.py"),
-                ("Echo Contract", "python echo_contract.py")
-            ]
-            
-            for i, (name, filename, _) in enumerate(deployments):
-                if not os.path.exists(filename):
-                    print(f"   {missing[i][1]}")
+            for kind in missing:
+                print(f"   {deploy_commands[kind]}")
                     
     def run(self):
         """Main demo loop"""
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Round-aware suggested_params cache
+
+Transactions built within the same round window share one suggested_params
+response instead of paying a round trip each. When the estimated round moves
+past the window the params are refreshed on a background thread, and the
+cached copy keeps being served meanwhile because its validity range is widened
+to the protocol maximum (1000 rounds) when it is fetched.
+
+Note: two identical transactions built from the same cached params have the
+same TxID. Add a note/lease when deliberately repeating a transaction.
+"""
+
+import copy
+import os
+import threading
+import time
+from algod_client import get_algod_client
+
+# Configuration
+ROUND_WINDOW = int(os.environ.get("PARAMS_ROUND_WINDOW", "4"))  # rounds to reuse params for
+BLOCK_TIME = float(os.environ.get("PARAMS_BLOCK_TIME", "2.8"))  # seconds, used to estimate rounds
+MAX_TXN_LIFE = 1000  # protocol limit on LastValid - FirstValid
+MIN_REMAINING_VALIDITY = 50  # refresh synchronously below this many rounds of validity
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class SuggestedParamsCache:
+    """Caches suggested_params for one algod client"""
+
+    def __init__(self, algod_client, round_window=ROUND_WINDOW, block_time=BLOCK_TIME):
+        self.algod_client = algod_client
+        self.round_window = round_window
+        self.block_time = block_time
+        self._params = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _fetch(self):
+        sp = self.algod_client.suggested_params()
+        # Widen to the full validity window so cached params cannot expire early
+        sp.last = sp.first + MAX_TXN_LIFE
+        return sp
+
+    def _estimated_round(self):
+        elapsed_rounds = int((time.monotonic() - self._fetched_at) / self.block_time)
+        return self._params.first + elapsed_rounds
+
+    def _store(self, sp):
+        with self._lock:
+            self._params = sp
+            self._fetched_at = time.monotonic()
+
+    def refresh(self):
+        """Fetch fresh params now"""
+        self._store(self._fetch())
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"⚠️  suggested_params refresh failed: {e}")
+        finally:
+            self._refreshing = False
+
+    def invalidate(self):
+        """Drop cached params (e.g. after a 'txn dead' rejection)"""
+        with self._lock:
+            self._params = None
+
+    def get(self):
+        """Return a copy of the cached params, refreshing when the round advances"""
+        with self._lock:
+            sp = self._params
+            if sp is not None:
+                current_round = self._estimated_round()
+                if sp.last - current_round >= MIN_REMAINING_VALIDITY:
+                    if current_round - sp.first >= self.round_window and not self._refreshing:
+                        self._refreshing = True
+                        threading.Thread(target=self._background_refresh, daemon=True).start()
+                    return copy.copy(sp)
+
+        # Nothing usable cached yet - fetch inline. Return what was fetched
+        # rather than re-reading _params, which a concurrent invalidate() may
+        # have cleared again
+        sp = self._fetch()
+        self._store(sp)
+        return copy.copy(sp)
+
+
+def get_params_cache(algod_client=None):
+    """Return the shared cache for an algod client (default: the process-wide one)"""
+    if algod_client is None:
+        algod_client = get_algod_client()
+    key = id(algod_client)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None or cache.algod_client is not algod_client:
+            cache = SuggestedParamsCache(algod_client)
+            _caches[key] = cache
+        return cache
+
+
+def get_suggested_params(algod_client=None):
+    """Drop-in replacement for algod_client.suggested_params()"""
+    return get_params_cache(algod_client).get()
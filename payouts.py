@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Payout lists shared by the sender and governance contracts
+
+Both contracts pay a list of (recipient, microAlgos) with chained inner
+payments. Every receiver must be referenced as a foreign account somewhere
+in the group (TEAL v9 resource sharing) and an app call holds at most 4, so
+each paying call is followed by no-op ref_accounts calls carrying the rest.
+The paying call's fee covers its inner payments.
+"""
+
+import copy
+import csv
+from algosdk import constants, encoding, transaction
+
+# Protocol limits
+ACCOUNTS_PER_TXN = 4  # foreign accounts one app call may reference
+MAX_GROUP_SIZE = 16
+INNER_TXNS_PER_CALL = 16
+PAYOUT_ENTRY_SIZE = 40  # recipient (32) + amount (8) in encode_payouts
+
+
+def load_payouts_csv(path):
+    """Read "address,amount_algo" rows (header optional) into [(address, microAlgos)]"""
+    payouts = []
+    with open(path, newline='') as f:
+        for line_no, row in enumerate(csv.reader(f), 1):
+            if not row or not row[0].strip() or row[0].startswith('#'):
+                continue
+            address = row[0].strip()
+            if line_no == 1 and not encoding.is_valid_address(address):
+                continue  # header
+            if not encoding.is_valid_address(address):
+                raise ValueError(f"line {line_no}: invalid address {address}")
+            amount_micro = int(round(float(row[1]) * 1_000_000))
+            if amount_micro <= 0:
+                raise ValueError(f"line {line_no}: amount must be positive")
+            payouts.append((address, amount_micro))
+    return payouts
+
+
+def encode_payouts(payouts):
+    """[(address, microAlgos)] -> 40-byte entries, as stored in the governance box"""
+    return b"".join(encoding.decode_address(address) + amount.to_bytes(8, 'big')
+                    for address, amount in payouts)
+
+
+def decode_payouts(data):
+    return [(encoding.encode_address(data[i:i + 32]), int.from_bytes(data[i + 32:i + 40], 'big'))
+            for i in range(0, len(data), PAYOUT_ENTRY_SIZE)]
+
+
+def payout_calls(sp, app_id, sender, batch, app_args, boxes=None):
+    """One paying app call for batch plus the ref_accounts calls its receivers need"""
+    recipients = [address for address, _ in batch]
+    call_sp = copy.copy(sp)
+    call_sp.flat_fee = True
+    call_sp.fee = (sp.min_fee or constants.MIN_TXN_FEE) * (1 + len(batch))
+    txns = [transaction.ApplicationNoOpTxn(
+        sender=sender, sp=call_sp, index=app_id, app_args=app_args,
+        accounts=recipients[:ACCOUNTS_PER_TXN], boxes=boxes
+    )]
+    for start in range(ACCOUNTS_PER_TXN, len(recipients), ACCOUNTS_PER_TXN):
+        txns.append(transaction.ApplicationNoOpTxn(
+            sender=sender, sp=sp, index=app_id, app_args=[b"ref_accounts"],
+            accounts=recipients[start:start + ACCOUNTS_PER_TXN], boxes=boxes
+        ))
+    return txns
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Interact with concurrent governance proposals
+
+Each proposal lives in its own "p" + id box next to the single global
+proposal of governance_interact.py, so flights, hotel and activities can be
+voted on in parallel. Votes are bits in the box's member-slot bitmap; the
+75% quorum and the chained payout work as for batch proposals. New
+proposals can only be opened while no global proposal is active, since both
+draw ids from the same counter.
+"""
+
+import base64
+import time
+from algosdk import transaction
+from algod_client import get_algod_client
+from bulk_submit import print_report, submit_pipelined
+from confirmations import wait_for_confirmation
+from governance_interact import load_governance_deployment, read_global_state
+from governance_sender import (MAX_PAYOUTS, PAYOUTS_PER_CALL, PROPOSAL_BOX_REFS, PROPOSAL_HEADER_SIZE,
+                               proposal_box_name)
+from params_cache import get_suggested_params
+from payouts import decode_payouts, encode_payouts, load_payouts_csv, payout_calls
+from roster import member_box_name
+from wallet_selector import select_wallet
+
+
+def _id_arg(proposal_id):
+    return proposal_id.to_bytes(8, 'big')
+
+
+def _box_refs(app_id, proposal_id):
+    return [(app_id, proposal_box_name(proposal_id))] * PROPOSAL_BOX_REFS
+
+
+def decode_proposal(proposal_id, value):
+    """Proposal box contents as a dict"""
+    return {
+        "id": proposal_id,
+        "votes": int.from_bytes(value[0:8], 'big'),
+        "payout_count": int.from_bytes(value[8:16], 'big'),
+        "payout_cursor": int.from_bytes(value[16:24], 'big'),
+        "total": int.from_bytes(value[24:32], 'big'),
+        "bitmap": value[32:PROPOSAL_HEADER_SIZE],
+        "payouts": decode_payouts(value[PROPOSAL_HEADER_SIZE:]),
+    }
+
+
+def has_voted(proposal, slot):
+    return bool(proposal["bitmap"][slot // 8] & (0x80 >> (slot % 8)))
+
+
+def read_proposal(algod_client, app_id, proposal_id):
+    box = algod_client.application_box_by_name(app_id, proposal_box_name(proposal_id))
+    return decode_proposal(proposal_id, base64.b64decode(box['value']))
+
+
+def read_open_proposals(algod_client, app_id):
+    """Every open proposal, oldest first"""
+    proposal_ids = []
+    for box in algod_client.application_boxes(app_id).get('boxes', []):
+        name = base64.b64decode(box['name'])
+        if len(name) == 9 and name.startswith(b"p"):
+            proposal_ids.append(int.from_bytes(name[1:], 'big'))
+    return [read_proposal(algod_client, app_id, pid) for pid in sorted(proposal_ids)]
+
+
+def build_open_proposal(sp, app_id, owner, payouts, proposal_id):
+    """open_proposal call; proposal_id must be the contract's next id (box_proposal_id global + 1)"""
+    if not 1 <= len(payouts) <= MAX_PAYOUTS:
+        raise ValueError(f"a proposal holds 1-{MAX_PAYOUTS} payouts")
+    return transaction.ApplicationNoOpTxn(
+        sender=owner, sp=sp, index=app_id,
+        app_args=[b"open_proposal", encode_payouts(payouts)],
+        boxes=_box_refs(app_id, proposal_id)
+    )
+
+
+def build_execute_proposal_group(sp, app_id, executor, proposal):
+    """execute_proposal calls for the unpaid payouts, as one unsigned atomic group"""
+    payouts = proposal["payouts"][proposal["payout_cursor"]:]
+    txns = []
+    for start in range(0, len(payouts), PAYOUTS_PER_CALL):
+        txns += payout_calls(sp, app_id, executor, payouts[start:start + PAYOUTS_PER_CALL],
+                             [b"execute_proposal", _id_arg(proposal["id"])],
+                             boxes=_box_refs(app_id, proposal["id"]))
+    if len(txns) > 1:
+        transaction.assign_group_id(txns)
+    return txns
+
+
+def _select_proposal(algod_client, app_id):
+    proposals = read_open_proposals(algod_client, app_id)
+    if not proposals:
+        print("❌ No open proposals")
+        return None
+    try:
+        proposal_id = int(input(f"Proposal id ({', '.join(str(p['id']) for p in proposals)}): "))
+    except ValueError:
+        print("❌ Invalid proposal id")
+        return None
+    for proposal in proposals:
+        if proposal["id"] == proposal_id:
+            return proposal
+    print(f"❌ Proposal {proposal_id} is not open")
+    return None
+
+
+def open_proposal():
+    """Open a new proposal paying one or more recipients (owner only)"""
+    gov_info = load_governance_deployment()
+    if not gov_info:
+        return
+
+    print("📝 Open Proposal")
+    print(f"   APP_ID: {gov_info['appId']}")
+    print(f"   CSV rows: address,amount_algo (up to {MAX_PAYOUTS})")
+
+    # Select wallet (must be owner)
+    proposer = select_wallet()
+    if not proposer:
+        return
+
+    if proposer['addr'] != gov_info['owner']:
+        print("❌ Only owner can open proposals")
+        return
+
+    path = input("Payouts CSV path: ").strip()
+    try:
+        payouts = load_payouts_csv(path)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"❌ Could not read payouts: {e}")
+        return
+
+    algod_client = get_algod_client()
+    sp = get_suggested_params(algod_client)
+
+    try:
+        state = read_global_state(algod_client, gov_info['appId'])
+        proposal_id = state.get('box_proposal_id', 0) + 1
+        txn = build_open_proposal(sp, gov_info['appId'], proposer['addr'], payouts, proposal_id)
+        tx_id = algod_client.send_transaction(txn.sign(proposer['sk']))
+        print(f"Sent proposal tx: {tx_id}")
+
+        confirmed = wait_for_confirmation(algod_client, tx_id, 4)
+        proposal_id = int.from_bytes(base64.b64decode(confirmed['logs'][0]), 'big')
+        print(f"✅ Proposal {proposal_id} opened!")
+        print(f"   {len(payouts)} recipient(s), {sum(a for _, a in payouts)/1_000_000} ALGO")
+
+    except Exception as e:
+        print(f"❌ Proposal failed: {e}")
+
+
+def list_proposals():
+    """List open proposals with their tallies"""
+    gov_info = load_governance_deployment()
+    if not gov_info:
+        return
+
+    algod_client = get_algod_client()
+    try:
+        contributors = read_global_state(algod_client, gov_info['appId']).get('total_contributors', 0)
+        proposals = read_open_proposals(algod_client, gov_info['appId'])
+    except Exception as e:
+        print(f"❌ Could not read proposals: {e}")
+        return
+
+    print(f"📋 Open Proposals ({len(proposals)}), {contributors} contributor(s)")
+    for proposal in proposals:
+        approved = proposal['votes'] * 4 >= contributors * 3
+        print(f"\n   #{proposal['id']}: {proposal['total']/1_000_000} ALGO to "
+              f"{proposal['payout_count']} recipient(s)")
+        print(f"   Votes: {proposal['votes']}/{contributors} {'✅ approved' if approved else ''}")
+        for address, amount in proposal['payouts']:
+            print(f"     {address}: {amount/1_000_000} ALGO")
+
+
+def vote_on_open_proposal():
+    """Vote YES on an open proposal (contributors only)"""
+    gov_info = load_governance_deployment()
+    if not gov_info:
+        return
+
+    voter = select_wallet()
+    if not voter:
+        return
+
+    algod_client = get_algod_client()
+    proposal = _select_proposal(algod_client, gov_info['appId'])
+    if not proposal:
+        return
+
+    sp = get_suggested_params(algod_client)
+    txn = transaction.ApplicationNoOpTxn(
+        sender=voter['addr'], sp=sp, index=gov_info['appId'],
+        app_args=[b"vote_proposal", _id_arg(proposal['id'])],
+        boxes=[(gov_info['appId'], member_box_name(voter['addr']))] + _box_refs(gov_info['appId'], proposal['id'])
+    )
+
+    try:
+        tx_id = algod_client.send_transaction(txn.sign(voter['sk']))
+        print(f"Sent vote tx: {tx_id}")
+
+        wait_for_confirmation(algod_client, tx_id, 4)
+        print(f"✅ {voter['name']} voted YES on proposal {proposal['id']}!")
+
+    except Exception as e:
+        print(f"❌ Vote failed: {e}")
+        print("   You must be a contributor and may only vote once per proposal")
+
+
+def execute_open_proposal():
+    """Pay out an approved proposal in one atomic group"""
+    gov_info = load_governance_deployment()
+    if not gov_info:
+        return
+
+    executor = select_wallet()
+    if not executor:
+        return
+
+    algod_client = get_algod_client()
+    proposal = _select_proposal(algod_client, gov_info['appId'])
+    if not proposal:
+        return
+
+    sp = get_suggested_params(algod_client)
+    group = build_execute_proposal_group(sp, gov_info['appId'], executor['addr'], proposal)
+
+    start = time.perf_counter()
+    outcome = submit_pipelined(algod_client, [[txn.sign(executor['sk']) for txn in group]])
+    print_report(f"Proposal {proposal['id']} execution", outcome, time.perf_counter() - start)
+    if outcome[0]['ok']:
+        print(f"✅ Proposal {proposal['id']} executed!")
+    else:
+        print(f"❌ Execution failed: {outcome[0]['error']}")
+        print("   Need 75% contributor approval")
+
+
+def cancel_open_proposal():
+    """Drop an open proposal (owner only)"""
+    gov_info = load_governance_deployment()
+    if not gov_info:
+        return
+
+    owner = select_wallet()
+    if not owner:
+        return
+
+    algod_client = get_algod_client()
+    proposal = _select_proposal(algod_client, gov_info['appId'])
+    if not proposal:
+        return
+
+    sp = get_suggested_params(algod_client)
+    txn = transaction.ApplicationNoOpTxn(
+        sender=owner['addr'], sp=sp, index=gov_info['appId'],
+        app_args=[b"cancel_proposal", _id_arg(proposal['id'])],
+        boxes=_box_refs(gov_info['appId'], proposal['id'])
+    )
+
+    try:
+        tx_id = algod_client.send_transaction(txn.sign(owner['sk']))
+        wait_for_confirmation(algod_client, tx_id, 4)
+        print(f"✅ Proposal {proposal['id']} cancelled")
+    except Exception as e:
+        print(f"❌ Cancel failed: {e}")
+
+
+def main():
+    """Main proposals menu"""
+    while True:
+        print("\n🗂️  Concurrent Proposals")
+        print("1. Open proposal (owner only)")
+        print("2. List open proposals")
+        print("3. Vote on a proposal")
+        print("4. Execute an approved proposal")
+        print("5. Cancel a proposal (owner only)")
+        print("6. Exit")
+
+        choice = input("Choose (1-6): ").strip()
+
+        if choice == "1":
+            open_proposal()
+        elif choice == "2":
+            list_proposals()
+        elif choice == "3":
+            vote_on_open_proposal()
+        elif choice == "4":
+            execute_open_proposal()
+        elif choice == "5":
+            cancel_open_proposal()
+        elif choice == "6":
+            break
+        else:
+            print("❌ Invalid choice")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Box-backed member rosters shared by the governance and simple deposit contracts
+
+Members no longer have to opt in: a member's record lives in a box named by
+their 32-byte address, and every member also gets a dense index (slot) in
+join order. Slots are packed 32 addresses per "r" + page box, so the whole
+roster is read back with one box read per 32 members.
+
+Boxes raise the app account's minimum balance. A page box grows by one
+32-byte entry per join rather than being created at its full 1 KB, so each
+new member adds only their own share: join_cost() µALGO, which their first
+governance contribution covers. The 0.1 ALGO minimum of the app account
+itself is not covered by anyone's contribution, so the deploy scripts fund
+the app with APP_FUNDING right after creating it. A simple deposit pays after
+its app call, so the simple app must already hold the join cost (see
+simple_deposit.DEPLOY_FUNDING).
+"""
+
+import base64
+from algosdk import encoding, error
+
+ROSTER_PAGE_SIZE = 32  # member addresses per roster page box (up to 1 KB, one box reference)
+BOX_MIN_BALANCE = 2_500  # µALGO per box, plus BOX_BYTE_MIN_BALANCE per byte of name and value
+BOX_BYTE_MIN_BALANCE = 400
+APP_FUNDING = 100_000  # µALGO sent to a new app: the minimum balance of its account
+
+
+def box_min_balance(name_length, size):
+    """Minimum balance a box of size bytes named with name_length bytes adds"""
+    return BOX_MIN_BALANCE + BOX_BYTE_MIN_BALANCE * (name_length + size)
+
+
+def join_cost(slot, record_size=0):
+    """µALGO of minimum balance the app gains when the member at slot joins:
+    their 32-byte roster entry, the page box itself for the first slot of a
+    page, and a record_size-byte member box (0 for members in local state)"""
+    cost = BOX_BYTE_MIN_BALANCE * 32
+    if slot % ROSTER_PAGE_SIZE == 0:
+        cost += box_min_balance(len(roster_box_name(0)), 0)
+    if record_size:
+        cost += box_min_balance(32, record_size)
+    return cost
+
+
+def join_shortfall(algod_client, app_address, slot, amount, record_size=0):
+    """µALGO the app would be short of its minimum balance if a new member
+    joined at slot with a first contribution of amount (0 when it is enough)"""
+    cost = join_cost(slot, record_size)
+    if amount >= cost:
+        return 0
+    info = algod_client.account_info(app_address)
+    return max(0, cost - amount - (info['amount'] - info['min-balance']))
+
+
+def member_box_name(address):
+    """Box holding the member record of address"""
+    return encoding.decode_address(address)
+
+
+def roster_box_name(page):
+    return b"r" + page.to_bytes(8, 'big')
+
+
+def roster_box_refs(app_id, first_slot, count=1):
+    """Box references for the roster pages holding slots first_slot .. first_slot + count - 1"""
+    first_page = first_slot // ROSTER_PAGE_SIZE
+    last_page = (first_slot + max(count, 1) - 1) // ROSTER_PAGE_SIZE
+    return [(app_id, roster_box_name(page)) for page in range(first_page, last_page + 1)]
+
+
+def join_box_refs(app_id, next_slot, first=None, count=1):
+    """Roster pages that `count` joining members may write. next_slot is the app's
+    member count when the calls were built; if every member ahead of them is new
+    and lands first, their slots start at `first`. Existing members and groups
+    landing out of order only move the slots down, by up to a page."""
+    first = next_slot if first is None else first
+    low = max(next_slot, first - ROSTER_PAGE_SIZE)
+    return roster_box_refs(app_id, low, first + count - low)
+
+
+def read_member_box(algod_client, app_id, address):
+    """Raw member record of address, or None if they are not a box member"""
+    try:
+        box = algod_client.application_box_by_name(app_id, member_box_name(address))
+    except error.AlgodHTTPError:
+        return None
+    return base64.b64decode(box['value'])
+
+
+def read_roster(algod_client, app_id, member_count):
+    """Member addresses in slot order"""
+    members = []
+    for page in range(-(-member_count // ROSTER_PAGE_SIZE)):
+        value = base64.b64decode(algod_client.application_box_by_name(app_id, roster_box_name(page))['value'])
+        for offset in range(0, len(value), 32):
+            if len(members) < member_count:
+                members.append(encoding.encode_address(value[offset:offset + 32]))
+    return members
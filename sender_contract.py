@@ -4,24 +4,22 @@ Sender Contract - Can send ALGO to any address
 Inherits wallet system from existing branch
 """
 
-import json
 import os
-import base64
-from algosdk.v2client import algod
 from algosdk import transaction, logic
 from algosdk.transaction import ApplicationCreateTxn, OnComplete
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import record_deployment
+from teal_compiler import compile_teal
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 def get_sender_contract_teal():
     """Generate sender contract TEAL code"""
-    approval_teal = """#pragma version 8
+    approval_teal = """#pragma version 9
 
 // Sender Contract - Can send ALGO to any address
 // Global state: owner (bytes), total_sent (uint64)
+// Version 9 so send_batch can pay accounts referenced by any call in its group
 
 txn ApplicationID
 int 0
@@ -59,11 +57,22 @@ handle_noop:
     ==
     bnz send_algo
     
+    txn ApplicationArgs 0
+    byte "send_batch"
+    ==
+    bnz send_batch
+    
     txn ApplicationArgs 0
     byte "get_balance"
     ==
     bnz get_balance
     
+    // Carries extra foreign accounts for a send_batch in the same group
+    txn ApplicationArgs 0
+    byte "ref_accounts"
+    ==
+    bnz get_balance
+    
     int 0
     return
 
@@ -111,24 +120,127 @@ send_algo:
     int 1
     return
 
+send_batch:
+    // Only owner can send
+    txn Sender
+    byte "owner"
+    app_global_get
+    ==
+    assert
+    
+    // args[1] = recipients (32 bytes each), args[2] = amounts (8 bytes each)
+    // n = number of payouts, 1..16 (inner transaction limit per call)
+    txn ApplicationArgs 2
+    len
+    int 8
+    /
+    store 0
+    
+    load 0
+    int 0
+    >
+    assert
+    
+    load 0
+    int 16
+    <=
+    assert
+    
+    txn ApplicationArgs 2
+    len
+    load 0
+    int 8
+    *
+    ==
+    assert
+    
+    txn ApplicationArgs 1
+    len
+    load 0
+    int 32
+    *
+    ==
+    assert
+    
+    // i = 0, total = 0
+    int 0
+    store 1
+    int 0
+    store 2
+    
+    itxn_begin
+    b batch_fields
+
+batch_next:
+    itxn_next
+
+batch_fields:
+    int pay
+    itxn_field TypeEnum
+    
+    txn ApplicationArgs 1
+    load 1
+    int 32
+    *
+    int 32
+    extract3
+    itxn_field Receiver
+    
+    txn ApplicationArgs 2
+    load 1
+    int 8
+    *
+    extract_uint64
+    dup
+    int 0
+    >
+    assert
+    dup
+    itxn_field Amount
+    load 2
+    +
+    store 2
+    
+    // Fees are pooled from the outer call
+    int 0
+    itxn_field Fee
+    
+    load 1
+    int 1
+    +
+    store 1
+    
+    load 1
+    load 0
+    <
+    bnz batch_next
+    
+    itxn_submit
+    
+    // Update total sent
+    byte "total_sent"
+    byte "total_sent"
+    app_global_get
+    load 2
+    +
+    app_global_put
+    
+    int 1
+    return
+
 get_balance:
     // Return current balance (for info)
     int 1
     return
 """
 
-    clear_teal = """#pragma version 8
+    clear_teal = """#pragma version 9
 int 1
 return
 """
     
     return approval_teal, clear_teal
 
-def compile_teal(algod_client, teal_source):
-    """Compile TEAL source code"""
-    compile_response = algod_client.compile(teal_source)
-    return base64.b64decode(compile_response['result'])
-
 def deploy_sender_contract():
     """Deploy sender contract"""
     print("📤 Deploy Sender Contract")
@@ -142,7 +254,7 @@ def deploy_sender_contract():
     print(f"Deploying sender contract with owner: {creator['addr']}")
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get TEAL code
     approval_teal, clear_teal = get_sender_contract_teal()
@@ -179,7 +291,7 @@ def deploy_sender_contract():
     print(f"Sent app create tx: {tx_id}")
     
     # Wait for confirmation
-    confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
     app_id = confirmed_txn["application-index"]
     
     if not app_id:
@@ -210,23 +322,20 @@ def deploy_sender_contract():
         
         signed_fund = fund_txn.sign(creator['sk'])
         fund_tx_id = algod_client.send_transaction(signed_fund)
-        transaction.wait_for_confirmation(algod_client, fund_tx_id, 4)
+        wait_for_confirmation(algod_client, fund_tx_id, 4)
         print(f"✅ Funded contract with {amount} ALGO")
     
     # Save deployment info
     deployment_info = {
         "appId": app_id,
         "appAddress": app_addr,
+        "createdRound": confirmed_txn["confirmed-round"],
         "owner": creator['addr'],
-        "network": "testnet",
-        "deployedBy": creator['name'],
-        "type": "sender_contract"
+        "deployedBy": creator['name']
     }
     
-    with open("sender_contract_deployment.json", 'w') as f:
-        json.dump(deployment_info, f, indent=2)
-    
-    print(f"Wrote sender_contract_deployment.json")
+    record = record_deployment("sender", deployment_info, approval_prog, clear_prog)
+    print("Recorded in deployments.json" + (f" (tag: {record['tag']})" if record['tag'] else ""))
     print(f"\n🎯 Next Steps:")
     print(f"1. Use: python sender_interact.py")
 
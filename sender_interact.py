@@ -3,25 +3,26 @@
 Interact with Sender Contract
 """
 
-import json
-import os
-from algosdk.v2client import algod
+import time
 from algosdk import transaction, encoding
+from algod_client import get_algod_client
+from app_state import get_state_reader
+from bulk_submit import print_report, submit_pipelined
+from confirmations import wait_for_confirmation
+from deployments import load_deployment
+from params_cache import get_suggested_params
+from payouts import ACCOUNTS_PER_TXN, INNER_TXNS_PER_CALL, MAX_GROUP_SIZE, load_payouts_csv, payout_calls
 from wallet_selector import select_wallet
 
 # Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
+PAYOUTS_PER_CALL = INNER_TXNS_PER_CALL  # inner payments one send_batch call may emit
 
 def load_sender_deployment():
     """Load sender deployment info"""
-    if not os.path.exists("sender_contract_deployment.json"):
-        print("❌ No sender_contract_deployment.json found")
+    info = load_deployment("sender")
+    if not info:
         print("Deploy sender first: python sender_contract.py")
-        return None
-    
-    with open("sender_contract_deployment.json", 'r') as f:
-        return json.load(f)
+    return info
 
 def send_from_contract():
     """Send ALGO from contract to any address"""
@@ -56,7 +57,7 @@ def send_from_contract():
     amount_micro = int(amount_algo * 1_000_000)
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Check contract balance first
     try:
@@ -74,7 +75,7 @@ def send_from_contract():
         return
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create app call transaction
     app_args = [
@@ -99,13 +100,96 @@ def send_from_contract():
         print(f"Sent transaction: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ Sent {amount_algo} ALGO to {recipient}")
         print(f"   TX: https://testnet.algoexplorer.io/tx/{tx_id}")
         
     except Exception as e:
         print(f"❌ Send failed: {e}")
 
+def build_payout_groups(sp, app_id, owner, payouts):
+    """Split payouts into the fewest send_batch calls and atomic groups (unsigned).
+
+    Each send_batch call pays up to PAYOUTS_PER_CALL recipients packed in its
+    app args; see payouts.py for how the receivers are referenced.
+    """
+    calls_per_group = MAX_GROUP_SIZE * ACCOUNTS_PER_TXN // PAYOUTS_PER_CALL
+    per_group = calls_per_group * PAYOUTS_PER_CALL
+    groups = []
+    for group_start in range(0, len(payouts), per_group):
+        txns = []
+        group_payouts = payouts[group_start:group_start + per_group]
+        for call_start in range(0, len(group_payouts), PAYOUTS_PER_CALL):
+            batch = group_payouts[call_start:call_start + PAYOUTS_PER_CALL]
+            app_args = [b"send_batch",
+                        b"".join(encoding.decode_address(address) for address, _ in batch),
+                        b"".join(amount.to_bytes(8, 'big') for _, amount in batch)]
+            txns += payout_calls(sp, app_id, owner, batch, app_args)
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        groups.append(txns)
+    return groups
+
+
+def send_batch_from_csv():
+    """Pay many recipients from the contract, listed in a CSV"""
+    sender_info = load_sender_deployment()
+    if not sender_info:
+        return
+    
+    print("📤 Batch Payout from Contract")
+    print(f"   APP_ID: {sender_info['appId']}")
+    print("   CSV rows: address,amount_algo")
+    
+    # Select wallet (must be owner)
+    caller = select_wallet()
+    if not caller:
+        return
+    
+    if caller['addr'] != sender_info['owner']:
+        print("❌ Only owner can send from contract")
+        print(f"   Owner: {sender_info['owner']}")
+        print(f"   You: {caller['addr']}")
+        return
+    
+    path = input("Payouts CSV path: ").strip()
+    try:
+        payouts = load_payouts_csv(path)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"❌ Could not read payouts: {e}")
+        return
+    if not payouts:
+        print("❌ No payouts in file")
+        return
+    
+    total_micro = sum(amount for _, amount in payouts)
+    algod_client = get_algod_client()
+    sp = get_suggested_params(algod_client)
+    groups = build_payout_groups(sp, sender_info['appId'], caller['addr'], payouts)
+    
+    print(f"\n📋 {len(payouts)} payout(s), {total_micro/1_000_000} ALGO total")
+    print(f"   {sum(len(g) for g in groups)} transaction(s) in {len(groups)} group(s)")
+    
+    try:
+        balance = algod_client.account_info(sender_info['appAddress'])['amount']
+        if balance < total_micro + 100000:  # contract keeps its min balance
+            print("❌ Insufficient contract balance")
+            print(f"   Contract has: {balance/1_000_000} ALGO")
+            return
+    except Exception as e:
+        print(f"❌ Could not check contract balance: {e}")
+        return
+    
+    confirm = input("Send payouts? (y/N): ").strip().lower()
+    if confirm != 'y':
+        print("Cancelled")
+        return
+    
+    signed_groups = [[txn.sign(caller['sk']) for txn in group] for group in groups]
+    start = time.perf_counter()
+    outcomes = submit_pipelined(algod_client, signed_groups)
+    print_report("Batch payouts", outcomes, time.perf_counter() - start)
+
 def check_sender_status():
     """Check sender contract status"""
     sender_info = load_sender_deployment()
@@ -117,12 +201,13 @@ def check_sender_status():
     print(f"   Address: {sender_info['appAddress']}")
     print(f"   Owner: {sender_info['owner']}")
     
-    # Check balance
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    # Check balance and state
+    reader = get_state_reader()
     try:
-        account_info = algod_client.account_info(sender_info['appAddress'])
-        balance = account_info['amount'] / 1_000_000
+        balance = reader.balance(sender_info['appAddress']) / 1_000_000
+        state = reader.global_state(sender_info['appId'], "sender")
         print(f"   Balance: {balance} ALGO")
+        print(f"   Total sent: {state['total_sent']/1_000_000} ALGO")
         
         print(f"   Explorer: https://testnet.algoexplorer.io/address/{sender_info['appAddress']}")
         
@@ -146,10 +231,10 @@ def fund_sender_contract():
     amount_micro = int(amount_algo * 1_000_000)
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create funding transaction
     fund_txn = transaction.PaymentTxn(
@@ -168,7 +253,7 @@ def fund_sender_contract():
         print(f"Sent funding tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ Funded contract with {amount_algo} ALGO")
         
     except Exception as e:
@@ -179,19 +264,22 @@ def main():
     while True:
         print("\n📤 Sender Contract Interaction")
         print("1. Send ALGO from contract")
-        print("2. Fund contract")
-        print("3. Check contract status")
-        print("4. Exit")
+        print("2. Batch payout from CSV")
+        print("3. Fund contract")
+        print("4. Check contract status")
+        print("5. Exit")
         
-        choice = input("Choose (1-4): ").strip()
+        choice = input("Choose (1-5): ").strip()
         
         if choice == "1":
             send_from_contract()
         elif choice == "2":
-            fund_sender_contract()
+            send_batch_from_csv()
         elif choice == "3":
-            check_sender_status()
+            fund_sender_contract()
         elif choice == "4":
+            check_sender_status()
+        elif choice == "5":
             break
         else:
             print("❌ Invalid choice")
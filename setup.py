@@ -1,14 +1,33 @@
 #!/usr/bin/env python3
 """
-Simple setup for Algorand Smart Contract System
+Setup for the Algorand Smart Contract System - installs the `ogc` command
+
+  pip install -e .      # editable: the scripts keep reading wallets.json,
+                        # deployments.json and the .teal files from this folder
+  ogc help
 """
 
-print("🚀 Algorand Smart Contract System")
-print("\n📋 Available Commands:")
-print("1. Deploy contract: python simple_deploy.py")
-print("2. Interact with contract: python simple_deposit.py <command>")
-print("3. Manage wallet: python simple_wallet.py <command>")
-print("\n💡 Quick start:")
-print("  source venv/bin/activate")
-print("  python simple_wallet.py balance")
-print("  python simple_deposit.py deposit 2")
+import os
+from setuptools import setup
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _modules():
+    """Every top-level script; they import each other as flat modules"""
+    return sorted(name[:-3] for name in os.listdir(HERE) if name.endswith(".py") and name != "setup.py")
+
+
+def _requirements():
+    with open(os.path.join(HERE, "requirements.txt"), 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+setup(
+    name="ogc",
+    version="0.1.0",
+    description="Out The Groupchat - group payments, vaults and governance on Algorand",
+    py_modules=_modules(),
+    install_requires=_requirements(),
+    entry_points={"console_scripts": ["ogc=ogc_cli:main"]},
+)
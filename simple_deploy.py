@@ -1,25 +1,23 @@
 #!/usr/bin/env python3
 """
-Deploys the TEAL app and writes simple_deployment.json with the appId
+Deploys the TEAL app and records its appId in deployments.json
 Network: TestNet via Algonode (no token needed)
 """
 
 import json
 import os
-import base64
-from algosdk.v2client import algod
 from algosdk import mnemonic, account, transaction, logic, encoding
 from algosdk.transaction import ApplicationCreateTxn, OnComplete
-
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""  # not needed for Algonode
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import record_deployment
+from simple_deposit import CONTRACT_VERSION, DEPLOY_FUNDING
+from teal_compiler import compile_teal
 
 # File paths
 APPROVAL_PATH = os.path.join(os.path.dirname(__file__), "simple_approval.teal")
 CLEAR_PATH = os.path.join(os.path.dirname(__file__), "simple_clear.teal")
 WALLET_PATH = os.path.join(os.path.dirname(__file__), "permanent_wallet.json")
-OUT_PATH = os.path.join(os.path.dirname(__file__), "simple_deployment.json")
 
 
 def load_account():
@@ -51,16 +49,10 @@ def load_account():
     return {"addr": file_addr, "sk": private_key}
 
 
-def compile_teal(algod_client, teal_source):
-    """Compile TEAL source code"""
-    compile_response = algod_client.compile(teal_source)
-    return base64.b64decode(compile_response['result'])
-
-
 def main():
     """Main deployment function"""
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Load account
     creator = load_account()
@@ -76,10 +68,10 @@ def main():
     approval_prog = compile_teal(algod_client, approval_teal)
     clear_prog = compile_teal(algod_client, clear_teal)
     
-    # Schema: 1 local uint ("d"); no globals
+    # Schema: 1 local uint ("d"); 1 global uint ("n", box depositors)
     local_ints = 1
     local_bytes = 0
-    global_ints = 0
+    global_ints = 1
     global_bytes = 0
     
     print(f"Using sender address: {creator['addr']}")
@@ -106,7 +98,7 @@ def main():
     print(f"Sent app create tx: {tx_id}")
     
     # Wait for confirmation
-    confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
     app_id = confirmed_txn["application-index"]
     
     if not app_id:
@@ -115,6 +107,13 @@ def main():
     # Get app address
     app_addr = logic.get_application_address(app_id)
     
+    # Fund the app account's own minimum balance plus the first depositor's
+    # boxes; later ones are covered by the deposits the app keeps
+    fund_txn = transaction.PaymentTxn(creator['addr'], sp, app_addr, DEPLOY_FUNDING)
+    fund_tx_id = algod_client.send_transaction(fund_txn.sign(creator['sk']))
+    wait_for_confirmation(algod_client, fund_tx_id, 4)
+    print(f"Funded app account with {DEPLOY_FUNDING / 1_000_000} ALGO (minimum balance and first depositor's boxes)")
+    
     print(f"Deployed App ID: {app_id}")
     print(f"App Address: {app_addr}")
     
@@ -122,13 +121,12 @@ def main():
     deployment_info = {
         "appId": app_id,
         "appAddress": app_addr,
-        "network": "testnet"
+        "createdRound": confirmed_txn["confirmed-round"],
+        "contractVersion": CONTRACT_VERSION
     }
     
-    with open(OUT_PATH, 'w') as f:
-        json.dump(deployment_info, f, indent=2)
-    
-    print(f"Wrote {OUT_PATH}")
+    record = record_deployment("simple", deployment_info, approval_prog, clear_prog)
+    print("Recorded in deployments.json" + (f" (tag: {record['tag']})" if record['tag'] else ""))
 
 
 if __name__ == "__main__":
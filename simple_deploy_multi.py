@@ -3,32 +3,24 @@
 Deploy with wallet selection
 """
 
-import json
 import os
-import base64
-from algosdk.v2client import algod
 from algosdk import transaction, logic
 from algosdk.transaction import ApplicationCreateTxn, OnComplete
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import record_deployment
+from simple_deposit import CONTRACT_VERSION, DEPLOY_FUNDING
+from teal_compiler import compile_teal
 from wallet_selector import select_wallet
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 # File paths
 APPROVAL_PATH = os.path.join(os.path.dirname(__file__), "simple_approval.teal")
 CLEAR_PATH = os.path.join(os.path.dirname(__file__), "simple_clear.teal")
-OUT_PATH = os.path.join(os.path.dirname(__file__), "simple_deployment.json")
-
-def compile_teal(algod_client, teal_source):
-    """Compile TEAL source code"""
-    compile_response = algod_client.compile(teal_source)
-    return base64.b64decode(compile_response['result'])
 
 def main():
     """Main deployment function with wallet selection"""
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Select wallet
     print("🚀 Deploy Smart Contract")
@@ -48,10 +40,10 @@ def main():
     approval_prog = compile_teal(algod_client, approval_teal)
     clear_prog = compile_teal(algod_client, clear_teal)
     
-    # Schema: 1 local uint ("d"); no globals
+    # Schema: 1 local uint ("d"); 1 global uint ("n", box depositors)
     local_ints = 1
     local_bytes = 0
-    global_ints = 0
+    global_ints = 1
     global_bytes = 0
     
     print(f"Using sender address: {creator['addr']}")
@@ -78,7 +70,7 @@ def main():
     print(f"Sent app create tx: {tx_id}")
     
     # Wait for confirmation
-    confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
     app_id = confirmed_txn["application-index"]
     
     if not app_id:
@@ -87,6 +79,13 @@ def main():
     # Get app address
     app_addr = logic.get_application_address(app_id)
     
+    # Fund the app account's own minimum balance plus the first depositor's
+    # boxes; later ones are covered by the deposits the app keeps
+    fund_txn = transaction.PaymentTxn(creator['addr'], sp, app_addr, DEPLOY_FUNDING)
+    fund_tx_id = algod_client.send_transaction(fund_txn.sign(creator['sk']))
+    wait_for_confirmation(algod_client, fund_tx_id, 4)
+    print(f"Funded app account with {DEPLOY_FUNDING / 1_000_000} ALGO (minimum balance and first depositor's boxes)")
+    
     print(f"✅ Deployed App ID: {app_id}")
     print(f"   App Address: {app_addr}")
     print(f"   Deployed by: {creator['name']}")
@@ -95,15 +94,14 @@ def main():
     deployment_info = {
         "appId": app_id,
         "appAddress": app_addr,
-        "network": "testnet",
+        "createdRound": confirmed_txn["confirmed-round"],
+        "contractVersion": CONTRACT_VERSION,
         "deployedBy": creator['name'],
         "deployerAddress": creator['addr']
     }
     
-    with open(OUT_PATH, 'w') as f:
-        json.dump(deployment_info, f, indent=2)
-    
-    print(f"Wrote {OUT_PATH}")
+    record = record_deployment("simple", deployment_info, approval_prog, clear_prog)
+    print("Recorded in deployments.json" + (f" (tag: {record['tag']})" if record['tag'] else ""))
 
 if __name__ == "__main__":
     try:
@@ -3,29 +3,42 @@
 Interacts with the app:
   python simple_deposit.py optin
   python simple_deposit.py deposit 1
+  python simple_deposit.py deposit 1 --optin
   python simple_deposit.py info
+  python simple_deposit.py members
 
 Deposits must be grouped as [AppCall("deposit"), Payment], both from the same sender.
 When your cumulative deposits reach 2 ALGO, the app inner-sends 2 ALGO back and logs "success".
+Opting in is optional: without it your running total is kept in a box named by
+your address, and you are listed in the app's box roster. With --optin the
+first deposit's app call is the OptIn itself, so opting in costs no extra round.
 """
 
 import json
 import os
 import sys
 import base64
-from algosdk.v2client import algod
-from algosdk import mnemonic, account, transaction, logic
+from algosdk import mnemonic, account, logic
 from algosdk.transaction import (
     ApplicationOptInTxn, ApplicationCallTxn, PaymentTxn, OnComplete, assign_group_id
 )
-
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""  # not needed for Algonode
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from app_state import get_state_reader, read_global_state
+from deployments import contract_version, get_registry
+from roster import APP_FUNDING, join_box_refs, join_cost, member_box_name
 
 # File paths
 WALLET_PATH = os.path.join(os.path.dirname(__file__), "permanent_wallet.json")
-DEPLOY_PATH = os.path.join(os.path.dirname(__file__), "simple_deployment.json")
+
+REFUND = 2_000_000  # the app sends this back once a running total reaches it
+MEMBER_RECORD_SIZE = 16  # total, roster index in a box depositor's record
+# The deposit's app call runs before its payment lands, so a depositor's new
+# boxes are paid from what the app already holds: deploy covers the first one
+DEPLOY_FUNDING = APP_FUNDING + join_cost(0, MEMBER_RECORD_SIZE)
+# Recorded by the deploy scripts. Version 1 (legacy simple_deployment.json apps)
+# is opt-in only: no depositor boxes, no "n", so this client can't drive it
+CONTRACT_VERSION = 2
 
 
 def load_account():
@@ -44,16 +57,22 @@ def load_account():
 
 
 def load_deployment():
-    """Load deployment info from simple_deployment.json"""
-    with open(DEPLOY_PATH, 'r') as f:
-        deploy_data = json.load(f)
-    
-    if 'appId' not in deploy_data:
-        raise ValueError("simple_deployment.json missing appId")
+    """Load the simple app's deployment info from the registry"""
+    deploy_data = get_registry().latest("simple")
+    if deploy_data is None:
+        raise ValueError("No simple app in deployments.json (deploy with simple_deploy.py)")
+    if contract_version(deploy_data) < CONTRACT_VERSION:
+        raise ValueError(f"Simple app {deploy_data['appId']} runs the version {contract_version(deploy_data)} "
+                         "program, which has no depositor boxes - redeploy with simple_deploy.py")
     
     return deploy_data
 
 
+def box_depositor_count(algod_client, app_id):
+    """Global "n": depositors that joined through the box roster"""
+    return read_global_state(algod_client, app_id).get('n', 0)
+
+
 def text_arg(s):
     """Convert string to bytes for app arguments"""
     return s.encode('utf-8')
@@ -61,7 +80,7 @@ def text_arg(s):
 
 def print_logs_from_tx(algod_client, tx_id):
     """Print logs and inner transactions from a transaction"""
-    confirmed_txn = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    confirmed_txn = wait_for_confirmation(algod_client, tx_id, 4)
     
     # Print logs
     logs = confirmed_txn.get('logs', [])
@@ -94,7 +113,7 @@ def do_opt_in(algod_client, acct, app_id):
     tx_id = algod_client.send_transaction(signed_txn)
     
     print(f"Sent opt-in tx: {tx_id}")
-    transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    wait_for_confirmation(algod_client, tx_id, 4)
     print("Opt-in confirmed")
 
 
@@ -117,8 +136,8 @@ def do_info(algod_client, acct, app_id):
     print_logs_from_tx(algod_client, tx_id)
 
 
-def do_deposit(algod_client, acct, app_id, algos):
-    """Make a deposit to the application"""
+def do_deposit(algod_client, acct, app_id, algos, opt_in=False):
+    """Make a deposit to the application (opting in with the same app call if opt_in)"""
     if not isinstance(algos, (int, float)) or algos <= 0:
         raise ValueError("Deposit amount must be a positive number of ALGOs")
     
@@ -126,14 +145,27 @@ def do_deposit(algod_client, acct, app_id, algos):
     
     sp = algod_client.suggested_params()
     app_addr = logic.get_application_address(app_id)
+    next_slot = box_depositor_count(algod_client, app_id)
+    
+    # A new box depositor's record and roster entry raise the app's minimum
+    # balance before this payment arrives, as does any 2 ALGO refund
+    if not opt_in and get_state_reader(algod_client).member(app_id, "simple", acct['addr']) is None:
+        needed = join_cost(next_slot, MEMBER_RECORD_SIZE) + (REFUND + 1000 if amount >= REFUND else 0)
+        app_info = algod_client.account_info(app_addr)
+        spare = app_info['amount'] - app_info['min-balance']
+        if spare < needed:
+            raise ValueError(f"the app holds {spare / 1_000_000} ALGO spare but needs {needed / 1_000_000} "
+                             f"to add your depositor box - fund {app_addr} or use --optin")
     
     # 1) App call first
     app_call_txn = ApplicationCallTxn(
         sender=acct['addr'],
         sp=sp,
         index=app_id,
-        on_complete=OnComplete.NoOpOC,
-        app_args=[text_arg("deposit")]
+        on_complete=OnComplete.OptInOC if opt_in else OnComplete.NoOpOC,
+        app_args=[text_arg("deposit")],
+        boxes=[(app_id, member_box_name(acct['addr']))]
+              + join_box_refs(app_id, next_slot)
     )
     
     # 2) Payment second
@@ -158,23 +190,34 @@ def do_deposit(algod_client, acct, app_id, algos):
     print_logs_from_tx(algod_client, tx_id)
 
 
+def do_members(algod_client, app_id):
+    """List box depositors in join order with their running totals"""
+    members = get_state_reader(algod_client).members(app_id, "simple")
+    print(f"Box depositors: {len(members)}")
+    for index, (address, record) in enumerate(members.items()):
+        total = record['d'] if record else 0
+        print(f"  #{index} {address}: {total / 1_000_000} ALGO toward the next refund")
+
+
 def main():
     """Main function"""
     if len(sys.argv) < 2:
         print("Usage:")
         print("  python simple_deposit.py optin")
         print("  python simple_deposit.py deposit 1")
+        print("  python simple_deposit.py deposit 1 --optin")
         print("  python simple_deposit.py info")
+        print("  python simple_deposit.py members")
         sys.exit(1)
     
     cmd = sys.argv[1]
-    if cmd not in ["optin", "deposit", "info"]:
-        print("Invalid command. Use: optin, deposit, or info")
+    if cmd not in ["optin", "deposit", "info", "members"]:
+        print("Invalid command. Use: optin, deposit, info, or members")
         sys.exit(1)
     
     try:
         # Initialize client and load data
-        algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+        algod_client = get_algod_client()
         acct = load_account()
         deployment = load_deployment()
         app_id = deployment['appId']
@@ -184,11 +227,13 @@ def main():
             do_opt_in(algod_client, acct, app_id)
         elif cmd == "info":
             do_info(algod_client, acct, app_id)
+        elif cmd == "members":
+            do_members(algod_client, app_id)
         elif cmd == "deposit":
             if len(sys.argv) < 3:
                 raise ValueError("Please provide an amount in ALGO, e.g. 'deposit 1'")
             amount = float(sys.argv[2])
-            do_deposit(algod_client, acct, app_id, amount)
+            do_deposit(algod_client, acct, app_id, amount, opt_in="--optin" in sys.argv[3:])
     
     except Exception as e:
         error_msg = str(e).lower()
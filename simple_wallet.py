@@ -5,20 +5,19 @@ Simple Reusable Wallet Manager
 Creates and manages a permanent wallet address for ALGO transactions.
 """
 
+import base64
 import json
 import os
 import sys
 from datetime import datetime
-from algosdk.v2client import algod
-from algosdk import mnemonic, account, transaction
+from algosdk import mnemonic, account
 from algosdk.transaction import PaymentTxn
-
-# Algorand Testnet configuration
-ALGOD_TOKEN = ""
-ALGOD_SERVER = "https://testnet-api.algonode.cloud"
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from watcher_client import watched_account
 
 # Create Algod client
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_SERVER)
+algod_client = get_algod_client()
 
 WALLET_FILE = "permanent_wallet.json"
 
@@ -34,7 +33,7 @@ def create_permanent_wallet():
     wallet = {
         "address": address,
         "mnemonic": wallet_mnemonic,
-        "privateKey": list(private_key),
+        "privateKey": private_key,  # algosdk base64 key, used as-is
         "createdAt": datetime.now().isoformat(),
         "type": "permanent"
     }
@@ -88,9 +87,16 @@ def load_permanent_wallet():
 
 def get_account_from_wallet(wallet):
     """Get account object from wallet"""
-    # If we have privateKey array, use it; otherwise derive from mnemonic
-    if wallet.get('privateKey') and isinstance(wallet['privateKey'], list):
-        private_key = bytes(wallet['privateKey'])
+    # Use the stored privateKey if there is one; otherwise derive from mnemonic
+    stored_key = wallet.get('privateKey')
+    if isinstance(stored_key, str) and stored_key:
+        private_key = stored_key
+    elif isinstance(stored_key, list) and stored_key:
+        # Older files: the key as a list of ints, or of base64 characters
+        if all(isinstance(c, str) for c in stored_key):
+            private_key = "".join(stored_key)
+        else:
+            private_key = base64.b64encode(bytes(stored_key)).decode()
     elif wallet.get('mnemonic'):
         private_key = mnemonic.to_private_key(wallet['mnemonic'])
     else:
@@ -103,9 +109,9 @@ def get_account_from_wallet(wallet):
 
 
 def check_balance(address):
-    """Check account balance"""
+    """Check account balance (from the watcher when one is running)"""
     try:
-        account_info = algod_client.account_info(address)
+        account_info = watched_account(address) or algod_client.account_info(address)
         balance = account_info['amount'] / 1e6
         return balance
     except Exception as error:
@@ -158,7 +164,7 @@ def send_algo(from_wallet, to_address, amount):
         print(f"📤 Transaction sent: {tx_id}")
         
         # Wait for confirmation
-        result = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        result = wait_for_confirmation(algod_client, tx_id, 4)
         print("✅ Transaction confirmed!")
         
         return tx_id
@@ -186,10 +192,11 @@ def main():
             if not funded:
                 print("❌ Please fund your wallet first.")
                 return
+            balance = check_balance(wallet['address'])
         
         print("\n🎯 Your Permanent Wallet:")
         print(f"📍 Address: {wallet['address']}")
-        print(f"💰 Balance: {check_balance(wallet['address'])} ALGO")
+        print(f"💰 Balance: {balance} ALGO")
         
         print("\n📋 Available Commands:")
         print("1. Check balance: python simple_wallet.py balance")
@@ -205,7 +212,6 @@ def main():
             print("  python simple_wallet.py send <address> <amount>")
             print("  python simple_wallet.py fund")
         elif args[0] == "balance":
-            balance = check_balance(wallet['address'])
             print(f"💰 Balance: {balance} ALGO")
         elif args[0] == "send" and len(args) >= 3:
             to_address = args[1]
@@ -0,0 +1,862 @@
+#!/usr/bin/env python3
+"""
+Offline TEAL assembler and disassembler
+
+Turns the TEAL our contracts use into the same bytecode algod's /compile
+returns, without a network round trip:
+  - `int` / `byte` / `addr` / `method` constants are pooled into
+    intcblock / bytecblock the way algod does it (most used first,
+    single-use constants become pushint / pushbytes)
+  - labels and branch offsets are resolved locally
+  - program_address() / application_address() derive the program hash
+    and app account address
+
+Usage:
+  python teal_assembler.py assemble <file.teal>
+  python teal_assembler.py disassemble <file.teal>   (round trip check)
+"""
+
+import base64
+import hashlib
+import re
+import sys
+from algosdk import encoding, logic
+
+
+class TealAssemblyError(ValueError):
+    """Raised when TEAL source cannot be assembled"""
+
+
+# Bump whenever the bytecode assembled for some source changes, so
+# teal_compiler's cache stops serving what older assemblers produced
+ASSEMBLER_VERSION = 1
+
+# Branches and constants that change shape with the program version
+BACK_BRANCH_VERSION = 4
+OPTIMIZE_CONSTANTS_VERSION = 4
+MAX_TEAL_VERSION = 10
+
+TXN_FIELDS = [
+    "Sender", "Fee", "FirstValid", "FirstValidTime", "LastValid", "Note", "Lease",
+    "Receiver", "Amount", "CloseRemainderTo", "VotePK", "SelectionPK", "VoteFirst",
+    "VoteLast", "VoteKeyDilution", "Type", "TypeEnum", "XferAsset", "AssetAmount",
+    "AssetSender", "AssetReceiver", "AssetCloseTo", "GroupIndex", "TxID",
+    "ApplicationID", "OnCompletion", "ApplicationArgs", "NumAppArgs", "Accounts",
+    "NumAccounts", "ApprovalProgram", "ClearStateProgram", "RekeyTo", "ConfigAsset",
+    "ConfigAssetTotal", "ConfigAssetDecimals", "ConfigAssetDefaultFrozen",
+    "ConfigAssetUnitName", "ConfigAssetName", "ConfigAssetURL",
+    "ConfigAssetMetadataHash", "ConfigAssetManager", "ConfigAssetReserve",
+    "ConfigAssetFreeze", "ConfigAssetClawback", "FreezeAsset", "FreezeAssetAccount",
+    "FreezeAssetFrozen", "Assets", "NumAssets", "Applications", "NumApplications",
+    "GlobalNumUint", "GlobalNumByteSlice", "LocalNumUint", "LocalNumByteSlice",
+    "ExtraProgramPages", "Nonparticipation", "Logs", "NumLogs", "CreatedAssetID",
+    "CreatedApplicationID", "LastLog", "StateProofPK", "ApprovalProgramPages",
+    "NumApprovalProgramPages", "ClearStateProgramPages", "NumClearStateProgramPages",
+]
+
+# Fields that take an array index (txna / gtxna / ...)
+TXN_ARRAY_FIELDS = {
+    "ApplicationArgs", "Accounts", "Assets", "Applications", "Logs",
+    "ApprovalProgramPages", "ClearStateProgramPages",
+}
+
+GLOBAL_FIELDS = [
+    "MinTxnFee", "MinBalance", "MaxTxnLife", "ZeroAddress", "GroupSize",
+    "LogicSigVersion", "Round", "LatestTimestamp", "CurrentApplicationID",
+    "CreatorAddress", "CurrentApplicationAddress", "GroupID", "OpcodeBudget",
+    "CallerApplicationID", "CallerApplicationAddress", "AssetCreateMinBalance",
+    "AssetOptInMinBalance", "GenesisHash",
+]
+
+ASSET_HOLDING_FIELDS = ["AssetBalance", "AssetFrozen"]
+
+ASSET_PARAMS_FIELDS = [
+    "AssetTotal", "AssetDecimals", "AssetDefaultFrozen", "AssetUnitName",
+    "AssetName", "AssetURL", "AssetMetadataHash", "AssetManager", "AssetReserve",
+    "AssetFreeze", "AssetClawback", "AssetCreator",
+]
+
+APP_PARAMS_FIELDS = [
+    "AppApprovalProgram", "AppClearStateProgram", "AppGlobalNumUint",
+    "AppGlobalNumByteSlice", "AppLocalNumUint", "AppLocalNumByteSlice",
+    "AppExtraProgramPages", "AppCreator", "AppAddress",
+]
+
+ACCT_PARAMS_FIELDS = [
+    "AcctBalance", "AcctMinBalance", "AcctAuthAddr", "AcctTotalNumUint",
+    "AcctTotalNumByteSlice", "AcctTotalExtraAppPages", "AcctTotalAppsCreated",
+    "AcctTotalAppsOptedIn", "AcctTotalAssetsCreated", "AcctTotalAssets",
+    "AcctTotalBoxes", "AcctTotalBoxBytes",
+]
+
+# Named constants accepted by `int`
+NAMED_INTS = {
+    # TypeEnum
+    "unknown": 0, "pay": 1, "keyreg": 2, "acfg": 3, "axfer": 4, "afrz": 5, "appl": 6,
+    # OnCompletion
+    "NoOp": 0, "OptIn": 1, "CloseOut": 2, "ClearState": 3,
+    "UpdateApplication": 4, "DeleteApplication": 5,
+}
+
+# name -> (opcode, immediate layout, min version)
+# Immediate layouts:
+#   ""       no immediates
+#   "u8"     one uint8            "u8u8"  two uint8
+#   "i8"     one int8             "label" 2-byte branch offset
+#   "txn"    txn field            "txna"  txn field + uint8 index
+#   "gtxn"   uint8 + txn field    "gtxna" uint8 + txn field + uint8
+#   "global" global field         "asset_holding" / "asset_params" / ... field enums
+#   "varuint" / "bytes"           pushint / pushbytes
+#   "intcblock" / "bytecblock" / "pushints" / "pushbytess" / "labels"
+OPCODES = {
+    "err": (0x00, "", 1), "sha256": (0x01, "", 1), "keccak256": (0x02, "", 1),
+    "sha512_256": (0x03, "", 1), "ed25519verify": (0x04, "", 1),
+    "+": (0x08, "", 1), "-": (0x09, "", 1), "/": (0x0a, "", 1), "*": (0x0b, "", 1),
+    "<": (0x0c, "", 1), ">": (0x0d, "", 1), "<=": (0x0e, "", 1), ">=": (0x0f, "", 1),
+    "&&": (0x10, "", 1), "||": (0x11, "", 1), "==": (0x12, "", 1), "!=": (0x13, "", 1),
+    "!": (0x14, "", 1), "len": (0x15, "", 1), "itob": (0x16, "", 1), "btoi": (0x17, "", 1),
+    "%": (0x18, "", 1), "|": (0x19, "", 1), "&": (0x1a, "", 1), "^": (0x1b, "", 1),
+    "~": (0x1c, "", 1), "mulw": (0x1d, "", 1), "addw": (0x1e, "", 2),
+    "divmodw": (0x1f, "", 4),
+    "intcblock": (0x20, "intcblock", 1), "intc": (0x21, "u8", 1),
+    "intc_0": (0x22, "", 1), "intc_1": (0x23, "", 1), "intc_2": (0x24, "", 1),
+    "intc_3": (0x25, "", 1),
+    "bytecblock": (0x26, "bytecblock", 1), "bytec": (0x27, "u8", 1),
+    "bytec_0": (0x28, "", 1), "bytec_1": (0x29, "", 1), "bytec_2": (0x2a, "", 1),
+    "bytec_3": (0x2b, "", 1),
+    "arg": (0x2c, "u8", 1), "arg_0": (0x2d, "", 1), "arg_1": (0x2e, "", 1),
+    "arg_2": (0x2f, "", 1), "arg_3": (0x30, "", 1),
+    "txn": (0x31, "txn", 1), "global": (0x32, "global", 1), "gtxn": (0x33, "gtxn", 1),
+    "load": (0x34, "u8", 1), "store": (0x35, "u8", 1),
+    "txna": (0x36, "txna", 2), "gtxna": (0x37, "gtxna", 2),
+    "gtxns": (0x38, "txn", 3), "gtxnsa": (0x39, "txna", 3),
+    "gload": (0x3a, "u8u8", 4), "gloads": (0x3b, "u8", 4),
+    "gaid": (0x3c, "u8", 4), "gaids": (0x3d, "", 4),
+    "loads": (0x3e, "", 5), "stores": (0x3f, "", 5),
+    "bnz": (0x40, "label", 1), "bz": (0x41, "label", 2), "b": (0x42, "label", 2),
+    "return": (0x43, "", 2), "assert": (0x44, "", 3), "bury": (0x45, "u8", 8),
+    "popn": (0x46, "u8", 8), "dupn": (0x47, "u8", 8),
+    "pop": (0x48, "", 1), "dup": (0x49, "", 1), "dup2": (0x4a, "", 2),
+    "dig": (0x4b, "u8", 3), "swap": (0x4c, "", 3), "select": (0x4d, "", 3),
+    "cover": (0x4e, "u8", 5), "uncover": (0x4f, "u8", 5),
+    "concat": (0x50, "", 2), "substring": (0x51, "u8u8", 2), "substring3": (0x52, "", 2),
+    "getbit": (0x53, "", 3), "setbit": (0x54, "", 3),
+    "getbyte": (0x55, "", 3), "setbyte": (0x56, "", 3),
+    "extract": (0x57, "u8u8", 5), "extract3": (0x58, "", 5),
+    "extract_uint16": (0x59, "", 5), "extract_uint32": (0x5a, "", 5),
+    "extract_uint64": (0x5b, "", 5),
+    "replace2": (0x5c, "u8", 7), "replace3": (0x5d, "", 7),
+    "balance": (0x60, "", 2), "app_opted_in": (0x61, "", 2),
+    "app_local_get": (0x62, "", 2), "app_local_get_ex": (0x63, "", 2),
+    "app_global_get": (0x64, "", 2), "app_global_get_ex": (0x65, "", 2),
+    "app_local_put": (0x66, "", 2), "app_global_put": (0x67, "", 2),
+    "app_local_del": (0x68, "", 2), "app_global_del": (0x69, "", 2),
+    "asset_holding_get": (0x70, "asset_holding", 2),
+    "asset_params_get": (0x71, "asset_params", 2),
+    "app_params_get": (0x72, "app_params", 5),
+    "acct_params_get": (0x73, "acct_params", 6),
+    "min_balance": (0x78, "", 3),
+    "pushbytes": (0x80, "bytes", 3), "pushint": (0x81, "varuint", 3),
+    "pushbytess": (0x82, "pushbytess", 8), "pushints": (0x83, "pushints", 8),
+    "callsub": (0x88, "label", 4), "retsub": (0x89, "", 4),
+    "proto": (0x8a, "u8u8", 8), "frame_dig": (0x8b, "i8", 8),
+    "frame_bury": (0x8c, "i8", 8), "switch": (0x8d, "labels", 8),
+    "match": (0x8e, "labels", 8),
+    "shl": (0x90, "", 4), "shr": (0x91, "", 4), "sqrt": (0x92, "", 4),
+    "bitlen": (0x93, "", 4), "exp": (0x94, "", 4), "expw": (0x95, "", 4),
+    "bsqrt": (0x96, "", 6), "divw": (0x97, "", 6), "sha3_256": (0x98, "", 7),
+    "b+": (0xa0, "", 4), "b-": (0xa1, "", 4), "b/": (0xa2, "", 4), "b*": (0xa3, "", 4),
+    "b<": (0xa4, "", 4), "b>": (0xa5, "", 4), "b<=": (0xa6, "", 4), "b>=": (0xa7, "", 4),
+    "b==": (0xa8, "", 4), "b!=": (0xa9, "", 4), "b%": (0xaa, "", 4), "b|": (0xab, "", 4),
+    "b&": (0xac, "", 4), "b^": (0xad, "", 4), "b~": (0xae, "", 4), "bzero": (0xaf, "", 4),
+    "log": (0xb0, "", 5), "itxn_begin": (0xb1, "", 5), "itxn_field": (0xb2, "txn", 5),
+    "itxn_submit": (0xb3, "", 5), "itxn": (0xb4, "txn", 5), "itxna": (0xb5, "txna", 5),
+    "itxn_next": (0xb6, "", 6), "gitxn": (0xb7, "gtxn", 6), "gitxna": (0xb8, "gtxna", 6),
+    "box_create": (0xb9, "", 8), "box_extract": (0xba, "", 8),
+    "box_replace": (0xbb, "", 8), "box_del": (0xbc, "", 8), "box_len": (0xbd, "", 8),
+    "box_get": (0xbe, "", 8), "box_put": (0xbf, "", 8),
+    "txnas": (0xc0, "txn", 5), "gtxnas": (0xc1, "gtxn", 5), "gtxnsas": (0xc2, "txn", 5),
+    "args": (0xc3, "", 5), "gloadss": (0xc4, "", 6),
+    "itxnas": (0xc5, "txn", 6), "gitxnas": (0xc6, "gtxn", 6),
+}
+
+OPCODES_BY_BYTE = {spec[0]: name for name, spec in OPCODES.items()}
+
+FIELD_TABLES = {
+    "global": GLOBAL_FIELDS,
+    "asset_holding": ASSET_HOLDING_FIELDS,
+    "asset_params": ASSET_PARAMS_FIELDS,
+    "app_params": APP_PARAMS_FIELDS,
+    "acct_params": ACCT_PARAMS_FIELDS,
+}
+
+# Multi-form ops: `txn F i` is really txna, etc.
+ARRAY_FORMS = {"txn": "txna", "gtxn": "gtxna", "gtxns": "gtxnsa", "itxn": "itxna", "gitxn": "gitxna"}
+
+
+def encode_varuint(value):
+    """Encode an unsigned int as a Go-style uvarint"""
+    if value < 0:
+        raise TealAssemblyError(f"negative value {value}")
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varuint(data, pos):
+    """Decode a uvarint at pos, returning (value, new_pos)"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise TealAssemblyError("truncated varuint")
+        b = data[pos]
+        pos += 1
+        value |= (b & 0x7f) << shift
+        if b < 0x80:
+            return value, pos
+        shift += 7
+
+
+def program_address(bytecode):
+    """Address of a compiled program (the 'hash' algod's /compile returns)"""
+    return encoding.encode_address(encoding.checksum(b"Program" + bytecode))
+
+
+def application_address(app_id):
+    """Account address controlled by an application"""
+    return logic.get_application_address(app_id)
+
+
+def method_selector(signature):
+    """ARC-4 method selector for a signature (str or the bytes of a TEAL string literal)"""
+    if isinstance(signature, str):
+        signature = signature.encode()
+    return hashlib.new("sha512_256", signature).digest()[:4]
+
+
+def _split_fields(line):
+    """Split a line into tokens, keeping quoted strings whole and dropping // comments"""
+    tokens = []
+    current = ""
+    in_string = False
+    escaped = False
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if in_string:
+            current += ch
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            current += ch
+            in_string = True
+        elif ch == "/" and line[i:i + 2] == "//":
+            break
+        elif ch == ";":
+            if current:
+                tokens.append(current)
+                current = ""
+            tokens.append(";")
+        elif ch.isspace():
+            if current:
+                tokens.append(current)
+                current = ""
+        else:
+            current += ch
+        i += 1
+    if in_string:
+        raise TealAssemblyError("unterminated string literal")
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+def _parse_string(token):
+    body = token[1:-1]
+    out = bytearray()
+    i = 0
+    escapes = {"n": 10, "r": 13, "t": 9, "\\": 92, '"': 34, "0": 0}
+    while i < len(body):
+        ch = body[i]
+        if ch == "\\":
+            i += 1
+            if i >= len(body):
+                raise TealAssemblyError(f"bad escape in {token}")
+            esc = body[i]
+            if esc == "x":
+                out.append(int(body[i + 1:i + 3], 16))
+                i += 2
+            elif esc in escapes:
+                out.append(escapes[esc])
+            else:
+                raise TealAssemblyError(f"unknown escape \\{esc} in {token}")
+        else:
+            out.extend(ch.encode("utf-8"))
+        i += 1
+    return bytes(out)
+
+
+def parse_bytes(args):
+    """Parse a byte literal (string, hex, base64, base32) from tokens; return (bytes, used)"""
+    if not args:
+        raise TealAssemblyError("missing byte literal")
+    first = args[0]
+    if first.startswith('"') and first.endswith('"') and len(first) >= 2:
+        return _parse_string(first), 1
+    if first.startswith("0x"):
+        try:
+            return bytes.fromhex(first[2:]), 1
+        except ValueError:
+            raise TealAssemblyError(f"bad hex literal {first}")
+    for prefix, decoder in (("base64", base64.b64decode), ("b64", base64.b64decode),
+                            ("base32", base64.b32decode), ("b32", base64.b32decode)):
+        if first == prefix:
+            if len(args) < 2:
+                raise TealAssemblyError(f"{prefix} needs a value")
+            return _decode_encoded(decoder, args[1]), 2
+        if first.startswith(prefix + "(") and first.endswith(")"):
+            return _decode_encoded(decoder, first[len(prefix) + 1:-1]), 1
+    raise TealAssemblyError(f"unknown byte literal {first}")
+
+
+def _decode_encoded(decoder, text):
+    try:
+        if decoder is base64.b32decode:
+            text = text + "=" * (-len(text) % 8)
+        return decoder(text)
+    except Exception:
+        raise TealAssemblyError(f"bad encoded literal {text}")
+
+
+def parse_uint(token):
+    """Parse an integer literal the way TEAL does (decimal, 0x hex, 0 octal, named)"""
+    if token in NAMED_INTS:
+        return NAMED_INTS[token]
+    try:
+        if re.fullmatch(r"0[0-7]+", token):
+            value = int(token, 8)
+        else:
+            value = int(token, 0)
+    except ValueError:
+        raise TealAssemblyError(f"unable to parse {token!r} as integer")
+    if not 0 <= value < 2 ** 64:
+        raise TealAssemblyError(f"integer {token} out of uint64 range")
+    return value
+
+
+def _parse_u8(token, what="immediate"):
+    value = parse_uint(token)
+    if value > 255:
+        raise TealAssemblyError(f"{what} {token} exceeds 255")
+    return value
+
+
+def _field_index(table, name, kind):
+    try:
+        return table.index(name)
+    except ValueError:
+        raise TealAssemblyError(f"unknown {kind} field {name!r}")
+
+
+class _Instr:
+    """One assembled instruction before layout"""
+    __slots__ = ("line", "name", "raw", "labels", "const")
+
+    def __init__(self, line, name, raw=b"", labels=None, const=None):
+        self.line = line
+        self.name = name
+        self.raw = raw          # opcode + immediates (branches: opcode only)
+        self.labels = labels    # target label names for branches / switch
+        self.const = const      # ("int" | "byte", value) for pooled constants
+
+
+class Assembler:
+    """Two-pass TEAL assembler"""
+
+    def __init__(self, source):
+        self.source = source
+        self.version = 1
+        self.instrs = []
+        self.labels = {}  # label -> instruction index
+        self.explicit_intc = 0
+        self.explicit_bytec = 0
+
+    def error(self, line, message):
+        return TealAssemblyError(f"line {line}: {message}")
+
+    def assemble(self):
+        for lineno, text in enumerate(self.source.splitlines(), 1):
+            stripped = text.strip()
+            if stripped.startswith("#pragma"):
+                self._pragma(lineno, stripped)
+                continue
+            try:
+                tokens = _split_fields(text)
+            except TealAssemblyError as e:
+                raise self.error(lineno, e)
+            while tokens:
+                if ";" in tokens:
+                    cut = tokens.index(";")
+                    statement, tokens = tokens[:cut], tokens[cut + 1:]
+                else:
+                    statement, tokens = tokens, []
+                if statement:
+                    self._statement(lineno, statement)
+        return self._layout()
+
+    def _pragma(self, lineno, text):
+        parts = text.split()
+        if len(parts) >= 3 and parts[1] == "version":
+            if self.instrs:
+                raise self.error(lineno, "#pragma version must come before any instruction")
+            self.version = parse_uint(parts[2])
+            if not 1 <= self.version <= MAX_TEAL_VERSION:
+                raise self.error(lineno, f"unsupported TEAL version {self.version}")
+        elif len(parts) >= 2 and parts[1] == "typetrack":
+            return
+        else:
+            raise self.error(lineno, f"unknown pragma {text}")
+
+    def _statement(self, lineno, tokens):
+        # Labels, optionally followed by an instruction on the same line
+        while tokens and tokens[0].endswith(":") and not tokens[0].startswith('"'):
+            label = tokens[0][:-1]
+            if label in self.labels:
+                raise self.error(lineno, f"duplicate label {label!r}")
+            self.labels[label] = len(self.instrs)
+            tokens = tokens[1:]
+        if not tokens:
+            return
+        name, args = tokens[0], tokens[1:]
+        try:
+            self._instruction(lineno, name, args)
+        except TealAssemblyError as e:
+            if str(e).startswith("line "):
+                raise
+            raise self.error(lineno, f"{name}: {e}")
+
+    def _emit(self, lineno, name, raw=b"", labels=None, const=None):
+        self.instrs.append(_Instr(lineno, name, raw, labels, const))
+
+    def _instruction(self, lineno, name, args):
+        # Pseudo-ops that feed the constant pools
+        if name == "int":
+            self._expect(args, 1)
+            self._const_int(lineno, parse_uint(args[0]))
+            return
+        if name == "byte":
+            value, used = parse_bytes(args)
+            self._expect(args, used)
+            self._const_bytes(lineno, value)
+            return
+        if name == "addr":
+            self._expect(args, 1)
+            try:
+                value = encoding.decode_address(args[0])
+            except Exception:
+                raise TealAssemblyError(f"invalid address {args[0]}")
+            self._const_bytes(lineno, value)
+            return
+        if name == "method":
+            self._expect(args, 1)
+            if not (args[0].startswith('"') and args[0].endswith('"') and len(args[0]) >= 2):
+                raise TealAssemblyError(f"method needs a quoted signature, got {args[0]}")
+            self._const_bytes(lineno, method_selector(_parse_string(args[0])))
+            return
+
+        # Aliases whose shape depends on the immediates given
+        if name in ARRAY_FORMS and len(args) == (3 if name in ("gtxn", "gitxn") else 2):
+            name = ARRAY_FORMS[name]
+        elif name == "extract" and not args:
+            name = "extract3"
+        elif name == "substring" and not args:
+            name = "substring3"
+        elif name == "replace":
+            name = "replace2" if args else "replace3"
+
+        if name not in OPCODES:
+            raise TealAssemblyError("unknown opcode")
+        opcode, layout, min_version = OPCODES[name]
+        if self.version < min_version:
+            raise TealAssemblyError(f"opcode requires version >= {min_version}")
+        op = bytes([opcode])
+
+        if layout == "":
+            self._expect(args, 0)
+            self._emit(lineno, name, op)
+        elif layout == "u8":
+            self._expect(args, 1)
+            self._emit(lineno, name, op + bytes([_parse_u8(args[0])]))
+        elif layout == "u8u8":
+            self._expect(args, 2)
+            self._emit(lineno, name, op + bytes([_parse_u8(args[0]), _parse_u8(args[1])]))
+        elif layout == "i8":
+            self._expect(args, 1)
+            value = int(args[0], 0)
+            if not -128 <= value <= 127:
+                raise TealAssemblyError(f"{args[0]} out of int8 range")
+            self._emit(lineno, name, op + bytes([value & 0xff]))
+        elif layout == "label":
+            self._expect(args, 1)
+            self._emit(lineno, name, op, labels=[args[0]])
+        elif layout == "labels":
+            if len(args) > 255:
+                raise TealAssemblyError("too many labels")
+            self._emit(lineno, name, op + bytes([len(args)]), labels=list(args))
+        elif layout == "txn":
+            self._expect(args, 1)
+            self._emit(lineno, name, op + bytes([self._txn_field(args[0], name)]))
+        elif layout == "txna":
+            self._expect(args, 2)
+            field = self._txn_field(args[0], name)
+            self._emit(lineno, name, op + bytes([field, _parse_u8(args[1], "array index")]))
+        elif layout == "gtxn":
+            self._expect(args, 2)
+            group = _parse_u8(args[0], "group index")
+            self._emit(lineno, name, op + bytes([group, self._txn_field(args[1], name)]))
+        elif layout == "gtxna":
+            self._expect(args, 3)
+            group = _parse_u8(args[0], "group index")
+            field = self._txn_field(args[1], name)
+            self._emit(lineno, name, op + bytes([group, field, _parse_u8(args[2], "array index")]))
+        elif layout in FIELD_TABLES:
+            self._expect(args, 1)
+            index = _field_index(FIELD_TABLES[layout], args[0], layout)
+            self._emit(lineno, name, op + bytes([index]))
+        elif layout == "varuint":
+            self._expect(args, 1)
+            self._emit(lineno, name, op + encode_varuint(parse_uint(args[0])))
+        elif layout == "bytes":
+            value, used = parse_bytes(args)
+            self._expect(args, used)
+            self._emit(lineno, name, op + encode_varuint(len(value)) + value)
+        elif layout == "pushints":
+            values = [parse_uint(a) for a in args]
+            self._emit(lineno, name, op + encode_varuint(len(values))
+                       + b"".join(encode_varuint(v) for v in values))
+        elif layout == "pushbytess":
+            values = []
+            rest = list(args)
+            while rest:
+                value, used = parse_bytes(rest)
+                values.append(value)
+                rest = rest[used:]
+            self._emit(lineno, name, op + encode_varuint(len(values))
+                       + b"".join(encode_varuint(len(v)) + v for v in values))
+        elif layout == "intcblock":
+            self.explicit_intc += 1
+            values = [parse_uint(a) for a in args]
+            self._emit(lineno, name, op + encode_varuint(len(values))
+                       + b"".join(encode_varuint(v) for v in values))
+        elif layout == "bytecblock":
+            self.explicit_bytec += 1
+            values = []
+            rest = list(args)
+            while rest:
+                value, used = parse_bytes(rest)
+                values.append(value)
+                rest = rest[used:]
+            self._emit(lineno, name, op + encode_varuint(len(values))
+                       + b"".join(encode_varuint(len(v)) + v for v in values))
+        else:  # pragma: no cover - table is closed
+            raise TealAssemblyError(f"unhandled layout {layout}")
+
+    def _expect(self, args, count):
+        if len(args) != count:
+            raise TealAssemblyError(f"expects {count} immediate(s), got {len(args)}")
+
+    def _txn_field(self, name, opname):
+        index = _field_index(TXN_FIELDS, name, "txn")
+        is_array = name in TXN_ARRAY_FIELDS
+        if opname in ("txna", "gtxna", "gtxnsa", "itxna", "gitxna",
+                      "txnas", "gtxnas", "gtxnsas", "itxnas", "gitxnas") and not is_array:
+            raise TealAssemblyError(f"{name} is not an array field")
+        if opname in ("txn", "gtxn", "gtxns", "itxn", "gitxn") and is_array and self.version >= 2:
+            raise TealAssemblyError(f"{name} is an array field and needs an index")
+        return index
+
+    def _const_int(self, lineno, value):
+        if self.explicit_intc and self.version < BACK_BRANCH_VERSION:
+            raise TealAssemblyError("use intc with a hand-written intcblock before version 4")
+        if self.explicit_intc:
+            # With a hand-written intcblock algod falls back to pushint
+            self._emit(lineno, "pushint", bytes([0x81]) + encode_varuint(value))
+        else:
+            self._emit(lineno, "int", const=("int", value))
+
+    def _const_bytes(self, lineno, value):
+        if self.explicit_bytec and self.version < BACK_BRANCH_VERSION:
+            raise TealAssemblyError("use bytec with a hand-written bytecblock before version 4")
+        if self.explicit_bytec:
+            self._emit(lineno, "pushbytes", bytes([0x80]) + encode_varuint(len(value)) + value)
+        else:
+            self._emit(lineno, "byte", const=("byte", value))
+
+    def _pool(self, kind):
+        """Decide the constant block and per-value encoding for one constant kind"""
+        order = []
+        freq = {}
+        for instr in self.instrs:
+            if instr.const and instr.const[0] == kind:
+                value = instr.const[1]
+                if value not in freq:
+                    order.append(value)
+                    freq[value] = 0
+                freq[value] += 1
+
+        if self.version >= OPTIMIZE_CONSTANTS_VERSION:
+            # Stable sort keeps first-use order among equal frequencies
+            ranked = sorted(order, key=lambda v: -freq[v])
+            block = [v for v in ranked if freq[v] > 1]
+        else:
+            block = order
+        return block, {v: i for i, v in enumerate(block)}
+
+    def _layout(self):
+        int_block, int_index = self._pool("int")
+        byte_block, byte_index = self._pool("byte")
+
+        # Resolve pooled constants to concrete instructions
+        for instr in self.instrs:
+            if not instr.const:
+                continue
+            kind, value = instr.const
+            if kind == "int":
+                if value in int_index:
+                    i = int_index[value]
+                    instr.raw = bytes([0x22 + i]) if i < 4 else bytes([0x21, i])
+                else:
+                    instr.raw = bytes([0x81]) + encode_varuint(value)
+            else:
+                if value in byte_index:
+                    i = byte_index[value]
+                    instr.raw = bytes([0x28 + i]) if i < 4 else bytes([0x27, i])
+                else:
+                    instr.raw = bytes([0x80]) + encode_varuint(len(value)) + value
+        if len(int_block) > 256 or len(byte_block) > 256:
+            raise TealAssemblyError("constant block exceeds 256 entries")
+
+        # Instruction offsets (branches are opcode + 2 bytes per label)
+        offsets = []
+        pc = 0
+        for instr in self.instrs:
+            offsets.append(pc)
+            pc += len(instr.raw) + (2 * len(instr.labels) if instr.labels else 0)
+        end = pc
+
+        def label_pc(name, instr):
+            if name not in self.labels:
+                raise self.error(instr.line, f"reference to undefined label {name!r}")
+            index = self.labels[name]
+            return offsets[index] if index < len(offsets) else end
+
+        body = bytearray()
+        for instr, at in zip(self.instrs, offsets):
+            body.extend(instr.raw)
+            if instr.labels:
+                after = at + len(instr.raw) + 2 * len(instr.labels)
+                for name in instr.labels:
+                    delta = label_pc(name, instr) - after
+                    if delta < 0 and self.version < BACK_BRANCH_VERSION:
+                        raise self.error(instr.line, f"backward branch needs version >= {BACK_BRANCH_VERSION}")
+                    if not -0x8000 <= delta <= 0x7fff:
+                        raise self.error(instr.line, "branch offset out of range")
+                    body.extend((delta & 0xffff).to_bytes(2, "big"))
+
+        program = bytearray(encode_varuint(self.version))
+        if int_block and not self.explicit_intc:
+            program.append(0x20)
+            program.extend(encode_varuint(len(int_block)))
+            for value in int_block:
+                program.extend(encode_varuint(value))
+        if byte_block and not self.explicit_bytec:
+            program.append(0x26)
+            program.extend(encode_varuint(len(byte_block)))
+            for value in byte_block:
+                program.extend(encode_varuint(len(value)) + value)
+        program.extend(body)
+        return bytes(program)
+
+
+def assemble(teal_source):
+    """Assemble TEAL source into bytecode"""
+    return Assembler(teal_source).assemble()
+
+
+def compile_offline(teal_source):
+    """Assemble locally, returning {"bytecode": bytes, "hash": program address}"""
+    bytecode = assemble(teal_source)
+    return {"bytecode": bytecode, "hash": program_address(bytecode)}
+
+
+def _format_bytes(value):
+    try:
+        text = value.decode("ascii")
+        if text.isprintable():
+            return f"0x{value.hex()} // \"{text}\""
+    except UnicodeDecodeError:
+        pass
+    return f"0x{value.hex()}"
+
+
+def disassemble(bytecode):
+    """Disassemble bytecode into TEAL that reassembles to the same bytes"""
+    if not bytecode:
+        raise TealAssemblyError("empty program")
+    version, pos = decode_varuint(bytecode, 0)
+    decoded = []  # (pc, text, [branch target pcs])
+    intc = []
+    bytec = []
+
+    def u8():
+        nonlocal pos
+        if pos >= len(bytecode):
+            raise TealAssemblyError("truncated immediate")
+        pos += 1
+        return bytecode[pos - 1]
+
+    def field(table, index, kind):
+        if index >= len(table):
+            raise TealAssemblyError(f"unknown {kind} field {index}")
+        return table[index]
+
+    def read_bytes():
+        nonlocal pos
+        length, pos = decode_varuint(bytecode, pos)
+        value = bytecode[pos:pos + length]
+        pos += length
+        return value
+
+    while pos < len(bytecode):
+        start = pos
+        opcode = bytecode[pos]
+        pos += 1
+        if opcode not in OPCODES_BY_BYTE:
+            raise TealAssemblyError(f"unknown opcode 0x{opcode:02x} at pc {start}")
+        name = OPCODES_BY_BYTE[opcode]
+        layout = OPCODES[name][1]
+        targets = []
+        if layout == "":
+            text = name
+            if name.startswith("intc_") and int(name[-1]) < len(intc):
+                text += f" // {intc[int(name[-1])]}"
+            elif name.startswith("bytec_") and int(name[-1]) < len(bytec):
+                text += " // " + _format_bytes(bytec[int(name[-1])]).split(" // ")[-1]
+        elif layout in ("u8",):
+            text = f"{name} {u8()}"
+        elif layout == "u8u8":
+            a = u8()
+            text = f"{name} {a} {u8()}"
+        elif layout == "i8":
+            value = u8()
+            text = f"{name} {value - 256 if value > 127 else value}"
+        elif layout == "label":
+            if pos + 2 > len(bytecode):
+                raise TealAssemblyError("truncated branch")
+            delta = int.from_bytes(bytecode[pos:pos + 2], "big", signed=True)
+            pos += 2
+            targets = [pos + delta]
+            text = name
+        elif layout == "labels":
+            count = u8()
+            raw = [int.from_bytes(bytecode[pos + 2 * i:pos + 2 * i + 2], "big", signed=True)
+                   for i in range(count)]
+            pos += 2 * count
+            targets = [pos + d for d in raw]
+            text = name
+        elif layout == "txn":
+            text = f"{name} {field(TXN_FIELDS, u8(), 'txn')}"
+        elif layout == "txna":
+            f = field(TXN_FIELDS, u8(), "txn")
+            text = f"{name} {f} {u8()}"
+        elif layout == "gtxn":
+            g = u8()
+            text = f"{name} {g} {field(TXN_FIELDS, u8(), 'txn')}"
+        elif layout == "gtxna":
+            g = u8()
+            f = field(TXN_FIELDS, u8(), "txn")
+            text = f"{name} {g} {f} {u8()}"
+        elif layout in FIELD_TABLES:
+            text = f"{name} {field(FIELD_TABLES[layout], u8(), layout)}"
+        elif layout == "varuint":
+            value, pos = decode_varuint(bytecode, pos)
+            text = f"{name} {value}"
+        elif layout == "bytes":
+            text = f"{name} {_format_bytes(read_bytes())}"
+        elif layout in ("intcblock", "pushints"):
+            count, pos = decode_varuint(bytecode, pos)
+            values = []
+            for _ in range(count):
+                value, pos = decode_varuint(bytecode, pos)
+                values.append(value)
+            if layout == "intcblock":
+                intc = values
+            text = " ".join([name] + [str(v) for v in values])
+        elif layout in ("bytecblock", "pushbytess"):
+            count, pos = decode_varuint(bytecode, pos)
+            values = [read_bytes() for _ in range(count)]
+            if layout == "bytecblock":
+                bytec = values
+            text = " ".join([name] + [f"0x{v.hex()}" for v in values])
+        else:  # pragma: no cover
+            raise TealAssemblyError(f"unhandled layout {layout}")
+        if pos > len(bytecode):
+            raise TealAssemblyError(f"truncated instruction at pc {start}")
+        decoded.append((start, text, targets))
+
+    label_names = {}
+    for _, _, targets in decoded:
+        for target in targets:
+            if target not in label_names:
+                label_names[target] = f"label{len(label_names) + 1}"
+
+    lines = [f"#pragma version {version}"]
+    for pc, text, targets in decoded:
+        if pc in label_names:
+            lines.append(f"{label_names[pc]}:")
+        if targets:
+            text = " ".join([text] + [label_names[t] for t in targets])
+        lines.append(text)
+    if len(bytecode) in label_names:
+        lines.append(f"{label_names[len(bytecode)]}:")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Command line entry"""
+    if len(sys.argv) < 3 or sys.argv[1] not in ("assemble", "disassemble"):
+        print("Usage:")
+        print("  python teal_assembler.py assemble <file.teal>")
+        print("  python teal_assembler.py disassemble <file.teal>")
+        sys.exit(1)
+
+    with open(sys.argv[2], 'r') as f:
+        source = f.read()
+
+    try:
+        result = compile_offline(source)
+    except TealAssemblyError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if sys.argv[1] == "assemble":
+        print(f"✅ Assembled {len(result['bytecode'])} bytes")
+        print(f"   Hash: {result['hash']}")
+        print(f"   Base64: {base64.b64encode(result['bytecode']).decode()}")
+    else:
+        text = disassemble(result['bytecode'])
+        print(text)
+        round_trip = assemble(text)
+        print(f"// round trip: {'✅ identical' if round_trip == result['bytecode'] else '❌ differs'}")
+
+
+if __name__ == "__main__":
+    main()
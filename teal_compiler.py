@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Shared TEAL compiler with a content-addressed on-disk cache
+
+compile_teal() posts a program to algod's /compile only the first time it
+sees it. With TEAL_COMPILE=local it assembles in-process with teal_assembler
+instead, falling back to algod for programs the assembler cannot handle;
+algod stays the default until tests/fixtures/algod_programs.json pins the
+assembler's output to algod's for every contract (tests/test_algod_parity.py).
+Results are stored under .teal_cache/ keyed by the SHA-256 of the compiler
+(with the assembler version), the TEAL version and the source, so
+redeploying an unchanged contract costs no compile round trip, and a local
+key never holds algod output or the reverse.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+from teal_assembler import ASSEMBLER_VERSION, TealAssemblyError, compile_offline
+
+CACHE_DIR = os.environ.get(
+    "TEAL_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".teal_cache")
+)
+
+# "algod" always posts to /compile, "local" assembles in-process (falls back to algod)
+COMPILE_MODE = os.environ.get("TEAL_COMPILE", "algod")
+
+_PRAGMA_RE = re.compile(r"^\s*#pragma\s+version\s+(\d+)", re.MULTILINE)
+
+_stats = {"hits": 0, "misses": 0}
+
+
+def teal_version(teal_source):
+    """Return the #pragma version of a TEAL program (1 if not declared)"""
+    match = _PRAGMA_RE.search(teal_source)
+    return int(match.group(1)) if match else 1
+
+
+def compiler_tag(mode=None):
+    """Which compiler a cached program comes from: algod, or the local assembler at its version"""
+    mode = COMPILE_MODE if mode is None else mode
+    return "algod" if mode == "algod" else f"local-{ASSEMBLER_VERSION}"
+
+
+def cache_key(teal_source, mode=None):
+    """SHA-256 over the compiler, the TEAL version and the exact source text"""
+    digest = hashlib.sha256()
+    digest.update(f"{compiler_tag(mode)}\n".encode())
+    digest.update(f"v{teal_version(teal_source)}\n".encode())
+    digest.update(teal_source.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def _read_cache(key):
+    try:
+        with open(_cache_path(key), 'r') as f:
+            entry = json.load(f)
+        return {"bytecode": base64.b64decode(entry['result']), "hash": entry['hash']}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cache(key, version, result_b64, program_hash):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{_cache_path(key)}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"version": version, "result": result_b64, "hash": program_hash}, f)
+    os.replace(tmp_path, _cache_path(key))
+
+
+def compile_program(algod_client, teal_source, verbose=True, mode=None):
+    """Compile TEAL, returning {"bytecode": bytes, "hash": program address}.
+    mode overrides TEAL_COMPILE for this call."""
+    mode = COMPILE_MODE if mode is None else mode
+    key = cache_key(teal_source, mode)
+    cached = _read_cache(key)
+    if cached is not None:
+        _stats["hits"] += 1
+        if verbose:
+            print(f"♻️  TEAL cache hit ({key[:12]})")
+        return cached
+
+    _stats["misses"] += 1
+    if mode != "algod":
+        try:
+            result = compile_offline(teal_source)
+        except TealAssemblyError as e:
+            if verbose:
+                print(f"⚠️  Local assembler could not handle program ({e}) - falling back to algod")
+            # Cached under the algod key, so the local key only ever holds assembler output
+            return compile_program(algod_client, teal_source, verbose, mode="algod")
+        if verbose:
+            print(f"🔨 TEAL cache miss ({key[:12]}) - assembled locally")
+    else:
+        if verbose:
+            print(f"🔨 TEAL cache miss ({key[:12]}) - compiling via algod")
+        compile_response = algod_client.compile(teal_source)
+        result = {
+            "bytecode": base64.b64decode(compile_response['result']),
+            "hash": compile_response['hash'],
+        }
+
+    _write_cache(key, teal_version(teal_source),
+                 base64.b64encode(result['bytecode']).decode(), result['hash'])
+    return result
+
+
+def compile_teal(algod_client, teal_source):
+    """Compile TEAL source code"""
+    return compile_program(algod_client, teal_source)["bytecode"]
+
+
+def cache_stats():
+    """Return compile cache hit/miss counts for this process"""
+    return dict(_stats)
+
+
+def clear_cache():
+    """Delete every cached program"""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    removed = 0
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".json"):
+            os.remove(os.path.join(CACHE_DIR, name))
+            removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "clear":
+        print(f"🧹 Removed {clear_cache()} cached program(s) from {CACHE_DIR}")
+    else:
+        count = len([n for n in os.listdir(CACHE_DIR) if n.endswith(".json")]) if os.path.isdir(CACHE_DIR) else 0
+        print(f"📦 TEAL cache: {CACHE_DIR}")
+        print(f"   Cached programs: {count}")
+        print("   Usage: python teal_compiler.py [clear]")
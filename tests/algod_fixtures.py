@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Algod-compiled bytecode of every contract, for the assembler parity test
+
+  ALGOD_URL=<algod> python tests/algod_fixtures.py   # rewrite fixtures/algod_programs.json
+
+Each entry keeps the SHA-256 of the source algod compiled, so editing a
+contract without regenerating fails test_algod_parity instead of comparing
+against stale bytecode.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+HERE = os.path.dirname(TESTS)
+sys.path.insert(0, HERE)
+
+from advanced_vault import get_advanced_vault_teal  # noqa: E402
+from echo_contract import get_echo_contract_teal  # noqa: E402
+from governance_sender import get_governance_sender_teal  # noqa: E402
+from sender_contract import get_sender_contract_teal  # noqa: E402
+
+FIXTURES_PATH = os.path.join(TESTS, "fixtures", "algod_programs.json")
+
+
+def _simple_teal():
+    sources = []
+    for name in ("simple_approval.teal", "simple_clear.teal"):
+        with open(os.path.join(HERE, name), 'r') as f:
+            sources.append(f.read())
+    return tuple(sources)
+
+
+CONTRACTS = {
+    "governance": get_governance_sender_teal,
+    "vault": get_advanced_vault_teal,
+    "sender": get_sender_contract_teal,
+    "echo": get_echo_contract_teal,
+    "simple": _simple_teal,
+}
+
+
+def programs():
+    """{"<contract>_approval" / "<contract>_clear": TEAL source}"""
+    sources = {}
+    for kind, teal in CONTRACTS.items():
+        approval, clear = teal()
+        sources[f"{kind}_approval"] = approval
+        sources[f"{kind}_clear"] = clear
+    return sources
+
+
+def source_hash(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def load_fixtures(path=FIXTURES_PATH):
+    """{name: {"source_sha256", "bytecode"}}, or None before the first generation"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def main():
+    from algod_client import ALGOD_URL, get_algod_client
+    algod_client = get_algod_client()
+    fixtures = {}
+    for name, source in programs().items():
+        response = algod_client.compile(source)
+        fixtures[name] = {"source_sha256": source_hash(source), "bytecode": response['result']}
+        print(f"✅ {name}: {len(base64.b64decode(response['result']))} bytes")
+    os.makedirs(os.path.dirname(FIXTURES_PATH), exist_ok=True)
+    with open(FIXTURES_PATH, 'w') as f:
+        json.dump(fixtures, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {len(fixtures)} program(s) compiled by {ALGOD_URL} to {FIXTURES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Shared fixtures: the top-level scripts import each other as flat modules, and
+contract flows run through the in-process AVM (avm.py) - no algod needed.
+"""
+
+import base64
+import os
+import sys
+import pytest
+from algosdk import account, encoding, logic, transaction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from avm import Ledger, MAX_TXN_LIFE, MIN_TXN_FEE, execute_group  # noqa: E402
+from teal_assembler import assemble  # noqa: E402
+
+
+class Chain:
+    """An AVM ledger with funded accounts and shared suggested params"""
+
+    def __init__(self):
+        self.ledger = Ledger()
+        self.sp = transaction.SuggestedParams(
+            MIN_TXN_FEE, self.ledger.round, self.ledger.round + MAX_TXN_LIFE,
+            base64.b64encode(bytes(32)).decode(), flat_fee=True)
+
+    def account(self, algo=100):
+        """A new address holding algo ALGO"""
+        _, address = account.generate_account()
+        if algo:
+            self.ledger.fund(address, int(algo * 1_000_000))
+        return address
+
+    def run(self, *txns):
+        """Execute txns as one atomic group"""
+        txns = list(txns)
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        return execute_group(self.ledger, txns)
+
+    def run_signed(self, blobs):
+        """Execute one group of raw signed transactions (batch_signer output)"""
+        return execute_group(self.ledger, [encoding.msgpack_decode(base64.b64encode(blob).decode())
+                                           for blob in blobs])
+
+    def ok(self, *txns):
+        result = self.run(*txns)
+        assert result["ok"], result["error"]
+        return result
+
+    def create_app(self, creator, approval, clear, global_schema, local_schema):
+        """Create an app from TEAL sources; schemas are (uints, byte slices)"""
+        create = transaction.ApplicationCreateTxn(
+            creator, self.sp, transaction.OnComplete.NoOpOC, assemble(approval), assemble(clear),
+            transaction.StateSchema(*global_schema), transaction.StateSchema(*local_schema))
+        return self.ok(create)["txns"][0]["app_id"]
+
+    def keyed_account(self, algo=100):
+        """A new {"addr", "sk"} wallet holding algo ALGO"""
+        private_key, address = account.generate_account()
+        self.ledger.fund(address, int(algo * 1_000_000))
+        return {"addr": address, "sk": private_key}
+
+    def balance(self, address):
+        return self.ledger.balance(address)
+
+    def app_address(self, app_id):
+        return logic.get_application_address(app_id)
+
+
+@pytest.fixture
+def chain():
+    return Chain()
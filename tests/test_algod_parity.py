@@ -0,0 +1,17 @@
+import base64
+import pytest
+from algod_fixtures import load_fixtures, programs, source_hash
+from teal_assembler import assemble
+
+PROGRAMS = programs()
+FIXTURES = load_fixtures()
+
+
+@pytest.mark.skipif(FIXTURES is None, reason="no algod fixtures yet: ALGOD_URL=<algod> python tests/algod_fixtures.py")
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_offline_assembler_matches_algod(name):
+    fixture = FIXTURES.get(name)
+    assert fixture is not None, f"{name} has no fixture - regenerate with tests/algod_fixtures.py"
+    assert fixture["source_sha256"] == source_hash(PROGRAMS[name]), \
+        f"{name} changed since algod compiled it - regenerate with tests/algod_fixtures.py"
+    assert assemble(PROGRAMS[name]) == base64.b64decode(fixture["bytecode"])
@@ -0,0 +1,93 @@
+import os
+from algosdk import encoding, transaction
+from advanced_vault import get_advanced_vault_teal
+from app_state import SCHEMAS, decode_member_box, decode_state
+from echo_contract import get_echo_contract_teal
+from governance_sender import GLOBAL_BYTES, GLOBAL_INTS, LOCAL_BYTES, LOCAL_INTS, get_governance_sender_teal
+from local_algod import _state_json
+from roster import join_box_refs, member_box_name
+from sender_contract import get_sender_contract_teal
+from teal_assembler import assemble
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def global_state(chain, app_id, kind):
+    """Decoded the way the reader decodes algod's global-state of the app"""
+    return decode_state(_state_json(chain.ledger.global_state(app_id)), SCHEMAS[kind]["global"])
+
+
+def local_state(chain, address, app_id, kind):
+    return decode_state(_state_json(chain.ledger.local_state(address, app_id)), SCHEMAS[kind]["local"])
+
+
+def pay_and_call(chain, app_id, member, amount, *app_args, on_complete=transaction.OnComplete.NoOpOC, boxes=None):
+    return chain.ok(transaction.PaymentTxn(member, chain.sp, chain.app_address(app_id), amount),
+                    transaction.ApplicationCallTxn(member, chain.sp, app_id, on_complete,
+                                                   app_args=list(app_args), boxes=boxes))
+
+
+def test_governance_state(chain):
+    owner = chain.account()
+    app_id = chain.create_app(owner, *get_governance_sender_teal(),
+                              (GLOBAL_INTS, GLOBAL_BYTES), (LOCAL_INTS, LOCAL_BYTES))
+    chain.ledger.fund(chain.app_address(app_id), 1_000_000)
+    boxed, opted = chain.account(), chain.account()
+    pay_and_call(chain, app_id, boxed, 600_000, b"contribute",
+                 boxes=[(app_id, member_box_name(boxed))] + join_box_refs(app_id, 0))
+    pay_and_call(chain, app_id, opted, 400_000, b"contribute", on_complete=transaction.OnComplete.OptInOC,
+                 boxes=join_box_refs(app_id, 1))
+
+    state = global_state(chain, app_id, "governance")
+    assert state["owner"] == owner
+    assert state["total_contributors"] == 2
+    assert state["proposal_recipient"] is None and state["active_proposal"] == 0
+    assert local_state(chain, opted, app_id, "governance") == {"contributed": 400_000, "voted": 0, "slot": 1}
+    record = chain.ledger.box(app_id, member_box_name(boxed))
+    assert decode_member_box("governance", record) == {"contributed": 600_000, "voted": 0, "slot": 0}
+
+
+def test_vault_state(chain):
+    approval, clear = get_advanced_vault_teal()
+    receiver = chain.account(0)
+    app_id = chain.ok(transaction.ApplicationCreateTxn(
+        chain.account(), chain.sp, transaction.OnComplete.NoOpOC, assemble(approval), assemble(clear),
+        transaction.StateSchema(3, 1), transaction.StateSchema(0, 0),
+        app_args=[(5_000_000).to_bytes(8, 'big'), (1_700_000_000).to_bytes(8, 'big'),
+                  encoding.decode_address(receiver)]))["txns"][0]["app_id"]
+    pay_and_call(chain, app_id, chain.account(), 250_000, b"contribute")
+    assert global_state(chain, app_id, "vault") == {"goal": 5_000_000, "deadline": 1_700_000_000,
+                                                    "receiver": receiver, "total": 250_000}
+
+
+def test_sender_state(chain):
+    owner = chain.account()
+    app_id = chain.create_app(owner, *get_sender_contract_teal(), (1, 1), (0, 0))
+    assert global_state(chain, app_id, "sender") == {"owner": owner, "total_sent": 0}
+
+
+def test_echo_state(chain):
+    app_id = chain.create_app(chain.account(), *get_echo_contract_teal(), (2, 0), (0, 0))
+    chain.ledger.fund(chain.app_address(app_id), 1_000_000)
+    pay_and_call(chain, app_id, chain.account(), 1_000_000, b"echo")
+    state = global_state(chain, app_id, "echo")
+    assert state["echo_count"] == 1 and state["total_echoed"] > 0
+
+
+def test_simple_state(chain):
+    with open(os.path.join(HERE, "simple_approval.teal")) as approval, \
+            open(os.path.join(HERE, "simple_clear.teal")) as clear:
+        app_id = chain.create_app(chain.account(), approval.read(), clear.read(), (1, 0), (1, 0))
+    chain.ledger.fund(chain.app_address(app_id), 1_000_000)
+    boxed, opted = chain.account(), chain.account()
+    for member, on_complete, boxes in ((boxed, transaction.OnComplete.NoOpOC,
+                                        [(app_id, member_box_name(boxed))] + join_box_refs(app_id, 0)),
+                                       (opted, transaction.OnComplete.OptInOC, [])):
+        chain.ok(transaction.ApplicationCallTxn(member, chain.sp, app_id, on_complete, app_args=[b"deposit"],
+                                                boxes=boxes),
+                 transaction.PaymentTxn(member, chain.sp, chain.app_address(app_id), 1_000_000))
+
+    assert global_state(chain, app_id, "simple") == {"n": 1}
+    assert local_state(chain, opted, app_id, "simple") == {"d": 1_000_000}
+    assert decode_member_box("simple", chain.ledger.box(app_id, member_box_name(boxed))) == \
+        {"d": 1_000_000, "slot": 0}
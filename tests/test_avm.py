@@ -0,0 +1,79 @@
+import copy
+from algosdk import transaction
+from avm import execute_group
+
+APPROVE = "#pragma version 9\nint 1\nreturn\n"
+
+
+def app_program(*body):
+    """Approve creation, run body on every later call"""
+    return "\n".join(["#pragma version 9", "txn ApplicationID", "bnz call", "int 1", "return", "call:",
+                      *body]) + "\n"
+
+
+def test_failed_group_rolls_back_every_transaction(chain):
+    sender, receiver = chain.account(), chain.account()
+    app_id = chain.create_app(sender, app_program("txn NumAppArgs", "return"), APPROVE, (0, 0), (0, 0))
+    pay = transaction.PaymentTxn(sender, chain.sp, receiver, 500_000)
+    reject = transaction.ApplicationNoOpTxn(sender, chain.sp, app_id)
+    result = chain.run(pay, reject)
+    assert not result["ok"]
+    assert result["failed_at"] == 1
+    assert chain.balance(receiver) == 100_000_000
+
+
+def test_transactions_must_share_a_group_id(chain):
+    sender, receiver = chain.account(), chain.account()
+    txns = [transaction.PaymentTxn(sender, chain.sp, receiver, n) for n in (1, 2)]
+    assert not execute_group(chain.ledger, txns)["ok"]
+
+
+def test_fees_are_pooled_across_the_group(chain):
+    payer, other = chain.account(), chain.account()
+    rich_sp, free_sp = copy.copy(chain.sp), copy.copy(chain.sp)
+    rich_sp.fee, free_sp.fee = 2_000, 0
+    covered = chain.run(transaction.PaymentTxn(payer, rich_sp, other, 1),
+                        transaction.PaymentTxn(other, free_sp, payer, 1))
+    assert covered["ok"], covered["error"]
+    short = chain.run(transaction.PaymentTxn(payer, chain.sp, other, 1),
+                      transaction.PaymentTxn(other, free_sp, payer, 2))
+    assert not short["ok"]
+
+
+def test_global_state_delta_and_schema(chain):
+    creator = chain.account()
+    counter = app_program('byte "count"', 'byte "count"', "app_global_get", "int 1", "+", "app_global_put",
+                          "int 1", "return")
+    app_id = chain.create_app(creator, counter, APPROVE, (1, 0), (0, 0))
+    result = chain.ok(transaction.ApplicationNoOpTxn(creator, chain.sp, app_id))
+    assert result["global_delta"] == {app_id: {b"count": 1}}
+    assert chain.ledger.global_state(app_id) == {b"count": 1}
+
+    no_room = chain.create_app(creator, counter, APPROVE, (0, 0), (0, 0))
+    assert not chain.run(transaction.ApplicationNoOpTxn(creator, chain.sp, no_room))["ok"]
+
+
+def test_inner_payment_keeps_the_app_above_min_balance(chain):
+    creator, receiver = chain.account(), chain.account()
+    payer = app_program("itxn_begin", "int pay", "itxn_field TypeEnum", "txn Sender", "itxn_field Receiver",
+                        "int 50000", "itxn_field Amount", "itxn_submit", "int 1", "return")
+    app_id = chain.create_app(creator, payer, APPROVE, (0, 0), (0, 0))
+    app_address = chain.app_address(app_id)
+    call = transaction.ApplicationNoOpTxn(receiver, chain.sp, app_id)
+    chain.ledger.fund(app_address, 120_000)
+    assert not chain.run(call)["ok"]
+
+    chain.ledger.fund(app_address, 100_000)
+    result = chain.ok(call)
+    assert len(result["txns"][0]["inner_txns"]) == 1
+    # 50000 paid out plus the inner transaction's own fee
+    assert chain.balance(app_address) == 220_000 - 50_000 - 1_000
+
+
+def test_opcode_budget_is_enforced(chain):
+    creator = chain.account()
+    loop = app_program("int 0", "loop:", "int 1", "+", "dup", "int 1000", "<", "bnz loop", "return")
+    app_id = chain.create_app(creator, loop, APPROVE, (0, 0), (0, 0))
+    result = chain.run(transaction.ApplicationNoOpTxn(creator, chain.sp, app_id))
+    assert not result["ok"]
+    assert "budget" in result["error"]
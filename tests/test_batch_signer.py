@@ -0,0 +1,53 @@
+import base64
+import pytest
+from algosdk import account, encoding, transaction
+import batch_signer
+from batch_signer import sign_raw, sign_transactions
+
+SP = transaction.SuggestedParams(1000, 1, 1000, base64.b64encode(bytes(32)).decode(), flat_fee=True)
+
+
+def encoded(signed):
+    return base64.b64decode(encoding.msgpack_encode(signed))
+
+
+def payments(senders, count):
+    return [transaction.PaymentTxn(senders[i % len(senders)], SP, senders[0], 1000 + i, note=b"n%d" % i)
+            for i in range(count)]
+
+
+def test_sign_raw_matches_txn_sign():
+    private_key, address = account.generate_account()
+    txn, = payments([address], 1)
+    assert sign_raw(txn, private_key) == encoded(txn.sign(private_key))
+
+
+def test_sign_raw_matches_txn_sign_for_a_rekeyed_sender():
+    _, address = account.generate_account()
+    auth_key, _ = account.generate_account()
+    txn, = payments([address], 1)
+    blob = sign_raw(txn, auth_key)
+    assert blob == encoded(txn.sign(auth_key))
+    assert encoding.msgpack_decode(base64.b64encode(blob).decode()).authorizing_address is not None
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(batch_signer, "POOL_THRESHOLD", 1)
+    yield
+    batch_signer.get_signer_pool(2).shutdown()
+    batch_signer._pool = None
+
+
+def test_pooled_signing_keeps_order_and_bytes(pool):
+    wallets = [account.generate_account() for _ in range(3)]
+    keys = {address: private_key for private_key, address in wallets}
+    txns = payments([address for _, address in wallets], 10)
+    blobs = sign_transactions(txns, keys, workers=2, chunk_size=3)
+    assert blobs == [encoded(txn.sign(keys[txn.sender])) for txn in txns]
+
+
+def test_missing_key_is_reported_before_signing():
+    _, address = account.generate_account()
+    with pytest.raises(KeyError):
+        sign_transactions(payments([address], 1), {})
@@ -0,0 +1,69 @@
+import base64
+import threading
+from algosdk import encoding, transaction
+from bulk_submit import build_contribution_groups, submit_pipelined
+from governance_sender import GLOBAL_BYTES, GLOBAL_INTS, LOCAL_BYTES, LOCAL_INTS, get_governance_sender_teal
+from roster import ROSTER_PAGE_SIZE, member_box_name, roster_box_name
+
+MAX_ACCOUNT_REFS = 4  # foreign accounts per app call
+MAX_TOTAL_REFS = 8    # accounts + apps + assets + boxes per app call
+
+
+class UnwatchableClient:
+    """Accepts every group but fails the status call the block follower starts with"""
+
+    def send_transactions(self, group):
+        return f"TX{len(group)}"
+
+    def status(self):
+        raise ConnectionError("algod unreachable")
+
+
+def test_groups_that_cannot_be_watched_still_finish():
+    outcomes = []
+    worker = threading.Thread(daemon=True, target=lambda: outcomes.extend(
+        submit_pipelined(UnwatchableClient(), [["a"], ["a", "b"], ["a"]], in_flight=2)))
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive(), "submit_pipelined hung"
+    assert [o["ok"] for o in outcomes] == [False] * 3
+    assert outcomes[1]["txid"] == "TX2"
+    assert "unreachable" in outcomes[1]["error"]
+
+
+def governance_app(chain):
+    app_id = chain.create_app(chain.account(), *get_governance_sender_teal(),
+                              (GLOBAL_INTS, GLOBAL_BYTES), (LOCAL_INTS, LOCAL_BYTES))
+    chain.ledger.fund(chain.app_address(app_id), 1_000_000)
+    return app_id
+
+
+def decoded(group):
+    return [encoding.msgpack_decode(base64.b64encode(blob).decode()).transaction for blob in group]
+
+
+def test_contribution_groups_pack_pairs_and_reference_what_they_write(chain):
+    app_id = governance_app(chain)
+    contributors = [chain.keyed_account() for _ in range(ROSTER_PAGE_SIZE + 4)]
+    groups, labels = build_contribution_groups(chain.sp, app_id, chain.app_address(app_id), contributors,
+                                               500_000, next_slot=0)
+    assert [len(g) for g in groups] == [16, 16, 16, 16, 8] and len(labels) == 5
+
+    for group in groups:
+        result = chain.run_signed(group)
+        assert result["ok"], result["error"]
+    assert chain.ledger.global_state(app_id)[b"total_contributors"] == len(contributors)
+
+    for start, group in zip(range(0, len(contributors), 8), groups):
+        txns = decoded(group)
+        calls = [t for t in txns if t.type == transaction.constants.appcall_txn]
+        for call in calls:
+            assert len(call.accounts or []) <= MAX_ACCOUNT_REFS
+            assert (len(call.accounts or []) + len(call.foreign_apps or []) + len(call.foreign_assets or [])
+                    + len(call.boxes or [])) <= MAX_TOTAL_REFS
+        # avm.py does not enforce box references, so check the group names every box it writes
+        referenced = {box.name for call in calls for box in call.boxes}
+        batch = contributors[start:start + 8]
+        assert {member_box_name(c["addr"]) for c in batch} <= referenced
+        pages = {slot // ROSTER_PAGE_SIZE for slot in range(start, start + len(batch))}
+        assert {roster_box_name(page) for page in pages} <= referenced
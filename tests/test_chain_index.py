@@ -0,0 +1,84 @@
+import base64
+import msgpack
+import pytest
+from algosdk import account, encoding, logic, transaction
+from chain_index import _decode_call, _inner_payments, _txid
+from local_algod import GENESIS_HASH, GENESIS_ID, LocalAlgod
+from payouts import encode_payouts
+from sender_contract import get_sender_contract_teal
+from teal_assembler import assemble
+
+
+@pytest.fixture
+def node():
+    node = LocalAlgod(block_time=0)
+    private_key, address = account.generate_account()
+    node.fund(address, 100_000_000)
+    yield node, private_key, address
+    node.stop()
+
+
+def params(node, genesis_id=GENESIS_ID):
+    last = node.ledger.round
+    return transaction.SuggestedParams(1000, last, last + 1000, GENESIS_HASH, genesis_id, flat_fee=True)
+
+
+def submit(node, private_key, *txns):
+    txns = list(txns)
+    if len(txns) > 1:
+        transaction.assign_group_id(txns)
+    node.submit(b"".join(base64.b64decode(encoding.msgpack_encode(t.sign(private_key))) for t in txns))
+    return [t.get_txid() for t in txns]
+
+
+def last_block(node):
+    raw = node.block(node.ledger.round, response_format="msgpack")
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)["block"]
+
+
+def test_txids_of_block_transactions(node):
+    local, private_key, sender = node
+    _, receiver = account.generate_account()
+    # With and without the genesis id: blocks strip both and flag gen with hgi
+    txids = submit(local, private_key,
+                   transaction.PaymentTxn(sender, params(local), receiver, 200_000, note=b"a"),
+                   transaction.PaymentTxn(sender, params(local, genesis_id=None), receiver, 1, note=b"b"))
+    block = last_block(local)
+    assert [signed.get("hgi", False) for signed in block["txns"]] == [True, False]
+    assert all("gh" not in signed["txn"] for signed in block["txns"])
+    assert [_txid(block, signed) for signed in block["txns"]] == txids
+
+
+def test_inner_payments_and_decoded_call_of_a_batch_payout(node):
+    local, private_key, owner = node
+    approval, clear = get_sender_contract_teal()
+    submit(local, private_key, transaction.ApplicationCreateTxn(
+        owner, params(local), transaction.OnComplete.NoOpOC, assemble(approval), assemble(clear),
+        transaction.StateSchema(1, 1), transaction.StateSchema(0, 0)))
+    app_id = last_block(local)["txns"][0]["apid"]
+    app_address = logic.get_application_address(app_id)
+    submit(local, private_key, transaction.PaymentTxn(owner, params(local), app_address, 5_000_000))
+
+    payouts = [(account.generate_account()[1], 300_000), (account.generate_account()[1], 400_000)]
+    args = [b"send_batch", b"".join(encoding.decode_address(a) for a, _ in payouts),
+            b"".join(amount.to_bytes(8, 'big') for _, amount in payouts)]
+    call_sp = params(local)
+    call_sp.fee = 3000
+    txid, = submit(local, private_key, transaction.ApplicationNoOpTxn(
+        owner, call_sp, app_id, app_args=args, accounts=[a for a, _ in payouts]))
+
+    signed, = last_block(local)["txns"]
+    assert _txid(last_block(local), signed) == txid
+    assert _inner_payments(signed) == [(encoding.decode_address(app_address), encoding.decode_address(a), amount)
+                                       for a, amount in payouts]
+    assert _decode_call("send_batch", signed["txn"]["apaa"]) == (None, None, 700_000)
+
+
+def test_decode_call_by_method():
+    _, recipient = account.generate_account()
+    payouts = [(recipient, 1_000), (recipient, 2_500)]
+    assert _decode_call("propose_send", [b"propose_send", encoding.decode_address(recipient),
+                                         (5_000).to_bytes(8, 'big')]) == (None, recipient, 5_000)
+    assert _decode_call("open_proposal", [b"open_proposal", encode_payouts(payouts)]) == (None, None, 3_500)
+    assert _decode_call("vote_proposal", [b"vote_proposal", (7).to_bytes(8, 'big')]) == (7, None, None)
+    assert _decode_call("vote", [b"vote"]) == (None, None, None)
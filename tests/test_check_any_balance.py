@@ -0,0 +1,41 @@
+import threading
+import check_any_balance
+from check_any_balance import fetch_account_infos
+
+
+class StubClient:
+    """account_info that fails for BAD and holds SLOW until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def account_info(self, address):
+        if address == "SLOW":
+            assert self.release.wait(timeout=5)
+        if address == "BAD":
+            raise ConnectionError("algod unreachable")
+        return {"address": address, "amount": len(address)}
+
+
+def test_fan_out_yields_as_completed_and_isolates_errors(monkeypatch):
+    monkeypatch.setattr(check_any_balance, "watched_accounts", lambda: {})
+    entries = [("slow", "SLOW"), ("a", "AA"), ("bad", "BAD"), ("b", "BBB")]
+    client = StubClient()
+    lookups = fetch_account_infos(client, entries, max_workers=4)
+    # The slow first entry does not hold back the others
+    results = [next(lookups) for _ in range(3)]
+    assert "slow" not in [key for key, *_ in results]
+    client.release.set()
+    results += list(lookups)
+    assert sorted(r[0] for r in results) == sorted(key for key, _ in entries)
+    by_key = {key: (address, info, error) for key, address, info, error, _ in results}
+    assert by_key["a"] == ("AA", {"address": "AA", "amount": 2}, None)
+    assert by_key["b"] == ("BBB", {"address": "BBB", "amount": 3}, None)
+    assert by_key["bad"][1] is None and isinstance(by_key["bad"][2], ConnectionError)
+
+
+def test_watched_addresses_skip_algod(monkeypatch):
+    monkeypatch.setattr(check_any_balance, "watched_accounts",
+                        lambda: {"AA": {"address": "AA", "amount": 7}})
+    results = list(fetch_account_infos(StubClient(), [("a", "AA"), ("b", "BBB")]))
+    assert [(key, info["amount"]) for key, _, info, _, _ in results] == [("a", 7), ("b", 3)]
@@ -0,0 +1,35 @@
+import threading
+from confirmations import RECENT_ROUNDS, ConfirmationWaiter
+
+START = 100
+
+
+class JumpingClient:
+    """algod whose first wait-for-block lands more than RECENT_ROUNDS rounds
+    ahead, with the watched transaction in the first of them"""
+
+    def __init__(self, txid):
+        self.txid = txid
+        self.waits = 0
+
+    def status(self):
+        return {"last-round": START}
+
+    def status_after_block(self, round_num):
+        self.waits += 1
+        if self.waits > 1:
+            threading.Event().wait()
+        return {"last-round": START + RECENT_ROUNDS + 10}
+
+    def get_block_txids(self, round_num):
+        return {"blockTxids": [self.txid] if round_num == START else []}
+
+    def pending_transaction_info(self, txid):
+        return {}
+
+
+def test_follower_reads_every_round_after_falling_behind():
+    waiter = ConfirmationWaiter(JumpingClient("TX"))
+    result = waiter.watch("TX").result(timeout=5)
+    assert result == {"txid": "TX", "confirmed-round": START}
+    assert waiter.last_round() == START + RECENT_ROUNDS + 10
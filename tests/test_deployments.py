@@ -0,0 +1,98 @@
+import base64
+import json
+import threading
+import pytest
+import deployments
+from deployments import (Registry, add_records, import_legacy, load_registry, program_hash, record_deployment,
+                         verify, warn_outdated)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "deployments.json")
+
+
+def test_record_find_and_tag(path):
+    record_deployment("vault", {"appId": 1, "goal": 5}, network="testnet", path=path)
+    record_deployment("vault", {"appId": 2}, tag="paris", network="testnet", path=path)
+    record_deployment("vault", {"appId": 3}, network="localnet", path=path)
+    record_deployment("token", {"assetId": 4}, network="testnet", path=path)
+
+    registry = load_registry(path)
+    assert [r["appId"] for r in registry.find("vault", network="testnet")] == [1, 2]
+    assert [r["appId"] for r in registry.find("vault", network=None)] == [1, 2, 3]
+    assert [r["appId"] for r in registry.find("vault", network="testnet", tag="paris")] == [2]
+    assert registry.latest("vault", network="testnet", tag=None)["appId"] == 2
+    assert registry.latest("vault", network="testnet", tag="paris")["appId"] == 2
+    assert registry.latest("vault", network="testnet", tag="rome") is None
+    assert registry.get(4)["type"] == "token" and registry.get(1)["goal"] == 5
+
+
+def test_redeploying_an_id_replaces_its_record_in_place(path):
+    record_deployment("vault", {"appId": 1, "goal": 5}, path=path)
+    record_deployment("echo", {"appId": 2}, path=path)
+    record_deployment("vault", {"appId": 1, "goal": 9}, approval=b"a", clear=b"c", path=path)
+    records = load_registry(path).records
+    assert [(r["appId"], r.get("goal")) for r in records] == [(1, 9), (2, None)]
+    assert records[0]["approvalHash"] == program_hash(b"a") and records[0]["clearHash"] == program_hash(b"c")
+
+
+def test_bad_records_are_refused(path):
+    with pytest.raises(ValueError):
+        record_deployment("rocket", {"appId": 1}, path=path)
+    with pytest.raises(ValueError):
+        record_deployment("vault", {"goal": 5}, path=path)
+
+
+def test_concurrent_writers_keep_every_record(path):
+    threads = [threading.Thread(target=add_records, args=([{"appId": n, "type": "vault"}], path))
+               for n in range(1, 21)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(r["appId"] for r in load_registry(path).records) == list(range(1, 21))
+
+
+def test_warn_outdated(capsys):
+    assert warn_outdated({"type": "vault", "appId": 7}, 2)
+    assert "contract version 1" in capsys.readouterr().out
+    assert not warn_outdated({"type": "vault", "appId": 7, "contractVersion": 2}, 2)
+    assert capsys.readouterr().out == ""
+
+
+def test_import_legacy_files_once(path, tmp_path):
+    legacy = tmp_path / "simple_deployment.json"
+    legacy.write_text(json.dumps({"appId": 745489528, "appAddress": "X"}))
+    (tmp_path / "echo_contract_deployment.json").write_text(json.dumps({"note": "never deployed"}))
+
+    imported = import_legacy(path, str(tmp_path))
+    assert [(r["type"], r["appId"], r["contractVersion"], r["legacyFile"]) for r in imported] == \
+        [("simple", 745489528, 1, "simple_deployment.json")]
+    assert import_legacy(path, str(tmp_path)) == []
+    assert len(load_registry(path)) == 1
+
+
+class StubAlgod:
+    def __init__(self, programs):
+        self.programs = programs
+
+    def application_info(self, app_id):
+        if app_id not in self.programs:
+            raise ConnectionError("application does not exist")
+        approval, clear = self.programs[app_id]
+        return {"params": {"approval-program": base64.b64encode(approval).decode(),
+                           "clear-state-program": base64.b64encode(clear).decode()}}
+
+
+def test_verify_compares_program_hashes(monkeypatch, capsys):
+    hashes = {"approvalHash": program_hash(b"approval"), "clearHash": program_hash(b"clear")}
+    records = [dict(hashes, type="vault", appId=1), dict(hashes, type="vault", appId=2),
+               {"type": "vault", "appId": 3}, dict(hashes, type="vault", appId=4),
+               {"type": "token", "assetId": 5}]
+    monkeypatch.setattr(deployments, "get_registry", lambda: Registry(
+        [dict(r, network=deployments.NETWORK) for r in records]))
+    verify(algod_client=StubAlgod({1: (b"approval", b"clear"), 2: (b"changed", b"clear")}))
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines] == ["✅", "❌", "⚪", "❌"]
+    assert "differ" in lines[1] and "does not exist" in lines[3]
@@ -0,0 +1,318 @@
+from algosdk import encoding, transaction
+import pytest
+from governance_sender import (GLOBAL_BYTES, GLOBAL_INTS, LOCAL_BYTES, LOCAL_INTS, MEMBER_RECORD_SIZE,
+                               get_governance_sender_teal, proposal_box_name)
+from governance_interact import build_batch_proposal, build_execute_group
+from payouts import decode_payouts, encode_payouts
+from proposals_interact import build_execute_proposal_group, build_open_proposal, decode_proposal
+from roster import APP_FUNDING, ROSTER_PAGE_SIZE, join_box_refs, join_cost, member_box_name, roster_box_name
+
+APP_BALANCE = 1_000_000  # what the tests fund a new app with
+
+
+@pytest.fixture
+def gov(chain):
+    owner = chain.account()
+    app_id = chain.create_app(owner, *get_governance_sender_teal(),
+                              (GLOBAL_INTS, GLOBAL_BYTES), (LOCAL_INTS, LOCAL_BYTES))
+    chain.ledger.fund(chain.app_address(app_id), APP_BALANCE)
+    return {"app_id": app_id, "owner": owner}
+
+
+def state(chain, gov):
+    return {key.decode(): value for key, value in chain.ledger.global_state(gov["app_id"]).items()}
+
+
+def contribute(chain, gov, member, amount, opt_in=False):
+    app_id = gov["app_id"]
+    pay = transaction.PaymentTxn(member, chain.sp, chain.app_address(app_id), amount)
+    call = transaction.ApplicationCallTxn(
+        member, chain.sp, app_id,
+        transaction.OnComplete.OptInOC if opt_in else transaction.OnComplete.NoOpOC,
+        app_args=[b"contribute"],
+        boxes=[(app_id, member_box_name(member))] + join_box_refs(app_id, state(chain, gov)["total_contributors"]))
+    return chain.run(pay, call)
+
+
+def call(chain, gov, sender, *args, **kwargs):
+    return chain.run(transaction.ApplicationNoOpTxn(sender, chain.sp, gov["app_id"], app_args=list(args), **kwargs))
+
+
+def members(chain, gov, count, amount=1_000_000):
+    addresses = [chain.account() for _ in range(count)]
+    for n, address in enumerate(addresses):
+        assert contribute(chain, gov, address, amount, opt_in=n % 2 == 0)["ok"]
+    return addresses
+
+
+def propose_send(chain, gov, recipient, amount):
+    return call(chain, gov, gov["owner"], b"propose_send", encoding.decode_address(recipient),
+                amount.to_bytes(8, 'big'))
+
+
+def test_contribute_vote_execute(chain, gov):
+    voters = members(chain, gov, 4)
+    recipient = chain.account(0)
+    assert state(chain, gov)["total_contributors"] == 4
+    assert propose_send(chain, gov, recipient, 300_000)["ok"]
+
+    for voter in voters[:2]:
+        assert call(chain, gov, voter, b"vote")["ok"]
+    # 2 of 4 is below the 75% quorum
+    assert not call(chain, gov, gov["owner"], b"execute_send", accounts=[recipient])["ok"]
+
+    assert call(chain, gov, voters[2], b"vote")["ok"]
+    assert call(chain, gov, gov["owner"], b"execute_send", accounts=[recipient])["ok"]
+    assert chain.balance(recipient) == 300_000
+    assert state(chain, gov)["active_proposal"] == 0
+    assert state(chain, gov)["total_sent"] == 300_000
+
+
+def test_member_votes_once_per_proposal(chain, gov):
+    voter, = members(chain, gov, 1)
+    assert propose_send(chain, gov, chain.account(0), 100_000)["ok"]
+    assert call(chain, gov, voter, b"vote")["ok"]
+    assert not call(chain, gov, voter, b"vote")["ok"]
+    assert state(chain, gov)["proposal_votes"] == 1
+
+
+def test_votes_reset_with_the_next_proposal(chain, gov):
+    voter, = members(chain, gov, 1)
+    recipient = chain.account(0)
+    for _ in range(2):
+        assert propose_send(chain, gov, recipient, 100_000)["ok"]
+        assert call(chain, gov, voter, b"vote")["ok"]
+        assert call(chain, gov, gov["owner"], b"execute_send", accounts=[recipient])["ok"]
+    assert chain.balance(recipient) == 200_000
+
+
+def test_non_member_cannot_vote(chain, gov):
+    members(chain, gov, 1)
+    assert propose_send(chain, gov, chain.account(0), 100_000)["ok"]
+    assert not call(chain, gov, chain.account(), b"vote")["ok"]
+
+
+def test_box_member_joins_roster_without_opt_in(chain, gov):
+    first, second = chain.account(), chain.account()
+    assert contribute(chain, gov, first, 500_000)["ok"]
+    assert contribute(chain, gov, second, 700_000, opt_in=True)["ok"]
+    assert contribute(chain, gov, first, 250_000)["ok"]
+
+    app_id = gov["app_id"]
+    record = chain.ledger.box(app_id, member_box_name(first))
+    assert int.from_bytes(record[0:8], 'big') == 750_000  # contributed
+    assert int.from_bytes(record[16:24], 'big') == 0      # slot
+    assert chain.ledger.local_state(second, app_id)[b"slot"] == 1
+    assert chain.ledger.box(app_id, member_box_name(second)) is None
+
+    page = chain.ledger.box(app_id, roster_box_name(0))
+    assert page[0:32] == encoding.decode_address(first)
+    assert page[32:64] == encoding.decode_address(second)
+    assert state(chain, gov)["total_contributors"] == 2
+
+
+def test_contribute_pairs_with_the_payment_just_before_it(chain, gov):
+    app_id = gov["app_id"]
+    first, second = chain.account(), chain.account()
+
+    def pair(member, amount, roster=()):
+        return [transaction.PaymentTxn(member, chain.sp, chain.app_address(app_id), amount),
+                transaction.ApplicationNoOpTxn(member, chain.sp, app_id, app_args=[b"contribute"],
+                                               boxes=[(app_id, member_box_name(member)), *roster])]
+
+    assert chain.run(*pair(first, 500_000, join_box_refs(app_id, 0, 0, 2)), *pair(second, 700_000))["ok"]
+    assert state(chain, gov)["total_contributors"] == 2
+
+    # Nothing before the call at GroupIndex 0, and a call is not a payment
+    assert chain.run(pair(first, 100_000)[1], pair(first, 100_000)[0])["failed_at"] == 0
+    pay, call = pair(second, 100_000)
+    assert chain.run(pay, call, transaction.ApplicationNoOpTxn(
+        second, chain.sp, app_id, app_args=[b"contribute"], note=b"again"))["failed_at"] == 2
+
+
+def test_opted_in_member_cannot_also_hold_a_box(chain, gov):
+    member = chain.account()
+    assert contribute(chain, gov, member, 500_000)["ok"]
+    optin = transaction.ApplicationOptInTxn(member, chain.sp, gov["app_id"])
+    assert not chain.run(optin)["ok"]
+
+
+BOX_REF_SIZE = 1024  # bytes of box I/O each box reference in a group allows
+MAX_TOTAL_REFS = 8    # accounts + apps + assets + boxes per app call
+
+
+def batch(chain, count):
+    return [(chain.account(0), 100_000 + n) for n in range(count)]
+
+
+def box_refs(txn, name):
+    return sum(1 for box in txn.boxes if box.name == name)
+
+
+def test_batch_payouts_round_trip_through_the_box(chain, gov):
+    chain.ledger.fund(chain.app_address(gov["app_id"]), 10_000_000)
+    voters = members(chain, gov, 4)
+    payouts = batch(chain, 30)
+    propose = build_batch_proposal(chain.sp, gov["app_id"], gov["owner"], payouts)
+    # 30 x 40 bytes needs two references' worth of box I/O
+    assert box_refs(propose, b"payouts") == 2
+    assert chain.ok(propose)
+    box = chain.ledger.box(gov["app_id"], b"payouts")
+    assert box == encode_payouts(payouts) and decode_payouts(box) == payouts
+    assert state(chain, gov)["payout_count"] == 30
+
+    group = build_execute_group(chain.sp, gov["app_id"], gov["owner"], payouts)
+    assert len(group) == 8
+    for txn in group:
+        assert box_refs(txn, b"payouts") == 1
+        assert len(txn.accounts) + len(txn.foreign_apps or []) + len(txn.boxes) <= MAX_TOTAL_REFS
+    assert len(group) * BOX_REF_SIZE >= len(box)
+
+    # 2 of 4 votes is below quorum: nothing is paid and the list stays
+    for voter in voters[:2]:
+        assert call(chain, gov, voter, b"vote")["ok"]
+    assert not chain.run(*group)["ok"]
+    assert chain.ledger.box(gov["app_id"], b"payouts") == box
+
+    assert call(chain, gov, voters[2], b"vote")["ok"]
+    assert chain.ok(*group)
+    assert [chain.balance(address) for address, _ in payouts] == [amount for _, amount in payouts]
+    assert chain.ledger.box(gov["app_id"], b"payouts") is None
+    assert state(chain, gov)["active_proposal"] == 0
+    assert state(chain, gov)["total_sent"] == sum(amount for _, amount in payouts)
+
+    # The proposal is closed, so the same list cannot be paid twice
+    assert not chain.run(*build_execute_group(chain.sp, gov["app_id"], gov["owner"], payouts))["ok"]
+
+
+def test_batch_execution_can_span_groups(chain, gov):
+    chain.ledger.fund(chain.app_address(gov["app_id"]), 10_000_000)
+    voter, = members(chain, gov, 1)
+    payouts = batch(chain, 20)
+    assert chain.ok(build_batch_proposal(chain.sp, gov["app_id"], gov["owner"], payouts))
+    assert call(chain, gov, voter, b"vote")["ok"]
+
+    assert chain.ok(*build_execute_group(chain.sp, gov["app_id"], gov["owner"], payouts[:16]))
+    assert state(chain, gov)["payout_cursor"] == 16 and state(chain, gov)["active_proposal"] == 1
+    assert chain.ok(*build_execute_group(chain.sp, gov["app_id"], gov["owner"], payouts[16:]))
+    assert [chain.balance(address) for address, _ in payouts] == [amount for _, amount in payouts]
+    assert state(chain, gov)["active_proposal"] == 0
+
+
+def proposal(chain, gov, proposal_id):
+    value = chain.ledger.box(gov["app_id"], proposal_box_name(proposal_id))
+    return None if value is None else decode_proposal(proposal_id, value)
+
+
+def open_proposal(chain, gov, payouts):
+    proposal_id = state(chain, gov)["box_proposal_id"] + 1
+    result = chain.run(build_open_proposal(chain.sp, gov["app_id"], gov["owner"], payouts, proposal_id))
+    return proposal_id if result["ok"] else None
+
+
+def vote_proposal(chain, gov, voter, proposal_id):
+    return call(chain, gov, voter, b"vote_proposal", proposal_id.to_bytes(8, 'big'))
+
+
+def test_concurrent_proposals(chain, gov):
+    voters = members(chain, gov, 4)
+    flights, hotel = chain.account(1), chain.account(1)
+    first = open_proposal(chain, gov, [(flights, 200_000)])
+    second = open_proposal(chain, gov, [(hotel, 150_000), (flights, 50_000)])
+    assert first and second and first != second
+
+    for voter in voters[:3]:
+        assert vote_proposal(chain, gov, voter, second)["ok"]
+    assert vote_proposal(chain, gov, voters[0], first)["ok"]
+    assert proposal(chain, gov, first)["votes"] == 1
+    assert proposal(chain, gov, second)["votes"] == 3
+
+    assert not chain.run(*build_execute_proposal_group(chain.sp, gov["app_id"], gov["owner"],
+                                                       proposal(chain, gov, first)))["ok"]
+    assert chain.run(*build_execute_proposal_group(chain.sp, gov["app_id"], gov["owner"],
+                                                   proposal(chain, gov, second)))["ok"]
+    assert chain.balance(hotel) == 1_150_000
+    assert chain.balance(flights) == 1_050_000
+    assert proposal(chain, gov, second) is None
+    assert proposal(chain, gov, first)["votes"] == 1
+
+
+def test_proposal_vote_is_one_bit_per_member(chain, gov):
+    voter, = members(chain, gov, 1)
+    proposal_id = open_proposal(chain, gov, [(chain.account(0), 100_000)])
+    assert vote_proposal(chain, gov, voter, proposal_id)["ok"]
+    assert not vote_proposal(chain, gov, voter, proposal_id)["ok"]
+    assert proposal(chain, gov, proposal_id)["votes"] == 1
+
+
+def test_only_owner_opens_and_cancels_proposals(chain, gov):
+    member, = members(chain, gov, 1)
+    payouts = [(chain.account(0), 100_000)]
+    assert not chain.run(build_open_proposal(chain.sp, gov["app_id"], member, payouts, 1))["ok"]
+    proposal_id = open_proposal(chain, gov, payouts)
+    assert not call(chain, gov, member, b"cancel_proposal", proposal_id.to_bytes(8, 'big'))["ok"]
+    assert call(chain, gov, gov["owner"], b"cancel_proposal", proposal_id.to_bytes(8, 'big'))["ok"]
+    assert proposal(chain, gov, proposal_id) is None
+
+
+def test_open_proposal_cannot_reset_votes_on_the_active_proposal(chain, gov):
+    # One contributor used to reach proposal_votes == 4: every open_proposal moved
+    # the shared proposal_id, so their earlier vote no longer counted as cast
+    voter, = members(chain, gov, 1)
+    recipient = chain.account(0)
+    assert propose_send(chain, gov, recipient, 100_000)["ok"]
+    assert call(chain, gov, voter, b"vote")["ok"]
+    for expected_id in (1, 2, 3):
+        assert open_proposal(chain, gov, [(recipient, 100_000)]) == expected_id
+        assert not call(chain, gov, voter, b"vote")["ok"]
+    assert state(chain, gov)["proposal_votes"] == 1
+    assert state(chain, gov)["proposal_id"] == 1
+
+
+def test_one_proposal_open_on_each_path_at_once(chain, gov):
+    voters = members(chain, gov, 2)
+    flights, hotel = chain.account(0), chain.account(0)
+    assert propose_send(chain, gov, flights, 300_000)["ok"]
+    box_id = open_proposal(chain, gov, [(hotel, 200_000)])
+    assert box_id == 1 and state(chain, gov)["active_proposal"] == 1
+
+    for voter in voters:
+        assert call(chain, gov, voter, b"vote")["ok"]
+        assert vote_proposal(chain, gov, voter, box_id)["ok"]
+    assert call(chain, gov, gov["owner"], b"execute_send", accounts=[flights])["ok"]
+    assert chain.run(*build_execute_proposal_group(chain.sp, gov["app_id"], gov["owner"],
+                                                   proposal(chain, gov, box_id)))["ok"]
+    assert chain.balance(flights) == 300_000 and chain.balance(hotel) == 200_000
+    assert state(chain, gov)["active_proposal"] == 0 and proposal(chain, gov, box_id) is None
+
+
+@pytest.fixture
+def fresh_gov(chain):
+    """A governance app funded the way deploy_governance_sender funds it"""
+    owner = chain.account()
+    app_id = chain.create_app(owner, *get_governance_sender_teal(),
+                              (GLOBAL_INTS, GLOBAL_BYTES), (LOCAL_INTS, LOCAL_BYTES))
+    chain.ledger.fund(chain.app_address(app_id), APP_FUNDING)
+    return {"app_id": app_id, "owner": owner}
+
+
+def test_first_contribution_to_a_fresh_app_covers_its_roster_boxes(chain, fresh_gov):
+    assert contribute(chain, fresh_gov, chain.account(), 100_000)["ok"]
+    assert contribute(chain, fresh_gov, chain.account(), 100_000, opt_in=True)["ok"]
+
+
+def test_each_join_adds_only_its_own_min_balance(chain, fresh_gov):
+    app_address = chain.app_address(fresh_gov["app_id"])
+    for slot in range(ROSTER_PAGE_SIZE + 1):
+        opt_in = slot % 3 == 0
+        cost = join_cost(slot, 0 if opt_in else MEMBER_RECORD_SIZE)
+        before = chain.ledger.min_balance(app_address)
+        result = contribute(chain, fresh_gov, chain.account(), cost, opt_in=opt_in)
+        assert result["ok"], f"slot {slot}: {result['error']}"
+        assert chain.ledger.min_balance(app_address) - before == cost
+    assert len(chain.ledger.box(fresh_gov["app_id"], roster_box_name(0))) == 32 * ROSTER_PAGE_SIZE
+    assert len(chain.ledger.box(fresh_gov["app_id"], roster_box_name(1))) == 32
+
+
+def test_contribution_below_the_join_cost_is_rejected(chain, fresh_gov):
+    assert not contribute(chain, fresh_gov, chain.account(), join_cost(0, MEMBER_RECORD_SIZE) - 1)["ok"]
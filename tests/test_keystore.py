@@ -0,0 +1,74 @@
+import json
+import os
+import pytest
+from algosdk import account, mnemonic
+import keystore
+from keystore import Keystore, add_accounts, generate_accounts, get_keystore
+
+
+def row(name, address=None, private_key=None):
+    if address is None:
+        private_key, address = account.generate_account()
+    return [name, address, private_key, "localnet", None]
+
+
+def test_earlier_rows_win_name_and_address_clashes():
+    first, second = row("alice"), row("bob")
+    store = Keystore()
+    store._extend([first, second])
+    store._extend([row("alice"), row("carol", address=second[1])])
+
+    assert store.get("alice")["addr"] == first[1]
+    # carol's name is new, but bob already owns the address
+    assert store.get("carol")["addr"] == second[1]
+    assert store.find(second[1])["name"] == "bob"
+    assert len(store) == 3
+
+
+def test_add_accounts_rejects_clashes_without_touching_the_file(tmp_path):
+    path = str(tmp_path / "keystore.json")
+    rows = generate_accounts(2, "t-", keystore_path=path)
+    before = open(path).read()
+
+    with pytest.raises(ValueError):
+        add_accounts([row("t-00009"), row(rows[0][0])], path)
+    assert open(path).read() == before
+    assert os.listdir(tmp_path) == ["keystore.json"]
+
+    more = generate_accounts(1, "t-", keystore_path=path)
+    assert more[0][0] == "t-00002"
+    assert [r[0] for r in json.load(open(path))["accounts"]] == ["t-00000", "t-00001", "t-00002"]
+
+
+def test_generate_needs_at_least_one_account(tmp_path, capsys, monkeypatch):
+    path = str(tmp_path / "keystore.json")
+    with pytest.raises(ValueError):
+        generate_accounts(0, keystore_path=path)
+    monkeypatch.setattr(keystore, "KEYSTORE_PATH", path)
+    monkeypatch.setattr("sys.argv", ["keystore.py", "generate", "0"])
+    keystore.main()
+    assert "❌" in capsys.readouterr().out
+    assert not os.path.exists(path)
+
+
+def test_shared_keystore_reloads_when_a_file_changes(tmp_path, monkeypatch):
+    keystore_path, wallets_path = str(tmp_path / "keystore.json"), str(tmp_path / "wallets.json")
+    private_key, address = account.generate_account()
+    with open(wallets_path, "w") as f:
+        json.dump({"elton": {"addr": address, "mnemonic": mnemonic.from_private_key(private_key)}}, f)
+    monkeypatch.setattr(keystore, "KEYSTORE_PATH", keystore_path)
+    monkeypatch.setattr(keystore, "WALLETS_PATH", wallets_path)
+    monkeypatch.setattr(keystore, "_keystore", None)
+
+    loaded = get_keystore()
+    assert loaded.get("elton")["sk"] == private_key
+    assert get_keystore() is loaded
+
+    # wallets.json names are taken for the default keystore
+    with pytest.raises(ValueError):
+        add_accounts([row("elton")], keystore_path)
+    add_accounts([row("load-00000")], keystore_path)
+    stat = os.stat(keystore_path)
+    os.utime(keystore_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = get_keystore()
+    assert reloaded is not loaded and "load-00000" in reloaded
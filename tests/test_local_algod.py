@@ -0,0 +1,40 @@
+import pytest
+from algosdk import account, encoding, error, transaction
+from algosdk.v2client import algod
+from local_algod import start_local_algod
+
+
+@pytest.fixture
+def node():
+    private_key, address = account.generate_account()
+    node, server, url = start_local_algod(host="127.0.0.1", port=0, block_time=0, fund=[address])
+    yield algod.AlgodClient("", url), node, private_key, address
+    node.stop()
+    server.shutdown()
+    server.server_close()
+
+
+def test_payment_round_trip_through_the_sdk_client(node):
+    client, local, private_key, sender = node
+    start = client.status()["last-round"]
+    params = client.suggested_params()
+    assert params.gh == local.params()["genesis-hash"] and params.min_fee == 1000
+
+    _, receiver = account.generate_account()
+    txn = transaction.PaymentTxn(sender, params, receiver, 250_000)
+    txid = client.send_raw_transaction(encoding.msgpack_encode(txn.sign(private_key)))
+    assert txid == txn.get_txid()
+
+    info = client.pending_transaction_info(txid)
+    assert info["confirmed-round"] > start
+    assert info["txn"]["txn"]["rcv"] == receiver and info["txn"]["txn"]["amt"] == 250_000
+    assert client.status()["last-round"] == info["confirmed-round"]
+    assert client.account_info(receiver)["amount"] == 250_000
+
+
+def test_bad_signature_is_rejected_over_http(node):
+    client, _, _, sender = node
+    other_key, _ = account.generate_account()
+    txn = transaction.PaymentTxn(sender, client.suggested_params(), sender, 0)
+    with pytest.raises(error.AlgodHTTPError):
+        client.send_raw_transaction(encoding.msgpack_encode(txn.sign(other_key)))
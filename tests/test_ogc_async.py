@@ -0,0 +1,21 @@
+import asyncio
+import base64
+from algosdk import logic, transaction
+from ogc_async import AsyncAlgodClient
+
+# /v2/transactions/params: "fee" is the per-byte fee (0 off congestion), "min-fee" the flat minimum
+PARAMS = {"fee": 0, "min-fee": 1000, "last-round": 5000, "genesis-id": "testnet-v1.0",
+          "genesis-hash": base64.b64encode(bytes(32)).decode(), "consensus-version": "future"}
+
+
+class StubAlgod(AsyncAlgodClient):
+    async def request(self, method, path, **kwargs):
+        assert path == "/transactions/params"
+        return PARAMS
+
+
+def test_suggested_params_charge_the_minimum_fee():
+    sp = asyncio.run(StubAlgod(algod_address="http://localhost:4001").suggested_params())
+    assert (sp.first, sp.last, sp.min_fee) == (5000, 6000, 1000)
+    pay = transaction.PaymentTxn(logic.get_application_address(1), sp, logic.get_application_address(2), 1_000)
+    assert pay.fee == 1000
@@ -0,0 +1,53 @@
+import importlib
+import inspect
+import pytest
+import check_any_balance
+import ogc_cli
+import watcher_client
+
+MODULES = sorted({entry[1] for entry in ogc_cli._commands().values() if entry[1]}
+                 | set(ogc_cli.DEPLOY_MODULES.values()))
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_every_command_module_imports_and_runs_as_main(module):
+    source = inspect.getsource(importlib.import_module(module))
+    assert 'if __name__ == "__main__":' in source
+
+
+def test_unknown_command_exits_with_status_2(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        ogc_cli.main(["governence"])
+    assert exit_info.value.code == 2
+    assert "Did you mean: governance" in capsys.readouterr().out
+
+
+WATCHED = {"ADDR1": {"address": "ADDR1", "name": "alice", "amount": 2_000_000, "round": 7}}
+
+
+@pytest.fixture
+def algod_lookups(monkeypatch):
+    monkeypatch.setattr(watcher_client, "watched_accounts", lambda: WATCHED)
+    calls = []
+    monkeypatch.setattr(check_any_balance, "check_balances", calls.append)
+    monkeypatch.setattr(check_any_balance, "check_all_wallets", lambda: calls.append(None))
+    return calls
+
+
+def test_balance_of_watched_accounts_comes_from_the_watcher(algod_lookups, capsys):
+    ogc_cli.main(["balance", "alice"])
+    ogc_cli.main(["balance", "alice", "ADDR1"])
+    assert algod_lookups == []
+    assert "From the watcher (round 7)" in capsys.readouterr().out
+
+
+def test_balance_falls_back_when_some_accounts_are_not_watched(algod_lookups, capsys):
+    ogc_cli.main(["balance", "alice", "bob"])
+    assert algod_lookups == [["alice", "bob"]]
+    assert "From the watcher" not in capsys.readouterr().out
+
+
+def test_balance_without_a_watcher_asks_algod(algod_lookups, monkeypatch):
+    monkeypatch.setattr(watcher_client, "watched_accounts", lambda: {})
+    ogc_cli.main(["balance"])
+    assert algod_lookups == [None]
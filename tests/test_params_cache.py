@@ -0,0 +1,22 @@
+import base64
+from algosdk import transaction
+from params_cache import MAX_TXN_LIFE, SuggestedParamsCache
+
+
+class FixedClient:
+    def suggested_params(self):
+        return transaction.SuggestedParams(1000, 100, 1100, base64.b64encode(bytes(32)).decode(), flat_fee=True)
+
+
+class RacingCache(SuggestedParamsCache):
+    """Another thread's invalidate() (after a 'txn dead' rejection) lands right after each store"""
+
+    def _store(self, sp):
+        super()._store(sp)
+        self.invalidate()
+
+
+def test_get_survives_an_invalidate_racing_the_fetch():
+    sp = RacingCache(FixedClient()).get()
+    assert sp is not None
+    assert sp.first == 100 and sp.last == 100 + MAX_TXN_LIFE
@@ -0,0 +1,79 @@
+import copy
+from algosdk import constants, encoding, transaction
+from payouts import ACCOUNTS_PER_TXN, INNER_TXNS_PER_CALL, payout_calls
+from sender_contract import get_sender_contract_teal
+from sender_interact import build_payout_groups
+
+APP_BALANCE = 20_000_000
+
+
+def sender_app(chain):
+    owner = chain.account()
+    app_id = chain.create_app(owner, *get_sender_contract_teal(), (1, 1), (0, 0))
+    chain.ledger.fund(chain.app_address(app_id), APP_BALANCE)
+    return app_id, owner
+
+
+def payouts(chain, count):
+    return [(chain.account(0), 200_000 + n * 1_000) for n in range(count)]
+
+
+def batch_calls(group):
+    return [t for t in group if t.app_args[0] == b"send_batch"]
+
+
+def test_thirty_payouts_fit_two_calls_in_one_group(chain):
+    app_id, owner = sender_app(chain)
+    owed = payouts(chain, 30)
+    groups = build_payout_groups(chain.sp, app_id, owner, owed)
+    assert len(groups) == 1
+    group = groups[0]
+    calls = batch_calls(group)
+    assert [len(call.app_args[2]) // 8 for call in calls] == [INNER_TXNS_PER_CALL, 14]
+
+    # The paying call carries every inner payment's fee; its padding calls pay their own
+    assert [call.fee for call in calls] == [constants.MIN_TXN_FEE * 17, constants.MIN_TXN_FEE * 15]
+    assert all(t.fee == constants.MIN_TXN_FEE for t in group if t not in calls)
+    # No call references more than 4 accounts, and together they reference every receiver
+    assert all(len(t.accounts) <= ACCOUNTS_PER_TXN for t in group)
+    assert {a for t in group for a in t.accounts} == {address for address, _ in owed}
+
+    result = chain.ok(*group)
+    assert [chain.balance(address) for address, _ in owed] == [amount for _, amount in owed]
+    # Inner payments set Fee 0, so only the payouts leave the app
+    assert chain.balance(chain.app_address(app_id)) == APP_BALANCE - sum(amount for _, amount in owed)
+    inner = [i for r in result["txns"] for i in r.get("inner_txns", [])]
+    assert [i["receiver"] for i in inner] == [address for address, _ in owed]
+    assert chain.ledger.global_state(app_id)[b"total_sent"] == sum(amount for _, amount in owed)
+
+
+def test_short_pooled_fee_is_rejected(chain):
+    app_id, owner = sender_app(chain)
+    batch = payouts(chain, 5)
+    app_args = [b"send_batch", b"".join(encoding.decode_address(a) for a, _ in batch),
+                b"".join(amount.to_bytes(8, 'big') for _, amount in batch)]
+    txns = payout_calls(chain.sp, app_id, owner, batch, app_args)
+    assert [len(t.accounts) for t in txns] == [4, 1]
+
+    short = copy.deepcopy(txns)
+    short[0].fee -= constants.MIN_TXN_FEE
+    for txn in short:
+        txn.group = None
+    transaction.assign_group_id(short)
+    assert "fee" in chain.run(*short)["error"]
+    assert chain.balance(chain.app_address(app_id)) == APP_BALANCE
+    assert chain.ok(*txns)
+
+
+def test_only_the_owner_can_send_a_batch(chain):
+    app_id, _ = sender_app(chain)
+    group, = build_payout_groups(chain.sp, app_id, chain.account(), payouts(chain, 2))
+    assert not chain.run(*group)["ok"]
+
+
+def test_ref_accounts_alone_pays_nothing(chain):
+    app_id, owner = sender_app(chain)
+    call = transaction.ApplicationNoOpTxn(owner, chain.sp, app_id, app_args=[b"ref_accounts"],
+                                          accounts=[chain.account(0)])
+    assert chain.ok(call)
+    assert chain.balance(chain.app_address(app_id)) == APP_BALANCE
@@ -0,0 +1,120 @@
+import os
+from algosdk import encoding, transaction
+import pytest
+from roster import ROSTER_PAGE_SIZE, join_box_refs, join_cost, member_box_name, roster_box_name
+from simple_deposit import DEPLOY_FUNDING, MEMBER_RECORD_SIZE
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_BALANCE = 1_000_000  # what the tests fund a new app with
+
+
+def _teal(name):
+    with open(os.path.join(HERE, name), 'r') as f:
+        return f.read()
+
+
+@pytest.fixture
+def app_id(chain):
+    app_id = chain.create_app(chain.account(), _teal("simple_approval.teal"), _teal("simple_clear.teal"),
+                              (1, 0), (1, 0))
+    chain.ledger.fund(chain.app_address(app_id), APP_BALANCE)
+    return app_id
+
+
+def depositors(chain, app_id):
+    return chain.ledger.global_state(app_id).get(b"n", 0)
+
+
+def deposit(chain, app_id, sender, amount, opt_in=False):
+    call = transaction.ApplicationCallTxn(
+        sender, chain.sp, app_id, transaction.OnComplete.OptInOC if opt_in else transaction.OnComplete.NoOpOC,
+        app_args=[b"deposit"],
+        boxes=[(app_id, member_box_name(sender))] + join_box_refs(app_id, depositors(chain, app_id)))
+    pay = transaction.PaymentTxn(sender, chain.sp, chain.app_address(app_id), amount)
+    return chain.run(call, pay)
+
+
+def box_total(chain, app_id, address):
+    record = chain.ledger.box(app_id, member_box_name(address))
+    return None if record is None else int.from_bytes(record[0:8], 'big')
+
+
+def test_box_depositors_join_the_roster_in_order(chain, app_id):
+    first, second = chain.account(), chain.account()
+    assert deposit(chain, app_id, first, 1_000_000)["ok"]
+    assert deposit(chain, app_id, second, 1_500_000)["ok"]
+
+    assert depositors(chain, app_id) == 2
+    assert box_total(chain, app_id, first) == 1_000_000
+    record = chain.ledger.box(app_id, member_box_name(second))
+    assert int.from_bytes(record[8:16], 'big') == 1  # roster index
+    page = chain.ledger.box(app_id, roster_box_name(0))
+    assert page[0:32] == encoding.decode_address(first)
+    assert page[32:64] == encoding.decode_address(second)
+
+
+def test_deposit_with_optin_is_one_group(chain, app_id):
+    member = chain.account()
+    result = deposit(chain, app_id, member, 1_000_000, opt_in=True)
+    assert result["ok"], result["error"]
+    assert chain.ledger.local_state(member, app_id)[b"d"] == 1_000_000
+    # Opted-in depositors keep their total in local state, off the box roster
+    assert box_total(chain, app_id, member) is None
+    assert depositors(chain, app_id) == 0
+
+
+def test_refund_once_total_reaches_two_algo(chain, app_id):
+    # The app call runs before the payment lands, so the refund comes out of the app's own balance
+    chain.ledger.fund(chain.app_address(app_id), 2_000_000)
+    member = chain.account()
+    assert deposit(chain, app_id, member, 1_200_000)["ok"]
+    before = chain.balance(member)
+    result = deposit(chain, app_id, member, 1_000_000)
+    assert result["ok"], result["error"]
+    assert result["txns"][0]["logs"] == [b"success"]
+    assert chain.balance(member) == before - 1_000_000 - 2_000 + 2_000_000
+    assert box_total(chain, app_id, member) == 200_000
+
+
+def test_deposit_below_one_algo_is_rejected(chain, app_id):
+    assert not deposit(chain, app_id, chain.account(), 999_999)["ok"]
+
+
+def test_payment_must_come_from_the_caller(chain, app_id):
+    caller, payer = chain.account(), chain.account()
+    call = transaction.ApplicationNoOpTxn(caller, chain.sp, app_id, app_args=[b"deposit"])
+    pay = transaction.PaymentTxn(payer, chain.sp, chain.app_address(app_id), 1_000_000)
+    assert not chain.run(call, pay)["ok"]
+
+
+@pytest.fixture
+def fresh_app_id(chain):
+    """A simple app funded the way simple_deploy funds it"""
+    app_id = chain.create_app(chain.account(), _teal("simple_approval.teal"), _teal("simple_clear.teal"),
+                              (1, 0), (1, 0))
+    chain.ledger.fund(chain.app_address(app_id), DEPLOY_FUNDING)
+    return app_id
+
+
+def test_roster_pages_grow_one_entry_per_depositor(chain, fresh_app_id):
+    app_address = chain.app_address(fresh_app_id)
+    for slot in range(ROSTER_PAGE_SIZE + 1):
+        before = chain.ledger.min_balance(app_address)
+        result = deposit(chain, fresh_app_id, chain.account(), 1_000_000)
+        assert result["ok"], f"slot {slot}: {result['error']}"
+        assert chain.ledger.min_balance(app_address) - before == join_cost(slot, MEMBER_RECORD_SIZE)
+    assert len(chain.ledger.box(fresh_app_id, roster_box_name(0))) == 32 * ROSTER_PAGE_SIZE
+    assert len(chain.ledger.box(fresh_app_id, roster_box_name(1))) == 32
+
+
+def test_legacy_deployment_is_refused(monkeypatch):
+    import simple_deposit
+    from deployments import Registry
+    legacy = {"appId": 745489528, "type": "simple", "network": "testnet", "contractVersion": 1}
+    monkeypatch.setattr(simple_deposit, "get_registry", lambda: Registry([legacy]))
+    with pytest.raises(ValueError, match="redeploy"):
+        simple_deposit.load_deployment()
+
+    current = dict(legacy, appId=1, contractVersion=simple_deposit.CONTRACT_VERSION)
+    monkeypatch.setattr(simple_deposit, "get_registry", lambda: Registry([legacy, current]))
+    assert simple_deposit.load_deployment()['appId'] == 1
@@ -0,0 +1,88 @@
+import pytest
+from algosdk import abi
+from algod_fixtures import CONTRACTS
+from teal_assembler import (TealAssemblyError, assemble, decode_varuint, disassemble, encode_varuint,
+                            program_address)
+
+
+def program(*lines):
+    return "#pragma version 9\n" + "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("value, encoded", [(0, "00"), (127, "7f"), (128, "8001"), (300, "ac02"),
+                                            (2 ** 64 - 1, "ffffffffffffffffff01")])
+def test_varuint_round_trip(value, encoded):
+    assert encode_varuint(value).hex() == encoded
+    assert decode_varuint(bytes.fromhex(encoded), 0) == (value, len(encoded) // 2)
+
+
+def test_single_use_constants_are_pushed():
+    assert assemble(program("int 1", "return")).hex() == "09810143"
+    assert assemble(program('byte "hi"', "len", "return")).hex() == "09800268691543"
+
+
+def test_repeated_ints_go_to_intcblock_most_used_first():
+    bytecode = assemble(program("int 1", "int 2", "int 2", "int 3", "int 3", "int 3",
+                                "+", "+", "+", "+", "+", "return"))
+    # intcblock 3 2 | pushint 1 | intc_1 intc_1 | intc_0 intc_0 intc_0 | + x5 | return
+    assert bytecode.hex() == "09" + "20020302" + "8101" + "2323" + "222222" + "0808080808" + "43"
+
+
+def test_repeated_bytes_go_to_bytecblock():
+    bytecode = assemble(program('byte "a"', 'byte "a"', "concat", "len", "return"))
+    assert bytecode.hex() == "09" + "26010161" + "2828" + "50" + "15" + "43"
+
+
+def test_multibyte_int_constant():
+    assert assemble(program("int 300", "int 300", "+", "return")).hex() == "092001ac0222220843"
+
+
+def test_branch_offsets_resolve_labels():
+    bytecode = assemble(program("int 1", "bnz done", "err", "done:", "int 1", "return"))
+    # bnz skips the one-byte err: offset 0x0001
+    assert bytecode.hex() == "09" + "200101" + "22" + "400001" + "00" + "22" + "43"
+
+
+def test_named_int_constants():
+    assert assemble(program("int pay", "int OptIn", "==", "return")) == \
+        assemble(program("int 1", "int 1", "==", "return"))
+
+
+def test_method_pushes_the_arc4_selector():
+    signature = "send_batch(address[],uint64[])void"
+    selector = abi.Method.from_signature(signature).get_selector()
+    assert assemble(program(f'method "{signature}"', "len", "return")).hex() == \
+        "0980" + "04" + selector.hex() + "1543"
+
+
+def test_method_without_a_quoted_signature_is_rejected():
+    with pytest.raises(TealAssemblyError):
+        assemble(program("method send()void", "len", "return"))
+
+
+def test_unknown_opcode_is_rejected():
+    with pytest.raises(TealAssemblyError):
+        assemble(program("int 1", "frobnicate", "return"))
+
+
+def test_opcode_newer_than_program_version_is_rejected():
+    with pytest.raises(TealAssemblyError):
+        assemble("#pragma version 7\nbyte \"b\"\nint 8\nbox_create\nreturn\n")
+
+
+def test_undefined_label_is_rejected():
+    with pytest.raises(TealAssemblyError):
+        assemble(program("int 1", "bnz nowhere", "int 1", "return"))
+
+
+@pytest.mark.parametrize("kind", sorted(CONTRACTS))
+def test_contracts_round_trip_through_disassembler(kind):
+    for source in CONTRACTS[kind]():
+        bytecode = assemble(source)
+        assert assemble(disassemble(bytecode)) == bytecode
+
+
+def test_program_address_is_the_logicsig_hash():
+    from algosdk import transaction
+    bytecode = assemble(program("int 1", "return"))
+    assert program_address(bytecode) == transaction.LogicSigAccount(bytecode).address()
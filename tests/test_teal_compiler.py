@@ -0,0 +1,57 @@
+import base64
+import importlib
+import pytest
+import teal_compiler
+
+SOURCE = "#pragma version 9\nint 1\nreturn\n"
+ALGOD_BYTECODE = b"\x09\x81\x01\x43"
+
+
+class CompileClient:
+    """algod /compile stand-in that counts calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def compile(self, source):
+        self.calls += 1
+        return {"result": base64.b64encode(ALGOD_BYTECODE).decode(), "hash": "ALGOD"}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(teal_compiler, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_cache_key_covers_mode_and_assembler_version(monkeypatch):
+    local, algod = teal_compiler.cache_key(SOURCE, "local"), teal_compiler.cache_key(SOURCE, "algod")
+    assert local != algod
+    monkeypatch.setattr(teal_compiler, "ASSEMBLER_VERSION", teal_compiler.ASSEMBLER_VERSION + 1)
+    assert teal_compiler.cache_key(SOURCE, "local") != local
+    assert teal_compiler.cache_key(SOURCE, "algod") == algod
+
+
+def test_algod_is_the_default_compiler(monkeypatch):
+    monkeypatch.delenv("TEAL_COMPILE", raising=False)
+    assert importlib.reload(teal_compiler).COMPILE_MODE == "algod"
+
+
+def test_modes_never_share_cache_entries(cache_dir):
+    client = CompileClient()
+    local = teal_compiler.compile_program(client, SOURCE, verbose=False, mode="local")
+    assert client.calls == 0 and local["hash"] != "ALGOD"
+
+    assert teal_compiler.compile_program(client, SOURCE, verbose=False, mode="algod")["hash"] == "ALGOD"
+    assert teal_compiler.compile_program(client, SOURCE, verbose=False, mode="algod")["hash"] == "ALGOD"
+    assert client.calls == 1
+    assert teal_compiler.compile_program(client, SOURCE, verbose=False, mode="local") == local
+
+
+def test_fallback_to_algod_is_cached_under_the_algod_key(cache_dir):
+    client = CompileClient()
+    unsupported = "#pragma version 9\nint 1\nfrobnicate\nreturn\n"
+    assert teal_compiler.compile_program(client, unsupported, verbose=False, mode="local")["hash"] == "ALGOD"
+    assert client.calls == 1
+    assert teal_compiler._read_cache(teal_compiler.cache_key(unsupported, "local")) is None
+    assert teal_compiler._read_cache(teal_compiler.cache_key(unsupported, "algod"))["hash"] == "ALGOD"
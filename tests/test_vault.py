@@ -0,0 +1,69 @@
+from algosdk import encoding, transaction
+from advanced_vault import get_advanced_vault_teal
+from teal_assembler import assemble
+
+GOAL = 1_000_000
+
+
+def create_vault(chain, receiver, deadline):
+    approval, clear = get_advanced_vault_teal()
+    create = transaction.ApplicationCreateTxn(
+        chain.account(), chain.sp, transaction.OnComplete.NoOpOC, assemble(approval), assemble(clear),
+        transaction.StateSchema(3, 1), transaction.StateSchema(0, 0),
+        app_args=[GOAL.to_bytes(8, 'big'), deadline.to_bytes(8, 'big'), encoding.decode_address(receiver)])
+    return chain.ok(create)["txns"][0]["app_id"]
+
+
+def contribute(chain, app_id, member, amount):
+    pay = transaction.PaymentTxn(member, chain.sp, chain.app_address(app_id), amount)
+    call = transaction.ApplicationNoOpTxn(member, chain.sp, app_id, app_args=[b"contribute"])
+    return chain.run(pay, call)
+
+
+def release(chain, app_id, sender):
+    return chain.run(transaction.ApplicationNoOpTxn(sender, chain.sp, app_id, app_args=[b"release"]))
+
+
+def test_release_pays_the_receiver_and_keeps_the_app_at_min_balance(chain):
+    receiver = chain.account(0)
+    app_id = create_vault(chain, receiver, chain.ledger.timestamp - 1)
+    chain.ledger.fund(chain.app_address(app_id), 100_000)
+    assert contribute(chain, app_id, chain.account(), GOAL)["ok"]
+
+    result = release(chain, app_id, chain.account())
+    assert result["ok"], result["error"]
+    # Everything but the app's own min balance and the inner payment's fee
+    assert chain.balance(receiver) == GOAL - 1_000
+    assert chain.balance(chain.app_address(app_id)) == 100_000
+
+
+def test_release_waits_for_the_deadline(chain):
+    app_id = create_vault(chain, chain.account(0), chain.ledger.timestamp + 3600)
+    chain.ledger.fund(chain.app_address(app_id), 100_000)
+    assert contribute(chain, app_id, chain.account(), GOAL)["ok"]
+    assert not release(chain, app_id, chain.account())["ok"]
+
+
+def test_one_group_carries_several_contributions(chain):
+    app_id = create_vault(chain, chain.account(0), chain.ledger.timestamp + 3600)
+    txns = []
+    for amount in (100_000, 200_000, 300_000):
+        member = chain.account()
+        txns += [transaction.PaymentTxn(member, chain.sp, chain.app_address(app_id), amount),
+                 transaction.ApplicationNoOpTxn(member, chain.sp, app_id, app_args=[b"contribute"])]
+    assert chain.ok(*txns)
+    assert chain.ledger.global_state(app_id)[b"total"] == 600_000
+
+
+def test_contribute_needs_a_payment_just_before_it(chain):
+    app_id = create_vault(chain, chain.account(0), chain.ledger.timestamp + 3600)
+    member = chain.account()
+    pay = transaction.PaymentTxn(member, chain.sp, chain.app_address(app_id), 100_000)
+
+    def call(note=b""):
+        return transaction.ApplicationNoOpTxn(member, chain.sp, app_id, app_args=[b"contribute"], note=note)
+
+    # At GroupIndex 0 there is nothing before the call
+    assert chain.run(call(), pay)["failed_at"] == 0
+    # The second call's predecessor is the first call, not a payment
+    assert chain.run(pay, call(), call(b"again"))["failed_at"] == 2
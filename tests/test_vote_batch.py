@@ -0,0 +1,99 @@
+import os
+import pytest
+from algosdk import encoding, transaction
+import vote_batch
+from avm import execute_group
+from bulk_submit import build_vote_groups
+from governance_sender import GLOBAL_BYTES, GLOBAL_INTS, LOCAL_BYTES, LOCAL_INTS, get_governance_sender_teal
+from roster import join_box_refs, member_box_name
+
+
+@pytest.fixture
+def gov(chain):
+    owner = chain.account()
+    app_id = chain.create_app(owner, *get_governance_sender_teal(),
+                              (GLOBAL_INTS, GLOBAL_BYTES), (LOCAL_INTS, LOCAL_BYTES))
+    chain.ledger.fund(chain.app_address(app_id), 1_000_000)
+    return {"app_id": app_id, "owner": owner}
+
+
+def join(chain, gov, count):
+    """count new box members, each with a {"addr", "sk"} wallet"""
+    app_id = gov["app_id"]
+    members = [chain.keyed_account() for _ in range(count)]
+    for slot, member in enumerate(members):
+        chain.ok(transaction.PaymentTxn(member["addr"], chain.sp, chain.app_address(app_id), 500_000),
+                 transaction.ApplicationNoOpTxn(member["addr"], chain.sp, app_id, app_args=[b"contribute"],
+                                                boxes=[(app_id, member_box_name(member["addr"]))]
+                                                + join_box_refs(app_id, slot)))
+    return members
+
+
+def propose(chain, gov):
+    chain.ok(transaction.ApplicationNoOpTxn(gov["owner"], chain.sp, gov["app_id"], app_args=[
+        b"propose_send", encoding.decode_address(chain.account(0)), (100_000).to_bytes(8, 'big')]))
+
+
+def votes(chain, gov):
+    return chain.ledger.global_state(gov["app_id"])[b"proposal_votes"]
+
+
+def test_signed_vote_groups_reach_quorum_in_two_groups(chain, gov):
+    voters = join(chain, gov, 20)
+    propose(chain, gov)
+    groups, labels = build_vote_groups(chain.sp, gov["app_id"], voters[:15] + voters[16:])
+    assert [len(g) for g in groups] == [16, 3] and len(labels) == 2
+    for group in groups:
+        result = chain.run_signed(group)
+        assert result["ok"], result["error"]
+    assert votes(chain, gov) == 19
+
+
+@pytest.fixture
+def coordinator(chain, gov, tmp_path, monkeypatch):
+    """vote_batch wired to the AVM: submitted groups execute on the chain ledger"""
+    def submit(algod_client, groups, labels=None):
+        outcomes = []
+        for index, group in enumerate(groups):
+            result = execute_group(chain.ledger, group)
+            outcomes.append({"index": index, "label": labels[index], "ok": result["ok"], "txid": None,
+                             "error": result["error"], "confirmed_round": chain.ledger.round, "latency": 0.0})
+        return outcomes
+
+    monkeypatch.setattr(vote_batch, "load_deployment", lambda name: {"appId": gov["app_id"]})
+    monkeypatch.setattr(vote_batch, "get_algod_client", lambda: None)
+    monkeypatch.setattr(vote_batch, "get_suggested_params", lambda algod_client: chain.sp)
+    monkeypatch.setattr(vote_batch, "submit_pipelined", submit)
+    return str(tmp_path / "votes.txns")
+
+
+def test_create_sign_submit_keeps_unsigned_and_failed_groups(chain, gov, coordinator):
+    members = join(chain, gov, 3)
+    stranger = chain.keyed_account()
+    propose(chain, gov)
+    voters = members + [stranger]
+    groups = vote_batch.create_batch([v["addr"] for v in voters], path=coordinator, votes_per_group=2)
+    assert [len(g) for g in groups] == [2, 2]
+
+    for voter in (members[0], members[1], stranger):
+        assert vote_batch.sign_batch(voter, path=coordinator) == 1
+    assert vote_batch.batch_status(coordinator) == (1, 2)
+
+    # Only the first group is complete; the second waits on members[2]
+    vote_batch.submit_batch(coordinator)
+    assert votes(chain, gov) == 2
+    assert len(vote_batch.load_batch(coordinator)) == 2
+
+    # The stranger is not a member, so the whole second group fails and stays in the file
+    assert vote_batch.sign_batch(members[2], path=coordinator) == 1
+    vote_batch.submit_batch(coordinator)
+    assert votes(chain, gov) == 2
+    assert vote_batch.batch_status(coordinator) == (1, 1)
+
+    # Its members re-sign a fresh batch without the stranger, and the file is cleared once all land
+    os.remove(coordinator)
+    vote_batch.create_batch([members[2]["addr"]], path=coordinator)
+    vote_batch.sign_batch(members[2], path=coordinator)
+    vote_batch.submit_batch(coordinator)
+    assert votes(chain, gov) == 3
+    assert not os.path.exists(coordinator)
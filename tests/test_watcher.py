@@ -0,0 +1,76 @@
+import json
+import threading
+from urllib import error, request
+import pytest
+from watcher import _Handler, _Server, touched_by
+
+A, B, C, D, APP = (bytes([n]) * 32 for n in range(1, 6))
+
+
+def test_touched_by_follows_inner_transactions():
+    signed = {
+        "txn": {"type": "appl", "snd": A, "apid": 5},
+        "dt": {"itx": [
+            {"txn": {"type": "pay", "snd": APP, "rcv": B, "amt": 1}},
+            {"txn": {"type": "appl", "snd": APP, "apid": 7},
+             "dt": {"itx": [{"txn": {"type": "pay", "snd": APP, "rcv": C, "close": D}}]}},
+        ]},
+    }
+    assert touched_by(signed) == ({A, APP, B, C, D}, {5, 7})
+
+
+def test_touched_by_reads_a_created_app_id_from_apply_data():
+    assert touched_by({"txn": {"type": "appl", "snd": A}, "apid": 9}) == ({A}, {9})
+
+
+class StubWatcher:
+    """At round 10, watching one account and never catching up further"""
+
+    round = 10
+
+    def wait_for_round(self, round_num, timeout=None):
+        return round_num <= self.round
+
+    def account(self, address):
+        return {"amount": 5} if address == "WATCHED" else None
+
+    def accounts(self):
+        return {"WATCHED": {"amount": 5}}
+
+    def app(self, app_id):
+        return None
+
+    def apps(self):
+        return {}
+
+    def status(self):
+        return {"round": self.round}
+
+
+@pytest.fixture
+def url():
+    handler = type("StubHandler", (_Handler,), {"watcher": StubWatcher()})
+    server = _Server(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url, path):
+    try:
+        with request.urlopen(url + path, timeout=5) as response:
+            return response.status, json.load(response)
+    except error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_min_round_responses(url):
+    assert get(url, "/accounts/WATCHED?min_round=10") == (200, {"amount": 5})
+    assert get(url, "/accounts/WATCHED") == (200, {"amount": 5})
+    assert get(url, "/accounts/WATCHED?min_round=ten")[0] == 400
+    status, body = get(url, "/accounts/WATCHED?min_round=11")
+    assert status == 503 and "round 10" in body["message"]
+    assert get(url, "/accounts/OTHER?min_round=10")[0] == 404
+    assert get(url, "/apps/3")[0] == 404
+    assert get(url, "/nowhere")[0] == 404
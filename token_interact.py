@@ -3,25 +3,19 @@
 Interact with OGC Token - Transfer, opt-in, check balances
 """
 
-import json
-import os
-from algosdk.v2client import algod
 from algosdk import transaction, encoding
-from wallet_selector import select_wallet
-
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
+from algod_client import get_algod_client
+from confirmations import wait_for_confirmation
+from deployments import load_deployment
+from params_cache import get_suggested_params
+from wallet_selector import get_wallet_by_address, select_wallet
 
 def load_token_info():
     """Load OGC token info"""
-    if not os.path.exists("ogc_token_info.json"):
-        print("❌ No ogc_token_info.json found")
+    info = load_deployment("token")
+    if not info:
         print("Create token first: python create_ogc_token.py")
-        return None
-    
-    with open("ogc_token_info.json", 'r') as f:
-        return json.load(f)
+    return info
 
 def opt_in_to_token():
     """Opt into OGC token"""
@@ -38,10 +32,10 @@ def opt_in_to_token():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create opt-in transaction (0 amount to self)
     txn = transaction.AssetTransferTxn(
@@ -61,12 +55,27 @@ def opt_in_to_token():
         print(f"Sent opt-in tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ {account['name']} opted into OGC token!")
         
     except Exception as e:
         print(f"❌ Opt-in failed: {e}")
 
+def is_opted_in(algod_client, address, asset_id):
+    """True if address holds (has opted into) asset_id"""
+    assets = algod_client.account_info(address).get('assets', [])
+    return any(asset['asset-id'] == asset_id for asset in assets)
+
+def build_opt_in_transfer(sp, asset_id, sender, receiver, amount):
+    """[receiver opt-in, transfer] as one unsigned atomic group - the receiver
+    co-signs, so a new holder gets the tokens in a single round"""
+    txns = [
+        transaction.AssetTransferTxn(sender=receiver, sp=sp, receiver=receiver, amt=0, index=asset_id),
+        transaction.AssetTransferTxn(sender=sender, sp=sp, receiver=receiver, amt=amount, index=asset_id),
+    ]
+    transaction.assign_group_id(txns)
+    return txns
+
 def transfer_tokens():
     """Transfer OGC tokens"""
     token_info = load_token_info()
@@ -94,32 +103,50 @@ def transfer_tokens():
     amount_micro = int(amount * (10 ** token_info['decimals']))
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
-    # Create transfer transaction
-    txn = transaction.AssetTransferTxn(
-        sender=sender['addr'],
-        sp=sp,
-        receiver=recipient,
-        amt=amount_micro,
-        index=token_info['assetId']
-    )
+    # A recipient from our wallets who hasn't opted in co-signs an opt-in in the same group
+    try:
+        receiver_wallet = None
+        if not is_opted_in(algod_client, recipient, token_info['assetId']):
+            receiver_wallet = get_wallet_by_address(recipient)
+            if not receiver_wallet:
+                print("❌ Recipient has not opted into OGC token")
+                print("   They must opt in first (option 1)")
+                return
+            print(f"   {receiver_wallet['name']} is not opted in - opting in within the same group")
+    except Exception as e:
+        print(f"❌ Could not check recipient: {e}")
+        return
     
-    # Sign transaction
-    signed_txn = txn.sign(sender['sk'])
+    if receiver_wallet:
+        opt_in_txn, txn = build_opt_in_transfer(sp, token_info['assetId'], sender['addr'], recipient, amount_micro)
+        signed_txns = [opt_in_txn.sign(receiver_wallet['sk']), txn.sign(sender['sk'])]
+    else:
+        # Create transfer transaction
+        txn = transaction.AssetTransferTxn(
+            sender=sender['addr'],
+            sp=sp,
+            receiver=recipient,
+            amt=amount_micro,
+            index=token_info['assetId']
+        )
+        
+        # Sign transaction
+        signed_txns = [txn.sign(sender['sk'])]
     
     try:
         # Send transaction
-        tx_id = algod_client.send_transaction(signed_txn)
+        tx_id = algod_client.send_transactions(signed_txns)
         print(f"Sent transfer tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ Sent {amount} {token_info['unitName']} to {recipient}")
-        print(f"   TX: https://testnet.algoexplorer.io/tx/{tx_id}")
+        print(f"   TX: https://testnet.algoexplorer.io/tx/{txn.get_txid()}")
         
     except Exception as e:
         print(f"❌ Transfer failed: {e}")
@@ -138,7 +165,7 @@ def check_token_balance():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     try:
         account_info = algod_client.account_info(account['addr'])
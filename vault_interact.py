@@ -3,25 +3,24 @@
 Interact with Advanced Vault Contract
 """
 
-import json
-import os
-from algosdk.v2client import algod
+from datetime import datetime
 from algosdk import transaction
+from advanced_vault import CONTRACT_VERSION
+from algod_client import get_algod_client
+from app_state import get_state_reader
+from confirmations import wait_for_confirmation
+from deployments import load_deployment, warn_outdated
+from params_cache import get_suggested_params
 from wallet_selector import select_wallet, load_wallets
 
-# Configuration
-ALGOD_URL = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-
 def load_vault_deployment():
     """Load vault deployment info"""
-    if not os.path.exists("advanced_vault_deployment.json"):
-        print("❌ No advanced_vault_deployment.json found")
+    info = load_deployment("vault")
+    if not info:
         print("Deploy vault first: python advanced_vault.py")
-        return None
-    
-    with open("advanced_vault_deployment.json", 'r') as f:
-        return json.load(f)
+    else:
+        warn_outdated(info, CONTRACT_VERSION)
+    return info
 
 def contribute_to_vault():
     """Contribute ALGO to vault"""
@@ -43,10 +42,10 @@ def contribute_to_vault():
     amount_micro = int(amount_algo * 1_000_000)
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create payment transaction
     pay_txn = transaction.PaymentTxn(
@@ -76,7 +75,7 @@ def contribute_to_vault():
     print(f"Sent contribution tx: {tx_id}")
     
     # Wait for confirmation
-    transaction.wait_for_confirmation(algod_client, tx_id, 4)
+    wait_for_confirmation(algod_client, tx_id, 4)
     print(f"✅ Contributed {amount_algo} ALGO to vault!")
 
 def release_vault_funds():
@@ -93,10 +92,10 @@ def release_vault_funds():
         return
     
     # Initialize Algod client
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    algod_client = get_algod_client()
     
     # Get suggested parameters
-    sp = algod_client.suggested_params()
+    sp = get_suggested_params(algod_client)
     
     # Create app call transaction
     app_call_txn = transaction.ApplicationNoOpTxn(
@@ -115,7 +114,7 @@ def release_vault_funds():
         print(f"Sent release tx: {tx_id}")
         
         # Wait for confirmation
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation(algod_client, tx_id, 4)
         print(f"✅ Vault funds released to receiver!")
         
     except Exception as e:
@@ -137,14 +136,16 @@ def check_vault_status():
     print(f"   Goal: {vault_info['goal']/1_000_000} ALGO")
     print(f"   Receiver: {vault_info['receiver']}")
     
-    # Check balance
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    # Check balance and state
+    reader = get_state_reader()
     try:
-        account_info = algod_client.account_info(vault_info['appAddress'])
-        balance = account_info['amount'] / 1_000_000
+        balance = reader.balance(vault_info['appAddress']) / 1_000_000
+        state = reader.global_state(vault_info['appId'], "vault")
         print(f"   Current Balance: {balance} ALGO")
+        print(f"   Contributed: {state['total']/1_000_000} ALGO")
+        print(f"   Deadline: {datetime.fromtimestamp(state['deadline']).isoformat(' ')}")
         
-        goal_reached = balance >= (vault_info['goal'] / 1_000_000)
+        goal_reached = state['total'] >= state['goal']
         print(f"   Goal Reached: {'✅' if goal_reached else '❌'}")
         
         print(f"   Explorer: https://testnet.algoexplorer.io/address/{vault_info['appAddress']}")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Coordinator workflow for batched governance votes
+
+A group id covers every transaction in the group, so members cannot sign
+their vote until the coordinator has fixed the batch. The flow is:
+
+  1. create  - coordinator builds up to 16 vote calls per atomic group and
+               writes them, unsigned, to a batch file
+  2. sign    - each member loads the file and signs the call(s) they send
+               (share the file around, or run it once per wallet)
+  3. submit  - coordinator submits every fully signed group, pipelined
+
+The batch file holds plain msgpack transactions (transaction.write_to_file),
+so members can also sign it with goal or any other wallet. Votes are valid
+for 1000 rounds (~45 min) from creation.
+
+Usage:
+  python vote_batch.py create [address ...]   # default: every wallets.json address
+  python vote_batch.py create --proposal <id> [address ...]   # a concurrent proposal
+  python vote_batch.py sign
+  python vote_batch.py submit
+  python vote_batch.py status
+"""
+
+import os
+import sys
+import time
+from algosdk import encoding, transaction
+from algod_client import get_algod_client
+from bulk_submit import VOTES_PER_GROUP, build_unsigned_vote_groups, print_report, submit_pipelined
+from deployments import load_deployment
+from params_cache import get_suggested_params
+from wallet_selector import select_wallet, load_wallets
+
+# Configuration
+BATCH_FILE = os.environ.get("VOTE_BATCH_FILE", "vote_batch.txns")
+
+
+def _load_governance_deployment():
+    info = load_deployment("governance")
+    if not info:
+        print("Deploy governance contract first: python governance_sender.py")
+    return info
+
+
+def _unsigned(entry):
+    return entry if isinstance(entry, transaction.Transaction) else entry.transaction
+
+
+def _split_groups(entries):
+    """Split a flat batch back into its atomic groups"""
+    groups = []
+    for entry in entries:
+        group_id = _unsigned(entry).group
+        if groups and group_id is not None and _unsigned(groups[-1][0]).group == group_id:
+            groups[-1].append(entry)
+        else:
+            groups.append([entry])
+    return groups
+
+
+def load_batch(path=BATCH_FILE):
+    if not os.path.exists(path):
+        print(f"❌ No {path} found")
+        print("Create one first: python vote_batch.py create")
+        return None
+    return transaction.retrieve_from_file(path)
+
+
+def create_batch(voter_addresses=None, path=BATCH_FILE, votes_per_group=VOTES_PER_GROUP, proposal_id=None):
+    """Write unsigned vote groups for voter_addresses to path (on proposal_id if given)"""
+    gov_info = _load_governance_deployment()
+    if not gov_info:
+        return None
+    if not voter_addresses:
+        voter_addresses = [wallet['addr'] for wallet in load_wallets().values()]
+    invalid = [a for a in voter_addresses if not encoding.is_valid_address(a)]
+    if invalid:
+        print(f"❌ Invalid address(es): {', '.join(invalid)}")
+        return None
+    if len(set(voter_addresses)) != len(voter_addresses):
+        # A second vote from the same member would fail its whole group
+        print("❌ Duplicate voter addresses")
+        return None
+
+    sp = get_suggested_params(get_algod_client())
+    groups = build_unsigned_vote_groups(sp, gov_info['appId'], voter_addresses, votes_per_group, proposal_id)
+    transaction.write_to_file([txn for group in groups for txn in group], path)
+    print(f"✅ Wrote {len(voter_addresses)} vote call(s) in {len(groups)} group(s) to {path}")
+    print(f"   Valid until round {sp.last}")
+    print("   Members sign with: python vote_batch.py sign")
+    return groups
+
+
+def sign_batch(signer=None, path=BATCH_FILE):
+    """Sign every still-unsigned call in the batch sent by signer"""
+    entries = load_batch(path)
+    if entries is None:
+        return 0
+    if signer is None:
+        signer = select_wallet()
+        if not signer:
+            return 0
+    signed = 0
+    for i, entry in enumerate(entries):
+        if isinstance(entry, transaction.Transaction) and entry.sender == signer['addr']:
+            entries[i] = entry.sign(signer['sk'])
+            signed += 1
+    if signed:
+        transaction.write_to_file(entries, path)
+        print(f"✅ Signed {signed} vote call(s) as {signer.get('name', signer['addr'])}")
+    else:
+        print(f"❌ No unsigned vote for {signer['addr']} in {path}")
+    return signed
+
+
+def batch_status(path=BATCH_FILE):
+    """Print how many signatures each group is still missing"""
+    entries = load_batch(path)
+    if entries is None:
+        return None
+    groups = _split_groups(entries)
+    ready = 0
+    print(f"📋 {path}: {len(entries)} vote call(s) in {len(groups)} group(s)")
+    for i, group in enumerate(groups):
+        missing = [_unsigned(e).sender for e in group if isinstance(e, transaction.Transaction)]
+        if missing:
+            print(f"   Group {i + 1}: {len(group) - len(missing)}/{len(group)} signed, waiting on:")
+            for address in missing:
+                print(f"     {address}")
+        else:
+            ready += 1
+            print(f"   Group {i + 1}: ✅ {len(group)}/{len(group)} signed")
+    return ready, len(groups)
+
+
+def submit_batch(path=BATCH_FILE):
+    """Submit every fully signed group; partially signed groups are left in the file"""
+    entries = load_batch(path)
+    if entries is None:
+        return None
+    groups = _split_groups(entries)
+    # Tracked by position: two groups' contents can compare equal
+    complete = [i for i, g in enumerate(groups) if not any(isinstance(e, transaction.Transaction) for e in g)]
+    if not complete:
+        print("❌ No fully signed group yet")
+        batch_status(path)
+        return None
+
+    algod_client = get_algod_client()
+    print(f"🗳️  Submitting {sum(len(groups[i]) for i in complete)} vote(s) in {len(complete)} group(s)")
+    start = time.perf_counter()
+    outcomes = submit_pipelined(algod_client, [groups[i] for i in complete],
+                                labels=[f"group {i + 1}" for i in complete])
+    stats = print_report("Batched votes", outcomes, time.perf_counter() - start)
+
+    # Keep anything not yet confirmed (unsigned or failed) for another attempt
+    confirmed = {i for i, o in zip(complete, outcomes) if o['ok']}
+    remaining = [g for i, g in enumerate(groups) if i not in confirmed]
+    if remaining:
+        transaction.write_to_file([e for g in remaining for e in g], path)
+        print(f"   {len(remaining)} group(s) left in {path}")
+    else:
+        os.remove(path)
+    return stats
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "create":
+        if len(args) > 2 and args[1] == "--proposal":
+            create_batch(args[3:], proposal_id=int(args[2]))
+        else:
+            create_batch(args[1:])
+    elif args and args[0] == "sign":
+        sign_batch()
+    elif args and args[0] == "submit":
+        submit_batch()
+    elif args and args[0] == "status":
+        batch_status()
+    else:
+        print("💡 Usage:")
+        print("  python vote_batch.py create [--proposal <id>] [address ...]")
+        print("  python vote_batch.py sign")
+        print("  python vote_batch.py submit")
+        print("  python vote_batch.py status")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,89 @@
 #!/usr/bin/env python3
 """
 Wallet selector utility - choose between multiple wallets
-"""
 
-import json
-import os
-from algosdk import mnemonic, account
+Lookups go through the shared keystore (keystore.py): wallets.json is parsed
+and its mnemonics decoded once per process, and generated load-test accounts
+in keystore.json can be picked by name too.
+"""
 
-WALLETS_PATH = os.path.join(os.path.dirname(__file__), "wallets.json")
+from algosdk import account
+from keystore import PLACEHOLDER_MNEMONIC, WALLETS_PATH, get_keystore
 
 def load_wallets():
-    """Load all available wallets"""
-    with open(WALLETS_PATH, 'r') as f:
-        return json.load(f)
+    """Load all available wallets (wallets.json entries, parsed once per process)"""
+    return get_keystore().wallets
+
+def _signer(wallet):
+    return {
+        "addr": wallet['addr'],
+        "sk": wallet['sk'],
+        "name": wallet['name']
+    }
 
 def select_wallet():
     """Interactive wallet selection"""
-    wallets = load_wallets()
-    
+    keystore = get_keystore()
+    wallets = keystore.wallets
+
     print("💳 Available Wallets:")
     wallet_keys = list(wallets.keys())
-    
+
     for i, key in enumerate(wallet_keys, 1):
         wallet = wallets[key]
         print(f"{i}. {key}: {wallet['addr']} ({wallet.get('note', 'no note')})")
-    
+    extra = len(keystore) - len(wallet_keys)
+    if extra > 0:
+        print(f"   (+{extra} keystore account(s), enter one by name)")
+
     while True:
-        try:
-            choice = int(input(f"Choose wallet (1-{len(wallet_keys)}): ")) - 1
-            if 0 <= choice < len(wallet_keys):
-                selected_key = wallet_keys[choice]
-                selected_wallet = wallets[selected_key]
-                
-                # Validate mnemonic if provided
-                if selected_wallet['mnemonic'] != "YOUR_24_OR_25_WORD_MNEMONIC_HERE":
-                    try:
-                        private_key = mnemonic.to_private_key(selected_wallet['mnemonic'])
-                        derived_addr = account.address_from_private_key(private_key)
-                        
-                        print(f"✅ Selected: {selected_key}")
-                        print(f"   Address: {selected_wallet['addr']}")
-                        
-                        if derived_addr != selected_wallet['addr']:
-                            print(f"⚠️  Warning: Mnemonic doesn't match address!")
-                        
-                        return {
-                            "addr": selected_wallet['addr'],
-                            "sk": private_key,
-                            "name": selected_key
-                        }
-                    except Exception as e:
-                        print(f"❌ Invalid mnemonic for {selected_key}: {e}")
-                        continue
-                else:
-                    print(f"❌ Please update mnemonic for {selected_key} in wallets.json")
-                    continue
-            else:
+        choice = input(f"Choose wallet (1-{len(wallet_keys)}): ").strip()
+        if choice.isdigit():
+            index = int(choice) - 1
+            if not 0 <= index < len(wallet_keys):
                 print("❌ Invalid choice")
-        except ValueError:
-            print("❌ Please enter a number")
+                continue
+            selected_key = wallet_keys[index]
+        elif choice in keystore:
+            selected_key = choice
+        else:
+            print("❌ Please enter a number or an account name")
+            continue
+
+        selected_wallet = keystore.get(selected_key)
+        if selected_wallet['sk'] is None:
+            if wallets[selected_key]['mnemonic'] == PLACEHOLDER_MNEMONIC:
+                print(f"❌ Please update mnemonic for {selected_key} in wallets.json")
+            else:
+                print(f"❌ Invalid mnemonic for {selected_key}")
+            continue
+
+        print(f"✅ Selected: {selected_key}")
+        print(f"   Address: {selected_wallet['addr']}")
+
+        if account.address_from_private_key(selected_wallet['sk']) != selected_wallet['addr']:
+            print(f"⚠️  Warning: Mnemonic doesn't match address!")
+
+        return _signer(selected_wallet)
 
 def get_wallet_by_name(name):
     """Get specific wallet by name"""
-    wallets = load_wallets()
-    if name not in wallets:
+    wallet = get_keystore().get(name)
+    if wallet is None:
         raise ValueError(f"Wallet '{name}' not found")
-    
-    wallet = wallets[name]
-    private_key = mnemonic.to_private_key(wallet['mnemonic'])
-    
-    return {
-        "addr": wallet['addr'],
-        "sk": private_key,
-        "name": name
-    }
+    if wallet['sk'] is None:
+        raise ValueError(f"Wallet '{name}' has no valid mnemonic in {WALLETS_PATH}")
+
+    return _signer(wallet)
+
+def get_wallet_by_address(address):
+    """Wallet whose address is `address`, or None if it is not in the keystore"""
+    wallet = get_keystore().find(address)
+    if wallet is None or wallet['sk'] is None:
+        return None
+    return _signer(wallet)
 
 if __name__ == "__main__":
     wallet = select_wallet()
     if wallet:
-        print(f"Selected wallet: {wallet['name']} - {wallet['addr']}")
\ No newline at end of file
+        print(f"Selected wallet: {wallet['name']} - {wallet['addr']}")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Long-running balance and app state watcher
+
+Loads every wallet in wallets.json (plus permanent_wallet.json) and every
+app in the deployment registry once, then follows new blocks: each block's
+transactions, inner ones included, name the accounts and apps it touched,
+and only those are re-read. Everything else is served from memory over a
+local HTTP port, so balance checks and status screens cost no algod calls.
+
+  GET /status                  round, counts, reads since start
+  GET /accounts                {address: account} for every watched address
+  GET /accounts/<address>      amount, min-balance, assets, ... (404 if not watched)
+  GET /apps                    {app_id: app} for every watched app
+  GET /apps/<app_id>           kind, address, round, global-state (raw TealKeyValues)
+
+Any query can carry ?min_round=N; the watcher waits briefly to reach round N
+and answers 503 if it cannot, so a reader never gets state older than a
+transaction it just confirmed. watcher_client.py wraps these queries.
+
+Usage:
+  python watcher.py              # run the watcher (Ctrl+C to stop)
+  python watcher.py status       # ask a running watcher what it holds
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+from algosdk import encoding, error, logic
+from algod_client import get_algod_client
+from chain_index import fetch_block
+from deployments import APP_TYPES, REGISTRY_PATH, get_registry
+from keystore import WALLETS_PATH, get_keystore
+from watcher_client import WATCHER_HOST, WATCHER_PORT, WATCHER_URL, query_watcher
+
+# Configuration
+PERMANENT_WALLET_PATH = "permanent_wallet.json"
+REFRESH_WORKERS = int(os.environ.get("WATCHER_REFRESH_WORKERS", "8"))  # concurrent re-reads per block
+MAX_CATCHUP = 1000  # rounds behind after which everything is reloaded instead of replayed
+CATCHUP_WAIT = 2.0  # seconds a min_round query waits for the watcher to get there
+RETRY_DELAY = 1.0  # seconds to back off after an algod error
+
+# account_info fields kept per address
+ACCOUNT_FIELDS = ("amount", "min-balance", "status", "assets", "apps-total-schema",
+                  "total-apps-opted-in", "total-assets-opted-in")
+# Transaction fields that name an account whose balance can change
+ACCOUNT_KEYS = ("snd", "rcv", "close", "asnd", "arcv", "aclose")
+
+
+def touched_by(signed, addresses=None, app_ids=None):
+    """(addresses, app ids) a block transaction and its inner transactions touched"""
+    addresses = set() if addresses is None else addresses
+    app_ids = set() if app_ids is None else app_ids
+    txn = signed["txn"]
+    addresses.update(txn[key] for key in ACCOUNT_KEYS if key in txn)
+    if txn.get("type") == "appl":
+        app_ids.add(txn.get("apid") or signed.get("apid"))
+    for inner in signed.get("dt", {}).get("itx", []):
+        touched_by(inner, addresses, app_ids)
+    return addresses, app_ids
+
+
+def _watch_list():
+    """({address: name}, {app_id: kind}) from the wallet files and the deployment registry"""
+    names = {wallet['addr']: name for name, wallet in get_keystore().wallets.items()
+             if encoding.is_valid_address(wallet.get('addr', ''))}
+    apps = {}
+    if os.path.exists(PERMANENT_WALLET_PATH):
+        with open(PERMANENT_WALLET_PATH, 'r') as f:
+            names.setdefault(json.load(f)['address'], "permanent")
+    for info in get_registry().find():
+        if info['type'] in APP_TYPES:
+            apps[info['appId']] = info['type']
+            label = f"{info['type']} app" + (f" {info['tag']}" if info.get('tag') else "")
+            names.setdefault(logic.get_application_address(info['appId']), label)
+    return names, apps
+
+
+def _watch_list_stamp():
+    paths = [WALLETS_PATH, PERMANENT_WALLET_PATH, REGISTRY_PATH]
+    return tuple(os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in paths)
+
+
+class Watcher:
+    """In-memory balances and app state, kept current block by block"""
+
+    def __init__(self, algod_client):
+        self.algod_client = algod_client
+        self.round = None
+        self.names = {}     # address -> wallet name (or "<kind> app")
+        self.app_kinds = {}  # app_id -> kind
+        self._accounts = {}  # address -> account snapshot
+        self._apps = {}      # app_id -> app snapshot
+        self._stamp = None
+        self._changed = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS)
+        self.stats = {"blocks": 0, "account_reads": 0, "app_reads": 0, "started": time.time()}
+
+    def _read_account(self, address):
+        info = self.algod_client.account_info(address)
+        return dict({key: info[key] for key in ACCOUNT_FIELDS if key in info},
+                    address=address, name=self.names.get(address), round=info.get("round"))
+
+    def _read_app(self, app_id, round_num):
+        try:
+            params = self.algod_client.application_info(app_id)['params']
+        except error.AlgodHTTPError as e:
+            print(f"⚠️  Not watching {self.app_kinds[app_id]} app {app_id}: {e}")
+            return None
+        return {"app_id": app_id, "kind": self.app_kinds[app_id], "address": logic.get_application_address(app_id),
+                "round": round_num, "global-state": params.get('global-state', [])}
+
+    def _apply(self, round_num, addresses=(), app_ids=()):
+        """Re-read the given watched addresses and apps, then mark round_num applied"""
+        addresses = [a for a in addresses if a in self.names]
+        app_ids = [a for a in app_ids if a in self.app_kinds]
+        accounts = dict(zip(addresses, self._pool.map(self._read_account, addresses)))
+        apps = {app_id: app for app_id, app in zip(
+            app_ids, self._pool.map(lambda app_id: self._read_app(app_id, round_num), app_ids)) if app is not None}
+        with self._changed:
+            self._accounts.update(accounts)
+            self._apps.update(apps)
+            self.stats["account_reads"] += len(accounts)
+            self.stats["app_reads"] += len(apps)
+            self.round = round_num
+            self._changed.notify_all()
+
+    def _reload_watch_list(self, round_num, force=False):
+        """Pick up wallets/deployments added or removed on disk; read everything new (or all, if forced)"""
+        stamp = _watch_list_stamp()
+        if stamp == self._stamp and not force:
+            return
+        self._stamp = stamp
+        names, app_kinds = _watch_list()
+        added = [a for a in names if force or a not in self.names]
+        added_apps = [a for a in app_kinds if force or a not in self.app_kinds]
+        with self._changed:
+            self.names, self.app_kinds = names, app_kinds
+            for address in set(self._accounts) - set(names):
+                del self._accounts[address]
+            for app_id in set(self._apps) - set(app_kinds):
+                del self._apps[app_id]
+        self._apply(round_num, added, added_apps)
+
+    def start(self):
+        """Read everything once and follow blocks on a background thread"""
+        self._reload_watch_list(self.algod_client.status()["last-round"], force=True)
+        threading.Thread(target=self._follow, daemon=True).start()
+
+    def _follow(self):
+        while True:
+            try:
+                last_round = self.algod_client.status_after_block(self.round)["last-round"]
+                if last_round <= self.round:
+                    continue
+                self._reload_watch_list(self.round)
+                if last_round - self.round > MAX_CATCHUP:
+                    self._reload_watch_list(last_round, force=True)
+                    continue
+                addresses, app_ids = set(), set()
+                for round_num in range(self.round + 1, last_round + 1):
+                    for signed in fetch_block(self.algod_client, round_num).get("txns", []):
+                        touched_by(signed, addresses, app_ids)
+                    self.stats["blocks"] += 1
+                self._apply(last_round, [encoding.encode_address(a) for a in addresses], app_ids)
+            except Exception as e:
+                print(f"⚠️  Watcher error: {e}")
+                time.sleep(RETRY_DELAY)
+
+    def wait_for_round(self, round_num, timeout=CATCHUP_WAIT):
+        """True once the watcher has applied round_num (False after timeout)"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.round is not None and self.round >= round_num, timeout)
+
+    def account(self, address):
+        return self._accounts.get(address)
+
+    def accounts(self):
+        with self._changed:
+            return dict(self._accounts)
+
+    def app(self, app_id):
+        return self._apps.get(app_id)
+
+    def apps(self):
+        with self._changed:
+            return {str(app_id): app for app_id, app in self._apps.items()}
+
+    def status(self):
+        return dict(self.stats, round=self.round, accounts=len(self._accounts), apps=len(self._apps))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves a Watcher's snapshots as JSON"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    watcher = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = parse.urlsplit(self.path)
+        min_round = parse.parse_qs(url.query).get("min_round", ["0"])[0]
+        if not min_round.isdigit():
+            return self._send(400, {"message": "min_round must be a round number"})
+        if int(min_round) and not self.watcher.wait_for_round(int(min_round)):
+            return self._send(503, {"message": f"watcher is at round {self.watcher.round}, not {min_round}"})
+        for pattern, handler in _ROUTES:
+            match = pattern.fullmatch(url.path)
+            if match:
+                result = handler(self.watcher, *match.groups())
+                if result is None:
+                    return self._send(404, {"message": f"{url.path} is not watched"})
+                return self._send(200, result)
+        self._send(404, {"message": f"unknown endpoint {url.path}"})
+
+
+_ROUTES = [
+    (re.compile(r"/status"), lambda w: w.status()),
+    (re.compile(r"/accounts"), lambda w: w.accounts()),
+    (re.compile(r"/accounts/([A-Z2-7]+)"), lambda w, address: w.account(address)),
+    (re.compile(r"/apps"), lambda w: w.apps()),
+    (re.compile(r"/apps/(\d+)"), lambda w, app_id: w.app(int(app_id))),
+]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def start_watcher(algod_client=None, host=WATCHER_HOST, port=WATCHER_PORT):
+    """Load the watch list, start following blocks and serving, returning (watcher, server, url)"""
+    watcher = Watcher(algod_client or get_algod_client())
+    watcher.start()
+    handler = type("WatcherHandler", (_Handler,), {"watcher": watcher})
+    server = _Server((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return watcher, server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "status":
+        status = query_watcher("/status")
+        if status is None:
+            print(f"❌ No watcher answering at {WATCHER_URL}")
+            return
+        print(f"👀 Watcher at {WATCHER_URL}, round {status['round']}")
+        print(f"   Watching {status['accounts']} account(s) and {status['apps']} app(s)")
+        print(f"   {status['blocks']} block(s) followed, {status['account_reads']} account "
+              f"and {status['app_reads']} app read(s) since start")
+        return
+    if args:
+        print("💡 Usage:")
+        print("  python watcher.py")
+        print("  python watcher.py status")
+        return
+
+    watcher, server, url = start_watcher()
+    print(f"👀 Watcher listening on {url} from round {watcher.round}")
+    print(f"   Watching {len(watcher.names)} account(s) and {len(watcher.app_kinds)} app(s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n👋 Stopping watcher")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Queries against a running balance watcher (watcher.py)
+
+Each lookup is one request to the local watcher, never to algod. When the
+watcher is not running, does not watch the address/app, or cannot reach
+min_round in time, the functions return None and callers fall back to algod.
+Set WATCHER_URL="" to skip the watcher entirely.
+"""
+
+import json
+import os
+import socket
+
+# Configuration
+WATCHER_HOST = os.environ.get("WATCHER_HOST", "127.0.0.1")
+WATCHER_PORT = int(os.environ.get("WATCHER_PORT", "4190"))
+WATCHER_URL = os.environ.get("WATCHER_URL", f"http://{WATCHER_HOST}:{WATCHER_PORT}")
+QUERY_TIMEOUT = float(os.environ.get("WATCHER_TIMEOUT", "3"))  # covers the watcher's wait for min_round
+
+
+def _endpoint():
+    """(host, port) of WATCHER_URL"""
+    netloc = WATCHER_URL.split("://", 1)[-1].split("/", 1)[0]
+    host, _, port = netloc.rpartition(":")
+    return (host, int(port)) if host else (netloc, 80)
+
+
+def query_watcher(path, min_round=None):
+    """GET path from the watcher as parsed JSON, or None"""
+    if not WATCHER_URL:
+        return None
+    if min_round:
+        path += ("&" if "?" in path else "?") + f"min_round={int(min_round)}"
+    # One HTTP/1.0 request per connection: the watcher is on loopback, and
+    # skipping urllib/http.client keeps `ogc balance` start-up light
+    try:
+        host, port = _endpoint()
+        with socket.create_connection((host, port), timeout=QUERY_TIMEOUT) as conn:
+            conn.sendall(f"GET {path} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        head, _, body = b"".join(chunks).partition(b"\r\n\r\n")
+        if head.split(b" ", 2)[1] != b"200":
+            return None
+        return json.loads(body)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def watched_account(address, min_round=None):
+    """{"amount", "min-balance", "assets", ...} for a watched address, or None"""
+    return query_watcher(f"/accounts/{address}", min_round)
+
+
+def watched_accounts(min_round=None):
+    """{address: account} for every watched address ({} without a watcher)"""
+    return query_watcher("/accounts", min_round) or {}
+
+
+def watched_app(app_id, min_round=None):
+    """{"kind", "address", "round", "global-state"} for a watched app, or None.
+    global-state is the raw algod TealKeyValue list."""
+    return query_watcher(f"/apps/{app_id}", min_round)